@@ -0,0 +1,209 @@
+"""Local stand-in for the Groq OpenAI-compatible API.
+
+Serves ``POST /chat/completions`` (and ``/openai/v1/chat/completions``) with
+a valid classification JSON body, a ``usage`` block and Groq-style rate-limit
+headers. Latency, jitter, a requests-per-minute / tokens-per-minute budget
+and an error rate are configurable so ``GroqClient`` retry and backoff paths
+can be exercised without touching the real API.
+
+    with FakeGroqServer(latency_ms=150, requests_per_minute=30) as server:
+        config = GroqConfig(api_key="test", base_url=server.base_url)
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Optional, Tuple
+
+from benchmarks.fixtures import TOPICS
+
+
+@dataclass
+class FakeGroqStats:
+    requests: int = 0
+    completed: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@dataclass
+class FakeGroqServer:
+    latency_ms: float = 100.0
+    jitter_ms: float = 0.0
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    error_rate: float = 0.0
+    retry_after_s: float = 1.0
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: FakeGroqStats = field(default_factory=FakeGroqStats)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        # (timestamp, tokens) for requests in the last 60s window
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if not self._server:
+            raise RuntimeError("Server not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGroqServer":
+        handler = _make_handler(self)
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGroqServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    # --- request handling -------------------------------------------------
+
+    def _admit(self, tokens: int) -> Tuple[bool, Dict[str, str]]:
+        """Sliding 60s window check. Returns (allowed, rate-limit headers)."""
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0][0] >= 60:
+                self._window.popleft()
+            used_requests = len(self._window)
+            used_tokens = sum(t for _, t in self._window)
+            reset = 60 - (now - self._window[0][0]) if self._window else 0.0
+
+            allowed = True
+            if self.requests_per_minute and used_requests >= self.requests_per_minute:
+                allowed = False
+            if self.tokens_per_minute and used_tokens + tokens > self.tokens_per_minute:
+                allowed = False
+            if allowed:
+                self._window.append((now, tokens))
+                used_requests += 1
+                used_tokens += tokens
+
+        headers: Dict[str, str] = {}
+        if self.requests_per_minute:
+            headers["x-ratelimit-limit-requests"] = str(self.requests_per_minute)
+            headers["x-ratelimit-remaining-requests"] = str(
+                max(0, self.requests_per_minute - used_requests)
+            )
+            headers["x-ratelimit-reset-requests"] = f"{reset:.2f}s"
+        if self.tokens_per_minute:
+            headers["x-ratelimit-limit-tokens"] = str(self.tokens_per_minute)
+            headers["x-ratelimit-remaining-tokens"] = str(
+                max(0, self.tokens_per_minute - used_tokens)
+            )
+            headers["x-ratelimit-reset-tokens"] = f"{reset:.2f}s"
+        if not allowed:
+            headers["retry-after"] = str(self.retry_after_s)
+        return allowed, headers
+
+    def _sleep(self) -> None:
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, delay) / 1000)
+
+    def _completion(self, request: Dict) -> Tuple[Dict, int, int]:
+        prompt_chars = sum(len(m.get("content", "")) for m in request.get("messages", []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        with self._lock:
+            topics = self._rng.sample(TOPICS, k=self._rng.randint(2, 4))
+        content = json.dumps({"topics": topics, "summary": "Synthetic summary of the tweet."})
+        completion_tokens = max(1, len(content) // 4)
+        body = {
+            "id": f"chatcmpl-fake-{self.stats.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        return body, prompt_tokens, completion_tokens
+
+
+def _make_handler(server: FakeGroqServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: Dict, headers: Dict[str, str]) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):  # noqa: N802
+            if not self.path.endswith("/chat/completions"):
+                self._send(404, {"error": {"message": "not found"}}, {})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            with server._lock:
+                server.stats.requests += 1
+            body, prompt_tokens, completion_tokens = server._completion(request)
+
+            allowed, headers = server._admit(prompt_tokens + completion_tokens)
+            if not allowed:
+                with server._lock:
+                    server.stats.rate_limited += 1
+                self._send(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                    headers,
+                )
+                return
+
+            server._sleep()
+            with server._lock:
+                failed = server._rng.random() < server.error_rate
+            if failed:
+                with server._lock:
+                    server.stats.server_errors += 1
+                self._send(503, {"error": {"message": "Service unavailable"}}, headers)
+                return
+
+            with server._lock:
+                server.stats.completed += 1
+                server.stats.prompt_tokens += prompt_tokens
+                server.stats.completion_tokens += completion_tokens
+            self._send(200, body, headers)
+
+        def log_message(self, format, *args):  # noqa: A002
+            pass
+
+    return Handler
@@ -0,0 +1,153 @@
+"""Local stand-in for the media CDN (pbs.twimg.com).
+
+Serves ``GET /media/<name>.png`` with a small generated PNG. Names that share
+a ``variant`` get identical bytes, as the same picture reposted under two
+URLs would. ``/gone/...`` answers 404. Latency and a 503 error rate are
+configurable, so ``HttpMediaDownloader`` retry and dedupe paths can be
+exercised without touching the real CDN.
+
+    with FakeMediaServer(latency_ms=50, error_rate=0.1) as server:
+        downloader = HttpMediaDownloader(store, allowed_hosts=[server.host])
+        url = server.url("photo-1", variant=1)
+"""
+
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def png(width: int, height: int, seed: int) -> bytes:
+    """A solid-colour RGB PNG, built without an imaging library."""
+    rng = random.Random(seed)
+    pixel = bytes(rng.randrange(256) for _ in range(3))
+    rows = (b"\x00" + pixel * width) * height
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+@dataclass
+class FakeMediaStats:
+    requests: int = 0
+    served: int = 0
+    server_errors: int = 0
+    not_found: int = 0
+    # Requests per path, to check each URL is fetched once
+    paths: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class FakeMediaServer:
+    latency_ms: float = 20.0
+    error_rate: float = 0.0
+    image_size: int = 1200
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: FakeMediaStats = field(default_factory=FakeMediaStats)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._images: Dict[int, bytes] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if not self._server:
+            raise RuntimeError("Server not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name: str, variant: int = 0, gone: bool = False) -> str:
+        prefix = "gone" if gone else "media"
+        return f"{self.base_url}/{prefix}/{name}.png?variant={variant}"
+
+    def start(self) -> "FakeMediaServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeMediaServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _image(self, variant: int) -> bytes:
+        image = self._images.get(variant)
+        if image is None:
+            image = png(self.image_size, self.image_size * 2 // 3, variant)
+            self._images[variant] = image
+        return image
+
+
+def _make_handler(server: FakeMediaServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # noqa: N802
+            url = urlsplit(self.path)
+            with server._lock:
+                server.stats.requests += 1
+                server.stats.paths[self.path] += 1
+                failed = server._rng.random() < server.error_rate
+            time.sleep(server.latency_ms / 1000)
+
+            if not url.path.startswith("/media/"):
+                with server._lock:
+                    server.stats.not_found += 1
+                self._send(404, b"not found", "text/plain")
+                return
+            if failed:
+                with server._lock:
+                    server.stats.server_errors += 1
+                self._send(503, b"unavailable", "text/plain")
+                return
+            variant = int(parse_qs(url.query).get("variant", ["0"])[0])
+            self._send(200, server._image(variant), "image/png")
+            with server._lock:
+                server.stats.served += 1
+
+        def log_message(self, format, *args):  # noqa: A002
+            pass
+
+    return Handler
@@ -0,0 +1,216 @@
+"""Synthetic X/Twitter GraphQL payloads and DB rows for benchmarks.
+
+Payload shapes follow what ``TwitterParser`` handles: bookmark timeline pages
+(``bookmark_timeline_v2``) and ``TweetDetail`` responses, including note
+tweets, truncated legacy text, quoted tweets with and without
+``quoted_status_result`` and both the legacy and the newer ``core`` user
+layouts. Everything is derived from a seed so runs are reproducible.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+TOPICS = [
+    "machine-learning", "python", "web-dev", "startup-advice", "crypto", "ai-tools",
+    "career-tips", "productivity", "design", "javascript", "data-science", "rust",
+    "databases", "devops", "security", "llm", "open-source", "typescript", "finance",
+    "writing", "marketing", "hiring", "distributed-systems", "performance",
+]
+
+WORDS = (
+    "the a to of and in is for on that with this you it we are be new how why "
+    "just model data build ship learn code thread tips api fast slow scale users "
+    "python rust llm agent prompt latency index query cache queue deploy prod "
+    "startup founder growth design product launch open source release benchmark"
+).split()
+
+BASE_TIME = datetime(2024, 12, 6, 10, 37, 37, tzinfo=timezone.utc)
+
+
+def _twitter_date(dt: datetime) -> str:
+    return dt.strftime("%a %b %d %H:%M:%S %z %Y")
+
+
+def _text(rng: random.Random, min_words: int = 8, max_words: int = 60) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    if rng.random() < 0.3:
+        words.append(f"#{rng.choice(TOPICS).replace('-', '')}")
+    if rng.random() < 0.5:
+        words.append(f"https://t.co/{rng.getrandbits(40):010x}")
+    return " ".join(words)
+
+
+def _user(rng: random.Random, handle_index: int) -> Dict[str, Any]:
+    handle = f"author_{handle_index}"
+    name = f"Author {handle_index}"
+    if rng.random() < 0.5:
+        return {"result": {"legacy": {"screen_name": handle, "name": name}}}
+    # Newer layout: screen_name/name under core, legacy present but sparse.
+    return {"result": {"legacy": {}, "core": {"screen_name": handle, "name": name}}}
+
+
+def tweet_result(
+    rest_id: str,
+    rng: random.Random,
+    created_at: datetime,
+    author_count: int = 500,
+    quote: Optional[Dict[str, Any]] = None,
+    quote_missing: bool = False,
+) -> Dict[str, Any]:
+    """A ``tweet_results.result`` object."""
+    text = _text(rng)
+    legacy: Dict[str, Any] = {
+        "full_text": text,
+        "created_at": _twitter_date(created_at),
+        "truncated": False,
+        "favorite_count": rng.randint(0, 5000),
+        "retweet_count": rng.randint(0, 500),
+    }
+    result: Dict[str, Any] = {
+        "__typename": "Tweet",
+        "rest_id": rest_id,
+        "core": {"user_results": _user(rng, rng.randint(0, author_count - 1))},
+        "legacy": legacy,
+        "views": {"count": str(rng.randint(10, 2_000_000)), "state": "EnabledWithCount"},
+    }
+
+    if rng.random() < 0.35:
+        legacy["extended_entities"] = {
+            "media": [
+                {"media_url_https": f"https://pbs.twimg.com/media/{rest_id}_{i}.jpg"}
+                for i in range(rng.randint(1, 4))
+            ]
+        }
+
+    roll = rng.random()
+    if roll < 0.1:
+        # Long-form note tweet: full text lives in note_tweet.
+        legacy["full_text"] = text[:270] + "…"
+        result["note_tweet"] = {
+            "is_expandable": True,
+            "note_tweet_results": {"result": {"text": text + " " + _text(rng, 80, 300)}},
+        }
+    elif roll < 0.15:
+        legacy["truncated"] = True
+        legacy["full_text"] = text[:140] + "…"
+
+    if quote is not None:
+        # The quote itself may be a TweetWithVisibilityResults wrapper.
+        legacy["quoted_status_id_str"] = quote.get("tweet", quote)["rest_id"]
+        if not quote_missing:
+            result["quoted_status_result"] = {"result": quote}
+
+    if rng.random() < 0.05:
+        # Occasionally wrapped (TweetWithVisibilityResults).
+        return {"__typename": "TweetWithVisibilityResults", "tweet": result}
+    return result
+
+
+def bookmark_timeline_page(
+    size: int,
+    seed: int = 0,
+    start: int = 0,
+    quote_ratio: float = 0.15,
+    author_count: int = 500,
+) -> Dict[str, Any]:
+    """One ``Bookmarks`` GraphQL response with `size` tweet entries."""
+    rng = random.Random(seed * 1_000_003 + start)
+    entries: List[Dict[str, Any]] = []
+    for i in range(start, start + size):
+        rest_id = str(1_800_000_000_000_000_000 + i)
+        created_at = BASE_TIME - timedelta(minutes=i * 7)
+        quote = None
+        quote_missing = False
+        if rng.random() < quote_ratio:
+            quote = tweet_result(
+                str(1_700_000_000_000_000_000 + i), rng, created_at - timedelta(days=1),
+                author_count,
+            )
+            quote_missing = rng.random() < 0.3
+        entries.append(
+            {
+                "entryId": f"tweet-{rest_id}",
+                "sortIndex": str(10**18 - i),
+                "content": {
+                    "entryType": "TimelineTimelineItem",
+                    "__typename": "TimelineTimelineItem",
+                    "itemContent": {
+                        "itemType": "TimelineTweet",
+                        "tweet_results": {
+                            "result": tweet_result(
+                                rest_id, rng, created_at, author_count, quote, quote_missing
+                            )
+                        },
+                    },
+                },
+            }
+        )
+    entries.append(
+        {
+            "entryId": f"cursor-bottom-{start + size}",
+            "content": {"entryType": "TimelineTimelineCursor", "value": f"c{start + size}"},
+        }
+    )
+    return {
+        "data": {
+            "bookmark_timeline_v2": {
+                "timeline": {
+                    "instructions": [{"type": "TimelineAddEntries", "entries": entries}]
+                }
+            }
+        }
+    }
+
+
+def bookmark_timeline_pages(
+    total: int, page_size: int = 20, seed: int = 0
+) -> Iterator[Dict[str, Any]]:
+    for start in range(0, total, page_size):
+        yield bookmark_timeline_page(min(page_size, total - start), seed=seed, start=start)
+
+
+def tweet_detail(rest_id: str, seed: int = 0, with_quote: bool = True) -> Dict[str, Any]:
+    """A ``TweetDetail`` response for `rest_id` (``data.tweetResult.result``)."""
+    rng = random.Random(seed * 7919 + int(rest_id) % 1_000_000)
+    quote = None
+    if with_quote:
+        quote = tweet_result(str(int(rest_id) - 1), rng, BASE_TIME - timedelta(days=2))
+    result = tweet_result(rest_id, rng, BASE_TIME, quote=quote)
+    if "tweet" in result:
+        result = result["tweet"]
+    result["legacy"]["truncated"] = False
+    return {"data": {"tweetResult": {"result": result}}}
+
+
+def tweet_rows(
+    count: int,
+    seed: int = 0,
+    start: int = 0,
+    classified_ratio: float = 0.8,
+    author_count: int = 5000,
+) -> Iterator[Dict[str, Any]]:
+    """Column dicts for bulk-inserting into ``tweets`` without going through the parser."""
+    rng = random.Random(seed)
+    # Zipf-ish topic popularity so a handful of topics dominate, like real data.
+    weights = [1 / (rank + 1) for rank in range(len(TOPICS))]
+    for i in range(start, start + count):
+        classified = rng.random() < classified_ratio
+        topics = sorted(set(rng.choices(TOPICS, weights=weights, k=rng.randint(2, 5))))
+        text = _text(rng)
+        yield {
+            "rest_id": str(1_800_000_000_000_000_000 + i),
+            "text": text,
+            "author_handle": f"author_{rng.randint(0, author_count - 1)}",
+            "author_name": "Synthetic Author",
+            "created_at": (BASE_TIME - timedelta(minutes=i * 3)).replace(tzinfo=None),
+            "media_urls": [],
+            "raw_data": None,
+            "topics": topics if classified else None,
+            "summary": f"Summary of {text[:60]}" if classified else None,
+            "classification_status": "completed" if classified else "pending",
+            "classification_retry_count": 0,
+            "is_truncated": False,
+            "is_quote_missing": False,
+            "needs_hydration": False,
+        }
@@ -0,0 +1,140 @@
+"""Shared plumbing for benchmark scenarios: scratch databases and timing."""
+
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from sqlalchemy import insert
+
+BULK_CHUNK = 10_000
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    params: Dict[str, Any]
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def reset_caches() -> None:
+    """Forget cached settings/engine/app so a new DATABASE_URL takes effect."""
+    from src.infrastructure.config import get_settings
+    from src.infrastructure.database import get_engine, get_session_factory
+
+    get_settings.cache_clear()
+    get_engine.cache_clear()
+    get_session_factory.cache_clear()
+
+    from src.infrastructure.cache import get_response_cache
+
+    get_response_cache.cache_clear()
+
+    import sys
+
+    server = sys.modules.get("src.infrastructure.api.server")
+    if server is not None:
+        server.get_app.cache_clear()
+
+
+@contextmanager
+def scratch_database(name: str = "bench", response_cache: str = "off") -> Iterator[str]:
+    """Point the app at a fresh SQLite file for the duration of the block.
+
+    Classification, Groq and the media cache are disabled so API scenarios
+    never enqueue Celery tasks. The response cache is off unless asked for, so query
+    scenarios keep measuring the queries.
+    """
+    keys = (
+        "DATABASE_URL",
+        "CLASSIFICATION_ENABLED",
+        "GROQ_API_KEY",
+        "MEDIA_CACHE_ENABLED",
+        "RESPONSE_CACHE_BACKEND",
+    )
+    previous = {k: os.environ.get(k) for k in keys}
+    with tempfile.TemporaryDirectory(prefix="birdbrain-bench-") as tmp:
+        url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+        os.environ["DATABASE_URL"] = url
+        os.environ["CLASSIFICATION_ENABLED"] = "false"
+        os.environ["GROQ_API_KEY"] = ""
+        os.environ["MEDIA_CACHE_ENABLED"] = "false"
+        os.environ["RESPONSE_CACHE_BACKEND"] = response_cache
+        reset_caches()
+
+        from src.infrastructure.database import get_engine, init_db
+
+        init_db()
+        try:
+            yield url
+        finally:
+            get_engine().dispose()
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            reset_caches()
+
+
+def bulk_insert_tweets(rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert tweet rows with executemany, bypassing the ORM unit of work."""
+    from src.adapters.db.models import TweetModel
+    from src.infrastructure.database import get_engine
+
+    engine = get_engine()
+    total = 0
+    chunk: List[Dict[str, Any]] = []
+    with engine.begin() as conn:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= BULK_CHUNK:
+                conn.execute(insert(TweetModel), chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            conn.execute(insert(TweetModel), chunk)
+            total += len(chunk)
+    return total
+
+
+def rebuild_analytics() -> int:
+    """Recount the analytics rollups, which bulk_insert_tweets bypasses."""
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return SqlAlchemyRepository(db).rebuild_analytics()
+    finally:
+        db.close()
+
+
+def sample_latency(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Call `func` repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+
+    def pct(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(pct(95), 3),
+        "max_ms": round(ordered[-1], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
@@ -0,0 +1,127 @@
+"""Import-time budget check for CLI startup.
+
+Runs each entry point under ``python -X importtime`` in a fresh interpreter,
+reports the cumulative import time and fails if it exceeds the budget or if
+a module that the entry point should never pull in (FastAPI, uvicorn, ...)
+shows up in the import graph.
+
+Usage:
+    uv run python -m benchmarks.import_time
+    uv run python -m benchmarks.import_time --budget-ms 250 --runs 5
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+@dataclass
+class ImportTarget:
+    module: str
+    budget_ms: float
+    forbidden: List[str] = field(default_factory=list)
+
+
+DEFAULT_TARGETS = [
+    # What `main.py stats` / `main.py classify` pay before doing any work.
+    # The budget leaves headroom for noisy machines; the forbidden list is
+    # what catches a server-side import sneaking back into the CLI.
+    ImportTarget(
+        module="src.infrastructure.cli.app",
+        budget_ms=500.0,
+        forbidden=["fastapi", "uvicorn", "starlette", "celery", "httpx"],
+    ),
+]
+
+
+@dataclass
+class ImportResult:
+    module: str
+    cumulative_ms: float
+    budget_ms: float
+    forbidden_loaded: List[str]
+    top_imports: Dict[str, float]
+
+    @property
+    def ok(self) -> bool:
+        return self.cumulative_ms <= self.budget_ms and not self.forbidden_loaded
+
+
+def measure_once(module: str) -> Dict[str, int]:
+    """Return {module_name: cumulative_us} for one cold import of `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def measure(target: ImportTarget, runs: int = 3) -> ImportResult:
+    samples = [measure_once(target.module) for _ in range(runs)]
+    totals = [s.get(target.module, 0) / 1000 for s in samples]
+    last = samples[-1]
+
+    loaded = set(last)
+    forbidden_loaded = sorted(
+        name
+        for name in target.forbidden
+        if any(m == name or m.startswith(name + ".") for m in loaded)
+    )
+    top = sorted(
+        ((name, us / 1000) for name, us in last.items() if "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:10]
+
+    return ImportResult(
+        module=target.module,
+        cumulative_ms=round(statistics.median(totals), 1),
+        budget_ms=target.budget_ms,
+        forbidden_loaded=forbidden_loaded,
+        top_imports={name: round(ms, 1) for name, ms in top},
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--json", action="store_true", help="Emit JSON results")
+    args = parser.parse_args(argv)
+
+    results = []
+    for target in DEFAULT_TARGETS:
+        if args.budget_ms is not None:
+            target.budget_ms = args.budget_ms
+        results.append(measure(target, runs=args.runs))
+
+    if args.json:
+        print(json.dumps([asdict(r) | {"ok": r.ok} for r in results], indent=2))
+    else:
+        for r in results:
+            status = "OK" if r.ok else "FAIL"
+            print(f"[{status}] {r.module}: {r.cumulative_ms}ms (budget {r.budget_ms}ms)")
+            if r.forbidden_loaded:
+                print(f"       forbidden imports: {', '.join(r.forbidden_loaded)}")
+            for name, ms in r.top_imports.items():
+                print(f"       {ms:8.1f}ms  {name}")
+
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Run benchmark scenarios and write machine-readable results.
+
+Usage:
+    uv run python -m benchmarks --scenarios ingest,list --scales 10000,100000
+    uv run python -m benchmarks --output results/after.json --compare results/before.json
+
+Results are a JSON document with run metadata and one entry per
+(scenario, params) pair, so two runs can be diffed with ``--compare``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import BenchmarkResult
+from benchmarks.scenarios import (
+    classification_drain,
+    ingest_throughput,
+    list_latency,
+    media_cache,
+    response_cache_latency,
+    topic_aggregation,
+)
+
+# Metrics where a larger value is better; everything else is a cost.
+HIGHER_IS_BETTER = {"tweets_per_s", "pages_per_s", "files_per_s"}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+
+def _key(entry: Dict[str, Any]) -> str:
+    return entry["scenario"] + ":" + json.dumps(entry["params"], sort_keys=True)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Human-readable per-metric deltas between two result documents."""
+    previous = {_key(e): e for e in baseline.get("results", [])}
+    lines = []
+    for entry in current["results"]:
+        before = previous.get(_key(entry))
+        if not before:
+            continue
+        for metric, value in entry["metrics"].items():
+            old = before["metrics"].get(metric)
+            if not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old * 100
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            marker = " " if abs(change) < 5 else "+" if better else "-"
+            lines.append(
+                f"{marker} {entry['scenario']:<22} {json.dumps(entry['params'], sort_keys=True):<60} "
+                f"{metric:<14} {old:>12} -> {value:<12} ({change:+.1f}%)"
+            )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Birdbrain benchmark suite")
+    parser.add_argument("--scenarios", default="ingest,list,topics,drain")
+    parser.add_argument("--scales", default="10000,100000", help="Row counts for list/topics")
+    parser.add_argument("--ingest-tweets", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--drain-pending", type=int, default=200)
+    parser.add_argument("--groq-latency-ms", type=float, default=150.0)
+    parser.add_argument("--groq-rpm", type=int, default=None)
+    parser.add_argument("--groq-tpm", type=int, default=None)
+    parser.add_argument("--media-files", type=int, default=200)
+    parser.add_argument("--media-latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to diff against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    scales = [int(s) for s in args.scales.split(",") if s]
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    results: List[BenchmarkResult] = []
+    for name in selected:
+        print(f"running {name}...", file=sys.stderr)
+        if name == "ingest":
+            results += ingest_throughput(total=args.ingest_tweets, seed=args.seed)
+        elif name == "list":
+            results += list_latency(scales=scales, repeat=args.repeat, seed=args.seed)
+        elif name == "topics":
+            results += topic_aggregation(scales=scales, repeat=max(3, args.repeat // 2), seed=args.seed)
+        elif name == "cache":
+            results += response_cache_latency(scales=scales, repeat=args.repeat, seed=args.seed)
+        elif name == "drain":
+            results += classification_drain(
+                pending=args.drain_pending,
+                latency_ms=args.groq_latency_ms,
+                requests_per_minute=args.groq_rpm,
+                tokens_per_minute=args.groq_tpm,
+                seed=args.seed,
+            )
+        elif name == "media":
+            results += media_cache(
+                files=args.media_files, latency_ms=args.media_latency_ms, seed=args.seed
+            )
+        else:
+            parser.error(f"unknown scenario: {name}")
+
+    document = {"meta": _metadata(args), "results": [asdict(r) for r in results]}
+    output = json.dumps(document, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"wrote {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for line in compare(document, baseline):
+            print(line, file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
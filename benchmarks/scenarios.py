@@ -0,0 +1,373 @@
+"""Benchmark scenarios. Each returns a list of ``BenchmarkResult``."""
+
+import asyncio
+import gzip
+import json
+import time
+from typing import Callable, Dict, List, Sequence
+
+from benchmarks.fake_groq import FakeGroqServer
+from benchmarks.fake_media import FakeMediaServer
+from benchmarks.fixtures import bookmark_timeline_pages, tweet_rows
+from benchmarks.harness import (
+    BenchmarkResult,
+    bulk_insert_tweets,
+    rebuild_analytics,
+    sample_latency,
+    scratch_database,
+    summarize,
+)
+
+
+def _client():
+    from fastapi.testclient import TestClient
+
+    from src.infrastructure.api.server import create_app
+
+    return TestClient(create_app())
+
+
+def ingest_throughput(
+    total: int = 2000, page_size: int = 20, seed: int = 0, batch_pages: int = 20
+) -> List[BenchmarkResult]:
+    """POST synthetic bookmark pages to /api/bookmarks/ingest, first pass and
+    re-post, then the same pages as compressed batches to a fresh database."""
+    pages = list(bookmark_timeline_pages(total, page_size=page_size, seed=seed))
+    results = []
+    with scratch_database("ingest"):
+        client = _client()
+        for label in ("fresh", "repost"):
+            samples = []
+            start = time.perf_counter()
+            for page in pages:
+                t0 = time.perf_counter()
+                response = client.post("/api/bookmarks/ingest", json=page)
+                response.raise_for_status()
+                samples.append((time.perf_counter() - t0) * 1000)
+            elapsed = time.perf_counter() - start
+            metrics = {
+                "tweets_per_s": round(total / elapsed, 1),
+                "pages_per_s": round(len(pages) / elapsed, 2),
+                "elapsed_s": round(elapsed, 3),
+            }
+            metrics.update(summarize(samples))
+            results.append(
+                BenchmarkResult(
+                    scenario="ingest",
+                    params={"pass": label, "tweets": total, "page_size": page_size},
+                    metrics=metrics,
+                )
+            )
+
+    # The extension's protocol: gzip NDJSON batches into a fresh database.
+    with scratch_database("ingest_batch"):
+        client = _client()
+        samples = []
+        start = time.perf_counter()
+        for i in range(0, len(pages), batch_pages):
+            lines = "\n".join(json.dumps(page) for page in pages[i:i + batch_pages])
+            body = gzip.compress(lines.encode("utf-8"))
+            t0 = time.perf_counter()
+            response = client.post(
+                "/api/bookmarks/ingest/batch",
+                content=body,
+                headers={"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"},
+            )
+            response.raise_for_status()
+            samples.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+        metrics = {
+            "tweets_per_s": round(total / elapsed, 1),
+            "pages_per_s": round(len(pages) / elapsed, 2),
+            "elapsed_s": round(elapsed, 3),
+        }
+        metrics.update(summarize(samples))
+        results.append(
+            BenchmarkResult(
+                scenario="ingest",
+                params={"pass": "batched", "tweets": total, "page_size": page_size, "batch_pages": batch_pages},
+                metrics=metrics,
+            )
+        )
+    return results
+
+
+LIST_QUERIES: Dict[str, Callable[[int], str]] = {
+    "first_page": lambda n: "/api/bookmarks?limit=50",
+    "search": lambda n: "/api/bookmarks?limit=50&q=latency",
+    "topic": lambda n: "/api/bookmarks?limit=50&topic=rust",
+    "status_pending": lambda n: "/api/bookmarks?limit=50&status=pending",
+    "deep_offset": lambda n: f"/api/bookmarks?limit=50&offset={n // 2}",
+    "large_page": lambda n: "/api/bookmarks?limit=500",
+}
+
+TOPIC_QUERIES: Dict[str, Callable[[int], str]] = {
+    "topics": lambda n: "/api/topics",
+    "topic_bookmarks": lambda n: "/api/topics/python/bookmarks?limit=50",
+    "stats": lambda n: "/api/stats",
+    "timeline": lambda n: "/api/analytics/timeline?interval=week",
+    "authors": lambda n: "/api/analytics/authors?interval=week",
+}
+
+
+def _query_latency(
+    scenario: str,
+    queries: Dict[str, Callable[[int], str]],
+    scales: Sequence[int],
+    repeat: int,
+    seed: int,
+) -> List[BenchmarkResult]:
+    results = []
+    for scale in scales:
+        with scratch_database(f"{scenario}_{scale}"):
+            seed_start = time.perf_counter()
+            bulk_insert_tweets(tweet_rows(scale, seed=seed))
+            rebuild_analytics()
+            seed_elapsed = time.perf_counter() - seed_start
+            client = _client()
+            for name, build in queries.items():
+                url = build(scale)
+
+                def call(url: str = url) -> None:
+                    client.get(url).raise_for_status()
+
+                metrics = sample_latency(call, repeat=repeat)
+                metrics["seed_s"] = round(seed_elapsed, 2)
+                results.append(
+                    BenchmarkResult(
+                        scenario=scenario,
+                        params={"rows": scale, "query": name},
+                        metrics=metrics,
+                    )
+                )
+    return results
+
+
+def list_latency(scales: Sequence[int] = (10_000, 100_000), repeat: int = 20, seed: int = 0) -> List[BenchmarkResult]:
+    """List/search latency of /api/bookmarks at each table size."""
+    return _query_latency("list", LIST_QUERIES, scales, repeat, seed)
+
+
+def topic_aggregation(scales: Sequence[int] = (10_000, 100_000), repeat: int = 10, seed: int = 0) -> List[BenchmarkResult]:
+    """/api/topics, per-topic listing, /api/stats and the analytics charts at each
+    table size."""
+    return _query_latency("topics", TOPIC_QUERIES, scales, repeat, seed)
+
+
+CACHE_QUERIES: Dict[str, Callable[[int], str]] = {
+    "first_page": lambda n: "/api/bookmarks?limit=50",
+    "topics": lambda n: "/api/topics",
+    "stats": lambda n: "/api/stats",
+}
+
+
+def response_cache_latency(
+    scales: Sequence[int] = (10_000, 100_000), repeat: int = 20, seed: int = 0
+) -> List[BenchmarkResult]:
+    """Cached reads: a cache hit, and a revalidation answered with 304."""
+    results = []
+    for scale in scales:
+        with scratch_database(f"cache_{scale}", response_cache="memory"):
+            bulk_insert_tweets(tweet_rows(scale, seed=seed))
+            client = _client()
+            for name, build in CACHE_QUERIES.items():
+                url = build(scale)
+                etag = client.get(url).headers["etag"]
+
+                def hit(url: str = url) -> None:
+                    response = client.get(url)
+                    assert response.headers["x-cache"] == "HIT"
+
+                def revalidate(url: str = url) -> None:
+                    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+                for mode, call in (("hit", hit), ("not_modified", revalidate)):
+                    results.append(
+                        BenchmarkResult(
+                            scenario="cache",
+                            params={"rows": scale, "query": name, "mode": mode},
+                            metrics=sample_latency(call, repeat=repeat),
+                        )
+                    )
+    return results
+
+
+def classification_drain(
+    pending: int = 200,
+    batch_size: int = 20,
+    latency_ms: float = 150.0,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    seed: int = 0,
+) -> List[BenchmarkResult]:
+    """Drain `pending` tweets through GroqTweetClassifier against the fake server."""
+    from src.adapters.ai.groq_classifier import GroqTweetClassifier
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.ai.groq_client import GroqConfig
+    from src.infrastructure.database import SessionLocal
+    from src.use_cases.classify_tweets import classify_pending_tweets
+
+    with scratch_database("drain"), FakeGroqServer(
+        latency_ms=latency_ms,
+        jitter_ms=latency_ms * 0.2,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        seed=seed,
+    ) as server:
+        bulk_insert_tweets(tweet_rows(pending, seed=seed, classified_ratio=0.0))
+        config = GroqConfig(api_key="bench", base_url=server.base_url)
+
+        async def drain() -> Dict[str, int]:
+            totals = {"batches": 0, "success": 0, "failed": 0}
+            db = SessionLocal()
+            try:
+                repo = SqlAlchemyRepository(db)
+                async with GroqTweetClassifier(config) as classifier:
+                    while True:
+                        result = await classify_pending_tweets(repo, classifier, batch_size)
+                        if not result.get("processed"):
+                            return totals
+                        totals["batches"] += 1
+                        totals["success"] += result["success"]
+                        totals["failed"] += result["failed"]
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        totals = asyncio.run(drain())
+        elapsed = time.perf_counter() - start
+
+        stats = server.stats
+        return [
+            BenchmarkResult(
+                scenario="classification_drain",
+                params={
+                    "pending": pending,
+                    "batch_size": batch_size,
+                    "latency_ms": latency_ms,
+                    "requests_per_minute": requests_per_minute,
+                    "tokens_per_minute": tokens_per_minute,
+                },
+                metrics={
+                    "tweets_per_s": round(totals["success"] / elapsed, 2),
+                    "elapsed_s": round(elapsed, 3),
+                    "success": totals["success"],
+                    "failed": totals["failed"],
+                    "batches": totals["batches"],
+                    "api_requests": stats.requests,
+                    "rate_limited": stats.rate_limited,
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                },
+            )
+        ]
+
+
+def media_cache(
+    files: int = 200,
+    tweets_per_file: int = 2,
+    variants: int = 50,
+    gone_ratio: float = 0.05,
+    latency_ms: float = 50.0,
+    error_rate: float = 0.1,
+    concurrency: int = 8,
+    seed: int = 0,
+) -> List[BenchmarkResult]:
+    """Download `files` media URLs through HttpMediaDownloader against the fake CDN.
+
+    Each URL is referenced by `tweets_per_file` tweets and the files only have
+    `variants` distinct contents, so both URL and content dedupe are exercised.
+    """
+    import os
+    import random
+    import tempfile
+    from datetime import datetime
+
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.core.entities import Tweet
+    from src.infrastructure.database import SessionLocal
+    from src.infrastructure.media.downloader import HttpMediaDownloader
+    from src.infrastructure.media.store import MediaStore
+    from src.infrastructure.media.thumbnails import thumbnails_available
+    from src.use_cases.cache_media import cache_due_media
+
+    rng = random.Random(seed)
+    with scratch_database("media"), FakeMediaServer(
+        latency_ms=latency_ms, error_rate=error_rate, seed=seed
+    ) as server, tempfile.TemporaryDirectory(prefix="birdbrain-media-") as directory:
+        urls = [
+            server.url(f"photo-{i}", variant=i % variants, gone=rng.random() < gone_ratio)
+            for i in range(files)
+        ]
+        tweets = [
+            Tweet(
+                rest_id=str(n),
+                text="media",
+                author_handle="bench",
+                author_name="Bench",
+                created_at=datetime(2024, 1, 1),
+                media_urls=[url],
+            )
+            for n, url in enumerate(urls * tweets_per_file)
+        ]
+        store = MediaStore(directory)
+
+        async def drain() -> Dict[str, int]:
+            db = SessionLocal()
+            try:
+                repo = SqlAlchemyRepository(db)
+                repo.save_tweets(tweets)
+                downloader = HttpMediaDownloader(
+                    store,
+                    allowed_hosts=[server.host],
+                    concurrency=concurrency,
+                    backoff_seconds=0.05,
+                )
+                async with downloader:
+                    return await cache_due_media(repo, downloader)
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        counts = asyncio.run(drain())
+        elapsed = time.perf_counter() - start
+
+        def stored(kind: str) -> int:
+            return sum(len(names) for _, _, names in os.walk(os.path.join(directory, kind)))
+
+        stats = server.stats
+        return [
+            BenchmarkResult(
+                scenario="media_cache",
+                params={
+                    "files": files,
+                    "tweets_per_file": tweets_per_file,
+                    "variants": variants,
+                    "latency_ms": latency_ms,
+                    "error_rate": error_rate,
+                    "concurrency": concurrency,
+                },
+                metrics={
+                    "files_per_s": round(counts["cached"] / elapsed, 2),
+                    "elapsed_s": round(elapsed, 3),
+                    "cached": counts["cached"],
+                    "failed": counts["failed"],
+                    "gone": counts["gone"],
+                    "requests": stats.requests,
+                    "server_errors": stats.server_errors,
+                    "max_requests_per_url": max(stats.paths.values(), default=0),
+                    "stored_files": stored("originals"),
+                    "thumbnails": stored("thumbnails") if thumbnails_available() else 0,
+                },
+            )
+        ]
+
+
+SCENARIOS = {
+    "ingest": ingest_throughput,
+    "list": list_latency,
+    "topics": topic_aggregation,
+    "cache": response_cache_latency,
+    "drain": classification_drain,
+    "media": media_cache,
+}
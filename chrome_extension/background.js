@@ -4,7 +4,10 @@ const API_BASE = "http://localhost:8787";
 // Fetch incomplete tweets on startup and periodically
 async function syncIncompleteTweets() {
   try {
-    const response = await fetch(`${API_BASE}/api/tweets/incomplete`);
+    // Scoped to the X account the content script last reported
+    const { accountId } = await chrome.storage.local.get("accountId");
+    const query = accountId ? `?account=${accountId}` : "";
+    const response = await fetch(`${API_BASE}/api/tweets/incomplete${query}`);
     if (response.ok) {
       const data = await response.json();
       // Store as a Set of rest_ids for quick lookup
@@ -66,4 +69,12 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
   if (message.type === "REFRESH_INCOMPLETE") {
     syncIncompleteTweets();
   }
+
+  if (message.type === "ACCOUNT") {
+    chrome.storage.local.get("accountId", (result) => {
+      if (result.accountId !== message.userId) {
+        chrome.storage.local.set({ accountId: message.userId }, syncIncompleteTweets);
+      }
+    });
+  }
 });
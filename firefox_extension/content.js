@@ -35,6 +35,181 @@ function getTweetIdFromUrl() {
   return match ? match[1] : null;
 }
 
+// The signed-in X account: its user id from the `twid` cookie ("u=<id>"),
+// and its handle from the sidebar profile link once the page has rendered.
+// Switching accounts reloads the page, so one page load is one account.
+function currentAccount() {
+  const cookie = document.cookie.match(/(?:^|;\s*)twid=([^;]+)/);
+  const id = cookie ? decodeURIComponent(cookie[1]).match(/u=(\d+)/) : null;
+  const link = document.querySelector('a[data-testid="AppTabBar_Profile_Link"]');
+  const handle = link ? link.getAttribute("href").replace(/^\//, "") : null;
+  return { userId: id ? id[1] : null, handle: handle || null };
+}
+
+function accountHeaders() {
+  const account = currentAccount();
+  const headers = {};
+  if (account.userId) {
+    headers["X-Birdbrain-Account"] = account.userId;
+    if (account.handle) headers["X-Birdbrain-Handle"] = account.handle;
+    // Lets the background worker scope its incomplete-tweets list
+    chrome.runtime.sendMessage({ type: "ACCOUNT", userId: account.userId }).catch(() => {});
+  }
+  return headers;
+}
+
+function accountQuery() {
+  const { userId } = currentAccount();
+  return userId ? `?account=${userId}` : "";
+}
+
+// Captured bookmark pages are sent in batches: gzip-compressed NDJSON, one
+// page per line, flushed once FLUSH_COUNT pages or FLUSH_BYTES are buffered,
+// or FLUSH_DELAY_MS after the first capture. Only one request is in flight at
+// a time. While the server is busy or unreachable, pages keep buffering (up
+// to MAX_BUFFER_BYTES, dropping the oldest) and retries back off, waiting
+// at least as long as the server's Retry-After when it sheds load (429/503).
+const FLUSH_DELAY_MS = 2000;
+const FLUSH_COUNT = 20;
+const FLUSH_BYTES = 1024 * 1024;
+const MAX_BUFFER_BYTES = 16 * 1024 * 1024;
+const MAX_BACKOFF_MS = 60000;
+
+const ingestQueue = { lines: [], bytes: 0, timer: null, inFlight: false, backoffMs: 0, retryAt: 0 };
+
+function trimIngestQueue() {
+  while (ingestQueue.bytes > MAX_BUFFER_BYTES && ingestQueue.lines.length > 1) {
+    ingestQueue.bytes -= ingestQueue.lines.shift().length;
+    console.warn("[Birdbrain] Ingest buffer full; dropped the oldest captured page.");
+  }
+}
+
+function enqueueCapture(data) {
+  const line = JSON.stringify(data);
+  ingestQueue.lines.push(line);
+  ingestQueue.bytes += line.length;
+  trimIngestQueue();
+  if (ingestQueue.lines.length >= FLUSH_COUNT || ingestQueue.bytes >= FLUSH_BYTES) {
+    flushIngest();
+  } else {
+    scheduleFlush(FLUSH_DELAY_MS);
+  }
+}
+
+function scheduleFlush(delayMs) {
+  if (ingestQueue.timer) return;
+  ingestQueue.timer = setTimeout(() => {
+    ingestQueue.timer = null;
+    flushIngest();
+  }, delayMs);
+}
+
+async function compressBody(text) {
+  if (typeof CompressionStream === "undefined") {
+    return { body: text, encoding: null };
+  }
+  const stream = new Blob([text]).stream().pipeThrough(new CompressionStream("gzip"));
+  return { body: await new Response(stream).blob(), encoding: "gzip" };
+}
+
+// Retry-After in ms: the header (seconds or an HTTP date), else the body's retry_after.
+async function retryAfterFrom(response) {
+  const header = response.headers.get("Retry-After");
+  if (header) {
+    const seconds = Number(header);
+    if (!Number.isNaN(seconds)) return seconds * 1000;
+    const date = Date.parse(header);
+    if (!Number.isNaN(date)) return Math.max(0, date - Date.now());
+  }
+  try {
+    const body = await response.json();
+    return (body.retry_after || 0) * 1000;
+  } catch (err) {
+    return 0;
+  }
+}
+
+async function flushIngest() {
+  if (ingestQueue.inFlight || ingestQueue.lines.length === 0) return;
+  const waitMs = ingestQueue.retryAt - Date.now();
+  if (waitMs > 0) {
+    scheduleFlush(waitMs);
+    return;
+  }
+  clearTimeout(ingestQueue.timer);
+  ingestQueue.timer = null;
+
+  const lines = ingestQueue.lines;
+  const bytes = ingestQueue.bytes;
+  ingestQueue.lines = [];
+  ingestQueue.bytes = 0;
+  ingestQueue.inFlight = true;
+  let retry = false;
+  let retryAfterMs = 0;
+
+  console.log(`[Birdbrain] 📥 Sending ${lines.length} captured page(s) to API...`);
+  try {
+    const { body, encoding } = await compressBody(lines.join("\n") + "\n");
+    const headers = { "Content-Type": "application/x-ndjson", ...accountHeaders() };
+    if (encoding) headers["Content-Encoding"] = encoding;
+    const response = await fetch(`${API_BASE}/api/bookmarks/ingest/batch`, {
+      method: "POST",
+      headers,
+      body
+    });
+
+    if (response.ok) {
+      const resJson = await response.json();
+      console.log(`[Birdbrain] ✅ Success! Server processed ${resJson.received} tweets (${resJson.written} new or changed, ${resJson.skipped} unchanged).`);
+
+      // Notify popup/background
+      chrome.runtime.sendMessage({
+          type: "SYNC_SUCCESS",
+          count: resJson.written
+      }).catch(() => {});
+
+      // Refresh incomplete list after new bookmarks
+      chrome.runtime.sendMessage({ type: "REFRESH_INCOMPLETE" }).catch(() => {});
+    } else if (response.status === 429 || response.status >= 500) {
+      retry = true;
+      retryAfterMs = await retryAfterFrom(response);
+      console.warn(`[Birdbrain] Server busy (${response.status}); will retry.`);
+    } else {
+      // Retrying won't fix a rejected batch; drop it.
+      console.error(`[Birdbrain] ❌ Server Error: ${response.status} ${response.statusText}`);
+      chrome.runtime.sendMessage({ type: "SYNC_ERROR", message: `Server error: ${response.status}` }).catch(() => {});
+    }
+  } catch (err) {
+    retry = true;
+    console.error("[Birdbrain] ❌ Network Error. Is the CLI 'serve' command running?", err);
+    chrome.runtime.sendMessage({
+        type: "SYNC_ERROR",
+        message: "Connection failed. Is 'uv run main.py serve' running?"
+    }).catch(() => {});
+  } finally {
+    ingestQueue.inFlight = false;
+    if (retry) {
+      // Put the batch back ahead of anything captured meanwhile.
+      ingestQueue.lines = lines.concat(ingestQueue.lines);
+      ingestQueue.bytes += bytes;
+      trimIngestQueue();
+      ingestQueue.backoffMs = Math.min(MAX_BACKOFF_MS, Math.max(1000, ingestQueue.backoffMs * 2));
+      const delayMs = Math.max(ingestQueue.backoffMs, retryAfterMs);
+      ingestQueue.retryAt = Date.now() + delayMs;
+      scheduleFlush(delayMs);
+    } else {
+      ingestQueue.backoffMs = 0;
+      ingestQueue.retryAt = 0;
+      if (ingestQueue.lines.length) scheduleFlush(FLUSH_DELAY_MS);
+    }
+  }
+}
+
+// Send what's buffered before the tab goes away.
+document.addEventListener("visibilitychange", () => {
+  if (document.visibilityState === "hidden") flushIngest();
+});
+
 // Listen for the custom event from the main world hook - Bookmarks
 document.addEventListener('BirdbrainBookmarkData', async function(e) {
   console.log("[Birdbrain] 📨 Received bookmark event!");
@@ -62,39 +237,8 @@ document.addEventListener('BirdbrainBookmarkData', async function(e) {
       return;
   }
 
-  console.log("[Birdbrain] 📥 Intercepted Bookmark Data. Sending to API...");
-
-  try {
-      const response = await fetch(`${API_BASE}/api/bookmarks/ingest`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(data)
-      });
-
-      if (response.ok) {
-          const resJson = await response.json();
-          console.log(`[Birdbrain] ✅ Success! Server processed ${resJson.processed_count} tweets.`);
-
-          // Notify popup/background
-          chrome.runtime.sendMessage({
-              type: "SYNC_SUCCESS",
-              count: resJson.processed_count
-          }).catch(() => {});
-
-          // Refresh incomplete list after new bookmarks
-          chrome.runtime.sendMessage({ type: "REFRESH_INCOMPLETE" }).catch(() => {});
-
-      } else {
-          console.error(`[Birdbrain] ❌ Server Error: ${response.status} ${response.statusText}`);
-          chrome.runtime.sendMessage({ type: "SYNC_ERROR", message: `Server error: ${response.status}` }).catch(() => {});
-      }
-  } catch (err) {
-      console.error("[Birdbrain] ❌ Network Error. Is the CLI 'serve' command running?", err);
-      chrome.runtime.sendMessage({
-          type: "SYNC_ERROR",
-          message: "Connection failed. Is 'uv run main.py serve' running?"
-      }).catch(() => {});
-  }
+  console.log("[Birdbrain] 📥 Intercepted Bookmark Data. Queued for the next batch.");
+  enqueueCapture(data);
 });
 
 // Listen for TweetDetail events - for hydrating incomplete tweets
@@ -131,7 +275,7 @@ document.addEventListener('BirdbrainTweetDetail', async function(e) {
       console.log(`[Birdbrain] 🔄 Tweet ${tweetId} needs hydration. Sending to API...`);
 
       try {
-        const apiResponse = await fetch(`${API_BASE}/api/tweets/${tweetId}/hydrate`, {
+        const apiResponse = await fetch(`${API_BASE}/api/tweets/${tweetId}/hydrate${accountQuery()}`, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify(data)
@@ -2,6 +2,21 @@ import type { BookmarksResponse, TopicsResponse, Stats } from './types';
 
 const API_BASE = 'http://localhost:8787';
 
+// Open the UI with ?account=<username or X user id> to see one account's bookmarks
+const ACCOUNT =
+	typeof window !== 'undefined' ? new URLSearchParams(window.location.search).get('account') : null;
+
+function api(path: string): string {
+	if (!ACCOUNT) return `${API_BASE}${path}`;
+	const separator = path.includes('?') ? '&' : '?';
+	return `${API_BASE}${path}${separator}account=${encodeURIComponent(ACCOUNT)}`;
+}
+
+// Served from the local media cache (it redirects upstream until a file is cached)
+export function mediaUrl(key: string, thumbnail = true): string {
+	return api(`/api/media/${key}${thumbnail ? '/thumbnail' : ''}`);
+}
+
 export async function fetchBookmarks(
 	limit = 50,
 	offset = 0,
@@ -15,41 +30,62 @@ export async function fetchBookmarks(
 	if (topic) params.set('topic', topic);
 	if (query) params.set('q', query);
 
-	const res = await fetch(`${API_BASE}/api/bookmarks?${params}`);
+	const res = await fetch(api(`/api/bookmarks?${params}`));
 	if (!res.ok) throw new Error('Failed to fetch bookmarks');
 	return res.json();
 }
 
+export async function fetchContext(restId: string): Promise<import('./types').ContextResponse> {
+	const res = await fetch(api(`/api/bookmarks/${restId}/context`));
+	if (!res.ok) throw new Error('Failed to fetch context');
+	return res.json();
+}
+
+export async function fetchDuplicates(
+	restId: string
+): Promise<import('./types').DuplicatesResponse> {
+	const res = await fetch(api(`/api/bookmarks/${restId}/duplicates`));
+	if (!res.ok) throw new Error('Failed to fetch similar bookmarks');
+	return res.json();
+}
+
 export async function fetchTopics(): Promise<TopicsResponse> {
-	const res = await fetch(`${API_BASE}/api/topics`);
+	const res = await fetch(api(`/api/topics`));
 	if (!res.ok) throw new Error('Failed to fetch topics');
 	return res.json();
 }
 
 export async function fetchStats(): Promise<Stats> {
-	const res = await fetch(`${API_BASE}/api/stats`);
+	const res = await fetch(api(`/api/stats`));
 	if (!res.ok) throw new Error('Failed to fetch stats');
 	return res.json();
 }
 
 export async function triggerClassification(): Promise<{ status: string; task_id?: string }> {
-	const res = await fetch(`${API_BASE}/api/tweets/classify`, { method: 'POST' });
+	const res = await fetch(api(`/api/tweets/classify`), { method: 'POST' });
 	return res.json();
 }
 
 export async function reclassifyBookmark(restId: string): Promise<{ status: string }> {
-	const res = await fetch(`${API_BASE}/api/bookmarks/${restId}/reclassify`, { method: 'POST' });
+	const res = await fetch(api(`/api/bookmarks/${restId}/reclassify`), { method: 'POST' });
 	return res.json();
 }
 
-export async function reclassifyAll(status?: string): Promise<{ status: string; count: number }> {
+export async function reclassifyAll(
+	status?: string
+): Promise<{ status: string; count: number; job_id: number }> {
 	const params = status ? `?status=${status}` : '';
-	const res = await fetch(`${API_BASE}/api/bookmarks/reclassify-all${params}`, { method: 'POST' });
+	const res = await fetch(api(`/api/bookmarks/reclassify-all${params}`), { method: 'POST' });
+	return res.json();
+}
+
+export async function fetchReclassifyJob(jobId: number): Promise<import('./types').ReclassifyJob> {
+	const res = await fetch(api(`/api/reclassify-jobs/${jobId}`));
 	return res.json();
 }
 
 export async function deleteBookmark(restId: string): Promise<{ status: string }> {
-	const res = await fetch(`${API_BASE}/api/bookmarks/${restId}`, { method: 'DELETE' });
+	const res = await fetch(api(`/api/bookmarks/${restId}`), { method: 'DELETE' });
 	return res.json();
 }
 
@@ -58,7 +94,7 @@ export async function fetchTopicBookmarks(
 	limit = 5
 ): Promise<{ topic: string; bookmarks: import('./types').Bookmark[]; total: number }> {
 	const params = new URLSearchParams({ limit: limit.toString() });
-	const res = await fetch(`${API_BASE}/api/topics/${encodeURIComponent(topicName)}/bookmarks?${params}`);
+	const res = await fetch(api(`/api/topics/${encodeURIComponent(topicName)}/bookmarks?${params}`));
 	if (!res.ok) throw new Error('Failed to fetch topic bookmarks');
 	return res.json();
 }
@@ -66,7 +102,22 @@ export async function fetchTopicBookmarks(
 export async function fetchTopicSummary(
 	topicName: string
 ): Promise<{ topic: string; summary: string | null }> {
-	const res = await fetch(`${API_BASE}/api/topics/${encodeURIComponent(topicName)}/summary`);
+	const res = await fetch(api(`/api/topics/${encodeURIComponent(topicName)}/summary`));
 	if (!res.ok) throw new Error('Failed to fetch topic summary');
 	return res.json();
 }
+
+/**
+ * Listen to live deltas from /api/events. EventSource reconnects on its own
+ * and resumes from the last event id. Returns a function that closes the stream.
+ */
+export function subscribeEvents(handlers: {
+	[K in keyof import('./types').LiveEvents]?: (data: import('./types').LiveEvents[K]) => void;
+}): () => void {
+	const source = new EventSource(`${API_BASE}/api/events`);
+	for (const [type, handler] of Object.entries(handlers)) {
+		if (!handler) continue;
+		source.addEventListener(type, (e) => handler(JSON.parse((e as MessageEvent).data)));
+	}
+	return () => source.close();
+}
@@ -7,9 +7,38 @@ export interface Bookmark {
 	created_at: string | null;
 	topics: string[];
 	summary: string | null;
-	classification_status: 'pending' | 'completed' | 'failed';
-	media_urls: string | null;
+	classification_status: 'pending' | 'completed' | 'failed' | 'dead';
+	media_urls: string[];
+	// Local copies at /api/media/{key}, one per media_urls entry
+	media_keys: string[];
 	quoted_status_id: string | null;
+	// Near-duplicates folded into this bookmark by the collapsed list
+	duplicate_count?: number;
+}
+
+/** The bookmarks grouped with one as near-duplicates (/api/bookmarks/{id}/duplicates). */
+export interface DuplicatesResponse {
+	rest_id: string;
+	// The bookmark whose classification the others share
+	representative: string;
+	bookmarks: Bookmark[];
+}
+
+/** A tweet in a bookmark's quote/reply context (/api/bookmarks/{id}/context). */
+export interface ContextTweet extends Partial<Bookmark> {
+	rest_id: string;
+	// Steps above the bookmark (what it quotes or replies to), negative below it
+	depth: number;
+	// False when only its id is known
+	stored: boolean;
+	quoted_status_id: string | null;
+	in_reply_to_status_id: string | null;
+	retweeted_status_id: string | null;
+}
+
+export interface ContextResponse {
+	rest_id: string;
+	tweets: ContextTweet[];
 }
 
 export interface BookmarksResponse {
@@ -33,4 +62,41 @@ export interface Stats {
 	pending: number;
 	completed: number;
 	failed: number;
+	dead: number;
+	retry_due: number;
+	reclassifying: number;
+}
+
+export interface ReclassifyJob {
+	id: number;
+	status: 'marking' | 'classifying' | 'completed' | 'cancelled';
+	status_filter: string | null;
+	total: number;
+	flagged: number;
+	requeued: number;
+	reclassified: number;
+	failed: number;
+	remaining: number;
+	percent: number;
+	created_at: string | null;
+	updated_at: string | null;
+	finished_at: string | null;
+}
+
+/** Payloads of the /api/events server-sent events. */
+export type BookmarkDelta = Omit<Bookmark, 'id'>;
+
+export interface ClassificationDelta {
+	rest_id: string;
+	classification_status: Bookmark['classification_status'];
+	topics?: string[] | null;
+	summary?: string | null;
+}
+
+export interface LiveEvents {
+	'bookmarks.ingested': { count: number; bookmarks: BookmarkDelta[] };
+	'tweets.classified': { tweets: ClassificationDelta[] };
+	'tweet.hydrated': Pick<Bookmark, 'rest_id' | 'text' | 'classification_status'>;
+	'bookmark.deleted': { rest_id: string };
+	resync: { reason: string };
 }
@@ -0,0 +1,87 @@
+"""Chains classifier backends so one exhausted quota doesn't stop classification."""
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.core.entities import Tweet
+from src.core.interfaces import TweetClassifier
+from src.core.value_objects import ClassificationResult
+from src.infrastructure.ai.groq_client import is_rate_limited
+
+logger = logging.getLogger(__name__)
+
+# Backend name -> monotonic time until which it is skipped. Module level so
+# the cooldown outlives the per-task classifier instances.
+_COOLDOWN_UNTIL: Dict[str, float] = {}
+
+
+class FallbackClassifier(TweetClassifier):
+    """Tries each backend in order; tweets a backend fails on go to the next.
+
+    A backend that answers with HTTP 429 is skipped for `cooldown_seconds`,
+    so later batches go straight to the next backend instead of waiting
+    out the rate limit.
+    """
+
+    def __init__(
+        self, backends: List[Tuple[str, TweetClassifier]], cooldown_seconds: float = 60.0
+    ):
+        self.backends = backends
+        self.cooldown_seconds = cooldown_seconds
+
+    async def __aenter__(self):
+        for _, backend in self.backends:
+            await backend.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        for _, backend in self.backends:
+            await backend.__aexit__(*args)
+
+    def _usable(self) -> List[Tuple[str, TweetClassifier]]:
+        now = time.monotonic()
+        return [
+            (name, backend)
+            for name, backend in self.backends
+            if backend.is_available() and _COOLDOWN_UNTIL.get(name, 0.0) <= now
+        ]
+
+    def _cool_down(self, name: str) -> None:
+        logger.warning(f"Classifier backend {name} rate limited; skipping for {self.cooldown_seconds}s")
+        _COOLDOWN_UNTIL[name] = time.monotonic() + self.cooldown_seconds
+
+    def is_available(self) -> bool:
+        return any(backend.is_available() for _, backend in self.backends)
+
+    async def classify(self, tweet: Tweet) -> ClassificationResult:
+        (_, result, error), = await self.classify_batch([tweet])
+        if result is None:
+            raise error or RuntimeError("No classifier backend available")
+        return result
+
+    async def classify_batch(
+        self, tweets: List[Tweet], max_concurrent: int = 5
+    ) -> List[Tuple[Tweet, Optional[ClassificationResult], Optional[Exception]]]:
+        results: Dict[int, Tuple[Optional[ClassificationResult], Optional[Exception]]] = {
+            i: (None, RuntimeError("No classifier backend available"))
+            for i in range(len(tweets))
+        }
+        pending = list(range(len(tweets)))
+
+        for name, backend in self._usable():
+            if not pending:
+                break
+            batch = await backend.classify_batch([tweets[i] for i in pending], max_concurrent)
+            failed = []
+            for i, (_, result, error) in zip(pending, batch):
+                results[i] = (result, error)
+                if result is None:
+                    failed.append(i)
+            if any(is_rate_limited(results[i][1]) for i in failed):
+                self._cool_down(name)
+            if failed and len(failed) < len(pending):
+                logger.info(f"{len(failed)} tweets fall through from {name}")
+            pending = failed
+
+        return [(tweets[i], *results[i]) for i in range(len(tweets))]
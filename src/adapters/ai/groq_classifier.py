@@ -9,32 +9,24 @@ from typing import List, Optional, Tuple
 from src.core.entities import Tweet
 from src.core.interfaces import TweetClassifier
 from src.core.value_objects import ClassificationResult
+from src.adapters.ai.prompt import LEGACY_PROMPT_VERSION, PROMPT_VERSION, build_messages
 from src.infrastructure.ai.groq_client import GroqClient, GroqConfig
 
 logger = logging.getLogger(__name__)
 
-CLASSIFICATION_PROMPT = """You are a tweet classification assistant. Analyze the following tweet and provide:
-
-1. **Topics**: 2-5 relevant topic tags (lowercase, hyphenated). Examples: machine-learning, python, web-dev, startup-advice, crypto, ai-tools, career-tips, productivity, design, javascript, data-science
-2. **Summary**: A concise 1-2 sentence summary of the tweet's main point or value.
-
-Tweet from @{author_handle}:
----
-{text}
----
-
-Respond in JSON format:
-{{
-  "topics": ["topic-1", "topic-2", "topic-3"],
-  "summary": "Brief summary of the tweet content and why it might be valuable."
-}}"""
-
 
 class GroqTweetClassifier(TweetClassifier):
     """Groq-based implementation of TweetClassifier."""
 
-    def __init__(self, config: GroqConfig):
+    def __init__(
+        self,
+        config: GroqConfig,
+        compact_prompt: bool = True,
+        max_input_chars: int = 1000,
+    ):
         self.config = config
+        self.compact_prompt = compact_prompt
+        self.max_input_chars = max_input_chars
         self._client: Optional[GroqClient] = None
 
     async def __aenter__(self):
@@ -50,6 +42,10 @@ class GroqTweetClassifier(TweetClassifier):
     def is_available(self) -> bool:
         return bool(self.config.api_key)
 
+    @property
+    def prompt_version(self) -> str:
+        return PROMPT_VERSION if self.compact_prompt else LEGACY_PROMPT_VERSION
+
     async def classify(self, tweet: Tweet) -> ClassificationResult:
         """Classify a single tweet."""
         if not self._client:
@@ -62,15 +58,15 @@ class GroqTweetClassifier(TweetClassifier):
                 confidence=0.5,
                 model_used=self.config.model,
                 classified_at=datetime.utcnow(),
+                prompt_version=self.prompt_version,
             )
 
-        prompt = CLASSIFICATION_PROMPT.format(
-            author_handle=tweet.author_handle or "unknown",
-            text=tweet.text[:2000],
+        messages = build_messages(
+            tweet, compact=self.compact_prompt, max_chars=self.max_input_chars
         )
 
         response = await self._client.chat_completion(
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             temperature=0.1,
             max_tokens=300,
             response_format={"type": "json_object"},
@@ -78,6 +74,7 @@ class GroqTweetClassifier(TweetClassifier):
 
         content = response["choices"][0]["message"]["content"]
         parsed = json.loads(content)
+        usage = response.get("usage") or {}
 
         return ClassificationResult(
             topics=parsed.get("topics", [])[:5],
@@ -85,6 +82,9 @@ class GroqTweetClassifier(TweetClassifier):
             confidence=0.9,
             model_used=self.config.model,
             classified_at=datetime.utcnow(),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            prompt_version=self.prompt_version,
         )
 
     async def classify_batch(
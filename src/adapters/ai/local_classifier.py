@@ -0,0 +1,276 @@
+"""Local k-NN topic classifier that answers easy tweets before the LLM.
+
+Tweets already labelled by the LLM are embedded and kept in memory. A new
+tweet's nearest labelled neighbours vote for their topics, weighted by
+cosine similarity. When enough close neighbours agree, the topics are
+assigned locally; otherwise the tweet goes to the remote classifier.
+
+Only LLM-labelled tweets are used as examples: local answers and keyword
+rule guesses (NON_LLM_MODEL_PREFIXES) never feed back into the model. Each database (see ACCOUNT_DATABASE_DIR) gets its own
+model, built from its own tweets. Local results carry no summary.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.adapters.ai.prompt import compact_tweet_text
+from src.adapters.ai.rule_classifier import RULES_VERSION
+from src.core.entities import Tweet
+from src.core.interfaces import BookmarkRepository, TextEmbedder, TweetClassifier
+from src.core.metrics import CLASSIFICATION_PATH
+from src.core.value_objects import ClassificationResult
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MODEL_PREFIX = "local"
+# Backends whose results are not used as examples
+NON_LLM_MODEL_PREFIXES = (LOCAL_MODEL_PREFIX, RULES_VERSION)
+MIN_VOTING_NEIGHBOURS = 3
+MAX_TOPICS = 5
+
+
+@dataclass
+class Prediction:
+    topics: List[str]
+    confidence: float
+
+
+class KnnTopicModel:
+    """Similarity-weighted k-NN over embeddings of labelled tweets."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        labels: List[List[str]],
+        k: int = 10,
+        min_similarity: float = 0.5,
+        min_agreement: float = 0.7,
+    ):
+        self.vectors = vectors
+        self.labels = labels
+        self.k = k
+        self.min_similarity = min_similarity
+        self.min_agreement = min_agreement
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def predict(self, queries: np.ndarray) -> List[Optional[Prediction]]:
+        """One prediction per query row, or None when the neighbours disagree."""
+        if not len(self) or not len(queries):
+            return [None] * len(queries)
+
+        k = min(self.k, len(self))
+        scores = queries @ self.vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        predictions: List[Optional[Prediction]] = []
+        for row, neighbours in enumerate(top):
+            sims = scores[row, neighbours]
+            close = sims >= self.min_similarity
+            if close.sum() < MIN_VOTING_NEIGHBOURS:
+                predictions.append(None)
+                continue
+
+            votes: Dict[str, float] = defaultdict(float)
+            for index, sim in zip(neighbours[close], sims[close]):
+                for topic in self.labels[index]:
+                    votes[topic] += float(sim)
+            weight = float(sims[close].sum())
+            ranked = sorted(votes.items(), key=lambda kv: kv[1], reverse=True)
+            best_share = ranked[0][1] / weight
+            if best_share < self.min_agreement:
+                predictions.append(None)
+                continue
+
+            topics = [t for t, v in ranked if v / weight >= 0.5][:MAX_TOPICS]
+            predictions.append(Prediction(topics=topics, confidence=round(best_share, 3)))
+        return predictions
+
+
+# Built models are shared across classifier instances (one per Celery task
+# run) and rebuilt after `refresh_seconds`. Keyed by (partition, model name):
+# one account's labels never vote on another account's tweets.
+_MODEL_CACHE: Dict[Tuple[Optional[str], str], Tuple[float, KnnTopicModel]] = {}
+
+
+class LocalTopicClassifier(TweetClassifier):
+    """Assigns topics from labelled neighbours; `classify` raises when unsure."""
+
+    def __init__(
+        self,
+        repo: BookmarkRepository,
+        embedder: TextEmbedder,
+        k: int = 10,
+        min_similarity: float = 0.5,
+        min_agreement: float = 0.7,
+        min_examples: int = 200,
+        max_examples: int = 5000,
+        refresh_seconds: int = 900,
+        partition: Optional[str] = None,
+    ):
+        self.repo = repo
+        self.embedder = embedder
+        self.k = k
+        self.min_similarity = min_similarity
+        self.min_agreement = min_agreement
+        self.min_examples = min_examples
+        self.max_examples = max_examples
+        self.refresh_seconds = refresh_seconds
+        # Account database `repo` reads (None for the main one)
+        self.partition = partition
+
+    @property
+    def model_name(self) -> str:
+        return f"{LOCAL_MODEL_PREFIX}-knn:{self.embedder.model_name}"
+
+    def is_available(self) -> bool:
+        return True
+
+    async def _model(self) -> KnnTopicModel:
+        key = (self.partition, self.model_name)
+        cached = _MODEL_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < self.refresh_seconds:
+            return cached[1]
+
+        tweets = self.repo.get_labelled_tweets(
+            limit=self.max_examples, exclude_model_prefixes=NON_LLM_MODEL_PREFIXES
+        )
+        tweets = [t for t in tweets if t.topics and t.text]
+        if len(tweets) < self.min_examples:
+            vectors = np.zeros((0, self.embedder.dimension), dtype=np.float32)
+            tweets = []
+        else:
+            vectors = await self.embedder.embed([self._text(t) for t in tweets])
+
+        model = KnnTopicModel(
+            vectors,
+            [t.topics for t in tweets],
+            k=self.k,
+            min_similarity=self.min_similarity,
+            min_agreement=self.min_agreement,
+        )
+        _MODEL_CACHE[key] = (time.monotonic(), model)
+        logger.info(f"Local topic model built from {len(model)} labelled tweets")
+        return model
+
+    @staticmethod
+    def _text(tweet: Tweet) -> str:
+        return compact_tweet_text(tweet.text or "")
+
+    def _result(self, tweet: Tweet, prediction: Prediction) -> ClassificationResult:
+        # No generator runs locally, so there is no summary to store
+        return ClassificationResult(
+            topics=prediction.topics,
+            summary=None,
+            confidence=prediction.confidence,
+            model_used=self.model_name,
+            classified_at=datetime.utcnow(),
+            prompt_version=f"k{self.k}",
+        )
+
+    async def predict(self, tweets: List[Tweet]) -> List[Optional[ClassificationResult]]:
+        """A result for each confidently classified tweet, None for the rest."""
+        model = await self._model()
+        candidates = [i for i, t in enumerate(tweets) if t.text and t.text.strip()]
+        results: List[Optional[ClassificationResult]] = [None] * len(tweets)
+        if not len(model) or not candidates:
+            return results
+
+        queries = await self.embedder.embed([self._text(tweets[i]) for i in candidates])
+        for i, prediction in zip(candidates, model.predict(queries)):
+            if prediction:
+                results[i] = self._result(tweets[i], prediction)
+        return results
+
+    async def classify(self, tweet: Tweet) -> ClassificationResult:
+        result = (await self.predict([tweet]))[0]
+        if result is None:
+            raise ValueError(f"No confident local classification for {tweet.rest_id}")
+        return result
+
+    async def classify_batch(
+        self, tweets: List[Tweet], max_concurrent: int = 5
+    ) -> List[Tuple[Tweet, Optional[ClassificationResult], Optional[Exception]]]:
+        results = await self.predict(tweets)
+        return [
+            (t, r, None if r else ValueError("No confident local classification"))
+            for t, r in zip(tweets, results)
+        ]
+
+
+class TieredClassifier(TweetClassifier):
+    """Tries the local stage first and sends only unsure tweets to `remote`."""
+
+    def __init__(self, local: LocalTopicClassifier, remote: TweetClassifier):
+        self.local = local
+        self.remote = remote
+
+    async def __aenter__(self):
+        await self.remote.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.remote.__aexit__(*args)
+
+    def is_available(self) -> bool:
+        return self.remote.is_available()
+
+    async def _local_results(self, tweets: List[Tweet]) -> List[Optional[ClassificationResult]]:
+        try:
+            return await self.local.predict(tweets)
+        except Exception as e:
+            logger.warning(f"Local classifier failed, using remote only: {e}")
+            return [None] * len(tweets)
+
+    async def classify(self, tweet: Tweet) -> ClassificationResult:
+        result = (await self._local_results([tweet]))[0]
+        if result:
+            CLASSIFICATION_PATH.inc(path="local")
+            return result
+        CLASSIFICATION_PATH.inc(path="remote")
+        return await self.remote.classify(tweet)
+
+    async def classify_batch(
+        self, tweets: List[Tweet], max_concurrent: int = 5
+    ) -> List[Tuple[Tweet, Optional[ClassificationResult], Optional[Exception]]]:
+        local = await self._local_results(tweets)
+        unsure = [t for t, r in zip(tweets, local) if r is None]
+        CLASSIFICATION_PATH.inc(len(tweets) - len(unsure), path="local")
+        CLASSIFICATION_PATH.inc(len(unsure), path="remote")
+
+        remote = iter(
+            await self.remote.classify_batch(unsure, max_concurrent) if unsure else []
+        )
+        return [(t, r, None) if r else next(remote) for t, r in zip(tweets, local)]
+
+
+def with_local_stage(
+    remote: TweetClassifier, repo: BookmarkRepository, partition: Optional[str] = None
+) -> TweetClassifier:
+    """Wrap `remote` in a TieredClassifier when LOCAL_CLASSIFIER_ENABLED is
+    set. `partition` names the account database `repo` reads."""
+    from src.adapters.embeddings.factory import get_embedder
+    from src.infrastructure.config import get_settings
+
+    settings = get_settings()
+    if not settings.local_classifier_enabled:
+        return remote
+    local = LocalTopicClassifier(
+        repo,
+        get_embedder(),
+        k=settings.local_classifier_k,
+        min_similarity=settings.local_classifier_min_similarity,
+        min_agreement=settings.local_classifier_min_agreement,
+        min_examples=settings.local_classifier_min_examples,
+        max_examples=settings.local_classifier_max_examples,
+        refresh_seconds=settings.local_classifier_refresh_seconds,
+        partition=partition,
+    )
+    return TieredClassifier(local, remote)
@@ -0,0 +1,14 @@
+"""Classifier for self-hosted OpenAI-compatible servers (llama.cpp, Ollama, vLLM)."""
+
+from src.adapters.ai.groq_classifier import GroqTweetClassifier
+
+
+class OpenAICompatibleClassifier(GroqTweetClassifier):
+    """Same prompt and parsing as Groq; only the endpoint differs.
+
+    Local servers usually need no API key, so availability depends on the
+    base URL alone.
+    """
+
+    def is_available(self) -> bool:
+        return bool(self.config.base_url)
@@ -0,0 +1,129 @@
+"""Classification prompts and tweet-text compaction.
+
+The compact prompt puts the fixed instructions in a system message that is
+byte-identical on every call, and sends only the trimmed tweet as the user
+message. Input tokens per tweet drop sharply, which is what Groq's TPM limit
+is measured in.
+"""
+
+import html
+import math
+import re
+from typing import Dict, List
+
+from src.core.entities import Tweet
+
+# Bump when the prompt wording changes, so classifications can be compared.
+PROMPT_VERSION = "compact-v1"
+LEGACY_PROMPT_VERSION = "legacy-v1"
+
+LEGACY_PROMPT = """You are a tweet classification assistant. Analyze the following tweet and provide:
+
+1. **Topics**: 2-5 relevant topic tags (lowercase, hyphenated). Examples: machine-learning, python, web-dev, startup-advice, crypto, ai-tools, career-tips, productivity, design, javascript, data-science
+2. **Summary**: A concise 1-2 sentence summary of the tweet's main point or value.
+
+Tweet from @{author_handle}:
+---
+{text}
+---
+
+Respond in JSON format:
+{{
+  "topics": ["topic-1", "topic-2", "topic-3"],
+  "summary": "Brief summary of the tweet content and why it might be valuable."
+}}"""
+
+SYSTEM_PROMPT = (
+    "Classify the tweet. Reply with JSON only: "
+    '{"topics":[2-5 lowercase hyphenated tags, e.g. machine-learning, web-dev],'
+    '"summary":"1-2 sentences on the main point"}'
+)
+
+URL_RE = re.compile(r"https?://\S+")
+WHITESPACE_RE = re.compile(r"\s+")
+# Runs of emoji / pictographs / dingbats (and their joiners and modifiers).
+EMOJI_RUN_RE = re.compile(
+    "(["
+    "\U0001F000-\U0001FAFF"  # emoji, pictographs, symbols
+    "\u2600-\u27BF"  # misc symbols, dingbats
+    "\u2B00-\u2BFF"  # arrows, stars
+    "\uFE0F\u200D"  # variation selector, zero-width joiner
+    "]+)"
+)
+HASHTAG_RUN_RE = re.compile(r"(?:#\w+\s*){4,}")
+REPEATED_PUNCT_RE = re.compile(r"([!?.\-_=*~])\1{2,}")
+TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def _shorten_hashtag_run(match: re.Match) -> str:
+    tags = match.group(0).split()
+    return " ".join(tags[:3]) + " "
+
+
+def compact_tweet_text(text: str, max_chars: int = 1000) -> str:
+    """Strip what costs tokens but carries no meaning for topic tagging.
+
+    - t.co/other URLs are dropped (they are opaque shortlinks)
+    - HTML entities from legacy text are unescaped
+    - emoji runs collapse to their first emoji
+    - hashtag runs keep their first three tags
+    - repeated punctuation and whitespace collapse
+    - the result is cut at a word boundary near `max_chars`
+    """
+    if not text:
+        return ""
+
+    text = html.unescape(text)
+    text = URL_RE.sub(" ", text)
+    text = EMOJI_RUN_RE.sub(lambda m: m.group(1)[0], text)
+    text = HASHTAG_RUN_RE.sub(_shorten_hashtag_run, text)
+    text = REPEATED_PUNCT_RE.sub(r"\1\1", text)
+    text = WHITESPACE_RE.sub(" ", text).strip()
+
+    if len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        text = text[: cut if cut > max_chars * 0.8 else max_chars].rstrip() + "…"
+    return text
+
+
+def build_messages(
+    tweet: Tweet, compact: bool = True, max_chars: int = 1000
+) -> List[Dict[str, str]]:
+    """Chat messages for classifying `tweet`."""
+    author = tweet.author_handle or "unknown"
+    if not compact:
+        return [
+            {
+                "role": "user",
+                "content": LEGACY_PROMPT.format(
+                    author_handle=author, text=(tweet.text or "")[:2000]
+                ),
+            }
+        ]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": f"@{author}: {compact_tweet_text(tweet.text or '', max_chars)}",
+        },
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE-style token estimate (no tokenizer dependency).
+
+    Words cost about one token per four characters, punctuation one each,
+    and non-ASCII symbols such as emoji usually split into two or more.
+    """
+    total = 0
+    for piece in TOKEN_RE.findall(text):
+        if piece.isascii():
+            total += max(1, math.ceil(len(piece) / 4)) if piece[0].isalnum() else 1
+        else:
+            total += 2 * len(piece) if not piece[0].isalnum() else max(1, math.ceil(len(piece) / 3))
+    return total
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    # ~4 tokens of chat-format overhead per message
+    return sum(estimate_tokens(m["content"]) + 4 for m in messages)
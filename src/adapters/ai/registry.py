@@ -0,0 +1,121 @@
+"""Classifier backends selectable through CLASSIFIER_BACKENDS.
+
+`CLASSIFIER_BACKENDS=groq,openai,rules` builds a FallbackClassifier that
+tries Groq, then a self-hosted OpenAI-compatible server, then keyword rules.
+Further backends can be added with `register_backend`.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.core.interfaces import BookmarkRepository, TweetClassifier
+from src.infrastructure.config import Settings, get_settings
+
+
+@dataclass(frozen=True)
+class ClassifierBackend:
+    name: str
+    build: Callable[[Settings], TweetClassifier]
+    # Cheap settings check, usable without building the backend
+    configured: Callable[[Settings], bool]
+
+
+CLASSIFIER_BACKENDS: Dict[str, ClassifierBackend] = {}
+
+
+def register_backend(
+    name: str,
+    build: Callable[[Settings], TweetClassifier],
+    configured: Callable[[Settings], bool] = lambda settings: True,
+) -> None:
+    CLASSIFIER_BACKENDS[name] = ClassifierBackend(name, build, configured)
+
+
+def _build_groq(settings: Settings) -> TweetClassifier:
+    from src.adapters.ai.groq_classifier import GroqTweetClassifier
+    from src.infrastructure.ai.groq_client import GroqConfig
+
+    return GroqTweetClassifier(
+        GroqConfig(
+            api_key=settings.groq_api_key,
+            model=settings.groq_model,
+            base_url=settings.groq_base_url,
+            timeout=settings.groq_timeout,
+        ),
+        compact_prompt=settings.classification_compact_prompt,
+        max_input_chars=settings.classification_max_input_chars,
+    )
+
+
+def _build_openai(settings: Settings) -> TweetClassifier:
+    from src.adapters.ai.openai_compatible import OpenAICompatibleClassifier
+    from src.infrastructure.ai.groq_client import GroqConfig
+
+    return OpenAICompatibleClassifier(
+        GroqConfig(
+            api_key=settings.local_llm_api_key or "local",
+            model=settings.local_llm_model,
+            base_url=settings.local_llm_base_url,
+            timeout=settings.local_llm_timeout,
+        ),
+        compact_prompt=settings.classification_compact_prompt,
+        max_input_chars=settings.classification_max_input_chars,
+    )
+
+
+def _build_rules(settings: Settings) -> TweetClassifier:
+    from src.adapters.ai.rule_classifier import RuleBasedClassifier, load_rules
+
+    return RuleBasedClassifier(load_rules(settings.classifier_rules_path))
+
+
+register_backend("groq", _build_groq, lambda settings: bool(settings.groq_api_key))
+register_backend("openai", _build_openai, lambda settings: bool(settings.local_llm_base_url))
+register_backend("rules", _build_rules)
+
+
+def backend_names(settings: Optional[Settings] = None) -> List[str]:
+    settings = settings or get_settings()
+    names = [n.strip() for n in settings.classifier_backends.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CLASSIFIER_BACKENDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown CLASSIFIER_BACKENDS entries: {', '.join(unknown)} "
+            f"(available: {', '.join(CLASSIFIER_BACKENDS)})"
+        )
+    return names
+
+
+def classifier_configured(settings: Optional[Settings] = None) -> bool:
+    """Whether any selected backend is configured, without building one."""
+    settings = settings or get_settings()
+    return any(CLASSIFIER_BACKENDS[n].configured(settings) for n in backend_names(settings))
+
+
+def build_classifier(
+    repo: Optional[BookmarkRepository] = None,
+    settings: Optional[Settings] = None,
+    partition: Optional[str] = None,
+) -> TweetClassifier:
+    """The configured backend chain, behind the local k-NN stage when a repo
+    is given. `partition` names the account database the repo reads."""
+    settings = settings or get_settings()
+    backends = [
+        (name, CLASSIFIER_BACKENDS[name].build(settings))
+        for name in backend_names(settings)
+        if CLASSIFIER_BACKENDS[name].configured(settings)
+    ]
+    if len(backends) == 1:
+        classifier = backends[0][1]
+    else:
+        from src.adapters.ai.fallback_classifier import FallbackClassifier
+
+        classifier = FallbackClassifier(
+            backends, cooldown_seconds=settings.classifier_fallback_cooldown_seconds
+        )
+
+    if repo is not None:
+        from src.adapters.ai.local_classifier import with_local_stage
+
+        classifier = with_local_stage(classifier, repo, partition)
+    return classifier
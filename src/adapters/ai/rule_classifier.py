@@ -0,0 +1,119 @@
+"""Deterministic keyword classifier that runs on CPU with no network access.
+
+Each topic has a list of keywords, matched as whole words case-insensitively
+against the tweet text and its hashtags. Topics are ranked by hit count. A
+tweet with no hits raises, so it stays with the slower backends rather than
+being filed under a made-up topic.
+
+Rule results are stored as completed and never retried, so the built-in
+keywords avoid short or everyday words ("go", "js", "ai", "job") that would
+file casual tweets under a topic. Results carry no summary.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.core.entities import Tweet
+from src.core.interfaces import TweetClassifier
+from src.core.value_objects import ClassificationResult
+
+RULES_VERSION = "rules-v1"
+# prompt_version of DEFAULT_RULES results; bump when the built-in rules change
+BUILTIN_RULES_VERSION = "builtin-v2"
+MAX_TOPICS = 3
+
+DEFAULT_RULES: Dict[str, List[str]] = {
+    "ai": ["artificial intelligence", "agi", "ai agents", "agentic"],
+    "llm": ["llm", "llms", "gpt", "chatgpt", "claude", "gemini", "llama", "prompt engineering", "prompting", "rag"],
+    "machine-learning": ["machine learning", "neural network", "deep learning", "pytorch", "tensorflow", "fine-tuning"],
+    "python": ["python", "django", "flask", "fastapi", "pandas", "numpy", "pytest"],
+    "javascript": ["javascript", "nodejs", "node.js", "npm", "react", "vue", "svelte", "nextjs"],
+    "typescript": ["typescript", "tsc", "deno"],
+    "rust": ["rust", "rustlang", "tokio", "borrow checker"],
+    "golang": ["golang", "goroutine", "goroutines"],
+    "web-dev": ["css", "html", "frontend", "web dev", "webdev", "tailwind", "browser"],
+    "databases": ["database", "databases", "sql", "postgres", "postgresql", "sqlite", "mysql", "redis", "mongodb"],
+    "devops": ["devops", "kubernetes", "k8s", "docker", "terraform", "ci/cd", "deployment"],
+    "cloud": ["aws", "gcp", "azure", "serverless", "lambda", "cloudflare"],
+    "security": ["security", "vulnerability", "cve", "exploit", "infosec", "phishing", "encryption"],
+    "open-source": ["open source", "opensource", "oss", "github", "maintainer"],
+    "startups": ["startup", "startups", "founder", "founders", "fundraising", "yc", "seed round", "vc"],
+    "career": ["career", "hiring", "job interview", "resume", "promotion", "salary"],
+    "productivity": ["productivity", "habits", "workflow", "time management"],
+    "design": ["design", "ui", "ux", "figma", "typography"],
+    "crypto": ["crypto", "bitcoin", "btc", "ethereum", "blockchain", "web3"],
+    "finance": ["stocks", "investing", "stock market", "inflation", "interest rates", "etf"],
+    "data-science": ["data science", "analytics", "statistics", "dataset", "visualization"],
+}
+
+
+def load_rules(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Built-in rules, or a JSON object of {topic: [keywords]} from `path`."""
+    if not path:
+        return DEFAULT_RULES
+    with open(path) as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict):
+        raise ValueError(f"{path} must contain a JSON object of topic -> keywords")
+    return {str(topic): [str(k) for k in keywords] for topic, keywords in rules.items()}
+
+
+class RuleBasedClassifier(TweetClassifier):
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        rules = rules or DEFAULT_RULES
+        # Custom rule sets are versioned by content, so their results can be
+        # told apart from the built-in rules in classification history.
+        if rules is DEFAULT_RULES:
+            self.prompt_version = BUILTIN_RULES_VERSION
+        else:
+            digest = hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8"))
+            self.prompt_version = f"custom-{digest.hexdigest()[:8]}"
+        # One alternation per topic; the lookarounds keep "rust" out of "trust".
+        self._patterns: List[Tuple[str, re.Pattern]] = [
+            (
+                topic,
+                re.compile(
+                    r"(?<![\w-])#?(?:"
+                    + "|".join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True))
+                    + r")(?![\w-])"
+                ),
+            )
+            for topic, keywords in rules.items()
+            if keywords
+        ]
+
+    def is_available(self) -> bool:
+        return True
+
+    def match(self, text: str) -> List[Tuple[str, int]]:
+        """(topic, hits) pairs for `text`, most hits first."""
+        text = (text or "").lower()
+        hits = [(topic, len(pattern.findall(text))) for topic, pattern in self._patterns]
+        return sorted((h for h in hits if h[1]), key=lambda h: h[1], reverse=True)
+
+    async def classify(self, tweet: Tweet) -> ClassificationResult:
+        matches = self.match(tweet.text or "")[:MAX_TOPICS]
+        if not matches:
+            raise ValueError(f"No keyword rule matched tweet {tweet.rest_id}")
+        return ClassificationResult(
+            topics=[topic for topic, _ in matches],
+            summary=None,
+            confidence=min(0.3 + 0.1 * matches[0][1], 0.6),
+            model_used=RULES_VERSION,
+            classified_at=datetime.utcnow(),
+            prompt_version=self.prompt_version,
+        )
+
+    async def classify_batch(
+        self, tweets: List[Tweet], max_concurrent: int = 5
+    ) -> List[Tuple[Tweet, Optional[ClassificationResult], Optional[Exception]]]:
+        results = []
+        for tweet in tweets:
+            try:
+                results.append((tweet, await self.classify(tweet), None))
+            except Exception as e:
+                results.append((tweet, None, e))
+        return results
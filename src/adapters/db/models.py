@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, Date, DateTime, Text, ForeignKey, JSON, Boolean, Float, Index
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from src.infrastructure.database import Base
 
@@ -8,7 +10,8 @@ class AccountModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
-    user_id = Column(String, nullable=True)
+    # X user id, from the extension; names the account's database when partitioned
+    user_id = Column(String, nullable=True, index=True)
     auth_file_path = Column(String, nullable=True)
     last_synced_at = Column(DateTime, nullable=True)
 
@@ -23,25 +26,293 @@ class TweetModel(Base):
     text = Column(Text, nullable=True)
     author_handle = Column(String, nullable=True)
     author_name = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=True, index=True)
+    # Legacy JSON-encoded string, no longer written; see media_urls
     media_blobs = Column(Text, nullable=True)
+    # Decoded once at ingest so reads never re-parse it
+    media_urls = Column(JSON, nullable=True)
     raw_data = Column(Text, nullable=True)
+    view_count = Column(Integer, nullable=True)
+    # Fingerprint of the last ingested content (see use_cases.sync_bookmarks)
+    content_hash = Column(String, nullable=True)
 
-    quoted_status_id = Column(String, ForeignKey("tweets.rest_id"), nullable=True)
+    # Not a foreign key: quoted tweets are usually not stored, and
+    # PostgreSQL would enforce one
+    quoted_status_id = Column(String, nullable=True)
+    # Representative of the near-duplicate cluster this tweet belongs to
+    # (see core.near_duplicates); NULL for representatives and unique tweets
+    duplicate_of = Column(String, nullable=True)
+    # The account that first imported the tweet; see BookmarkModel for all of them
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
 
     # AI Classification fields
-    topics = Column(JSON, nullable=True)
+    # JSONB on PostgreSQL, for the GIN index behind topic filters
+    topics = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     summary = Column(Text, nullable=True)
     classified_at = Column(DateTime, nullable=True)
-    classification_status = Column(String, default="pending", index=True, nullable=False)
+    # Indexed through ix_tweets_status_created, which leads with it
+    classification_status = Column(String, default="pending", nullable=False)
     classification_retry_count = Column(Integer, default=0)
     classification_model = Column(String, nullable=True)
+    classification_prompt_tokens = Column(Integer, default=0, nullable=False)
+    classification_completion_tokens = Column(Integer, default=0, nullable=False)
+    # Classification history row the fields above were copied from
+    active_classification_id = Column(Integer, ForeignKey("classifications.id"), nullable=True)
+    # Retry scheduling for failed classifications
+    next_attempt_at = Column(DateTime, nullable=True)
+    last_error_type = Column(String, nullable=True)
+    # Reclassify-all job re-running this tweet; old topics stay until it lands
+    reclassify_job_id = Column(Integer, ForeignKey("reclassify_jobs.id"), nullable=True, index=True)
 
     # Sync/Hydration tracking
     is_truncated = Column(Boolean, default=False, nullable=False)
     is_quote_missing = Column(Boolean, default=False, nullable=False)
-    needs_hydration = Column(Boolean, default=False, index=True, nullable=False)
+    needs_hydration = Column(Boolean, default=False, nullable=False)
 
     account = relationship("AccountModel", back_populates="bookmarks")
-    quoted_tweet = relationship("TweetModel", remote_side=[rest_id])
+    quoted_tweet = relationship(
+        "TweetModel",
+        primaryjoin="foreign(TweetModel.quoted_status_id) == TweetModel.rest_id",
+        remote_side=[rest_id],
+        viewonly=True,
+    )
+
+    # Changes to indexes here need a migration (infrastructure.migrations)
+    __table_args__ = (
+        # "Due for retry": status = 'failed' AND next_attempt_at <= now
+        Index("ix_tweets_retry_due", "classification_status", "next_attempt_at"),
+        # Newest first within a status: the status filter, pending batches, stats
+        Index("ix_tweets_status_created", "classification_status", "created_at"),
+        # Only the few tweets still waiting for hydration; a plain index on a
+        # boolean is too unselective for the planner to use
+        Index(
+            "ix_tweets_hydration_pending",
+            "id",
+            sqlite_where=sql_text("needs_hydration = 1"),
+            postgresql_where=sql_text("needs_hydration"),
+        ),
+        # Collapsed lists (duplicate_of IS NULL, newest first) and a cluster's members
+        Index("ix_tweets_duplicate_of", "duplicate_of", "created_at"),
+        # Topic filters (`topics ?| array[...]`); trigram indexes for search
+        # need pg_trgm and are created by the migrations
+        Index("ix_tweets_topics", "topics", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+
+class BookmarkModel(Base):
+    """Which accounts bookmarked a tweet. Tweets (and their classification)
+    are shared, so a tweet two accounts bookmarked is stored and classified
+    once."""
+
+    __tablename__ = "bookmarks"
+
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    rest_id = Column(String, primary_key=True)
+    # The tweet's created_at, copied so one index serves an account's newest-first list
+    created_at = Column(DateTime, nullable=True)
+    added_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_bookmarks_account_created", "account_id", "created_at"),
+        # Other accounts still holding a tweet, when one account deletes it
+        Index("ix_bookmarks_rest_id", "rest_id"),
+    )
+
+
+class TweetEdgeModel(Base):
+    """Quote, reply and retweet links between tweets, from raw_data. Targets
+    are often not stored, so neither end is a foreign key."""
+
+    __tablename__ = "tweet_edges"
+
+    source_id = Column(String, primary_key=True)
+    # "quote", "reply" or "retweet"; a tweet has at most one of each
+    kind = Column(String, primary_key=True)
+    target_id = Column(String, nullable=False)
+
+    __table_args__ = (
+        # Replies to and quotes of a tweet, walking a conversation downwards
+        Index("ix_tweet_edges_target", "target_id", "kind"),
+    )
+
+
+class NearDuplicateBucketModel(Base):
+    """LSH band keys of each tweet's MinHash signature; tweets sharing a key
+    are near-duplicate candidates (see core.near_duplicates)."""
+
+    __tablename__ = "near_duplicate_buckets"
+
+    bucket = Column(BigInteger, primary_key=True)
+    rest_id = Column(String, primary_key=True)
+
+    __table_args__ = (
+        # A tweet's keys, replaced when its text changes
+        Index("ix_near_duplicate_buckets_rest_id", "rest_id"),
+    )
+
+
+class TopicDayCountModel(Base):
+    """Tweets posted each day per topic (see core.analytics). Topic "" counts
+    all of them; account_id 0 counts every tweet in the database."""
+
+    __tablename__ = "topic_day_counts"
+
+    # Not a foreign key: 0 stands for every account
+    account_id = Column(Integer, primary_key=True)
+    topic = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # The most frequent topics over a date range
+        Index("ix_topic_day_counts_account_day", "account_id", "day"),
+    )
+
+
+class AuthorDayCountModel(Base):
+    """Tweets posted each day per author, like TopicDayCountModel."""
+
+    __tablename__ = "author_day_counts"
+
+    account_id = Column(Integer, primary_key=True)
+    author_handle = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # The most bookmarked authors over a date range
+        Index("ix_author_day_counts_account_day", "account_id", "day"),
+    )
+
+
+class AuthorCountModel(Base):
+    """Tweets per author overall, so the most bookmarked ones are read off an
+    index instead of summed from every day."""
+
+    __tablename__ = "author_counts"
+
+    account_id = Column(Integer, primary_key=True)
+    author_handle = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_author_counts_account_count", "account_id", "count"),)
+
+
+class MediaModel(Base):
+    """Media URLs found at ingest, keyed by URL hash, and where their local
+    copies are (see infrastructure.media)."""
+
+    __tablename__ = "media"
+
+    url_hash = Column(String, primary_key=True)
+    url = Column(Text, nullable=False)
+    # "pending", "cached", "failed" or "gone"
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    content_hash = Column(String, nullable=True)
+    content_type = Column(String, nullable=True)
+    size = Column(Integer, nullable=True)
+    has_thumbnail = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False)
+    fetched_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Downloads due: pending ones, then failed ones whose retry time has come
+        Index("ix_media_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+
+class ClassificationModel(Base):
+    """Append-only classification history, one row per classifier output."""
+
+    __tablename__ = "classifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tweet_rest_id = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    topics = Column(JSON, nullable=True)
+    summary = Column(Text, nullable=True)
+    confidence = Column(Float, nullable=False, default=0.0)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # A tweet's history, and "its latest result from model X / prompt Y"
+        Index("ix_classifications_tweet_version", "tweet_rest_id", "model", "prompt_version"),
+        # Everything one model / prompt version produced, for bulk activation
+        Index("ix_classifications_version", "model", "prompt_version", "tweet_rest_id"),
+    )
+
+
+class ClassificationRunModel(Base):
+    __tablename__ = "classification_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    model = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    processed = Column(Integer, default=0, nullable=False)
+    succeeded = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+
+
+class TokenUsageModel(Base):
+    """One row per successful classification, for per-model/day/run rollups."""
+
+    __tablename__ = "token_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("classification_runs.id"), nullable=True, index=True)
+    tweet_rest_id = Column(String, nullable=False, index=True)
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+class ReclassifyJobModel(Base):
+    """Progress of a reclassify-all pass; `cursor_id` makes it resumable."""
+
+    __tablename__ = "reclassify_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status_filter = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="marking", index=True)
+    cursor_id = Column(Integer, nullable=False, default=0)
+    max_id = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    flagged = Column(Integer, nullable=False, default=0)
+    requeued = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class TopicAliasModel(Base):
+    """alias -> canonical topic map maintained by the consolidation job."""
+
+    __tablename__ = "topic_aliases"
+
+    alias = Column(String, primary_key=True)
+    canonical = Column(String, nullable=False, index=True)
+    score = Column(Float, nullable=False, default=1.0)
+    status = Column(String, nullable=False, default="proposed", index=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class DataVersionModel(Base):
+    """Single-row counter bumped by every write to a versioned table
+    (see infrastructure.database); read endpoints cache on it."""
+
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,127 @@
-from typing import List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import and_, case, column, func, not_, or_, select, table, text, update
 from sqlalchemy.orm import Session
-from src.core.entities import Account, Tweet
+from src.core.entities import (
+    Account,
+    Classification,
+    ClassificationRun,
+    Media,
+    ReclassifyJob,
+    TopicAlias,
+    Tweet,
+    TweetEdge,
+)
+from src.core.analytics import RollupCounts, count_tweet, difference, empty_counts
 from src.core.interfaces import BookmarkRepository
+from src.core.metrics import REPOSITORY_DURATION, instrumented
+from src.core.topics import canonicalize_topics, normalize_topic
 from src.core.value_objects import ClassificationResult
-from src.adapters.db.models import AccountModel, TweetModel
+from src.adapters.db.models import (
+    AccountModel,
+    AuthorCountModel,
+    AuthorDayCountModel,
+    BookmarkModel,
+    ClassificationModel,
+    ClassificationRunModel,
+    MediaModel,
+    NearDuplicateBucketModel,
+    ReclassifyJobModel,
+    TokenUsageModel,
+    TopicAliasModel,
+    TopicDayCountModel,
+    TweetEdgeModel,
+    TweetModel,
+)
 
+ALIAS_CHUNK = 200
+# Bound parameters per IN (...) when looking up LSH buckets
+BUCKET_CHUNK = 5000
+# Copied from a cluster's representative onto its near-duplicates
+MIRRORED_FIELDS = ["topics", "summary", "classified_at", "classification_model"]
+# Tweets read per query when counting them into the analytics rollups
+ANALYTICS_CHUNK = 5000
+# What a tweet's analytics rollup rows depend on, besides its bookmarks
+ANALYTICS_COLUMNS = [
+    TweetModel.rest_id,
+    TweetModel.created_at,
+    TweetModel.author_handle,
+    TweetModel.topics,
+]
+# The rollup tables, in RollupCounts order, with their key columns
+ANALYTICS_ROLLUPS = [
+    (TopicDayCountModel, ["account_id", "topic", "day"]),
+    (AuthorDayCountModel, ["account_id", "author_handle", "day"]),
+    (AuthorCountModel, ["account_id", "author_handle"]),
+]
 
+# What ingest writes per tweet; the PostgreSQL path COPYs exactly these
+INGEST_COLUMNS = [
+    "rest_id",
+    "text",
+    "author_handle",
+    "author_name",
+    "created_at",
+    "media_urls",
+    "raw_data",
+    "quoted_status_id",
+    "view_count",
+    "content_hash",
+    "account_id",
+    "classification_status",
+    "is_truncated",
+    "is_quote_missing",
+    "needs_hydration",
+]
+# Overwritten from the incoming tweet when it already exists
+INGEST_REPLACED = [
+    "author_handle",
+    "author_name",
+    "created_at",
+    "media_urls",
+    "raw_data",
+    "quoted_status_id",
+    "view_count",
+    "content_hash",
+]
+
+
+@instrumented(REPOSITORY_DURATION)
 class SqlAlchemyRepository(BookmarkRepository):
     def __init__(self, db: Session):
         self.db = db
+        self._alias_map: Optional[Dict[str, str]] = None
+
+    @property
+    def _postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _insert(self, model):
+        """INSERT for `model`'s table, with the dialect's ON CONFLICT clauses."""
+        if self._postgresql:
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(model.__table__)
+
+    def topic_filter(self, names: List[str]):
+        """Clause matching tweets tagged with any of `names`."""
+        names = sorted(names)
+        if self._postgresql:
+            from sqlalchemy.dialects.postgresql import array
+
+            # JSONB "contains any of these strings", served by ix_tweets_topics
+            return TweetModel.topics.op("?|", is_comparison=True)(array(names))
+        # SQLite JSON compatibility - use LIKE for JSON array search
+        return or_(*[TweetModel.topics.like(f'%"{name}"%') for name in names])
+
+    def bookmarked_by(self, account_id: int):
+        """Clause matching the tweets `account_id` has bookmarked."""
+        return TweetModel.rest_id.in_(
+            select(BookmarkModel.rest_id).where(BookmarkModel.account_id == account_id)
+        )
 
     def _to_account_entity(self, model: AccountModel) -> Account:
         return Account(
@@ -26,9 +139,12 @@ class SqlAlchemyRepository(BookmarkRepository):
             author_handle=model.author_handle,
             author_name=model.author_name,
             created_at=model.created_at,
-            media_blobs=model.media_blobs,
+            media_urls=model.media_urls,
             raw_data=model.raw_data,
             quoted_status_id=model.quoted_status_id,
+            duplicate_of=model.duplicate_of,
+            view_count=model.view_count,
+            content_hash=model.content_hash,
             account_id=model.account_id,
             topics=model.topics,
             summary=model.summary,
@@ -36,20 +152,30 @@ class SqlAlchemyRepository(BookmarkRepository):
             classification_status=model.classification_status or "pending",
             classification_retry_count=model.classification_retry_count or 0,
             classification_model=model.classification_model,
+            classification_prompt_tokens=model.classification_prompt_tokens or 0,
+            classification_completion_tokens=model.classification_completion_tokens or 0,
+            active_classification_id=model.active_classification_id,
+            next_attempt_at=model.next_attempt_at,
+            last_error_type=model.last_error_type,
+            reclassify_job_id=model.reclassify_job_id,
             is_truncated=model.is_truncated or False,
             is_quote_missing=model.is_quote_missing or False,
             needs_hydration=model.needs_hydration or False,
         )
 
     def save_account(self, account: Account) -> Account:
-        model = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.username == account.username)
-            .first()
-        )
+        """Create or update the account with `account.user_id`, or else
+        with `account.username`. A known user id may take a new username."""
+        query = self.db.query(AccountModel)
+        if account.user_id:
+            query = query.filter(AccountModel.user_id == account.user_id)
+        else:
+            query = query.filter(AccountModel.username == account.username)
+        model = query.first()
         if not model:
             model = AccountModel(username=account.username)
             self.db.add(model)
+        model.username = account.username
 
         if account.user_id:
             model.user_id = account.user_id
@@ -72,6 +198,12 @@ class SqlAlchemyRepository(BookmarkRepository):
             return self._to_account_entity(model)
         return None
 
+    def get_account_by_user_id(self, user_id: str) -> Optional[Account]:
+        model = self.db.query(AccountModel).filter(AccountModel.user_id == user_id).first()
+        if model:
+            return self._to_account_entity(model)
+        return None
+
     def get_all_accounts(self) -> List[Account]:
         models = self.db.query(AccountModel).all()
         return [self._to_account_entity(m) for m in models]
@@ -82,6 +214,7 @@ class SqlAlchemyRepository(BookmarkRepository):
             .filter(TweetModel.rest_id == tweet.rest_id)
             .first()
         )
+        before = self._analytics_counts([tweet.rest_id])
         if not model:
             model = TweetModel(rest_id=tweet.rest_id)
             self.db.add(model)
@@ -90,19 +223,456 @@ class SqlAlchemyRepository(BookmarkRepository):
         model.author_handle = tweet.author_handle
         model.author_name = tweet.author_name
         model.created_at = tweet.created_at
-        model.media_blobs = tweet.media_blobs
+        model.media_urls = tweet.media_urls
         model.raw_data = tweet.raw_data
         model.quoted_status_id = tweet.quoted_status_id
+        model.view_count = tweet.view_count
+        model.content_hash = tweet.content_hash
         model.account_id = tweet.account_id
         model.classification_status = tweet.classification_status
         model.is_truncated = tweet.is_truncated
         model.is_quote_missing = tweet.is_quote_missing
         model.needs_hydration = tweet.needs_hydration
+        self._update_analytics([tweet.rest_id], before)
 
         self.db.commit()
         self.db.refresh(model)
         return self._to_tweet_entity(model)
 
+    def save_tweets(
+        self,
+        tweets: List[Tweet],
+        account: Optional[Account] = None,
+        near_duplicate_threshold: float = 0,
+    ) -> List[Tweet]:
+        """Insert or update `tweets` in one transaction.
+
+        They are recorded as `account`'s bookmarks, and its `last_synced_at`
+        is written, in the same transaction. `account_id` is only set on new
+        tweets: it names the account that imported the tweet first. With a
+        `near_duplicate_threshold`, they are grouped with stored
+        near-duplicates too (see `cluster_near_duplicates`); `duplicate_of`
+        on the returned tweets says which joined a group.
+
+        An existing tweet goes back to pending only when its text changes.
+        Text and quotes filled in by hydration are kept when the timeline
+        still shows them truncated or missing.
+        """
+        if not tweets:
+            return []
+        if self._postgresql:
+            return self._copy_tweets(tweets, account, near_duplicate_threshold)
+        rest_ids = [t.rest_id for t in tweets]
+        before = self._analytics_counts(rest_ids)
+        existing = {
+            m.rest_id: m
+            for m in self.db.query(TweetModel).filter(
+                TweetModel.rest_id.in_(rest_ids)
+            )
+        }
+
+        models = []
+        for tweet in tweets:
+            model = existing.get(tweet.rest_id)
+            if model is None:
+                model = TweetModel(
+                    rest_id=tweet.rest_id,
+                    text=tweet.text,
+                    account_id=tweet.account_id,
+                    classification_status=tweet.classification_status,
+                    is_truncated=tweet.is_truncated,
+                    is_quote_missing=tweet.is_quote_missing,
+                )
+                self.db.add(model)
+                existing[tweet.rest_id] = model
+            else:
+                if not (tweet.is_truncated and not model.is_truncated):
+                    if model.text != tweet.text:
+                        model.classification_status = "pending"
+                    model.text = tweet.text
+                    model.is_truncated = tweet.is_truncated
+                else:
+                    # The hydrated text stays, and near-duplicates match on it
+                    tweet.text = model.text
+                model.is_quote_missing = model.is_quote_missing and tweet.is_quote_missing
+
+            model.author_handle = tweet.author_handle
+            model.author_name = tweet.author_name
+            model.created_at = tweet.created_at
+            model.media_urls = tweet.media_urls
+            model.raw_data = tweet.raw_data
+            model.quoted_status_id = tweet.quoted_status_id
+            model.view_count = tweet.view_count
+            model.content_hash = tweet.content_hash
+            model.needs_hydration = model.is_truncated or model.is_quote_missing
+            models.append(model)
+
+        if account is not None and account.id is not None:
+            self._add_bookmarks(account, tweets)
+        self._add_media(tweets)
+        self.add_tweet_edges([e for t in tweets for e in t.edges])
+        self._update_analytics(rest_ids, before)
+        if near_duplicate_threshold:
+            self._group_near_duplicates(tweets, near_duplicate_threshold)
+
+        self.db.flush()
+        # Convert before commit; afterwards every attribute would reload.
+        saved = [self._to_tweet_entity(m) for m in models]
+        self.db.commit()
+        return saved
+
+    def _copy_tweets(
+        self, tweets: List[Tweet], account: Optional[Account], near_duplicate_threshold: float = 0
+    ) -> List[Tweet]:
+        """PostgreSQL: COPY into a temp table, then merge with one upsert.
+
+        The upsert applies the same rules as the ORM path. ON CONFLICT also
+        makes it safe for API replicas to ingest the same tweet concurrently.
+        """
+        import json
+
+        from sqlalchemy.dialects.postgresql import insert
+        from src.infrastructure.database import mark_data_changed
+
+        latest = {t.rest_id: t for t in tweets}
+        before = self._analytics_counts(list(latest))
+        columns = ", ".join(INGEST_COLUMNS)
+        connection = self.db.connection()
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE IF NOT EXISTS tweets_staging ON COMMIT DROP AS "
+            f"SELECT {columns} FROM tweets WITH NO DATA"
+        )
+        connection.exec_driver_sql("TRUNCATE tweets_staging")
+        with connection.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY tweets_staging ({columns}) FROM STDIN") as copy:
+                for t in latest.values():
+                    copy.write_row([
+                        t.rest_id,
+                        t.text,
+                        t.author_handle,
+                        t.author_name,
+                        t.created_at,
+                        json.dumps(t.media_urls) if t.media_urls is not None else None,
+                        t.raw_data,
+                        t.quoted_status_id,
+                        t.view_count,
+                        t.content_hash,
+                        t.account_id,
+                        t.classification_status,
+                        t.is_truncated,
+                        t.is_quote_missing,
+                        t.is_truncated or t.is_quote_missing,
+                    ])
+
+        tweets_table = TweetModel.__table__
+        staging = table("tweets_staging", *[column(name) for name in INGEST_COLUMNS])
+        statement = insert(tweets_table).from_select(INGEST_COLUMNS, select(*staging.c))
+        new, old = statement.excluded, tweets_table.c
+        keep_hydrated = and_(new.is_truncated, not_(old.is_truncated))
+        is_truncated = case((keep_hydrated, old.is_truncated), else_=new.is_truncated)
+        is_quote_missing = and_(old.is_quote_missing, new.is_quote_missing)
+        statement = statement.on_conflict_do_update(
+            index_elements=[old.rest_id],
+            set_={
+                "text": case((keep_hydrated, old.text), else_=new.text),
+                "is_truncated": is_truncated,
+                "classification_status": case(
+                    (and_(not_(keep_hydrated), old.text.is_distinct_from(new.text)), "pending"),
+                    else_=old.classification_status,
+                ),
+                "is_quote_missing": is_quote_missing,
+                "needs_hydration": or_(is_truncated, is_quote_missing),
+                **{name: new[name] for name in INGEST_REPLACED},
+            },
+        ).returning(*tweets_table.c)
+        rows = {row.rest_id: row for row in self.db.execute(statement)}
+
+        if account is not None and account.id is not None:
+            self._add_bookmarks(account, list(latest.values()))
+        self._add_media(list(latest.values()))
+        self.add_tweet_edges([e for t in latest.values() for e in t.edges])
+        self._update_analytics(list(latest), before)
+        for rest_id, tweet in latest.items():
+            # Hydrated text the upsert kept is what near-duplicates match on
+            tweet.text = rows[rest_id].text
+        groups = (
+            self._group_near_duplicates(list(latest.values()), near_duplicate_threshold)
+            if near_duplicate_threshold
+            else {}
+        )
+        mark_data_changed(self.db)
+        # Rows carry the model's attribute names, so they convert the same way
+        saved = [self._to_tweet_entity(rows[rest_id]) for rest_id in latest]
+        for tweet in saved:
+            tweet.duplicate_of = groups.get(tweet.rest_id, tweet.duplicate_of)
+        self.db.commit()
+        return saved
+
+    def _add_bookmarks(self, account: Account, tweets: List[Tweet]) -> None:
+        """Record `tweets` as bookmarked by `account` (existing ones are kept)
+        and write its sync time, in the caller's transaction."""
+        from src.infrastructure.database import mark_data_changed
+
+        now = datetime.utcnow()
+        latest = {t.rest_id: t for t in tweets}
+        self.db.execute(
+            self._insert(BookmarkModel).on_conflict_do_nothing(),
+            [
+                {
+                    "account_id": account.id,
+                    "rest_id": t.rest_id,
+                    "created_at": t.created_at,
+                    "added_at": now,
+                }
+                for t in latest.values()
+            ],
+        )
+        self.db.query(AccountModel).filter(AccountModel.id == account.id).update(
+            {"last_synced_at": account.last_synced_at}, synchronize_session=False
+        )
+        mark_data_changed(self.db)
+
+    def _add_media(self, tweets: List[Tweet]) -> None:
+        """Queue the media of `tweets` for the local cache (URLs already
+        known are kept), in the caller's transaction."""
+        from src.infrastructure.media.store import media_key
+
+        urls = {media_key(url): url for t in tweets for url in t.media_urls or []}
+        if not urls:
+            return
+        now = datetime.utcnow()
+        self.db.execute(
+            self._insert(MediaModel).on_conflict_do_nothing(),
+            [{"url_hash": key, "url": url, "created_at": now} for key, url in urls.items()],
+        )
+
+    def add_tweet_edges(self, edges: List[TweetEdge]) -> None:
+        # A tweet's quote, reply and retweet targets never change
+        rows = {(e.source_id, e.kind): e.target_id for e in edges}
+        if not rows:
+            return
+        self.db.execute(
+            self._insert(TweetEdgeModel).on_conflict_do_nothing(),
+            [
+                {"source_id": source_id, "kind": kind, "target_id": target_id}
+                for (source_id, kind), target_id in rows.items()
+            ],
+        )
+
+    def cluster_near_duplicates(self, tweets: List[Tweet], threshold: float = 0.8) -> List[str]:
+        """Group stored `tweets` with stored tweets of near-identical text,
+        and return the rest_ids that are in a cluster under another tweet."""
+        groups = self._group_near_duplicates(tweets, threshold)
+        self.db.commit()
+        return [rest_id for rest_id, representative in groups.items() if representative]
+
+    def _group_near_duplicates(
+        self, tweets: List[Tweet], threshold: float
+    ) -> Dict[str, Optional[str]]:
+        """rest_id -> representative (None for none) for `tweets`, grouped
+        in the caller's transaction.
+
+        Each tweet's LSH band keys replace its old ones. A tweet joins the
+        cluster of its most similar candidate at or above `threshold`
+        (estimated Jaccard similarity of the shingles), and takes the
+        representative's classification if it has one. Tweets quoting
+        different tweets are never grouped. A representative that already
+        has near-duplicates stays one.
+        """
+        from src.core.near_duplicates import band_keys, signature, similarity
+
+        latest = {t.rest_id: t for t in tweets}
+        if not latest:
+            return {}
+        ids = list(latest)
+        # Sessions don't autoflush; the candidate queries must see new tweets
+        self.db.flush()
+        buckets = NearDuplicateBucketModel.__table__
+        self.db.execute(buckets.delete().where(buckets.c.rest_id.in_(ids)))
+
+        signatures = {}
+        keys: Dict[str, List[int]] = {}
+        for rest_id, tweet in latest.items():
+            sig = signature(tweet.text)
+            if sig is not None:
+                signatures[rest_id] = sig
+                keys[rest_id] = band_keys(sig)
+
+        all_keys = list({key for tweet_keys in keys.values() for key in tweet_keys})
+        members: Dict[int, set] = {}
+        for start in range(0, len(all_keys), BUCKET_CHUNK):
+            rows = self.db.execute(
+                select(buckets.c.bucket, buckets.c.rest_id).where(
+                    buckets.c.bucket.in_(all_keys[start:start + BUCKET_CHUNK])
+                )
+            )
+            for bucket, rest_id in rows:
+                members.setdefault(bucket, set()).add(rest_id)
+
+        # Most tweets share no key with a stored tweet or another in the batch.
+        # They can't join a cluster, so only those that do are loaded.
+        in_batch = Counter(key for tweet_keys in keys.values() for key in tweet_keys)
+        grouped = [
+            rest_id
+            for rest_id in ids
+            if any(key in members or in_batch[key] > 1 for key in keys.get(rest_id, []))
+        ]
+        lone = set(ids).difference(grouped)
+        groups: Dict[str, Optional[str]] = dict.fromkeys(lone)
+        if lone:
+            self.db.query(TweetModel).filter(
+                TweetModel.rest_id.in_(list(lone)), TweetModel.duplicate_of.isnot(None)
+            ).update({"duplicate_of": None}, synchronize_session=False)
+
+        models: Dict[str, TweetModel] = {}
+        representatives: set = set()
+        if grouped:
+            candidate_ids = set(grouped).union(
+                *(members.get(key, ()) for i in grouped for key in keys[i])
+            )
+            models = {
+                m.rest_id: m
+                for m in self.db.query(TweetModel).filter(
+                    TweetModel.rest_id.in_(list(candidate_ids))
+                )
+            }
+            representatives = {
+                rest_id
+                for (rest_id,) in self.db.query(TweetModel.duplicate_of)
+                .filter(TweetModel.duplicate_of.in_(grouped))
+                .distinct()
+            }
+
+        new_rows = [
+            {"bucket": bucket, "rest_id": rest_id}
+            for rest_id in lone
+            for bucket in keys.get(rest_id, [])
+        ]
+        # Oldest first, so the earliest post of a cluster represents it
+        order = sorted(
+            (models[i] for i in grouped if i in models),
+            key=lambda m: (m.created_at or datetime.min, m.id),
+        )
+        for model in order:
+            rest_id = model.rest_id
+            best, best_score = None, threshold
+            for bucket in keys.get(rest_id, []):
+                for other_id in members.get(bucket, ()):
+                    other = models.get(other_id)
+                    if other_id == rest_id or other is None:
+                        continue
+                    if other.quoted_status_id != model.quoted_status_id:
+                        continue
+                    if other_id not in signatures:
+                        signatures[other_id] = signature(other.text)
+                    if signatures[other_id] is None:
+                        continue
+                    score = similarity(signatures[rest_id], signatures[other_id])
+                    if score >= best_score:
+                        best, best_score = other, score
+
+            representative = (best.duplicate_of or best.rest_id) if best is not None else None
+            if rest_id in representatives or representative == rest_id:
+                representative = None
+            if representative != model.duplicate_of:
+                model.duplicate_of = representative
+                if representative and model.classification_status != "completed":
+                    # Waits for the representative instead of being classified
+                    model.classification_status = "pending"
+            groups[rest_id] = representative
+
+            for bucket in keys.get(rest_id, []):
+                members.setdefault(bucket, set()).add(rest_id)
+                new_rows.append({"bucket": bucket, "rest_id": rest_id})
+
+        if new_rows:
+            self.db.execute(
+                self._insert(NearDuplicateBucketModel).on_conflict_do_nothing(), new_rows
+            )
+        self.db.flush()
+        representatives = list({r for r in groups.values() if r})
+        if representatives:
+            self._mirror_near_duplicates(representatives)
+        return groups
+
+    def _mirror_near_duplicates(self, representatives: Optional[List[str]] = None) -> None:
+        """Copy the classification of completed representatives (all, or
+        those in `representatives`) onto their near-duplicates, in the
+        caller's transaction."""
+        representative = TweetModel.__table__.alias("representative")
+
+        def of_representative(column: str):
+            return (
+                select(representative.c[column])
+                .where(representative.c.rest_id == TweetModel.duplicate_of)
+                .scalar_subquery()
+            )
+
+        members = select(TweetModel.rest_id).where(TweetModel.duplicate_of.isnot(None))
+        stmt = update(TweetModel).where(
+            TweetModel.duplicate_of.isnot(None),
+            of_representative("classification_status") == "completed",
+        )
+        if representatives is not None:
+            members = members.where(TweetModel.duplicate_of.in_(representatives))
+            stmt = stmt.where(TweetModel.duplicate_of.in_(representatives))
+        member_ids = list(self.db.execute(members).scalars())
+        if not member_ids:
+            return
+        stmt = stmt.values(
+            **{name: of_representative(name) for name in MIRRORED_FIELDS},
+            classification_status="completed",
+            # History rows belong to the representative; tokens weren't spent here
+            active_classification_id=None,
+            classification_prompt_tokens=0,
+            classification_completion_tokens=0,
+            classification_retry_count=0,
+            next_attempt_at=None,
+            last_error_type=None,
+            reclassify_job_id=None,
+        ).execution_options(synchronize_session=False)
+        with self.track_analytics(member_ids):
+            self.db.execute(stmt)
+
+    def release_near_duplicates(self, rest_id: str) -> None:
+        """Before `rest_id` is deleted: drop its LSH keys, and hand its
+        cluster to the oldest remaining near-duplicate. In the caller's
+        transaction."""
+        buckets = NearDuplicateBucketModel.__table__
+        self.db.execute(buckets.delete().where(buckets.c.rest_id == rest_id))
+        successor = (
+            self.db.query(TweetModel.rest_id)
+            .filter(TweetModel.duplicate_of == rest_id)
+            .order_by(TweetModel.created_at, TweetModel.id)
+            .first()
+        )
+        if successor is None:
+            return
+        self.db.query(TweetModel).filter(TweetModel.rest_id == successor.rest_id).update(
+            {"duplicate_of": None}, synchronize_session=False
+        )
+        self.db.query(TweetModel).filter(TweetModel.duplicate_of == rest_id).update(
+            {"duplicate_of": successor.rest_id}, synchronize_session=False
+        )
+        # Members still waiting take the successor's classification, if it has one
+        self._mirror_near_duplicates([successor.rest_id])
+
+    def get_bookmarked_rest_ids(self, account_id: int, rest_ids: List[str]) -> List[str]:
+        if not rest_ids:
+            return []
+        rows = self.db.query(BookmarkModel.rest_id).filter(
+            BookmarkModel.account_id == account_id, BookmarkModel.rest_id.in_(rest_ids)
+        )
+        return [rest_id for (rest_id,) in rows]
+
+    def get_content_hashes(self, rest_ids: List[str]) -> Dict[str, Optional[str]]:
+        if not rest_ids:
+            return {}
+        rows = self.db.query(TweetModel.rest_id, TweetModel.content_hash).filter(
+            TweetModel.rest_id.in_(rest_ids)
+        )
+        return {rest_id: content_hash for rest_id, content_hash in rows}
+
     def get_tweet_by_rest_id(self, rest_id: str) -> Optional[Tweet]:
         model = self.db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if model:
@@ -111,44 +681,847 @@ class SqlAlchemyRepository(BookmarkRepository):
 
     def get_bookmarks_for_account(self, account_id: int) -> List[Tweet]:
         models = (
-            self.db.query(TweetModel).filter(TweetModel.account_id == account_id).all()
+            self.db.query(TweetModel)
+            .join(BookmarkModel, BookmarkModel.rest_id == TweetModel.rest_id)
+            .filter(BookmarkModel.account_id == account_id)
+            .order_by(BookmarkModel.created_at.desc())
+            .all()
         )
         return [self._to_tweet_entity(m) for m in models]
 
+    def get_tweets_by_rest_ids(self, rest_ids: List[str]) -> List[Tweet]:
+        """Fetch tweets by rest_id; order is not guaranteed."""
+        if not rest_ids:
+            return []
+        models = self.db.query(TweetModel).filter(TweetModel.rest_id.in_(rest_ids)).all()
+        return [self._to_tweet_entity(m) for m in models]
+
+    def get_tweets_page(
+        self, after_rest_id: Optional[str] = None, limit: int = 500
+    ) -> List[Tweet]:
+        """Keyset page of tweets ordered by rest_id, starting after `after_rest_id`."""
+        query = self.db.query(TweetModel)
+        if after_rest_id is not None:
+            query = query.filter(TweetModel.rest_id > after_rest_id)
+        models = query.order_by(TweetModel.rest_id).limit(limit).all()
+        return [self._to_tweet_entity(m) for m in models]
+
     def update_tweet_classification(
         self, rest_id: str, result: ClassificationResult
     ) -> Tweet:
-        """Update a tweet with classification results."""
+        """Append `result` to the tweet's history and make it the active one."""
         model = self.db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if not model:
             raise ValueError(f"Tweet not found: {rest_id}")
 
-        model.topics = result.topics
+        topics = [normalize_topic(t) for t in result.topics]
+        history = ClassificationModel(
+            tweet_rest_id=rest_id,
+            model=result.model_used,
+            prompt_version=result.prompt_version,
+            topics=topics,
+            summary=result.summary,
+            confidence=result.confidence,
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            created_at=result.classified_at or datetime.utcnow(),
+        )
+        self.db.add(history)
+        self.db.flush()
+
+        before = self._analytics_counts([rest_id])
+        model.active_classification_id = history.id
+        model.topics = canonicalize_topics(topics, self._approved_aliases())
         model.summary = result.summary
         model.classified_at = result.classified_at
         model.classification_status = "completed"
+        model.next_attempt_at = None
+        model.last_error_type = None
+        model.reclassify_job_id = None
         model.classification_model = result.model_used
+        model.classification_prompt_tokens = result.prompt_tokens
+        model.classification_completion_tokens = result.completion_tokens
+        self._update_analytics([rest_id], before)
+        self._mirror_near_duplicates([rest_id])
 
         self.db.commit()
         self.db.refresh(model)
         return self._to_tweet_entity(model)
 
-    def get_unclassified_tweets(self, limit: int = 50) -> List[Tweet]:
-        """Get tweets that haven't been classified yet."""
+    def _to_classification_entity(self, model: ClassificationModel) -> Classification:
+        return Classification(
+            id=model.id,
+            tweet_rest_id=model.tweet_rest_id,
+            model=model.model,
+            prompt_version=model.prompt_version,
+            topics=model.topics or [],
+            summary=model.summary,
+            confidence=model.confidence,
+            prompt_tokens=model.prompt_tokens,
+            completion_tokens=model.completion_tokens,
+            created_at=model.created_at,
+        )
+
+    def get_tweet_classifications(self, rest_id: str) -> List[Classification]:
+        """A tweet's classification history, newest first."""
         models = (
-            self.db.query(TweetModel)
-            .filter(TweetModel.classification_status == "pending")
-            .limit(limit)
+            self.db.query(ClassificationModel)
+            .filter(ClassificationModel.tweet_rest_id == rest_id)
+            .order_by(ClassificationModel.id.desc())
             .all()
         )
+        return [self._to_classification_entity(m) for m in models]
+
+    def get_classification_versions(self) -> List[Dict[str, Any]]:
+        """Each (model, prompt_version) in history, with how many tweets it
+        classified and how many currently show its result."""
+        key = (ClassificationModel.model, ClassificationModel.prompt_version)
+        active = dict(
+            ((m, v), n)
+            for m, v, n in self.db.query(*key, func.count(TweetModel.id))
+            .join(TweetModel, TweetModel.active_classification_id == ClassificationModel.id)
+            .group_by(*key)
+        )
+        rows = (
+            self.db.query(
+                *key,
+                func.count(func.distinct(ClassificationModel.tweet_rest_id)),
+                func.min(ClassificationModel.created_at),
+                func.max(ClassificationModel.created_at),
+            )
+            .group_by(*key)
+            .order_by(func.max(ClassificationModel.created_at).desc())
+            .all()
+        )
+        return [
+            {
+                "model": m,
+                "prompt_version": v,
+                "tweets": tweets,
+                "active": active.get((m, v), 0),
+                "first_at": first,
+                "last_at": last,
+            }
+            for m, v, tweets, first, last in rows
+        ]
+
+    def activate_classification_version(self, model: str, prompt_version: str) -> int:
+        """Point every tweet classified by `model` / `prompt_version` at its
+        latest such result, in one UPDATE ... FROM. Returns tweets updated.
+
+        Tweets that version never classified keep their active result.
+        """
+        latest = (
+            select(func.max(ClassificationModel.id).label("id"))
+            .where(
+                ClassificationModel.model == model,
+                ClassificationModel.prompt_version == prompt_version,
+            )
+            .group_by(ClassificationModel.tweet_rest_id)
+            .subquery()
+        )
+        chosen = (
+            select(ClassificationModel)
+            .where(ClassificationModel.id.in_(select(latest.c.id)))
+            .subquery()
+        )
+        stmt = (
+            update(TweetModel)
+            .where(TweetModel.rest_id == chosen.c.tweet_rest_id)
+            .values(
+                active_classification_id=chosen.c.id,
+                topics=chosen.c.topics,
+                summary=chosen.c.summary,
+                classified_at=chosen.c.created_at,
+                classification_model=chosen.c.model,
+                classification_prompt_tokens=chosen.c.prompt_tokens,
+                classification_completion_tokens=chosen.c.completion_tokens,
+                classification_status="completed",
+                next_attempt_at=None,
+                last_error_type=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        classified = self.db.execute(
+            select(ClassificationModel.tweet_rest_id)
+            .where(
+                ClassificationModel.model == model,
+                ClassificationModel.prompt_version == prompt_version,
+            )
+            .distinct()
+        ).scalars()
+        with self.track_analytics(list(classified)):
+            count = self.db.execute(stmt).rowcount
+        self._mirror_near_duplicates()
+        self.db.commit()
+        # History keeps raw topics; re-fold them through the current aliases.
+        self.apply_topic_aliases()
+        return count
+
+    def get_unclassified_tweets(
+        self, limit: int = 50, priority: str = "newest"
+    ) -> List[Tweet]:
+        """Get tweets that haven't been classified yet. Near-duplicates wait
+        for their cluster's representative instead."""
+        query = self.db.query(TweetModel).filter(
+            TweetModel.classification_status == "pending",
+            TweetModel.duplicate_of.is_(None),
+        )
+        if priority == "most_viewed":
+            query = query.order_by(
+                TweetModel.view_count.desc().nulls_last(), TweetModel.created_at.desc()
+            )
+        else:
+            query = query.order_by(TweetModel.created_at.desc())
+        models = query.limit(limit).all()
+        return [self._to_tweet_entity(m) for m in models]
+
+    def get_labelled_tweets(
+        self, limit: int = 5000, exclude_model_prefixes: Sequence[str] = ()
+    ) -> List[Tweet]:
+        """Most recently classified tweets with topics, skipping those whose
+        `classification_model` starts with any of `exclude_model_prefixes`."""
+        query = self.db.query(TweetModel).filter(
+            TweetModel.classification_status == "completed",
+            TweetModel.topics.isnot(None),
+            # Copies of a representative's labels would outvote other examples
+            TweetModel.duplicate_of.is_(None),
+        )
+        if exclude_model_prefixes:
+            query = query.filter(
+                or_(
+                    TweetModel.classification_model.is_(None),
+                    not_(
+                        or_(
+                            *[
+                                TweetModel.classification_model.startswith(prefix)
+                                for prefix in exclude_model_prefixes
+                            ]
+                        )
+                    ),
+                )
+            )
+        models = query.order_by(TweetModel.classified_at.desc()).limit(limit).all()
         return [self._to_tweet_entity(m) for m in models]
 
     def mark_classification_failed(
-        self, rest_id: str, error_type: str, retry_count: int
+        self,
+        rest_id: str,
+        error_type: str,
+        retry_count: int,
+        next_attempt_at: Optional[datetime] = None,
     ) -> None:
-        """Mark a tweet as having failed classification."""
+        """Mark a tweet as having failed classification.
+
+        With `next_attempt_at` the tweet is retried from then on; without it
+        the tweet is dead-lettered (status "dead").
+        """
         model = self.db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if model:
-            model.classification_status = "failed"
+            model.classification_status = "failed" if next_attempt_at else "dead"
             model.classification_retry_count = retry_count
+            model.next_attempt_at = next_attempt_at
+            model.last_error_type = error_type
             self.db.commit()
+
+    def _due_query(self, now: datetime):
+        return self.db.query(TweetModel).filter(
+            TweetModel.classification_status == "failed",
+            TweetModel.next_attempt_at <= now,
+            TweetModel.duplicate_of.is_(None),
+        )
+
+    def get_due_retries(self, now: datetime, limit: int = 50) -> List[Tweet]:
+        """Failed tweets whose `next_attempt_at` has passed, oldest first."""
+        models = (
+            self._due_query(now).order_by(TweetModel.next_attempt_at).limit(limit).all()
+        )
+        return [self._to_tweet_entity(m) for m in models]
+
+    def count_due_retries(self, now: datetime) -> int:
+        return self._due_query(now).count()
+
+    def requeue_dead_letters(self) -> int:
+        """Move dead-lettered tweets back to pending with a fresh retry count."""
+        count = (
+            self.db.query(TweetModel)
+            .filter(TweetModel.classification_status == "dead")
+            .update(
+                {
+                    "classification_status": "pending",
+                    "classification_retry_count": 0,
+                    "next_attempt_at": None,
+                    "last_error_type": None,
+                },
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        return count
+
+    def _to_media_entity(self, model: MediaModel) -> Media:
+        return Media(
+            url=model.url,
+            url_hash=model.url_hash,
+            status=model.status,
+            attempts=model.attempts,
+            next_attempt_at=model.next_attempt_at,
+            last_error=model.last_error,
+            content_hash=model.content_hash,
+            content_type=model.content_type,
+            size=model.size,
+            has_thumbnail=model.has_thumbnail,
+            created_at=model.created_at,
+            fetched_at=model.fetched_at,
+        )
+
+    def claim_due_media(
+        self, now: datetime, limit: int = 100, lease_seconds: int = 600
+    ) -> List[Media]:
+        models = (
+            self.db.query(MediaModel)
+            .filter(
+                MediaModel.status.in_(["pending", "failed"]),
+                or_(MediaModel.next_attempt_at.is_(None), MediaModel.next_attempt_at <= now),
+            )
+            .limit(limit)
+            .all()
+        )
+        for model in models:
+            model.attempts += 1
+            model.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        claimed = [self._to_media_entity(m) for m in models]
+        self.db.commit()
+        return claimed
+
+    def save_media(self, media: List[Media]) -> None:
+        if not media:
+            return
+        self.db.execute(
+            update(MediaModel),
+            [
+                {
+                    "url_hash": m.url_hash,
+                    "status": m.status,
+                    "attempts": m.attempts,
+                    "next_attempt_at": m.next_attempt_at,
+                    "last_error": m.last_error,
+                    "content_hash": m.content_hash,
+                    "content_type": m.content_type,
+                    "size": m.size,
+                    "has_thumbnail": m.has_thumbnail,
+                    "fetched_at": m.fetched_at,
+                }
+                for m in media
+            ],
+        )
+        self.db.commit()
+
+    def get_media(self, url_hash: str) -> Optional[Media]:
+        model = self.db.get(MediaModel, url_hash)
+        return self._to_media_entity(model) if model else None
+
+    def get_media_counts(self) -> Dict[str, int]:
+        rows = self.db.query(MediaModel.status, func.count()).group_by(MediaModel.status)
+        return {status: count for status, count in rows}
+
+    def requeue_media(self) -> int:
+        count = (
+            self.db.query(MediaModel)
+            .filter(MediaModel.status.in_(["failed", "gone"]))
+            .update(
+                {"status": "pending", "attempts": 0, "next_attempt_at": None},
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        return count
+
+    def _to_job_entity(self, model: ReclassifyJobModel) -> ReclassifyJob:
+        return ReclassifyJob(
+            id=model.id,
+            status_filter=model.status_filter,
+            status=model.status,
+            cursor_id=model.cursor_id,
+            max_id=model.max_id,
+            total=model.total,
+            flagged=model.flagged,
+            requeued=model.requeued,
+            failed=model.failed,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            finished_at=model.finished_at,
+        )
+
+    def _job_scope(self, status_filter: Optional[str]):
+        # Near-duplicates follow their representative's new classification
+        query = self.db.query(TweetModel).filter(TweetModel.duplicate_of.is_(None))
+        if status_filter:
+            query = query.filter(TweetModel.classification_status == status_filter)
+        return query
+
+    def create_reclassify_job(self, status_filter: Optional[str] = None) -> ReclassifyJob:
+        """Open a job covering the tweets that exist now (optionally one status)."""
+        max_id = self.db.query(func.max(TweetModel.id)).scalar() or 0
+        total = self._job_scope(status_filter).filter(TweetModel.id <= max_id).count()
+        now = datetime.utcnow()
+        model = ReclassifyJobModel(
+            status_filter=status_filter,
+            status="marking" if total else "completed",
+            max_id=max_id,
+            total=total,
+            created_at=now,
+            updated_at=now,
+            finished_at=None if total else now,
+        )
+        self.db.add(model)
+        self.db.commit()
+        self.db.refresh(model)
+        return self._to_job_entity(model)
+
+    def get_reclassify_job(self, job_id: int) -> Optional[ReclassifyJob]:
+        model = self.db.get(ReclassifyJobModel, job_id)
+        return self._to_job_entity(model) if model else None
+
+    def get_reclassify_jobs(
+        self, statuses: Optional[List[str]] = None, limit: int = 20
+    ) -> List[ReclassifyJob]:
+        """Most recent jobs first, optionally only those in `statuses`."""
+        query = self.db.query(ReclassifyJobModel)
+        if statuses:
+            query = query.filter(ReclassifyJobModel.status.in_(statuses))
+        models = query.order_by(ReclassifyJobModel.id.desc()).limit(limit).all()
+        return [self._to_job_entity(m) for m in models]
+
+    def advance_reclassify_job(self, job_id: int, chunk_size: int = 500) -> ReclassifyJob:
+        """Queue the next keyset chunk of a job's tweets, in one short transaction.
+
+        Completed tweets keep their classification and are flagged with the
+        job id; anything else goes back to pending. The cursor moves in the
+        same commit, so a crash never skips or double-counts a chunk. Once
+        the scope is exhausted the job moves to "classifying".
+        """
+        model = self.db.get(ReclassifyJobModel, job_id)
+        if not model:
+            raise ValueError(f"Reclassify job not found: {job_id}")
+        if model.status != "marking":
+            return self._to_job_entity(model)
+
+        rows = (
+            self._job_scope(model.status_filter)
+            .with_entities(TweetModel.id, TweetModel.classification_status)
+            .filter(TweetModel.id > model.cursor_id, TweetModel.id <= model.max_id)
+            .order_by(TweetModel.id)
+            .limit(chunk_size)
+            .all()
+        )
+        now = datetime.utcnow()
+        if not rows:
+            model.status = "classifying"
+            model.updated_at = now
+            self.db.commit()
+            return self._to_job_entity(model)
+
+        completed = [tweet_id for tweet_id, status in rows if status == "completed"]
+        unfinished = [tweet_id for tweet_id, status in rows if status != "completed"]
+        reset = {
+            "classification_retry_count": 0,
+            "next_attempt_at": None,
+            "last_error_type": None,
+        }
+        if completed:
+            self.db.query(TweetModel).filter(TweetModel.id.in_(completed)).update(
+                {**reset, "reclassify_job_id": model.id}, synchronize_session=False
+            )
+        if unfinished:
+            self.db.query(TweetModel).filter(TweetModel.id.in_(unfinished)).update(
+                {**reset, "classification_status": "pending", "reclassify_job_id": None},
+                synchronize_session=False,
+            )
+        model.cursor_id = rows[-1][0]
+        model.flagged += len(completed)
+        model.requeued += len(unfinished)
+        model.updated_at = now
+        self.db.commit()
+        return self._to_job_entity(model)
+
+    def set_reclassify_job_status(self, job_id: int, status: str) -> ReclassifyJob:
+        model = self.db.get(ReclassifyJobModel, job_id)
+        if not model:
+            raise ValueError(f"Reclassify job not found: {job_id}")
+        now = datetime.utcnow()
+        model.status = status
+        model.updated_at = now
+        if status in ("completed", "cancelled"):
+            model.finished_at = now
+        self.db.commit()
+        return self._to_job_entity(model)
+
+    def count_reclassify_remaining(self, job_id: int) -> int:
+        return (
+            self.db.query(TweetModel)
+            .filter(TweetModel.reclassify_job_id == job_id)
+            .count()
+        )
+
+    def get_reclassify_tweets(self, now: datetime, limit: int = 50) -> List[Tweet]:
+        """Tweets flagged by a reclassify job and not backing off, oldest job
+        first and in id order within it."""
+        models = (
+            self.db.query(TweetModel)
+            .filter(
+                TweetModel.reclassify_job_id.isnot(None),
+                or_(TweetModel.next_attempt_at.is_(None), TweetModel.next_attempt_at <= now),
+            )
+            # Leading with the job id lets ix_tweets_reclassify_job_id serve the
+            # filter; ordering by id alone walks the whole table
+            .order_by(TweetModel.reclassify_job_id, TweetModel.id)
+            .limit(limit)
+            .all()
+        )
+        return [self._to_tweet_entity(m) for m in models]
+
+    def mark_reclassification_failed(
+        self,
+        rest_id: str,
+        error_type: str,
+        retry_count: int,
+        next_attempt_at: Optional[datetime] = None,
+    ) -> None:
+        """Back off a flagged tweet, leaving its old classification in place.
+
+        Without `next_attempt_at` the tweet is dropped from its job and
+        counted as failed there; its status stays "completed".
+        """
+        model = self.db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
+        if not model:
+            return
+        model.classification_retry_count = retry_count
+        model.next_attempt_at = next_attempt_at
+        model.last_error_type = error_type
+        if next_attempt_at is None and model.reclassify_job_id is not None:
+            self.db.query(ReclassifyJobModel).filter(
+                ReclassifyJobModel.id == model.reclassify_job_id
+            ).update({"failed": ReclassifyJobModel.failed + 1}, synchronize_session=False)
+            model.reclassify_job_id = None
+        self.db.commit()
+
+    def _to_run_entity(self, model: ClassificationRunModel) -> ClassificationRun:
+        return ClassificationRun(
+            id=model.id,
+            model=model.model,
+            started_at=model.started_at,
+            finished_at=model.finished_at,
+            processed=model.processed,
+            succeeded=model.succeeded,
+            failed=model.failed,
+            prompt_tokens=model.prompt_tokens,
+            completion_tokens=model.completion_tokens,
+        )
+
+    def start_classification_run(self, model: Optional[str]) -> ClassificationRun:
+        """Open a run record that token usage is attributed to."""
+        run = ClassificationRunModel(model=model, started_at=datetime.utcnow())
+        self.db.add(run)
+        self.db.commit()
+        self.db.refresh(run)
+        return self._to_run_entity(run)
+
+    def finish_classification_run(self, run: ClassificationRun) -> ClassificationRun:
+        """Persist a run's final counts and token totals."""
+        model = self.db.get(ClassificationRunModel, run.id)
+        if not model:
+            raise ValueError(f"Classification run not found: {run.id}")
+
+        model.model = run.model
+        model.finished_at = run.finished_at or datetime.utcnow()
+        model.processed = run.processed
+        model.succeeded = run.succeeded
+        model.failed = run.failed
+        model.prompt_tokens = run.prompt_tokens
+        model.completion_tokens = run.completion_tokens
+
+        self.db.commit()
+        self.db.refresh(model)
+        return self._to_run_entity(model)
+
+    def record_token_usage(
+        self,
+        rest_id: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        run_id: Optional[int] = None,
+    ) -> None:
+        """Append one classification's token usage."""
+        self.db.add(
+            TokenUsageModel(
+                run_id=run_id,
+                tweet_rest_id=rest_id,
+                model=model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                created_at=datetime.utcnow(),
+            )
+        )
+        self.db.commit()
+
+    def get_tokens_used_since(self, since: datetime) -> int:
+        """Total prompt + completion tokens recorded since `since`."""
+        total = (
+            self.db.query(
+                func.coalesce(
+                    func.sum(TokenUsageModel.prompt_tokens + TokenUsageModel.completion_tokens),
+                    0,
+                )
+            )
+            .filter(TokenUsageModel.created_at >= since)
+            .scalar()
+        )
+        return int(total or 0)
+
+    def get_average_tokens_per_classification(self, sample: int = 200) -> Optional[float]:
+        """Mean total tokens over the most recent `sample` classifications."""
+        recent = (
+            self.db.query(
+                (TokenUsageModel.prompt_tokens + TokenUsageModel.completion_tokens).label("total")
+            )
+            .order_by(TokenUsageModel.id.desc())
+            .limit(sample)
+            .subquery()
+        )
+        average = self.db.query(func.avg(recent.c.total)).scalar()
+        return float(average) if average is not None else None
+
+    def get_token_usage_summary(self, group_by: str = "day") -> List[Dict[str, Any]]:
+        """Token totals grouped by "model", "day" or "run"."""
+        if group_by == "model":
+            key = TokenUsageModel.model
+        elif group_by == "run":
+            key = TokenUsageModel.run_id
+        elif group_by == "day":
+            key = func.date(TokenUsageModel.created_at)
+        else:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+
+        rows = (
+            self.db.query(
+                key.label("key"),
+                func.count(TokenUsageModel.id),
+                func.sum(TokenUsageModel.prompt_tokens),
+                func.sum(TokenUsageModel.completion_tokens),
+            )
+            .group_by(key)
+            .order_by(key.desc())
+            .all()
+        )
+        return [
+            {
+                group_by: str(k) if group_by == "day" and k is not None else k,
+                "classifications": count,
+                "prompt_tokens": int(prompt or 0),
+                "completion_tokens": int(completion or 0),
+                "total_tokens": int((prompt or 0) + (completion or 0)),
+            }
+            for k, count, prompt, completion in rows
+        ]
+
+    def _approved_aliases(self) -> Dict[str, str]:
+        if self._alias_map is None:
+            self._alias_map = {a.alias: a.canonical for a in self.get_topic_aliases()}
+        return self._alias_map
+
+    def _to_alias_entity(self, model: TopicAliasModel) -> TopicAlias:
+        return TopicAlias(
+            alias=model.alias,
+            canonical=model.canonical,
+            score=model.score,
+            status=model.status,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    def get_topic_counts(self, account_id: Optional[int] = None) -> Dict[str, int]:
+        """Number of tweets (bookmarked by `account_id`) tagged with each stored topic name."""
+        if self._postgresql:
+            scope = (
+                "WHERE rest_id IN (SELECT rest_id FROM bookmarks WHERE account_id = :account_id) "
+            )
+            rows = self.db.execute(
+                text(
+                    "SELECT topic, COUNT(*) FROM tweets CROSS JOIN LATERAL "
+                    "jsonb_array_elements_text(CASE WHEN jsonb_typeof(topics) = 'array' "
+                    "THEN topics ELSE '[]'::jsonb END) AS topic "
+                    f"{scope if account_id is not None else ''}GROUP BY topic"
+                ),
+                {"account_id": account_id},
+            )
+            return {topic: count for topic, count in rows}
+        counts: Dict[str, int] = {}
+        query = self.db.query(TweetModel.topics).filter(TweetModel.topics.isnot(None))
+        if account_id is not None:
+            query = query.filter(self.bookmarked_by(account_id))
+        for (topics,) in query:
+            for topic in topics or []:
+                counts[topic] = counts.get(topic, 0) + 1
+        return counts
+
+    def get_topic_aliases(self, status: Optional[str] = "approved") -> List[TopicAlias]:
+        """Aliases with `status`, or all of them when None."""
+        query = self.db.query(TopicAliasModel)
+        if status is not None:
+            query = query.filter(TopicAliasModel.status == status)
+        models = query.order_by(TopicAliasModel.score.desc()).all()
+        return [self._to_alias_entity(m) for m in models]
+
+    def save_topic_aliases(self, aliases: List[TopicAlias]) -> int:
+        """Store proposed aliases; reviewed (approved/rejected) ones are kept as-is."""
+        existing = {
+            m.alias: m
+            for m in self.db.query(TopicAliasModel).filter(
+                TopicAliasModel.alias.in_([a.alias for a in aliases])
+            )
+        }
+        now = datetime.utcnow()
+        saved = 0
+        for alias in aliases:
+            model = existing.get(alias.alias)
+            if model is None:
+                model = TopicAliasModel(alias=alias.alias, created_at=now)
+                self.db.add(model)
+            elif model.status != "proposed" and alias.status == "proposed":
+                continue
+            model.canonical = alias.canonical
+            model.score = alias.score
+            model.status = alias.status
+            model.updated_at = now
+            saved += 1
+        self.db.commit()
+        self._alias_map = None
+        return saved
+
+    def set_topic_alias_status(self, alias: str, status: str) -> bool:
+        model = self.db.query(TopicAliasModel).filter(TopicAliasModel.alias == alias).first()
+        if not model:
+            return False
+        model.status = status
+        model.updated_at = datetime.utcnow()
+        self.db.commit()
+        self._alias_map = None
+        return True
+
+    def apply_topic_aliases(self) -> int:
+        """Rewrite stored tweet topics through the approved aliases."""
+        aliases = self._approved_aliases()
+        if not aliases:
+            return 0
+        names = list(aliases)
+        updated = 0
+        # Chunked so the OR of LIKEs stays under SQLite's expression depth limit.
+        for start in range(0, len(names), ALIAS_CHUNK):
+            chunk = names[start:start + ALIAS_CHUNK]
+            models = self.db.query(TweetModel).filter(self.topic_filter(chunk)).all()
+            with self.track_analytics([m.rest_id for m in models]):
+                for model in models:
+                    topics = canonicalize_topics(model.topics or [], aliases)
+                    if topics != model.topics:
+                        model.topics = topics
+                        updated += 1
+            self.db.commit()
+        return updated
+
+    @contextmanager
+    def track_analytics(self, rest_ids: List[str]) -> Iterator[None]:
+        """Keep the analytics rollups in step with what the block changes
+        about `rest_ids`: their date, author, topics or bookmarks, or whether
+        they exist at all. In the caller's transaction."""
+        self.db.flush()
+        before = self._analytics_counts(rest_ids)
+        yield
+        self._update_analytics(rest_ids, before)
+
+    def _analytics_counts(self, rest_ids: List[str]) -> RollupCounts:
+        """What the stored tweets among `rest_ids` add to the rollups."""
+        counts = empty_counts()
+        ids = list(set(rest_ids))
+        for start in range(0, len(ids), ANALYTICS_CHUNK):
+            rows = self.db.query(*ANALYTICS_COLUMNS).filter(
+                TweetModel.rest_id.in_(ids[start:start + ANALYTICS_CHUNK])
+            )
+            self._count_analytics(counts, rows.all())
+        return counts
+
+    def _count_analytics(self, counts: RollupCounts, rows) -> None:
+        """Add tweet rows (ANALYTICS_COLUMNS) to `counts`, under each
+        account that bookmarked them too."""
+        if not rows:
+            return
+        accounts: Dict[str, List[int]] = {}
+        bookmarks = self.db.query(BookmarkModel.rest_id, BookmarkModel.account_id).filter(
+            BookmarkModel.rest_id.in_([row.rest_id for row in rows])
+        )
+        for rest_id, account_id in bookmarks:
+            accounts.setdefault(rest_id, []).append(account_id)
+        for row in rows:
+            count_tweet(
+                counts, row.created_at, row.author_handle, row.topics, accounts.get(row.rest_id, ())
+            )
+
+    def _update_analytics(self, rest_ids: List[str], before: RollupCounts) -> None:
+        """Add the change in what `rest_ids` count for since `before` was
+        taken, in the caller's transaction."""
+        self.db.flush()
+        after = self._analytics_counts(rest_ids)
+        for (model, columns), old, new in zip(ANALYTICS_ROLLUPS, before, after):
+            changes = difference(old, new)
+            if not changes:
+                continue
+            table = model.__table__
+            stmt = self._insert(model)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[name] for name in columns],
+                set_={"count": table.c["count"] + stmt.excluded["count"]},
+            )
+            self.db.execute(
+                stmt,
+                [{**dict(zip(columns, key)), "count": change} for key, change in changes.items()],
+            )
+            if any(change < 0 for change in changes.values()):
+                # Drop rows that reached zero; account and day narrow the search
+                criteria = [table.c["count"] <= 0]
+                for i, name in enumerate(columns):
+                    if name in ("account_id", "day"):
+                        criteria.append(table.c[name].in_({key[i] for key in changes}))
+                self.db.execute(table.delete().where(*criteria))
+
+    def rebuild_analytics(self) -> int:
+        """Recount the analytics rollups from every stored tweet; returns
+        how many tweets were counted."""
+        from src.infrastructure.database import mark_data_changed
+
+        counts = empty_counts()
+        total = 0
+        last_id = 0
+        while True:
+            rows = (
+                self.db.query(TweetModel.id, *ANALYTICS_COLUMNS)
+                .filter(TweetModel.id > last_id)
+                .order_by(TweetModel.id)
+                .limit(ANALYTICS_CHUNK)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            self._count_analytics(counts, rows)
+            total += len(rows)
+
+        for (model, columns), rollup in zip(ANALYTICS_ROLLUPS, counts):
+            table = model.__table__
+            self.db.execute(table.delete())
+            rows = [{**dict(zip(columns, key)), "count": count} for key, count in rollup.items()]
+            for start in range(0, len(rows), ANALYTICS_CHUNK):
+                self.db.execute(table.insert(), rows[start:start + ANALYTICS_CHUNK])
+        mark_data_changed(self.db)
+        self.db.commit()
+        return total
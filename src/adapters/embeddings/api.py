@@ -0,0 +1,67 @@
+"""Embedder backed by an OpenAI-compatible ``/embeddings`` endpoint."""
+
+import logging
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+from src.core.interfaces import TextEmbedder
+
+logger = logging.getLogger(__name__)
+
+
+class ApiEmbedder(TextEmbedder):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        dimension: int,
+        api_key: Optional[str] = None,
+        timeout: float = 30.0,
+        batch_size: int = 64,
+    ):
+        self.base_url = base_url
+        self.model = model
+        self._dimension = dimension
+        self.api_key = api_key
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+    @property
+    def model_name(self) -> str:
+        return f"api-{self.model}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        rows: List[List[float]] = []
+        async with httpx.AsyncClient(
+            base_url=self.base_url, headers=headers, timeout=self.timeout
+        ) as client:
+            for start in range(0, len(texts), self.batch_size):
+                batch = texts[start:start + self.batch_size]
+                response = await client.post(
+                    "/embeddings", json={"model": self.model, "input": batch}
+                )
+                response.raise_for_status()
+                data = sorted(response.json()["data"], key=lambda d: d["index"])
+                rows.extend(d["embedding"] for d in data)
+
+        vectors = np.asarray(rows, dtype=np.float32)
+        if vectors.shape[1] != self._dimension:
+            raise ValueError(
+                f"Embedding API returned dimension {vectors.shape[1]}, "
+                f"expected {self._dimension} (set EMBEDDING_DIM)"
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
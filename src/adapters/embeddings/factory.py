@@ -0,0 +1,58 @@
+"""Builds the configured embedder and the vector index that matches it."""
+
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional
+
+from src.core.entities import Tweet
+from src.core.interfaces import TextEmbedder, VectorIndex
+from src.infrastructure.config import get_settings
+from src.infrastructure.vectors.index import LocalVectorIndex
+
+
+@lru_cache
+def get_embedder() -> TextEmbedder:
+    """Returns the cached embedder selected by EMBEDDING_PROVIDER."""
+    settings = get_settings()
+    provider = settings.embedding_provider
+
+    if provider == "hashing":
+        from src.adapters.embeddings.hashing import HashingEmbedder
+
+        return HashingEmbedder(dimension=settings.embedding_dim)
+    if provider == "sentence-transformers":
+        from src.adapters.embeddings.sentence_transformer import SentenceTransformerEmbedder
+
+        return SentenceTransformerEmbedder(model=settings.embedding_model)
+    if provider == "api":
+        from src.adapters.embeddings.api import ApiEmbedder
+
+        return ApiEmbedder(
+            base_url=settings.embedding_api_base_url or settings.groq_base_url,
+            model=settings.embedding_model,
+            dimension=settings.embedding_dim,
+            api_key=settings.embedding_api_key or settings.groq_api_key,
+        )
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER: {provider}")
+
+
+@lru_cache
+def get_vector_index() -> VectorIndex:
+    """Returns the cached vector index for the configured embedder."""
+    settings = get_settings()
+    embedder = get_embedder()
+    return LocalVectorIndex(
+        settings.vector_index_dir,
+        dim=embedder.dimension,
+        dtype=settings.embedding_dtype,
+        model=embedder.model_name,
+        nprobe=settings.vector_index_nprobe,
+    )
+
+
+def configured_index_hook() -> Optional[Callable[[List[Tweet]], Awaitable[int]]]:
+    """`make_index_hook` for the configured embedder, or None when EMBEDDINGS_ENABLED is off."""
+    if not get_settings().embeddings_enabled:
+        return None
+    from src.use_cases.embed_tweets import make_index_hook
+
+    return make_index_hook(get_embedder(), get_vector_index())
@@ -0,0 +1,66 @@
+"""Dependency-free local embedder based on feature hashing.
+
+Words, word bigrams and character trigrams are hashed into a fixed number of
+signed buckets with sublinear TF weighting. It needs no model download and
+runs on CPU in microseconds per tweet. Similarity is lexical rather than
+semantic, but that is enough for near-topic neighbours and it is a fallback
+when no neural model is installed.
+"""
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+from src.core.interfaces import TextEmbedder
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9_\-']+")
+URL_RE = re.compile(r"https?://\S+")
+
+
+def _features(text: str) -> List[str]:
+    text = URL_RE.sub(" ", text.lower())
+    words = WORD_RE.findall(text)
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+
+class HashingEmbedder(TextEmbedder):
+    def __init__(self, dimension: int = 384):
+        self._dimension = dimension
+
+    @property
+    def model_name(self) -> str:
+        return f"hashing-{self._dimension}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self._dimension, dtype=np.float32)
+        counts: dict = {}
+        for feature in _features(text or ""):
+            counts[feature] = counts.get(feature, 0) + 1
+        for feature, count in counts.items():
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            index = value % self._dimension
+            sign = 1.0 if (value >> 63) & 1 else -1.0
+            weight = 1.0 + np.log(count)
+            # Character n-grams are many and individually weak.
+            if feature.startswith("c:"):
+                weight *= 0.3
+            vector[index] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+        return np.vstack([self.embed_one(t) for t in texts])
@@ -0,0 +1,45 @@
+"""Local CPU embedder using sentence-transformers (optional dependency)."""
+
+import asyncio
+from typing import List
+
+import numpy as np
+
+from src.core.interfaces import TextEmbedder
+
+
+class SentenceTransformerEmbedder(TextEmbedder):
+    def __init__(self, model: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMBEDDING_PROVIDER=sentence-transformers requires the "
+                "'sentence-transformers' package (uv add sentence-transformers)"
+            ) from e
+
+        self._model_id = model
+        self._batch_size = batch_size
+        self._model = SentenceTransformer(model, device="cpu")
+        self._dimension = int(self._model.get_sentence_embedding_dimension())
+
+    @property
+    def model_name(self) -> str:
+        return f"st-{self._model_id}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+        # Model inference is CPU-bound; keep it off the event loop.
+        vectors = await asyncio.to_thread(
+            self._model.encode,
+            texts,
+            batch_size=self._batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return vectors.astype(np.float32, copy=False)
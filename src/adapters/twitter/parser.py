@@ -1,11 +1,16 @@
 import json
+import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from src.core.entities import Tweet
+from src.core.entities import Tweet, TweetEdge
+from src.core.metrics import PARSER_DURATION, PARSER_ERRORS, timed
+
+logger = logging.getLogger(__name__)
 
 
 class TwitterParser:
     @staticmethod
+    @timed(PARSER_DURATION, operation="parse_bookmarks_response")
     def parse_bookmarks_response(response_json: Dict[str, Any]) -> List[Tweet]:
         """
         Parses the 'Bookmark' GraphQL response.
@@ -29,12 +34,47 @@ class TwitterParser:
                         if tweet_data:
                             tweets.append(tweet_data)
         except Exception as e:
-            # In a real app, log this error
-            print(f"Error parsing response: {e}")
-            pass
+            PARSER_ERRORS.inc(operation="parse_bookmarks_response")
+            logger.warning(f"Error parsing response: {e}")
 
         return tweets
 
+    @staticmethod
+    def _view_count(result: Dict[str, Any]) -> Optional[int]:
+        count = result.get("views", {}).get("count")
+        try:
+            return int(count) if count is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def extract_edges(result: Dict[str, Any]) -> List[TweetEdge]:
+        """Quote, reply and retweet links of a tweet result and of the tweets
+        nested in it (the quoted tweet's own quote, a retweet's original)."""
+        edges: Dict[tuple, TweetEdge] = {}
+        pending = [result]
+        while pending:
+            current = pending.pop()
+            if "tweet" in current:
+                current = current["tweet"]
+            legacy = current.get("legacy") or {}
+            source_id = current.get("rest_id") or legacy.get("id_str")
+            if not source_id:
+                continue
+
+            quoted = current.get("quoted_status_result", {}).get("result") or {}
+            retweeted = legacy.get("retweeted_status_result", {}).get("result") or {}
+            targets = {
+                "quote": legacy.get("quoted_status_id_str") or quoted.get("rest_id"),
+                "reply": legacy.get("in_reply_to_status_id_str"),
+                "retweet": legacy.get("retweeted_status_id_str") or retweeted.get("rest_id"),
+            }
+            for kind, target_id in targets.items():
+                if target_id and target_id != source_id:
+                    edges[(source_id, kind)] = TweetEdge(source_id, kind, target_id)
+            pending.extend(nested for nested in (quoted, retweeted) if nested)
+        return list(edges.values())
+
     @staticmethod
     def _extract_tweet_from_entry(entry: Dict[str, Any]) -> Optional[Tweet]:
         try:
@@ -117,18 +157,22 @@ class TwitterParser:
                 author_handle=author_handle,
                 author_name=author_name,
                 created_at=created_at,
-                media_blobs=json.dumps(media_urls),
+                media_urls=media_urls,
                 raw_data=json.dumps(result),
                 quoted_status_id=quoted_status_id,
+                edges=TwitterParser.extract_edges(result),
+                view_count=TwitterParser._view_count(result),
                 is_truncated=is_truncated,
                 is_quote_missing=is_quote_missing,
                 needs_hydration=needs_hydration,
             )
         except Exception as e:
-            # print(f"Failed to parse individual tweet: {e}")
+            PARSER_ERRORS.inc(operation="extract_tweet_from_entry")
+            logger.debug(f"Failed to parse individual tweet: {e}")
             return None
 
     @staticmethod
+    @timed(PARSER_DURATION, operation="parse_tweet_detail")
     def parse_tweet_detail(response_json: Dict[str, Any]) -> Optional[Tweet]:
         """
         Parse a TweetDetail GraphQL response (when viewing a single tweet).
@@ -150,10 +194,12 @@ class TwitterParser:
 
             return TwitterParser._parse_tweet_result(result)
         except Exception as e:
-            print(f"Error parsing tweet detail: {e}")
+            PARSER_ERRORS.inc(operation="parse_tweet_detail")
+            logger.warning(f"Error parsing tweet detail: {e}")
             return None
 
     @staticmethod
+    @timed(PARSER_DURATION, operation="extract_quoted_tweet")
     def extract_quoted_tweet(response_json: Dict[str, Any]) -> Optional[Tweet]:
         """
         Extract the quoted tweet from a TweetDetail response.
@@ -174,7 +220,8 @@ class TwitterParser:
 
             return TwitterParser._parse_tweet_result(quoted_result)
         except Exception as e:
-            print(f"Error extracting quoted tweet: {e}")
+            PARSER_ERRORS.inc(operation="extract_quoted_tweet")
+            logger.warning(f"Error extracting quoted tweet: {e}")
             return None
 
     @staticmethod
@@ -223,13 +270,16 @@ class TwitterParser:
                 author_handle=author_handle,
                 author_name=author_name,
                 created_at=created_at,
-                media_blobs=json.dumps(media_urls),
+                media_urls=media_urls,
                 raw_data=json.dumps(result),
                 quoted_status_id=quoted_status_id,
+                edges=TwitterParser.extract_edges(result),
+                view_count=TwitterParser._view_count(result),
                 is_truncated=is_truncated,
                 is_quote_missing=is_quote_missing,
                 needs_hydration=needs_hydration,
             )
         except Exception as e:
-            print(f"Error parsing tweet result: {e}")
+            PARSER_ERRORS.inc(operation="parse_tweet_result")
+            logger.warning(f"Error parsing tweet result: {e}")
             return None
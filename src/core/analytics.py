@@ -0,0 +1,93 @@
+"""Bookmarks per day by topic and by author, behind the analytics charts.
+
+The rollup tables hold one row per (account, topic, day) and per (account,
+author, day), counting tweets on the day they were posted, plus each
+author's total. Every tweet is counted under ALL_ACCOUNTS (everything in its
+database) and again under each account that bookmarked it; ALL_TOPICS
+counts every tweet, classified or not. Reading a chart then touches a row
+per day and series, however many tweets are stored. Authors are too many to
+rank by summing their days, hence the totals.
+
+Writes keep the rows current by counting the tweets they change before and
+after, and adding the difference (see SqlAlchemyRepository.track_analytics).
+Weeks are summed from days when read.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# account_id of the rows counting every tweet in the database
+ALL_ACCOUNTS = 0
+# topic of the rows counting every tweet
+ALL_TOPICS = ""
+
+# (account_id, topic, day), (account_id, author_handle, day) and
+# (account_id, author_handle) -> tweets
+RollupCounts = Tuple[Counter, Counter, Counter]
+
+
+def empty_counts() -> RollupCounts:
+    return Counter(), Counter(), Counter()
+
+
+def count_tweet(
+    counts: RollupCounts,
+    created_at: Optional[datetime],
+    author_handle: Optional[str],
+    topics: Optional[List[str]],
+    account_ids: Sequence[int] = (),
+) -> None:
+    """Add one tweet to `counts`. Tweets without a date aren't charted."""
+    if created_at is None:
+        return
+    day = created_at.date()
+    topic_counts, author_counts, author_totals = counts
+    names = set(topics) if isinstance(topics, list) else set()
+    for account_id in (ALL_ACCOUNTS, *account_ids):
+        topic_counts[(account_id, ALL_TOPICS, day)] += 1
+        for topic in names:
+            topic_counts[(account_id, topic, day)] += 1
+        if author_handle:
+            author_counts[(account_id, author_handle, day)] += 1
+            author_totals[(account_id, author_handle)] += 1
+
+
+def difference(before: Counter, after: Counter) -> Dict[tuple, int]:
+    """Per-key change from `before` to `after`, without the unchanged keys."""
+    changes = {key: after[key] - before[key] for key in before.keys() | after.keys()}
+    return {key: change for key, change in changes.items() if change}
+
+
+def bucket_start(day: date, interval: str) -> date:
+    """First day of the day or week (starting Monday) that holds `day`."""
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def buckets(first: date, last: date, interval: str) -> List[date]:
+    """Every bucket from the one holding `first` to the one holding `last`."""
+    step = timedelta(days=7 if interval == "week" else 1)
+    start, end = bucket_start(first, interval), bucket_start(last, interval)
+    result = []
+    while start <= end:
+        result.append(start)
+        start += step
+    return result
+
+
+def series(
+    rows: Iterable[Tuple[str, date, int]], starts: List[date], interval: str
+) -> Dict[str, List[int]]:
+    """(name, day, count) rows summed into one count per bucket in `starts`
+    for each name. Rows outside the buckets are left out."""
+    position = {start: i for i, start in enumerate(starts)}
+    result: Dict[str, List[int]] = {}
+    for name, day, count in rows:
+        i = position.get(bucket_start(day, interval))
+        if i is None:
+            continue
+        counts = result.setdefault(name, [0] * len(starts))
+        counts[i] += count
+    return result
@@ -12,6 +12,16 @@ class Account:
     id: Optional[int] = None
 
 
+@dataclass
+class TweetEdge:
+    """One tweet pointing at another: the tweet it quotes, replies to, or retweets."""
+
+    source_id: str
+    # "quote", "reply" or "retweet"
+    kind: str
+    target_id: str
+
+
 @dataclass
 class Tweet:
     rest_id: str
@@ -19,12 +29,20 @@ class Tweet:
     author_handle: str
     author_name: str
     created_at: datetime
-    media_blobs: Optional[str] = None
+    media_urls: Optional[List[str]] = None
     raw_data: Optional[str] = None
     quoted_status_id: Optional[str] = None
+    view_count: Optional[int] = None
+    # Fingerprint of the ingested content; re-posts with the same one are skipped
+    content_hash: Optional[str] = None
 
     # Relationships
     quoted_tweet: Optional["Tweet"] = None
+    # Quote, reply and retweet links found in raw_data, nested tweets included
+    edges: List[TweetEdge] = field(default_factory=list)
+    # First tweet of the near-duplicate cluster this one belongs to; its
+    # classification is copied here instead of classifying this one
+    duplicate_of: Optional[str] = None
     account_id: Optional[int] = None
 
     # AI Classification fields
@@ -34,8 +52,105 @@ class Tweet:
     classification_status: str = "pending"
     classification_retry_count: int = 0
     classification_model: Optional[str] = None
+    classification_prompt_tokens: int = 0
+    classification_completion_tokens: int = 0
+    # The row in classification history that topics/summary were copied from
+    active_classification_id: Optional[int] = None
+    next_attempt_at: Optional[datetime] = None
+    last_error_type: Optional[str] = None
+    # Set while a reclassify-all job is re-running a completed tweet
+    reclassify_job_id: Optional[int] = None
 
     # Sync/Hydration tracking
     is_truncated: bool = False
     is_quote_missing: bool = False
     needs_hydration: bool = False
+
+
+@dataclass
+class Classification:
+    """One classifier output for a tweet; history rows are never updated."""
+
+    tweet_rest_id: str
+    model: str
+    prompt_version: str
+    topics: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+    confidence: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    created_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+
+@dataclass
+class ClassificationRun:
+    """One pass of classify_pending_tweets, with its token spend."""
+
+    model: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    id: Optional[int] = None
+
+
+@dataclass
+class TopicAlias:
+    """Maps a near-duplicate topic name onto its canonical form."""
+
+    alias: str
+    canonical: str
+    score: float = 1.0
+    # "proposed", "approved" or "rejected"
+    status: str = "proposed"
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass
+class ReclassifyJob:
+    """A reclassify-all pass that walks the tweets table in id order."""
+
+    # Only tweets with this classification status, or all when None
+    status_filter: Optional[str] = None
+    # "marking", "classifying", "completed" or "cancelled"
+    status: str = "marking"
+    # Keyset cursor: the last tweets.id handled, and the highest id in scope
+    cursor_id: int = 0
+    max_id: int = 0
+    total: int = 0
+    # Completed tweets flagged for re-run, and unfinished ones reset to pending
+    flagged: int = 0
+    requeued: int = 0
+    # Flagged tweets that kept their old classification after retries ran out
+    failed: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+
+@dataclass
+class Media:
+    """A media URL referenced by stored tweets, and its local copy if fetched."""
+
+    url: str
+    # Hash of the URL; a picture many tweets share is one row
+    url_hash: str
+    # "pending", "cached", "failed" (retried at next_attempt_at) or "gone"
+    # (not fetched again: 404/410 upstream, too large, or out of attempts)
+    status: str = "pending"
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    # sha256 of the file, which names it in the media store
+    content_hash: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    has_thumbnail: bool = False
+    created_at: Optional[datetime] = None
+    fetched_at: Optional[datetime] = None
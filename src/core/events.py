@@ -0,0 +1,34 @@
+"""Live update announcements made by use cases, independent of transport.
+
+Use cases tell `EVENTS` which tweets changed; whatever infrastructure binds
+to it (infrastructure.events binds the /api/events publisher on import)
+decides what clients are sent and how. Until then, announcing is a no-op.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from src.core.entities import Tweet
+
+
+class EventPublisher:
+    def __init__(self):
+        self._backend: Optional[Any] = None
+
+    def bind(self, backend: Any) -> None:
+        """Forward announcements to `backend` (an object with the same
+        methods)."""
+        self._backend = backend
+
+    def bookmarks_ingested(self, tweets: List[Tweet]) -> None:
+        """`tweets` were saved by an ingest, as new or changed bookmarks."""
+        if self._backend is not None:
+            self._backend.bookmarks_ingested(tweets)
+
+    def tweets_classified(self, classified: List[Tweet], failed: Dict[str, str]) -> None:
+        """`classified` got new results; `failed` maps rest_id to the status
+        ("failed" or "dead") of those that didn't."""
+        if self._backend is not None:
+            self._backend.tweets_classified(classified, failed)
+
+
+EVENTS = EventPublisher()
@@ -1,7 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from .entities import Account, Tweet
-from .value_objects import ClassificationResult
+from datetime import datetime
+from typing import Any, ContextManager, Dict, List, Optional, Sequence, Tuple
+from .entities import (
+    Account,
+    Classification,
+    ClassificationRun,
+    Media,
+    ReclassifyJob,
+    TopicAlias,
+    Tweet,
+    TweetEdge,
+)
+from .value_objects import ClassificationResult, DownloadResult
 
 
 class BookmarkRepository(ABC):
@@ -13,6 +23,10 @@ class BookmarkRepository(ABC):
     def get_account_by_username(self, username: str) -> Optional[Account]:
         pass
 
+    @abstractmethod
+    def get_account_by_user_id(self, user_id: str) -> Optional[Account]:
+        pass
+
     @abstractmethod
     def get_all_accounts(self) -> List[Account]:
         pass
@@ -21,6 +35,46 @@ class BookmarkRepository(ABC):
     def save_tweet(self, tweet: Tweet) -> Tweet:
         pass
 
+    @abstractmethod
+    def save_tweets(
+        self,
+        tweets: List[Tweet],
+        account: Optional[Account] = None,
+        near_duplicate_threshold: float = 0,
+    ) -> List[Tweet]:
+        """Insert or update `tweets` in one transaction, recording them as
+        `account`'s bookmarks along with its sync time, and grouping them
+        with stored near-duplicates when a threshold is given."""
+        pass
+
+    @abstractmethod
+    def add_tweet_edges(self, edges: List[TweetEdge]) -> None:
+        """Record quote, reply and retweet links (known ones are kept) in the
+        caller's transaction."""
+        pass
+
+    @abstractmethod
+    def cluster_near_duplicates(self, tweets: List[Tweet], threshold: float = 0.8) -> List[str]:
+        """Group stored `tweets` with stored near-duplicates of their text;
+        returns the rest_ids that are in a cluster under another tweet."""
+        pass
+
+    @abstractmethod
+    def release_near_duplicates(self, rest_id: str) -> None:
+        """Hand a tweet's near-duplicate cluster to another member before it
+        is deleted, in the caller's transaction."""
+        pass
+
+    @abstractmethod
+    def get_bookmarked_rest_ids(self, account_id: int, rest_ids: List[str]) -> List[str]:
+        """Those of `rest_ids` the account has already bookmarked."""
+        pass
+
+    @abstractmethod
+    def get_content_hashes(self, rest_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Stored content fingerprints of the tweets that exist, by rest_id."""
+        pass
+
     @abstractmethod
     def get_tweet_by_rest_id(self, rest_id: str) -> Optional[Tweet]:
         pass
@@ -29,28 +83,253 @@ class BookmarkRepository(ABC):
     def get_bookmarks_for_account(self, account_id: int) -> List[Tweet]:
         pass
 
+    @abstractmethod
+    def get_tweets_by_rest_ids(self, rest_ids: List[str]) -> List[Tweet]:
+        """Fetch tweets by rest_id; order is not guaranteed."""
+        pass
+
+    @abstractmethod
+    def get_tweets_page(
+        self, after_rest_id: Optional[str] = None, limit: int = 500
+    ) -> List[Tweet]:
+        """Keyset page of tweets ordered by rest_id, starting after `after_rest_id`."""
+        pass
+
     @abstractmethod
     def update_tweet_classification(
         self, rest_id: str, result: ClassificationResult
     ) -> Tweet:
-        """Update a tweet with classification results."""
+        """Append `result` to the tweet's history and make it the active one."""
+        pass
+
+    @abstractmethod
+    def get_tweet_classifications(self, rest_id: str) -> List[Classification]:
+        """A tweet's classification history, newest first."""
+        pass
+
+    @abstractmethod
+    def get_classification_versions(self) -> List[Dict[str, Any]]:
+        """Each (model, prompt_version) in history with its tweet and active counts."""
         pass
 
     @abstractmethod
-    def get_unclassified_tweets(self, limit: int = 50) -> List[Tweet]:
-        """Get tweets that haven't been classified yet."""
+    def activate_classification_version(self, model: str, prompt_version: str) -> int:
+        """Make `model` / `prompt_version` the active result for every tweet it
+        classified, in a single bulk update. Returns tweets updated."""
+        pass
+
+    @abstractmethod
+    def get_unclassified_tweets(
+        self, limit: int = 50, priority: str = "newest"
+    ) -> List[Tweet]:
+        """Get tweets that haven't been classified yet.
+
+        `priority` is "newest" (created_at desc) or "most_viewed".
+        """
+        pass
+
+    @abstractmethod
+    def get_labelled_tweets(
+        self, limit: int = 5000, exclude_model_prefixes: Sequence[str] = ()
+    ) -> List[Tweet]:
+        """Most recently classified tweets with topics, skipping those whose
+        `classification_model` starts with any of `exclude_model_prefixes`."""
         pass
 
     @abstractmethod
     def mark_classification_failed(
-        self, rest_id: str, error_type: str, retry_count: int
+        self,
+        rest_id: str,
+        error_type: str,
+        retry_count: int,
+        next_attempt_at: Optional[datetime] = None,
+    ) -> None:
+        """Mark a tweet as having failed classification.
+
+        With `next_attempt_at` the tweet is retried from then on; without it
+        the tweet is dead-lettered (status "dead").
+        """
+        pass
+
+    @abstractmethod
+    def get_due_retries(self, now: datetime, limit: int = 50) -> List[Tweet]:
+        """Failed tweets whose `next_attempt_at` has passed, oldest first."""
+        pass
+
+    @abstractmethod
+    def count_due_retries(self, now: datetime) -> int:
+        pass
+
+    @abstractmethod
+    def requeue_dead_letters(self) -> int:
+        """Move dead-lettered tweets back to pending with a fresh retry count."""
+        pass
+
+    @abstractmethod
+    def create_reclassify_job(self, status_filter: Optional[str] = None) -> ReclassifyJob:
+        """Open a job covering the tweets that exist now (optionally one status)."""
+        pass
+
+    @abstractmethod
+    def get_reclassify_job(self, job_id: int) -> Optional[ReclassifyJob]:
+        pass
+
+    @abstractmethod
+    def get_reclassify_jobs(
+        self, statuses: Optional[List[str]] = None, limit: int = 20
+    ) -> List[ReclassifyJob]:
+        """Most recent jobs first, optionally only those in `statuses`."""
+        pass
+
+    @abstractmethod
+    def advance_reclassify_job(self, job_id: int, chunk_size: int = 500) -> ReclassifyJob:
+        """Queue the next keyset chunk of a job's tweets and move its cursor.
+
+        Completed tweets are flagged and keep their classification until the
+        new one lands; others go back to pending.
+        """
+        pass
+
+    @abstractmethod
+    def set_reclassify_job_status(self, job_id: int, status: str) -> ReclassifyJob:
+        pass
+
+    @abstractmethod
+    def count_reclassify_remaining(self, job_id: int) -> int:
+        """Tweets still flagged by the job."""
+        pass
+
+    @abstractmethod
+    def get_reclassify_tweets(self, now: datetime, limit: int = 50) -> List[Tweet]:
+        """Tweets flagged by a reclassify job and not backing off, oldest job
+        first and in id order within it."""
+        pass
+
+    @abstractmethod
+    def mark_reclassification_failed(
+        self,
+        rest_id: str,
+        error_type: str,
+        retry_count: int,
+        next_attempt_at: Optional[datetime] = None,
+    ) -> None:
+        """Back off a flagged tweet, leaving its old classification in place.
+
+        Without `next_attempt_at` the tweet is dropped from its job.
+        """
+        pass
+
+    @abstractmethod
+    def start_classification_run(self, model: Optional[str]) -> ClassificationRun:
+        """Open a run record that token usage is attributed to."""
+        pass
+
+    @abstractmethod
+    def finish_classification_run(self, run: ClassificationRun) -> ClassificationRun:
+        """Persist a run's final counts and token totals."""
+        pass
+
+    @abstractmethod
+    def record_token_usage(
+        self,
+        rest_id: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        run_id: Optional[int] = None,
     ) -> None:
-        """Mark a tweet as having failed classification."""
+        """Append one classification's token usage."""
+        pass
+
+    @abstractmethod
+    def get_tokens_used_since(self, since: datetime) -> int:
+        """Total prompt + completion tokens recorded since `since`."""
+        pass
+
+    @abstractmethod
+    def get_average_tokens_per_classification(self, sample: int = 200) -> Optional[float]:
+        """Mean total tokens over the most recent `sample` classifications."""
+        pass
+
+    @abstractmethod
+    def get_token_usage_summary(self, group_by: str = "day") -> List[Dict[str, Any]]:
+        """Token totals grouped by "model", "day" or "run"."""
+        pass
+
+    @abstractmethod
+    def get_topic_counts(self, account_id: Optional[int] = None) -> Dict[str, int]:
+        """Number of tweets (bookmarked by `account_id`) tagged with each stored topic name."""
+        pass
+
+    @abstractmethod
+    def get_topic_aliases(self, status: Optional[str] = "approved") -> List[TopicAlias]:
+        """Aliases with `status`, or all of them when None."""
+        pass
+
+    @abstractmethod
+    def save_topic_aliases(self, aliases: List[TopicAlias]) -> int:
+        """Store proposed aliases; reviewed (approved/rejected) ones are kept as-is."""
+        pass
+
+    @abstractmethod
+    def set_topic_alias_status(self, alias: str, status: str) -> bool:
+        pass
+
+    @abstractmethod
+    def apply_topic_aliases(self) -> int:
+        """Rewrite stored tweet topics through the approved aliases."""
+        pass
+
+    @abstractmethod
+    def track_analytics(self, rest_ids: List[str]) -> ContextManager[None]:
+        """Context manager keeping the analytics rollups in step with what its
+        block changes about `rest_ids`, in the caller's transaction."""
+        pass
+
+    @abstractmethod
+    def rebuild_analytics(self) -> int:
+        """Recount the analytics rollups from every stored tweet."""
+        pass
+
+    @abstractmethod
+    def claim_due_media(
+        self, now: datetime, limit: int = 100, lease_seconds: int = 600
+    ) -> List[Media]:
+        """Media waiting for a download (pending, or failed and due again).
+        Claimed rows are held for `lease_seconds`, so a concurrent run
+        doesn't fetch them too."""
+        pass
+
+    @abstractmethod
+    def save_media(self, media: List[Media]) -> None:
+        pass
+
+    @abstractmethod
+    def get_media(self, url_hash: str) -> Optional[Media]:
+        pass
+
+    @abstractmethod
+    def get_media_counts(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def requeue_media(self) -> int:
+        """Give failed and gone media a fresh set of attempts."""
         pass
 
 
 class TweetClassifier(ABC):
-    """Abstract interface for tweet classification services."""
+    """Abstract interface for tweet classification services.
+
+    Classifiers are used as async context managers; backends holding
+    connections override these.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
 
     @abstractmethod
     async def classify(self, tweet: Tweet) -> ClassificationResult:
@@ -68,3 +347,76 @@ class TweetClassifier(ABC):
     def is_available(self) -> bool:
         """Check if the classifier service is configured and reachable."""
         pass
+
+
+class TextEmbedder(ABC):
+    """Abstract interface for turning text into fixed-size vectors."""
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Identifier stored alongside vectors; changing it requires a rebuild."""
+        pass
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        pass
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> Any:
+        """Embed `texts` into an L2-normalised float32 array of shape (n, dimension)."""
+        pass
+
+
+class VectorIndex(ABC):
+    """Abstract interface for nearest-neighbour search over tweet vectors."""
+
+    @abstractmethod
+    def upsert(self, rest_ids: Sequence[str], vectors: Any) -> None:
+        """Store one vector per tweet, replacing any it already has."""
+        pass
+
+    @abstractmethod
+    def remove(self, rest_ids: Sequence[str]) -> None:
+        pass
+
+    @abstractmethod
+    def vector_for(self, rest_id: str) -> Optional[Any]:
+        """The tweet's stored vector, or None when it isn't indexed."""
+        pass
+
+    @abstractmethod
+    def search(
+        self, vector: Any, k: int = 10, exclude: Sequence[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """Up to `k` (rest_id, score) pairs nearest to `vector`, best first."""
+        pass
+
+    @abstractmethod
+    def retrain(self) -> None:
+        """Rebuild the search structure after a bulk load."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MediaDownloader(ABC):
+    """Abstract interface for fetching bookmark media into the local cache.
+
+    Downloaders are used as async context managers; those holding
+    connections override these.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    @abstractmethod
+    async def download(self, media: List[Media]) -> List[DownloadResult]:
+        """Fetch `media`, returning one result per distinct url_hash."""
+        pass
@@ -0,0 +1,90 @@
+"""Metrics recorded by use cases and adapters, independent of any backend.
+
+Each handle names a metric and forwards to whatever infrastructure binds
+to it (infrastructure.metrics binds the Prometheus registry on import).
+Until then, recording is a no-op, so code here never depends on how or
+whether metrics are exported.
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+
+class MetricHandle:
+    def __init__(self, name: str):
+        self.name = name
+        self._backend: Optional[Any] = None
+
+    def bind(self, backend: Any) -> None:
+        """Forward recordings to `backend` (a counter or histogram with the
+        same methods and labels)."""
+        self._backend = backend
+
+
+class CounterHandle(MetricHandle):
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if self._backend is not None:
+            self._backend.inc(amount, **labels)
+
+
+class HistogramHandle(MetricHandle):
+    def observe(self, value: float, **labels: str) -> None:
+        if self._backend is not None:
+            self._backend.observe(value, **labels)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+INGEST_DURATION = HistogramHandle("ingest_duration")
+INGEST_TWEETS = CounterHandle("ingest_tweets")
+PARSER_DURATION = HistogramHandle("parser_duration")
+PARSER_ERRORS = CounterHandle("parser_errors")
+REPOSITORY_DURATION = HistogramHandle("repository_duration")
+CLASSIFICATION_DURATION = HistogramHandle("classification_duration")
+CLASSIFIED_TWEETS = CounterHandle("classified_tweets")
+CLASSIFICATION_PATH = CounterHandle("classification_path")
+
+
+def timed(histogram: HistogramHandle, **labels: str) -> Callable:
+    """Decorator recording the wrapped call's duration (sync or async)."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with histogram.time(**labels):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrumented(histogram: HistogramHandle, label: str = "method") -> Callable[[type], type]:
+    """Class decorator timing every public method, labelled by method name."""
+
+    def decorator(cls: type) -> type:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(attr):
+                continue
+            setattr(cls, name, timed(histogram, **{label: name})(attr))
+        return cls
+
+    return decorator
@@ -0,0 +1,25 @@
+"""Topic name normalisation shared by classification writes and queries."""
+
+import re
+from typing import Dict, List
+
+SEPARATOR_RE = re.compile(r"[\s_/]+")
+STRIP_RE = re.compile(r"[^a-z0-9+#.\-]")
+
+
+def normalize_topic(name: str) -> str:
+    """Lowercase, hyphen-separated form of a topic name."""
+    name = SEPARATOR_RE.sub("-", (name or "").strip().lower().lstrip("#"))
+    return re.sub(r"-{2,}", "-", STRIP_RE.sub("", name)).strip("-")
+
+
+def canonicalize_topics(topics: List[str], aliases: Dict[str, str]) -> List[str]:
+    """Map each topic through `aliases` and drop duplicates, keeping order."""
+    seen = set()
+    result = []
+    for topic in topics or []:
+        canonical = aliases.get(topic, topic)
+        if canonical not in seen:
+            seen.add(canonical)
+            result.append(canonical)
+    return result
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -8,7 +8,30 @@ class ClassificationResult:
     """Immutable value object representing AI classification output."""
 
     topics: List[str]
-    summary: str
+    # None when the classifier doesn't write summaries (local k-NN)
+    summary: Optional[str]
     confidence: float
     model_used: str
     classified_at: datetime
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt (or rule set) that produced this result; see adapters/ai/prompt.py
+    prompt_version: str = "unversioned"
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of fetching one media URL into the local cache."""
+
+    url_hash: str
+    # "cached", "failed" (worth another run) or "gone" (not worth one)
+    status: str
+    content_hash: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    has_thumbnail: bool = False
+    error: Optional[str] = None
@@ -0,0 +1,123 @@
+"""Which database, and which account's bookmarks, a request works on.
+
+The extension identifies the signed-in X account by the user id in the
+`twid` cookie, sent as `X-Birdbrain-Account` (with `X-Birdbrain-Handle`
+once it knows the handle). Readers pick an account with `?account=`,
+either its username or its user id. Requests that name no account see
+every bookmark in the main database, as before accounts were told apart.
+
+In the main database, an account's bookmarks are rows in `bookmarks`, and
+tweets are shared. With ACCOUNT_DATABASE_DIR set, each identified account
+instead gets its own SQLite file there, named by user id. The main database
+then keeps only the account list (and anything ingested unidentified). Each
+account's working set stays small, and a long write for one account
+(ingest, reclassify-all) never holds another account's database lock.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.database import PARTITION_KEY, SessionLocal
+
+
+class UnknownAccount(Exception):
+    def __init__(self, account: str):
+        super().__init__(f"Unknown account: {account}")
+        self.account = account
+
+
+@dataclass(frozen=True)
+class AccountScope:
+    # Restricts the main database to one account's bookmarks
+    account_id: Optional[int] = None
+    # The account's own database, when accounts are partitioned
+    partition: Optional[str] = None
+
+    def session(self) -> Session:
+        return SessionLocal(self.partition)
+
+
+def partitioned() -> bool:
+    return bool(get_settings().account_database_dir)
+
+
+def resolve_scope(account: Optional[str]) -> AccountScope:
+    """The scope for `?account=` (a username or X user id); raises UnknownAccount."""
+    if not account:
+        return AccountScope()
+    from src.adapters.db.repository import SqlAlchemyRepository
+
+    db = SessionLocal()
+    try:
+        repo = SqlAlchemyRepository(db)
+        found = repo.get_account_by_user_id(account) or repo.get_account_by_username(account)
+    finally:
+        db.close()
+    if found is None:
+        raise UnknownAccount(account)
+    if partitioned() and found.user_id:
+        return AccountScope(partition=found.user_id)
+    return AccountScope(account_id=found.id)
+
+
+def ingest_partition(user_id: Optional[str], handle: Optional[str] = None) -> Optional[str]:
+    """The database an ingest from `user_id` writes to (None = main).
+
+    When partitioned, the account is registered in the main database first,
+    so `?account=` can find it."""
+    if not user_id or not partitioned():
+        return None
+    if not PARTITION_KEY.match(user_id):
+        raise UnknownAccount(user_id)
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.use_cases.sync_bookmarks import ensure_account
+
+    db = SessionLocal()
+    try:
+        ensure_account(SqlAlchemyRepository(db), user_id, handle)
+    finally:
+        db.close()
+    return user_id
+
+
+def account_summaries() -> List[Dict[str, Any]]:
+    """Every account with its number of bookmarks and last sync time."""
+    from sqlalchemy import func
+
+    from src.adapters.db.models import BookmarkModel
+    from src.adapters.db.repository import SqlAlchemyRepository
+
+    db = SessionLocal()
+    try:
+        accounts = SqlAlchemyRepository(db).get_all_accounts()
+        counts = dict(
+            db.query(BookmarkModel.account_id, func.count()).group_by(BookmarkModel.account_id)
+        )
+    finally:
+        db.close()
+
+    summaries = []
+    for account in accounts:
+        count = counts.get(account.id, 0)
+        synced = account.last_synced_at
+        if partitioned() and account.user_id:
+            # Ingests update the account's row in its own database
+            partition_db = SessionLocal(account.user_id)
+            try:
+                count = partition_db.query(func.count(BookmarkModel.rest_id)).scalar()
+                own = SqlAlchemyRepository(partition_db).get_account_by_user_id(account.user_id)
+                synced = own.last_synced_at if own else synced
+            finally:
+                partition_db.close()
+        summaries.append(
+            {
+                "username": account.username,
+                "user_id": account.user_id,
+                "bookmarks": count,
+                "last_synced_at": synced,
+            }
+        )
+    return summaries
@@ -0,0 +1,183 @@
+"""Admission control for the ingest endpoints.
+
+Ingests run in the thread pool and take a writer slot before touching the
+database. SQLite has one writer, so extra concurrency only adds lock waits.
+Each account database (ACCOUNT_DATABASE_DIR) has its own writer slots.
+Requests are turned away early instead of queueing without bound:
+
+- 429 when this process already has INGEST_MAX_IN_FLIGHT ingests admitted
+  (the client is sending faster than we write);
+- 503 when INGEST_MAX_WRITER_QUEUE of them are waiting for a writer slot
+  (the database is the bottleneck).
+
+Both carry Retry-After, estimated from recent ingest durations. The Celery
+queue length is checked separately. Past CLASSIFICATION_QUEUE_MAX, ingest
+still writes but stops enqueuing classification batches. The pending tweets
+are picked up by the batches already queued. Media downloads are optional
+and are only queued while the broker answers and has room.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
+
+from src.infrastructure.metrics import (
+    INGEST_CLASSIFICATION_DEFERRED,
+    INGEST_IN_FLIGHT,
+    INGEST_REJECTED,
+)
+
+logger = logging.getLogger(__name__)
+
+CELERY_QUEUE = "celery"
+# Queue length is read from Redis at most this often
+QUEUE_LENGTH_TTL_SECONDS = 2.0
+MAX_RETRY_AFTER_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class Rejection:
+    status_code: int
+    reason: str
+    retry_after: int
+
+    def to_response_body(self) -> dict:
+        return {
+            "status": "error",
+            "message": f"Ingest is saturated ({self.reason}); retry in {self.retry_after}s",
+            "retry_after": self.retry_after,
+        }
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight: int, max_writer_queue: int, writer_concurrency: int = 1):
+        self.max_in_flight = max_in_flight
+        self.max_writer_queue = max_writer_queue
+        self._lock = threading.Lock()
+        self.writer_concurrency = max(writer_concurrency, 1)
+        # Per database: None is the main one, otherwise an account partition
+        self._writers: Dict[Optional[str], threading.Semaphore] = {}
+        self.in_flight = 0
+        self.writing = 0
+        # Moving average of admitted ingest time, for Retry-After
+        self.avg_seconds = 0.5
+
+    def _retry_after(self, ahead: int) -> int:
+        estimate = math.ceil(self.avg_seconds * max(ahead, 1))
+        return min(max(estimate, 1), MAX_RETRY_AFTER_SECONDS)
+
+    @property
+    def writer_queue(self) -> int:
+        """Admitted ingests not yet holding a writer slot."""
+        return self.in_flight - self.writing
+
+    def admit(self) -> Optional[Rejection]:
+        """Admit one ingest, or say why not. Admitted callers must `release`."""
+        with self._lock:
+            rejection = None
+            queued = self.writer_queue
+            if queued >= self.max_writer_queue:
+                rejection = Rejection(503, "writer_queue", self._retry_after(queued + 1))
+            elif self.in_flight >= self.max_in_flight:
+                rejection = Rejection(429, "in_flight", self._retry_after(self.in_flight))
+            else:
+                self.in_flight += 1
+        if rejection:
+            INGEST_REJECTED.inc(reason=rejection.reason)
+            return rejection
+        INGEST_IN_FLIGHT.inc()
+        return None
+
+    def release(self, elapsed: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * elapsed
+        INGEST_IN_FLIGHT.dec()
+
+    @contextmanager
+    def writer(self, partition: Optional[str] = None) -> Iterator[None]:
+        """Hold a writer slot for the database; until then the ingest counts as queued."""
+        with self._lock:
+            slots = self._writers.get(partition)
+            if slots is None:
+                slots = self._writers[partition] = threading.Semaphore(self.writer_concurrency)
+        slots.acquire()
+        with self._lock:
+            self.writing += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.writing -= 1
+            slots.release()
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    from src.infrastructure.config import get_settings
+
+    settings = get_settings()
+    return AdmissionController(
+        settings.ingest_max_in_flight,
+        settings.ingest_max_writer_queue,
+        settings.ingest_writer_concurrency,
+    )
+
+
+@lru_cache
+def _broker_client():
+    import redis
+
+    from src.infrastructure.config import get_settings
+
+    return redis.Redis.from_url(get_settings().broker_url, socket_timeout=0.5)
+
+
+_queue_length_lock = threading.Lock()
+_queue_length: Optional[int] = None
+_queue_length_at = 0.0
+
+
+def celery_queue_length() -> Optional[int]:
+    """Tasks waiting in the Celery queue, or None when Redis can't be read."""
+    global _queue_length, _queue_length_at
+    now = time.monotonic()
+    with _queue_length_lock:
+        if now - _queue_length_at < QUEUE_LENGTH_TTL_SECONDS:
+            return _queue_length
+        _queue_length_at = now
+    try:
+        length = int(_broker_client().llen(CELERY_QUEUE))
+    except Exception as e:
+        logger.debug(f"Could not read Celery queue length: {e}")
+        length = None
+    with _queue_length_lock:
+        _queue_length = length
+    return length
+
+
+def should_enqueue_classification(max_queue_length: int) -> bool:
+    """False while the Celery backlog is at `max_queue_length` or more (0 = no cap)."""
+    if not max_queue_length:
+        return True
+    length = celery_queue_length()
+    if length is not None and length >= max_queue_length:
+        INGEST_CLASSIFICATION_DEFERRED.inc()
+        return False
+    return True
+
+
+def should_enqueue_media(max_queue_length: int) -> bool:
+    """True while the broker can be read and its backlog is under
+    `max_queue_length` (0 = no cap). Downloads can wait for the next ingest
+    or `main.py media`, so an unreachable broker skips them instead of
+    blocking the request on Celery's connection retries."""
+    length = celery_queue_length()
+    if length is None:
+        return False
+    return not max_queue_length or length < max_queue_length
@@ -2,11 +2,19 @@
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from src.infrastructure.metrics import (
+    GROQ_RATE_LIMITED,
+    GROQ_REQUEST_DURATION,
+    GROQ_RETRIES,
+    GROQ_TOKENS,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,13 +72,22 @@ class GroqClient:
 
         last_error = None
         for attempt in range(self.config.max_retries):
+            if attempt > 0:
+                GROQ_RETRIES.inc(reason=_retry_reason(last_error))
+            start = time.perf_counter()
             try:
                 response = await self._client.post("/chat/completions", json=payload)
+                GROQ_REQUEST_DURATION.observe(
+                    time.perf_counter() - start, status=str(response.status_code)
+                )
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
+                self._record_usage(data)
+                return data
             except httpx.HTTPStatusError as e:
                 last_error = e
                 if e.response.status_code == 429:
+                    GROQ_RATE_LIMITED.inc()
                     retry_after = float(
                         e.response.headers.get("retry-after", 2 ** (attempt + 1))
                     )
@@ -83,6 +100,7 @@ class GroqClient:
                 else:
                     raise
             except httpx.TimeoutException as e:
+                GROQ_REQUEST_DURATION.observe(time.perf_counter() - start, status="timeout")
                 last_error = e
                 if attempt < self.config.max_retries - 1:
                     logger.warning("Timeout, retrying...")
@@ -91,3 +109,24 @@ class GroqClient:
                     raise
 
         raise last_error or RuntimeError("Max retries exceeded")
+
+    def _record_usage(self, data: Dict[str, Any]) -> None:
+        usage = data.get("usage") or {}
+        model = data.get("model") or self.config.model
+        GROQ_TOKENS.inc(usage.get("prompt_tokens", 0), model=model, kind="prompt")
+        GROQ_TOKENS.inc(usage.get("completion_tokens", 0), model=model, kind="completion")
+
+
+def is_rate_limited(error: Optional[BaseException]) -> bool:
+    """True for the HTTP 429 that GroqClient re-raises once retries run out."""
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+
+
+def _retry_reason(error: Optional[Exception]) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code == 429:
+            return "rate_limited"
+        return "server_error"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    return "unknown"
@@ -0,0 +1,83 @@
+"""Decoding of batched ingest bodies: compressed NDJSON, one payload per line.
+
+The extensions compress with the browser's CompressionStream (gzip).
+`deflate` is also accepted, and `zstd` when the `zstandard` package is
+installed. Decompression is capped so a small body can't expand without
+bound.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class BatchDecodeError(ValueError):
+    """The body could not be decoded; `status_code` is the HTTP status to return."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def supported_encodings() -> List[str]:
+    encodings = ["identity", "gzip", "deflate"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def _inflate(body: bytes, wbits: int, max_bytes: int) -> bytes:
+    decompressor = zlib.decompressobj(wbits)
+    try:
+        data = decompressor.decompress(body, max_bytes + 1)
+    except zlib.error as e:
+        raise BatchDecodeError(f"Corrupt compressed body: {e}") from e
+    if len(data) > max_bytes or decompressor.unconsumed_tail:
+        raise BatchDecodeError("Batch too large", status_code=413)
+    return data
+
+
+def decompress(body: bytes, content_encoding: Optional[str], max_bytes: int) -> bytes:
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        data = body
+    elif encoding in ("gzip", "x-gzip"):
+        data = _inflate(body, 16 + zlib.MAX_WBITS, max_bytes)
+    elif encoding == "deflate":
+        data = _inflate(body, zlib.MAX_WBITS, max_bytes)
+    elif encoding == "zstd" and zstandard is not None:
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(body) as reader:
+                data = reader.read(max_bytes + 1)
+        except zstandard.ZstdError as e:
+            raise BatchDecodeError(f"Corrupt compressed body: {e}") from e
+    else:
+        raise BatchDecodeError(
+            f"Unsupported Content-Encoding {encoding!r}; use one of "
+            f"{', '.join(supported_encodings())}",
+            status_code=415,
+        )
+    if len(data) > max_bytes:
+        raise BatchDecodeError("Batch too large", status_code=413)
+    return data
+
+
+def parse_ndjson(data: bytes) -> List[Dict[str, Any]]:
+    """One JSON object per non-empty line."""
+    payloads = []
+    for number, line in enumerate(data.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            raise BatchDecodeError(f"Line {number} is not valid JSON: {e}") from e
+        if not isinstance(payload, dict):
+            raise BatchDecodeError(f"Line {number} is not a JSON object")
+        payloads.append(payload)
+    return payloads
@@ -0,0 +1,90 @@
+"""Response models for the list and analytics endpoints.
+
+They document the contract in OpenAPI (`responses=`, not
+`response_model=`, since the handlers return `FastJSONResponse` directly
+and FastAPI would skip the model anyway). With VALIDATE_RESPONSES=true the
+bodies are validated against them and trimmed to their fields before
+rendering.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class BookmarkItem(BaseModel):
+    id: int
+    rest_id: str
+    text: Optional[str] = None
+    author_handle: Optional[str] = None
+    author_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    topics: List[str] = []
+    summary: Optional[str] = None
+    classification_status: str
+    media_urls: List[str] = []
+    # /api/media/{key} for each of media_urls
+    media_keys: List[str] = []
+    quoted_status_id: Optional[str] = None
+    # Near-duplicates folded into this item (collapsed lists only)
+    duplicate_count: int = 0
+    # Only present for semantic search
+    score: Optional[float] = None
+
+
+class BookmarkPage(BaseModel):
+    bookmarks: List[BookmarkItem]
+    total: int
+    limit: int
+    offset: int
+
+
+class TopicBookmarkPage(BookmarkPage):
+    topic: str
+
+
+class TopicCount(BaseModel):
+    name: str
+    count: int
+
+
+class TopicList(BaseModel):
+    topics: List[TopicCount]
+
+
+class Stats(BaseModel):
+    total: int
+    pending: int
+    completed: int
+    failed: int
+    dead: int
+    retry_due: int
+    reclassifying: int
+
+
+class TopicSeries(BaseModel):
+    name: str
+    count: int
+    # Bookmarks in each of the timeline's buckets
+    counts: List[int]
+
+
+class Timeline(BaseModel):
+    interval: str
+    # First day of each day or week
+    buckets: List[date]
+    total: List[int]
+    topics: List[TopicSeries]
+
+
+class AuthorSeries(BaseModel):
+    author_handle: str
+    count: int
+    counts: List[int]
+
+
+class AuthorTimeline(BaseModel):
+    interval: str
+    buckets: List[date]
+    authors: List[AuthorSeries]
@@ -1,82 +1,634 @@
-from fastapi import FastAPI, Query
+import logging
+import re
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from fastapi import APIRouter, FastAPI, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 
-from src.infrastructure.database import get_db, SessionLocal
+from src.infrastructure import cache
+from src.infrastructure.accounts import UnknownAccount, ingest_partition, resolve_scope
+from src.infrastructure.database import get_data_version, SessionLocal
 from src.infrastructure.config import get_settings
+from src.infrastructure.events import publish, tweet_delta
+from src.infrastructure.api.responses import CompressionMiddleware, FastJSONResponse
+from src.infrastructure.api.schemas import (
+    AuthorTimeline,
+    BookmarkPage,
+    Stats,
+    Timeline,
+    TopicBookmarkPage,
+    TopicList,
+)
+from src.infrastructure.metrics import CONTENT_TYPE_LATEST, HTTP_REQUEST_DURATION, REGISTRY
+from src.adapters.ai.registry import classifier_configured
 from src.adapters.db.repository import SqlAlchemyRepository
-from src.adapters.db.models import TweetModel
-from src.use_cases.sync_bookmarks import sync_bookmarks
+from src.adapters.db.models import (
+    AuthorCountModel,
+    AuthorDayCountModel,
+    BookmarkModel,
+    ClassificationModel,
+    TopicDayCountModel,
+    TweetEdgeModel,
+    TweetModel,
+)
+from src.core.analytics import ALL_ACCOUNTS, ALL_TOPICS, buckets, series
+from src.core.topics import normalize_topic
+from src.use_cases.sync_bookmarks import (
+    recent_payloads,
+    sync_bookmark_batch,
+    sync_bookmarks,
+    tweet_fingerprint,
+)
 
-app = FastAPI(title="Birdbrain API")
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Read endpoints served from the response cache, keyed on the data version.
+# Stats also count retries coming due, so their entries roll over each minute.
+CACHED_ROUTES = [
+    (re.compile(r"^/api/bookmarks$"), "/api/bookmarks", None),
+    (re.compile(r"^/api/bookmarks/[^/]+/context$"), "/api/bookmarks/{rest_id}/context", None),
+    (
+        re.compile(r"^/api/bookmarks/[^/]+/duplicates$"),
+        "/api/bookmarks/{rest_id}/duplicates",
+        None,
+    ),
+    (re.compile(r"^/api/topics$"), "/api/topics", None),
+    (re.compile(r"^/api/topics/[^/]+/bookmarks$"), "/api/topics/{topic_name}/bookmarks", None),
+    (re.compile(r"^/api/stats$"), "/api/stats", 60),
+    (re.compile(r"^/api/analytics/timeline$"), "/api/analytics/timeline", None),
+    (re.compile(r"^/api/analytics/authors$"), "/api/analytics/authors", None),
+]
+# Longest series the analytics endpoints return (about 27 years of days)
+MAX_BUCKETS = 10000
+
+
+def _cached_route(request: Request):
+    """(route template, time bucket) if this request may use the cache."""
+    if request.method != "GET":
+        return None
+    for pattern, template, bucket in CACHED_ROUTES:
+        if pattern.match(request.url.path):
+            # Semantic ranking depends on the vector index, not just the tables.
+            if request.query_params.get("semantic", "").lower() in ("1", "true", "yes", "on"):
+                return None
+            return template, bucket
+    return None
+
+
+def create_app() -> FastAPI:
+    """Build the API application. Used by `serve` and `uvicorn --factory`."""
+    api = FastAPI(title="Birdbrain API")
+
+    api.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Lets the extension read ingest backpressure hints.
+        expose_headers=["Retry-After"],
+    )
+    api.include_router(router)
+
+    @api.exception_handler(UnknownAccount)
+    async def unknown_account(request: Request, exc: UnknownAccount):
+        return _error(str(exc))
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    settings = get_settings()
 
+    timing_header = settings.metrics_timing_header
+
+    @api.middleware("http")
+    async def serve_cached_reads(request: Request, call_next):
+        response_cache = cache.get_response_cache()
+        matched = _cached_route(request) if response_cache is not None else None
+        if matched is None:
+            return await call_next(request)
+        template, bucket = matched
+
+        try:
+            scope = resolve_scope(request.query_params.get("account"))
+        except UnknownAccount:
+            return await call_next(request)
+        db = scope.session()
+        try:
+            version = get_data_version(db)
+        finally:
+            db.close()
+        key = cache.cache_key(
+            request.url.path, request.query_params.multi_items(), version, bucket
+        )
+        etag = cache.etag_for(key)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if cache.etag_matches(request.headers.get("if-none-match"), etag):
+            cache.record("not_modified")
+            request.scope["cached_route"] = template
+            return Response(status_code=304, headers=headers)
+
+        body = response_cache.get(key)
+        if body is not None:
+            cache.record("hit")
+            request.scope["cached_route"] = template
+            return Response(
+                body, media_type="application/json", headers={**headers, "X-Cache": "HIT"}
+            )
 
-@app.post("/api/bookmarks/ingest")
-async def ingest_bookmarks(payload: Dict[str, Any]):
-    """Receives raw GraphQL response from the browser extension."""
-    db = next(get_db())
-    repo = SqlAlchemyRepository(db)
+        cache.record("miss")
+        response = await call_next(request)
+        # Errors carry error statuses; only results are cached.
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        response_cache.set(key, body)
+        response_headers = dict(response.headers)
+        response_headers.update(headers, **{"X-Cache": "MISS"})
+        return Response(body, status_code=200, headers=response_headers)
+
+    @api.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+
+        # Label by route template, not raw path, to keep cardinality bounded.
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            elapsed,
+            method=request.method,
+            route=getattr(route, "path", None) or request.scope.get("cached_route", "unmatched"),
+            status=str(response.status_code),
+        )
+        if timing_header:
+            response.headers["Server-Timing"] = f"app;dur={elapsed * 1000:.1f}"
+        return response
+
+    # Outermost, so cached bodies are stored uncompressed and encoded per client.
+    if settings.response_compression_min_bytes:
+        api.add_middleware(
+            CompressionMiddleware, minimum_size=settings.response_compression_min_bytes
+        )
+    return api
+
+
+@lru_cache
+def get_app() -> FastAPI:
+    """Returns a cached application instance."""
+    return create_app()
+
+
+def __getattr__(name: str):
+    # Keep `src.infrastructure.api.server:app` working without building the
+    # application as a side effect of importing this module.
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def _admitted_ingest(
+    ingest: Callable[[SqlAlchemyRepository], Dict[str, Any]],
+    user_id: Optional[str] = None,
+    handle: Optional[str] = None,
+):
+    """Run `ingest` in the thread pool under admission control, against the
+    database of the account with X `user_id` (see infrastructure.accounts).
+
+    Returns its result, or a 429/503 response with Retry-After when this
+    process is saturated. Classification and media downloads are queued
+    only if something was written and the Celery backlog has room."""
+    from starlette.concurrency import run_in_threadpool
+    from src.infrastructure.admission import (
+        get_admission_controller,
+        should_enqueue_classification,
+        should_enqueue_media,
+    )
+
+    admission = get_admission_controller()
+    rejection = admission.admit()
+    if rejection:
+        return FastJSONResponse(
+            rejection.to_response_body(),
+            status_code=rejection.status_code,
+            headers={"Retry-After": str(rejection.retry_after)},
+        )
 
-    processed_count = sync_bookmarks(payload, repo)
+    partition: Optional[str] = None
+
+    def write() -> Dict[str, Any]:
+        nonlocal partition
+        partition = ingest_partition(user_id, handle)
+        with admission.writer(partition):
+            db = SessionLocal(partition)
+            try:
+                return ingest(SqlAlchemyRepository(db))
+            finally:
+                db.close()
+
+    start = time.perf_counter()
+    try:
+        result = await run_in_threadpool(write)
+    finally:
+        admission.release(time.perf_counter() - start)
 
-    # Queue classification task via Celery
     settings = get_settings()
-    if settings.classification_enabled and settings.groq_api_key:
-        from src.infrastructure.tasks import classify_tweets_task
+    result["classification_queued"] = False
+    if result["written"] and settings.classification_enabled and classifier_configured(settings):
+        if should_enqueue_classification(settings.classification_queue_max):
+            from src.infrastructure.tasks import classify_tweets_task
 
-        classify_tweets_task.delay(settings.classification_batch_size)
+            result["classification_queued"] = _enqueue(
+                classify_tweets_task, settings.classification_batch_size, partition=partition
+            )
+    if result["written"] and settings.media_cache_enabled:
+        if should_enqueue_media(settings.classification_queue_max):
+            from src.infrastructure.tasks import cache_media_task
+
+            _enqueue(cache_media_task, partition=partition)
+    return result
 
-    return {"status": "success", "processed_count": processed_count}
 
+def _enqueue(task, *args, **kwargs) -> bool:
+    """Queue a follow-up task of a write that has already committed. A
+    broker failure is logged rather than raised, so the client isn't told
+    the write failed and doesn't retry it."""
+    try:
+        task.delay(*args, **kwargs)
+    except Exception as e:
+        logger.warning(f"Could not queue {task.name}: {e}")
+        return False
+    return True
 
-@app.get("/api/bookmarks")
+
+@router.post("/api/bookmarks/ingest")
+async def ingest_bookmarks(
+    payload: Dict[str, Any],
+    x_birdbrain_account: Optional[str] = Header(None),
+    x_birdbrain_handle: Optional[str] = Header(None),
+):
+    """Receives raw GraphQL response from the browser extension.
+
+    Re-posted pages are cheap: unchanged tweets are skipped, and nothing is
+    queued for classification unless something was written. The headers
+    name the signed-in X account (user id and handle)."""
+    settings = get_settings()
+    result = await _admitted_ingest(
+        lambda repo: sync_bookmarks(
+            payload,
+            repo,
+            duplicate_window_seconds=settings.ingest_duplicate_window_seconds,
+            user_id=x_birdbrain_account,
+            handle=x_birdbrain_handle,
+            near_duplicate_threshold=settings.near_duplicate_threshold,
+        ),
+        x_birdbrain_account,
+        x_birdbrain_handle,
+    )
+    if isinstance(result, Response):
+        return result
+    return {"status": "success", "processed_count": result["received"], **result}
+
+
+@router.post("/api/bookmarks/ingest/batch")
+async def ingest_bookmark_batch(
+    request: Request,
+    x_birdbrain_account: Optional[str] = Header(None),
+    x_birdbrain_handle: Optional[str] = Header(None),
+):
+    """Several captured bookmark pages as NDJSON, optionally compressed
+    (Content-Encoding gzip, deflate or zstd), written in one transaction."""
+    from src.infrastructure.api.ingest_codec import BatchDecodeError, decompress, parse_ndjson
+
+    settings = get_settings()
+    max_bytes = settings.ingest_batch_max_mb * 1024 * 1024
+    try:
+        data = decompress(
+            await request.body(), request.headers.get("content-encoding"), max_bytes
+        )
+        payloads = parse_ndjson(data)
+    except BatchDecodeError as e:
+        return _error(str(e), e.status_code)
+
+    result = await _admitted_ingest(
+        lambda repo: sync_bookmark_batch(
+            payloads,
+            repo,
+            duplicate_window_seconds=settings.ingest_duplicate_window_seconds,
+            user_id=x_birdbrain_account,
+            handle=x_birdbrain_handle,
+            near_duplicate_threshold=settings.near_duplicate_threshold,
+        ),
+        x_birdbrain_account,
+        x_birdbrain_handle,
+    )
+    if isinstance(result, Response):
+        return result
+    return {"status": "success", **result}
+
+
+@router.get("/api/accounts")
+async def list_accounts():
+    """Accounts bookmarks were imported for, with their bookmark counts."""
+    from src.infrastructure.accounts import account_summaries
+
+    return {
+        "accounts": [
+            {
+                **summary,
+                "last_synced_at": summary["last_synced_at"].isoformat()
+                if summary["last_synced_at"]
+                else None,
+            }
+            for summary in account_summaries()
+        ]
+    }
+
+
+@router.get("/api/events")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None),
+):
+    """Server-sent events carrying small deltas: new bookmarks, finished
+    classifications, hydrated and deleted tweets. `types` is an optional
+    comma-separated filter; reconnecting clients resume from Last-Event-ID."""
+    from fastapi.responses import StreamingResponse
+    from src.infrastructure.events import ensure_relay, event_stream, get_event_bus
+
+    ensure_relay()
+    sub = get_event_bus().subscribe(types.split(",") if types else None, last_event_id)
+    return StreamingResponse(
+        event_stream(sub, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _error(message: str, status_code: int = 404) -> FastJSONResponse:
+    """The error body every endpoint uses, with a real error status so
+    clients and the response cache can tell it from a result."""
+    return FastJSONResponse({"status": "error", "message": message}, status_code=status_code)
+
+
+def _model_response(model, content: Dict[str, Any]) -> FastJSONResponse:
+    """Render `content`, the body documented by `model`. With
+    VALIDATE_RESPONSES it is validated first and trimmed to the model's
+    fields, so a handler that drifts from its schema fails loudly."""
+    if get_settings().validate_responses:
+        content = model.model_validate(content).model_dump(mode="json", exclude_unset=True)
+    return FastJSONResponse(content)
+
+
+# Columns of a bookmark list item; selected as plain rows, not ORM objects.
+BOOKMARK_COLUMNS = [
+    TweetModel.id,
+    TweetModel.rest_id,
+    TweetModel.text,
+    TweetModel.author_handle,
+    TweetModel.author_name,
+    TweetModel.created_at,
+    TweetModel.topics,
+    TweetModel.summary,
+    TweetModel.classification_status,
+    TweetModel.media_urls,
+    TweetModel.quoted_status_id,
+]
+BOOKMARK_ITEM_KEYS = [column.key for column in BOOKMARK_COLUMNS]
+
+
+def _bookmark_items(
+    rows,
+    scores: Optional[Dict[str, float]] = None,
+    duplicate_counts: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """List items from BOOKMARK_COLUMNS rows; datetimes are left to the renderer.
+
+    `media_keys` parallels `media_urls`: the /api/media paths of local copies.
+    `duplicate_count` is how many near-duplicates a collapsed list hides
+    behind the item."""
+    from src.infrastructure.media.store import media_key
+
+    items = []
+    for row in rows:
+        item = _bookmark_item(row._asdict(), media_key)
+        item["duplicate_count"] = (duplicate_counts or {}).get(item["rest_id"], 0)
+        if scores:
+            item["score"] = round(scores[item["rest_id"]], 4)
+        items.append(item)
+    return items
+
+
+def _bookmark_item(item: Dict[str, Any], media_key: Callable[[str], str]) -> Dict[str, Any]:
+    item["topics"] = item["topics"] or []
+    item["media_urls"] = item["media_urls"] or []
+    item["media_keys"] = [media_key(url) for url in item["media_urls"]]
+    return item
+
+
+def bookmarks_query(
+    db,
+    q: Optional[str] = None,
+    topic: Optional[str] = None,
+    status: Optional[str] = None,
+    rest_ids: Optional[List[str]] = None,
+    account_id: Optional[int] = None,
+    collapse: bool = False,
+):
+    """The /api/bookmarks query, newest first. `doctor` explains it too.
+
+    With `account_id`, only that account's bookmarks, in the order of
+    ix_bookmarks_account_created. With `collapse`, near-duplicates are left
+    out when their representative is listed too; for an account, that means
+    when the account bookmarked the representative."""
+    from sqlalchemy import exists, or_
+    from sqlalchemy.orm import aliased
+
+    query = db.query(TweetModel)
+    if account_id is not None:
+        query = (
+            query.join(BookmarkModel, BookmarkModel.rest_id == TweetModel.rest_id)
+            .filter(BookmarkModel.account_id == account_id)
+            .order_by(BookmarkModel.created_at.desc())
+        )
+    else:
+        query = query.order_by(TweetModel.created_at.desc())
+
+    if rest_ids is not None:
+        query = query.filter(TweetModel.rest_id.in_(rest_ids))
+    elif q:
+        search_term = f"%{q}%"
+        query = query.filter(
+            or_(
+                TweetModel.text.ilike(search_term),
+                TweetModel.author_handle.ilike(search_term),
+                TweetModel.author_name.ilike(search_term),
+                TweetModel.summary.ilike(search_term),
+            )
+        )
+
+    if topic:
+        query = query.filter(_topic_filter(db, topic))
+
+    if status:
+        query = query.filter(TweetModel.classification_status == status)
+
+    if collapse:
+        if account_id is None:
+            query = query.filter(TweetModel.duplicate_of.is_(None))
+        else:
+            representative = aliased(BookmarkModel)
+            query = query.filter(
+                or_(
+                    TweetModel.duplicate_of.is_(None),
+                    ~exists().where(
+                        representative.account_id == account_id,
+                        representative.rest_id == TweetModel.duplicate_of,
+                    ),
+                )
+            )
+
+    return query
+
+
+def duplicate_counts_query(db, rest_ids: List[str], account_id: Optional[int] = None):
+    """Near-duplicates per representative among `rest_ids` (the account's,
+    with `account_id`)."""
+    from sqlalchemy import exists, func
+
+    query = db.query(TweetModel.duplicate_of, func.count(TweetModel.id)).filter(
+        TweetModel.duplicate_of.in_(rest_ids)
+    )
+    if account_id is not None:
+        # EXISTS rather than a join, so the plan starts from the page's ids
+        query = query.filter(
+            exists().where(
+                BookmarkModel.account_id == account_id,
+                BookmarkModel.rest_id == TweetModel.rest_id,
+            )
+        )
+    return query.group_by(TweetModel.duplicate_of)
+
+
+def duplicate_counts(db, rows, account_id: Optional[int] = None) -> Dict[str, int]:
+    """rest_id -> near-duplicates folded into it, for a collapsed page."""
+    if not rows:
+        return {}
+    return dict(duplicate_counts_query(db, [row.rest_id for row in rows], account_id).all())
+
+
+@router.get("/api/bookmarks", responses={200: {"model": BookmarkPage}})
 async def get_bookmarks(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
     topic: Optional[str] = None,
     status: Optional[str] = None,
     q: Optional[str] = Query(None, description="Search query for text, author, or summary"),
+    semantic: bool = Query(False, description="Rank `q` matches by embedding similarity"),
+    account: Optional[str] = Query(None, description="Account username or X user id"),
+    collapse: bool = Query(True, description="Fold near-duplicates into their representative"),
 ):
     """Fetch bookmarks with optional filtering and search."""
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    scores: Dict[str, float] = {}
+    if q and semantic:
+        if not get_settings().embeddings_enabled:
+            return _error(EMBEDDINGS_DISABLED, 503)
+        scores = await _semantic_candidates(q, SEMANTIC_CANDIDATES_PER_PAGE * (offset + limit))
+
+    db = scope.session()
     try:
-        from sqlalchemy import or_
-
-        query = db.query(TweetModel).order_by(TweetModel.created_at.desc())
+        query = bookmarks_query(
+            db,
+            q=None if semantic else q,
+            topic=topic,
+            status=status,
+            rest_ids=list(scores) if q and semantic else None,
+            account_id=scope.account_id,
+            collapse=collapse,
+        )
 
-        if q:
-            search_term = f"%{q}%"
-            query = query.filter(
-                or_(
-                    TweetModel.text.ilike(search_term),
-                    TweetModel.author_handle.ilike(search_term),
-                    TweetModel.author_name.ilike(search_term),
-                    TweetModel.summary.ilike(search_term),
-                )
+        if q and semantic:
+            # The candidate set is bounded, so rank it in Python.
+            matches = sorted(
+                query.with_entities(*BOOKMARK_COLUMNS).all(),
+                key=lambda row: scores[row.rest_id],
+                reverse=True,
             )
+            total = len(matches)
+            rows = matches[offset:offset + limit]
+        else:
+            total = query.count()
+            rows = query.with_entities(*BOOKMARK_COLUMNS).offset(offset).limit(limit).all()
+
+        counts = duplicate_counts(db, rows, scope.account_id) if collapse else {}
+        return _model_response(BookmarkPage, {
+            "bookmarks": _bookmark_items(rows, scores, counts),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        })
+    finally:
+        db.close()
 
-        if topic:
-            # SQLite JSON compatibility - use LIKE for JSON array search
-            query = query.filter(TweetModel.topics.like(f'%"{topic}"%'))
 
-        if status:
-            query = query.filter(TweetModel.classification_status == status)
+# Over-fetch from the vector index so topic/status filters still fill a page.
+SEMANTIC_CANDIDATES_PER_PAGE = 4
+MAX_SEMANTIC_CANDIDATES = 2000
 
-        total = query.count()
-        tweets = query.offset(offset).limit(limit).all()
 
+EMBEDDINGS_DISABLED = "Semantic search requires EMBEDDINGS_ENABLED=true"
+
+
+async def _semantic_candidates(q: str, k: int) -> Dict[str, float]:
+    """rest_id -> cosine similarity for the `k` nearest tweets to `q`."""
+    from src.adapters.embeddings.factory import get_embedder, get_vector_index
+
+    vector = (await get_embedder().embed([q]))[0]
+    hits = get_vector_index().search(vector, k=min(k, MAX_SEMANTIC_CANDIDATES))
+    return dict(hits)
+
+
+@router.get("/api/bookmarks/{rest_id}/related")
+async def get_related_bookmarks(
+    rest_id: str, limit: int = Query(10, ge=1, le=100), account: Optional[str] = None
+):
+    """Bookmarks closest to `rest_id` in the embedding index.
+
+    The index holds every account's tweets, so it is over-fetched like
+    semantic search and the neighbours are then narrowed to the scope.
+    """
+    scope = resolve_scope(account)
+    if not get_settings().embeddings_enabled:
+        return _error(EMBEDDINGS_DISABLED, 503)
+    from src.adapters.embeddings.factory import get_vector_index
+
+    db = scope.session()
+    try:
+        seed = bookmarks_query(db, rest_ids=[rest_id], account_id=scope.account_id)
+        if seed.order_by(None).first() is None:
+            return _error("Bookmark not found")
+        index = get_vector_index()
+        vector = index.vector_for(rest_id)
+        if vector is None:
+            return _error("Bookmark is not in the vector index")
+        k = min(SEMANTIC_CANDIDATES_PER_PAGE * limit, MAX_SEMANTIC_CANDIDATES)
+        scores = dict(index.search(vector, k=k, exclude=[rest_id]))
+
+        tweets = (
+            bookmarks_query(db, rest_ids=list(scores), account_id=scope.account_id)
+            .order_by(None)
+            .all()
+        )
+        tweets.sort(key=lambda t: scores[t.rest_id], reverse=True)
+        tweets = tweets[:limit]
         return {
-            "bookmarks": [
+            "rest_id": rest_id,
+            "related": [
                 {
-                    "id": t.id,
                     "rest_id": t.rest_id,
                     "text": t.text,
                     "author_handle": t.author_handle,
@@ -84,49 +636,241 @@ async def get_bookmarks(
                     "created_at": t.created_at.isoformat() if t.created_at else None,
                     "topics": t.topics or [],
                     "summary": t.summary,
-                    "classification_status": t.classification_status,
-                    "media_urls": t.media_blobs,
-                    "quoted_status_id": t.quoted_status_id,
+                    "score": round(scores[t.rest_id], 4),
                 }
                 for t in tweets
             ],
-            "total": total,
-            "limit": limit,
-            "offset": offset,
         }
     finally:
         db.close()
 
 
-@app.get("/api/topics")
-async def get_topics():
+# Edges followed down from a tweet: its replies and the tweets quoting it
+CONTEXT_DOWN_KINDS = ("quote", "reply")
+
+
+def context_query(db, rest_id: str, depth: int = 10, account_id: Optional[int] = None):
+    """The /api/bookmarks/{id}/context query. `doctor` explains it too.
+
+    Two recursive CTEs walk tweet_edges from `rest_id`: up through what it
+    quotes, replies to or retweets (depth 1, 2, ...), and down through its
+    replies and quotes (depth -1, -2, ...). Each row is one tweet reached,
+    with its BOOKMARK_COLUMNS (NULL when it isn't stored) and one of its own
+    edges. With `account_id`, `bookmarked` tells whether that account has it.
+    """
+    from sqlalchemy import String, and_, cast, literal, select, union
+
+    edges = TweetEdgeModel.__table__
+    # varchar like the edge ids: PostgreSQL rejects a recursive CTE whose
+    # columns change type between the seed and the recursive term
+    seed = cast(literal(rest_id), String)
+    up = select(seed.label("node_id"), literal(0).label("depth")).cte(
+        "up", recursive=True
+    )
+    up = up.union(
+        select(edges.c.target_id, up.c.depth + 1).where(
+            edges.c.source_id == up.c.node_id, up.c.depth < depth
+        )
+    )
+    down = (
+        select(edges.c.source_id.label("node_id"), literal(-1).label("depth"))
+        .where(edges.c.target_id == rest_id, edges.c.kind.in_(CONTEXT_DOWN_KINDS))
+        .cte("down", recursive=True)
+    )
+    down = down.union(
+        select(edges.c.source_id, down.c.depth - 1).where(
+            edges.c.target_id == down.c.node_id,
+            edges.c.kind.in_(CONTEXT_DOWN_KINDS),
+            down.c.depth > -depth,
+        )
+    )
+    nodes = union(select(up.c.node_id, up.c.depth), select(down.c.node_id, down.c.depth)).subquery(
+        "nodes"
+    )
+
+    own_edges = edges.alias("own_edges")
+    joined = nodes.outerjoin(TweetModel, TweetModel.rest_id == nodes.c.node_id).outerjoin(
+        own_edges, own_edges.c.source_id == nodes.c.node_id
+    )
+    columns = [
+        nodes.c.node_id,
+        nodes.c.depth,
+        own_edges.c.kind.label("edge_kind"),
+        own_edges.c.target_id.label("edge_target"),
+        *BOOKMARK_COLUMNS,
+    ]
+    if account_id is not None:
+        joined = joined.outerjoin(
+            BookmarkModel,
+            and_(BookmarkModel.rest_id == nodes.c.node_id, BookmarkModel.account_id == account_id),
+        )
+        columns.append(BookmarkModel.account_id.label("bookmarked"))
+    return select(*columns).select_from(joined).order_by(nodes.c.depth.desc(), TweetModel.created_at)
+
+
+# Keys of a context node's own edges, by edge kind
+CONTEXT_EDGE_KEYS = {
+    "quote": "quoted_status_id",
+    "reply": "in_reply_to_status_id",
+    "retweet": "retweeted_status_id",
+}
+
+
+@router.get("/api/bookmarks/{rest_id}/context")
+async def get_bookmark_context(
+    rest_id: str, depth: int = Query(10, ge=1, le=50), account: Optional[str] = None
+):
+    """A bookmark's quote chain, the thread above it and the stored replies
+    and quotes below it, from one query over tweet_edges.
+
+    Tweets come from the top of the chain down. Each carries its `depth`
+    (negative below the bookmark) and the ids it quotes, replies to or
+    retweets. Tweets that aren't stored have `stored: false` and only those
+    fields.
+    """
+    scope = resolve_scope(account)
+    db = scope.session()
+    try:
+        rows = db.execute(context_query(db, rest_id, depth, scope.account_id)).all()
+    finally:
+        db.close()
+
+    from src.infrastructure.media.store import media_key
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        fields = row._asdict()
+        node = nodes.get(row.node_id)
+        if node is None:
+            stored = fields["id"] is not None
+            node = {key: fields[key] for key in BOOKMARK_ITEM_KEYS} if stored else {}
+            if stored:
+                _bookmark_item(node, media_key)
+            node.update(
+                rest_id=row.node_id,
+                depth=row.depth,
+                stored=stored,
+                bookmarked=fields.get("bookmarked") is not None,
+                **{key: None for key in CONTEXT_EDGE_KEYS.values()},
+            )
+            nodes[row.node_id] = node
+        # Reached along two paths: keep the shorter one
+        if abs(row.depth) < abs(node["depth"]):
+            node["depth"] = row.depth
+        if row.edge_kind:
+            node[CONTEXT_EDGE_KEYS[row.edge_kind]] = row.edge_target
+
+    root = nodes.get(rest_id)
+    if root is None or not (root["stored"] or len(nodes) > 1):
+        return _error("Bookmark not found")
+    if scope.account_id is not None:
+        if not root["bookmarked"]:
+            return _error("Bookmark not found")
+        # Replies and quotes only show when this account bookmarked them
+        nodes = {k: n for k, n in nodes.items() if n["depth"] >= 0 or n["bookmarked"]}
+    else:
+        for node in nodes.values():
+            del node["bookmarked"]
+
+    tweets = sorted(nodes.values(), key=lambda node: -node["depth"])
+    return FastJSONResponse({"rest_id": rest_id, "tweets": tweets})
+
+
+def duplicates_query(db, representative: str, account_id: Optional[int] = None):
+    """A near-duplicate cluster: the representative and every tweet
+    grouped with it (the account's bookmarks among them), oldest first."""
+    from sqlalchemy import or_
+
+    query = db.query(TweetModel).filter(
+        or_(TweetModel.rest_id == representative, TweetModel.duplicate_of == representative)
+    )
+    if account_id is not None:
+        query = query.join(BookmarkModel, BookmarkModel.rest_id == TweetModel.rest_id).filter(
+            BookmarkModel.account_id == account_id
+        )
+    return query.order_by(TweetModel.created_at, TweetModel.id)
+
+
+@router.get("/api/bookmarks/{rest_id}/duplicates")
+async def get_bookmark_duplicates(rest_id: str, account: Optional[str] = None):
+    """The bookmarks grouped with `rest_id` as near-duplicates, oldest
+    first, excluding `rest_id` itself. `representative` is the one whose
+    classification the others share."""
+    scope = resolve_scope(account)
+    db = scope.session()
+    try:
+        tweet = db.query(TweetModel.duplicate_of).filter(TweetModel.rest_id == rest_id).first()
+        if tweet is None:
+            return _error("Bookmark not found")
+        representative = tweet.duplicate_of or rest_id
+        rows = (
+            duplicates_query(db, representative, scope.account_id)
+            .with_entities(*BOOKMARK_COLUMNS)
+            .all()
+        )
+        if scope.account_id is not None and rest_id not in {row.rest_id for row in rows}:
+            return _error("Bookmark not found")
+
+        return FastJSONResponse({
+            "rest_id": rest_id,
+            "representative": representative,
+            "bookmarks": _bookmark_items([row for row in rows if row.rest_id != rest_id]),
+        })
+    finally:
+        db.close()
+
+
+def _alias_map(repo: SqlAlchemyRepository) -> Dict[str, str]:
+    return {a.alias: a.canonical for a in repo.get_topic_aliases()}
+
+
+def _topic_filter(db, topic: str):
+    """Match `topic`, its canonical form and every approved alias of it."""
+    repo = SqlAlchemyRepository(db)
+    aliases = _alias_map(repo)
+    canonical = aliases.get(topic, topic)
+    names = {canonical} | {a for a, c in aliases.items() if c == canonical}
+    return repo.topic_filter(list(names))
+
+
+@router.get("/api/topics", responses={200: {"model": TopicList}})
+async def get_topics(account: Optional[str] = None):
     """Get all unique topics with counts."""
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
-        tweets = db.query(TweetModel).filter(TweetModel.topics.isnot(None)).all()
+        repo = SqlAlchemyRepository(db)
+        aliases = _alias_map(repo)
         topic_counts: Dict[str, int] = {}
-        for tweet in tweets:
-            if tweet.topics:
-                for topic in tweet.topics:
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
+        for topic, count in repo.get_topic_counts(scope.account_id).items():
+            # Fold aliases that haven't been rewritten in stored tweets yet.
+            topic = aliases.get(topic, topic)
+            topic_counts[topic] = topic_counts.get(topic, 0) + count
 
         sorted_topics = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)
-        return {"topics": [{"name": t, "count": c} for t, c in sorted_topics]}
+        return _model_response(
+            TopicList, {"topics": [{"name": t, "count": c} for t, c in sorted_topics]}
+        )
     finally:
         db.close()
 
 
-@app.post("/api/topics/generate-summaries")
-async def generate_all_topic_summaries():
+@router.post("/api/topics/generate-summaries")
+async def generate_all_topic_summaries(account: Optional[str] = None):
     """Generate summaries for all topics."""
     settings = get_settings()
     if not settings.groq_api_key:
-        return {"status": "error", "message": "Classifier not configured"}
+        return _error("Classifier not configured", 503)
 
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         # Get all topics
-        tweets = db.query(TweetModel).filter(TweetModel.topics.isnot(None)).all()
+        tweets = (
+            bookmarks_query(db, account_id=scope.account_id)
+            .filter(TweetModel.topics.isnot(None))
+            .all()
+        )
         topic_names: set = set()
         for tweet in tweets:
             if tweet.topics:
@@ -138,18 +882,18 @@ async def generate_all_topic_summaries():
         db.close()
 
 
-@app.get("/api/topics/{topic_name}/summary")
-async def get_topic_summary(topic_name: str):
+@router.get("/api/topics/{topic_name}/summary")
+async def get_topic_summary(topic_name: str, account: Optional[str] = None):
     """Generate a summary for a topic based on its bookmarks."""
     settings = get_settings()
     if not settings.groq_api_key:
         return {"topic": topic_name, "summary": None, "error": "Classifier not configured"}
 
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         tweets = (
-            db.query(TweetModel)
-            .filter(TweetModel.topics.like(f'%"{topic_name}"%'))
+            bookmarks_query(db, topic=topic_name, account_id=scope.account_id, collapse=True)
             .limit(10)
             .all()
         )
@@ -197,172 +941,529 @@ Summary:"""
         db.close()
 
 
-@app.get("/api/stats")
-async def get_stats():
+@router.get("/api/stats", responses={200: {"model": Stats}})
+async def get_stats(account: Optional[str] = None):
     """Get classification statistics."""
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         from sqlalchemy import func
 
-        total = db.query(func.count(TweetModel.id)).scalar()
-        pending = (
-            db.query(func.count(TweetModel.id))
-            .filter(TweetModel.classification_status == "pending")
-            .scalar()
-        )
-        completed = (
-            db.query(func.count(TweetModel.id))
-            .filter(TweetModel.classification_status == "completed")
-            .scalar()
-        )
-        failed = (
-            db.query(func.count(TweetModel.id))
-            .filter(TweetModel.classification_status == "failed")
-            .scalar()
-        )
+        repo = SqlAlchemyRepository(db)
 
-        return {
+        def count(*criteria) -> int:
+            query = db.query(func.count(TweetModel.id)).filter(*criteria)
+            if scope.account_id is not None:
+                query = query.filter(repo.bookmarked_by(scope.account_id))
+            return query.scalar()
+
+        status = TweetModel.classification_status
+        total = count()
+        pending = count(status == "pending")
+        completed = count(status == "completed")
+        failed = count(status == "failed")
+        dead = count(status == "dead")
+        retry_due = count(status == "failed", TweetModel.next_attempt_at <= datetime.utcnow())
+        reclassifying = count(TweetModel.reclassify_job_id.isnot(None))
+
+        return _model_response(Stats, {
             "total": total,
             "pending": pending,
             "completed": completed,
             "failed": failed,
+            "dead": dead,
+            "retry_due": retry_due,
+            "reclassifying": reclassifying,
+        })
+    finally:
+        db.close()
+
+
+def _day_range(query, model, since: Optional[date], until: Optional[date]):
+    if since is not None:
+        query = query.filter(model.day >= since)
+    if until is not None:
+        query = query.filter(model.day <= until)
+    return query
+
+
+def top_topics_query(
+    db, account_id: int, since: Optional[date] = None, until: Optional[date] = None
+):
+    """(topic, bookmarks) between `since` and `until`, most first."""
+    from sqlalchemy import func
+
+    total = func.sum(TopicDayCountModel.count)
+    query = db.query(TopicDayCountModel.topic, total).filter(
+        TopicDayCountModel.account_id == account_id, TopicDayCountModel.topic != ALL_TOPICS
+    )
+    query = _day_range(query, TopicDayCountModel, since, until)
+    return query.group_by(TopicDayCountModel.topic).order_by(total.desc())
+
+
+def topic_days_query(
+    db,
+    account_id: int,
+    topics: List[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+):
+    """(topic, day, bookmarks) rollup rows of `topics`."""
+    query = db.query(
+        TopicDayCountModel.topic, TopicDayCountModel.day, TopicDayCountModel.count
+    ).filter(TopicDayCountModel.account_id == account_id, TopicDayCountModel.topic.in_(topics))
+    return _day_range(query, TopicDayCountModel, since, until)
+
+
+def top_authors_query(
+    db, account_id: int, since: Optional[date] = None, until: Optional[date] = None
+):
+    """(author_handle, bookmarks) between `since` and `until`, most first.
+    Without either, read in index order from the authors' totals."""
+    from sqlalchemy import func
+
+    if since is None and until is None:
+        return (
+            db.query(AuthorCountModel.author_handle, AuthorCountModel.count)
+            .filter(AuthorCountModel.account_id == account_id)
+            .order_by(AuthorCountModel.count.desc())
+        )
+    total = func.sum(AuthorDayCountModel.count)
+    query = db.query(AuthorDayCountModel.author_handle, total).filter(
+        AuthorDayCountModel.account_id == account_id
+    )
+    query = _day_range(query, AuthorDayCountModel, since, until)
+    return query.group_by(AuthorDayCountModel.author_handle).order_by(
+        total.desc(), AuthorDayCountModel.author_handle
+    )
+
+
+def author_days_query(
+    db,
+    account_id: int,
+    handles: List[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+):
+    """(author_handle, day, bookmarks) rollup rows of `handles`."""
+    query = db.query(
+        AuthorDayCountModel.author_handle, AuthorDayCountModel.day, AuthorDayCountModel.count
+    ).filter(
+        AuthorDayCountModel.account_id == account_id,
+        AuthorDayCountModel.author_handle.in_(handles),
+    )
+    return _day_range(query, AuthorDayCountModel, since, until)
+
+
+def _bucket_starts(
+    rows: List[tuple], since: Optional[date], until: Optional[date], interval: str
+) -> Optional[List[date]]:
+    """Buckets from `since` (or the first row) to `until` (or the last row);
+    None when there would be more than MAX_BUCKETS."""
+    days = [day for _, day, _ in rows]
+    first = since or (min(days) if days else None)
+    last = until or (max(days) if days else None)
+    if first is None or last is None or first > last:
+        return []
+    if (last - first).days // (7 if interval == "week" else 1) >= MAX_BUCKETS:
+        return None
+    return buckets(first, last, interval)
+
+
+@router.get("/api/analytics/timeline", responses={200: {"model": Timeline}})
+async def get_timeline(
+    interval: str = Query("day", pattern="^(day|week)$"),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    topics: Optional[str] = Query(None, description="Comma-separated; default the most frequent"),
+    limit: int = Query(10, ge=0, le=100, description="Topics charted when none are named"),
+    account: Optional[str] = None,
+):
+    """Bookmarks per day or week, in total and per topic, from the analytics
+    rollups. Days are when the tweets were posted."""
+    scope = resolve_scope(account)
+    db = scope.session()
+    try:
+        account_id = ALL_ACCOUNTS if scope.account_id is None else scope.account_id
+        aliases = _alias_map(SqlAlchemyRepository(db))
+        if topics:
+            named = (normalize_topic(name) for name in topics.split(","))
+            names = list(dict.fromkeys(aliases.get(name, name) for name in named if name))
+        else:
+            # Aliases not rewritten in stored tweets yet count for their canonical topic
+            totals: Dict[str, int] = {}
+            for topic, count in top_topics_query(db, account_id, since, until):
+                topic = aliases.get(topic, topic)
+                totals[topic] = totals.get(topic, 0) + count
+            names = sorted(totals, key=lambda name: (-totals[name], name))[:limit]
+        stored = {ALL_TOPICS, *names} | {a for a, c in aliases.items() if c in names}
+        rows = [
+            (aliases.get(topic, topic), day, count)
+            for topic, day, count in topic_days_query(db, account_id, list(stored), since, until)
+        ]
+        starts = _bucket_starts(rows, since, until, interval)
+        if starts is None:
+            return _error("Too many buckets", 400)
+        counts = series(rows, starts, interval)
+        empty = [0] * len(starts)
+        return _model_response(Timeline, {
+            "interval": interval,
+            "buckets": [start.isoformat() for start in starts],
+            "total": counts.get(ALL_TOPICS, empty),
+            "topics": [
+                {
+                    "name": name,
+                    "count": sum(counts.get(name, empty)),
+                    "counts": counts.get(name, empty),
+                }
+                for name in names
+            ],
+        })
+    finally:
+        db.close()
+
+
+@router.get("/api/analytics/authors", responses={200: {"model": AuthorTimeline}})
+async def get_author_timeline(
+    interval: str = Query("day", pattern="^(day|week)$"),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=100),
+    account: Optional[str] = None,
+):
+    """The most bookmarked authors, with their bookmarks per day or week,
+    from the analytics rollups."""
+    scope = resolve_scope(account)
+    db = scope.session()
+    try:
+        account_id = ALL_ACCOUNTS if scope.account_id is None else scope.account_id
+        top = top_authors_query(db, account_id, since, until).limit(limit).all()
+        handles = [handle for handle, _ in top]
+        rows = author_days_query(db, account_id, handles, since, until).all() if handles else []
+        starts = _bucket_starts(rows, since, until, interval)
+        if starts is None:
+            return _error("Too many buckets", 400)
+        counts = series(rows, starts, interval)
+        empty = [0] * len(starts)
+        return _model_response(AuthorTimeline, {
+            "interval": interval,
+            "buckets": [start.isoformat() for start in starts],
+            "authors": [
+                {"author_handle": handle, "count": count, "counts": counts.get(handle, empty)}
+                for handle, count in top
+            ],
+        })
+    finally:
+        db.close()
+
+
+@router.get("/api/usage")
+async def get_token_usage(
+    group_by: str = Query("day", pattern="^(day|model|run)$"), account: Optional[str] = None
+):
+    """Classification token usage grouped by day, model or run."""
+    from datetime import datetime
+
+    from src.use_cases.classification_scheduler import start_of_day
+
+    db = resolve_scope(account).session()
+    try:
+        repo = SqlAlchemyRepository(db)
+        settings = get_settings()
+        return {
+            "group_by": group_by,
+            "usage": repo.get_token_usage_summary(group_by=group_by),
+            "today_tokens": repo.get_tokens_used_since(start_of_day(datetime.utcnow())),
+            "daily_token_budget": settings.classification_daily_token_budget,
         }
     finally:
         db.close()
 
 
-@app.post("/api/tweets/classify")
-async def trigger_classification(batch_size: int = 20):
+@router.post("/api/tweets/classify")
+async def trigger_classification(batch_size: int = 20, account: Optional[str] = None):
     """Manually trigger classification of pending tweets via Celery."""
     settings = get_settings()
 
-    if not settings.groq_api_key:
-        return {"status": "error", "message": "Classifier not configured. Set GROQ_API_KEY."}
+    if not classifier_configured(settings):
+        return _error("Classifier not configured. Set GROQ_API_KEY.", 503)
 
     from src.infrastructure.tasks import classify_tweets_task
 
-    task = classify_tweets_task.delay(batch_size)
+    task = classify_tweets_task.delay(batch_size, partition=resolve_scope(account).partition)
     return {"status": "queued", "task_id": task.id}
 
 
-@app.post("/api/bookmarks/{rest_id}/reclassify")
-async def reclassify_bookmark(rest_id: str):
-    """Reset a bookmark to pending and queue for reclassification."""
-    db = SessionLocal()
+@router.post("/api/bookmarks/{rest_id}/reclassify")
+async def reclassify_bookmark(rest_id: str, account: Optional[str] = None):
+    """Queue a bookmark for reclassification.
+
+    Its current topics stay until the new classification replaces them.
+    """
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         tweet = db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if not tweet:
-            return {"status": "error", "message": "Bookmark not found"}
-
-        tweet.classification_status = "pending"
-        tweet.topics = None
-        tweet.summary = None
-        tweet.classified_at = None
+            return _error("Bookmark not found")
+
+        # A near-duplicate takes its representative's result, so the
+        # representative is the one classified again
+        targets = [tweet]
+        if tweet.duplicate_of:
+            targets += db.query(TweetModel).filter(TweetModel.rest_id == tweet.duplicate_of).all()
+        for target in targets:
+            target.classification_status = "pending"
+            target.classification_retry_count = 0
+            target.next_attempt_at = None
+            target.last_error_type = None
         db.commit()
 
         settings = get_settings()
-        if settings.groq_api_key:
+        if classifier_configured(settings):
             from src.infrastructure.tasks import classify_tweets_task
-            classify_tweets_task.delay(1)
+            classify_tweets_task.delay(1, partition=scope.partition)
 
         return {"status": "queued", "rest_id": rest_id}
     finally:
         db.close()
 
 
-@app.post("/api/bookmarks/reclassify-all")
-async def reclassify_all_bookmarks(status: Optional[str] = None):
-    """Reset all bookmarks (or by status) to pending and queue for reclassification."""
-    db = SessionLocal()
+@router.post("/api/bookmarks/reclassify-all")
+async def reclassify_all_bookmarks(status: Optional[str] = None, account: Optional[str] = None):
+    """Start a background job reclassifying all bookmarks (or those with `status`).
+
+    Current topics stay visible until each tweet's new classification lands;
+    poll /api/reclassify-jobs/{job_id} for progress. `queued` is false when
+    the job's task couldn't be queued; the job is saved all the same and
+    resumes like any stalled one.
+    """
+    from src.use_cases.reclassify_all import start_reclassify_job
+
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
-        query = db.query(TweetModel)
-        if status:
-            query = query.filter(TweetModel.classification_status == status)
-
-        count = query.update({
-            "classification_status": "pending",
-            "topics": None,
-            "summary": None,
-            "classified_at": None,
-        })
-        db.commit()
+        job = start_reclassify_job(SqlAlchemyRepository(db), status)
+        queued = False
+        if classifier_configured(get_settings()) and job.total > 0:
+            from src.infrastructure.tasks import reclassify_job_task
+            queued = _enqueue(reclassify_job_task, job.id, partition=scope.partition)
+
+        return {"status": "queued", "count": job.total, "job_id": job.id, "queued": queued}
+    finally:
+        db.close()
+
+
+@router.get("/api/reclassify-jobs")
+async def list_reclassify_jobs(
+    limit: int = Query(10, ge=1, le=100), account: Optional[str] = None
+):
+    """Recent reclassify-all jobs with their progress."""
+    from src.use_cases.reclassify_all import reclassify_progress
+
+    db = resolve_scope(account).session()
+    try:
+        repo = SqlAlchemyRepository(db)
+        jobs = repo.get_reclassify_jobs(limit=limit)
+        return {"jobs": [reclassify_progress(repo, job) for job in jobs]}
+    finally:
+        db.close()
+
+
+@router.get("/api/reclassify-jobs/{job_id}")
+async def get_reclassify_job(job_id: int, account: Optional[str] = None):
+    """Progress of one reclassify-all job."""
+    from src.use_cases.reclassify_all import reclassify_progress, refresh_reclassify_job
+
+    db = resolve_scope(account).session()
+    try:
+        repo = SqlAlchemyRepository(db)
+        job = refresh_reclassify_job(repo, job_id)
+        if not job:
+            return _error("Job not found")
+        return reclassify_progress(repo, job)
+    finally:
+        db.close()
 
-        settings = get_settings()
-        if settings.groq_api_key and count > 0:
-            from src.infrastructure.tasks import classify_tweets_task
-            classify_tweets_task.delay(settings.classification_batch_size)
 
-        return {"status": "queued", "count": count}
+@router.post("/api/reclassify-jobs/{job_id}/resume")
+async def resume_reclassify_job(job_id: int, account: Optional[str] = None):
+    """Re-queue an interrupted job; marking continues from its saved cursor."""
+    scope = resolve_scope(account)
+    db = scope.session()
+    try:
+        job = SqlAlchemyRepository(db).get_reclassify_job(job_id)
+        if not job:
+            return _error("Job not found")
+        if job.status not in ("marking", "classifying"):
+            return _error(f"Job is {job.status}", 409)
+        if not classifier_configured(get_settings()):
+            return _error("No classifier backend configured", 503)
+
+        from src.infrastructure.tasks import reclassify_job_task
+        queued = _enqueue(reclassify_job_task, job.id, partition=scope.partition)
+        return {"status": "queued", "job_id": job.id, "queued": queued}
     finally:
         db.close()
 
 
-@app.delete("/api/bookmarks/{rest_id}")
-async def delete_bookmark(rest_id: str):
-    """Delete a bookmark."""
-    db = SessionLocal()
+@router.delete("/api/bookmarks/{rest_id}")
+async def delete_bookmark(rest_id: str, account: Optional[str] = None):
+    """Delete a bookmark.
+
+    With `account` in the main database, only that account's bookmark goes;
+    the tweet itself is deleted once no account has it bookmarked."""
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         tweet = db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if not tweet:
-            return {"status": "error", "message": "Bookmark not found"}
-
-        db.delete(tweet)
+            return _error("Bookmark not found")
+
+        repo = SqlAlchemyRepository(db)
+        bookmarks = db.query(BookmarkModel).filter(BookmarkModel.rest_id == rest_id)
+        with repo.track_analytics([rest_id]):
+            if scope.account_id is not None:
+                removed = bookmarks.filter(BookmarkModel.account_id == scope.account_id).delete(
+                    synchronize_session=False
+                )
+                if not removed:
+                    return _error("Bookmark not found")
+            # Other accounts keep the tweet
+            shared = scope.account_id is not None and bookmarks.count() > 0
+            if not shared:
+                bookmarks.delete(synchronize_session=False)
+                repo.release_near_duplicates(rest_id)
+                tweet.active_classification_id = None
+                db.flush()
+                db.query(ClassificationModel).filter(
+                    ClassificationModel.tweet_rest_id == rest_id
+                ).delete(synchronize_session=False)
+                db.delete(tweet)
         db.commit()
+        # A page re-posted after this should bring the bookmark back.
+        recent_payloads.clear()
+        if shared:
+            return {"status": "deleted", "rest_id": rest_id}
+        publish("bookmark.deleted", rest_id=rest_id)
+        if get_settings().embeddings_enabled:
+            from src.adapters.embeddings.factory import get_vector_index
+
+            get_vector_index().remove([rest_id])
         return {"status": "deleted", "rest_id": rest_id}
     finally:
         db.close()
 
 
-@app.get("/api/topics/{topic_name}/bookmarks")
+@router.get("/api/bookmarks/{rest_id}/classifications")
+async def get_bookmark_classifications(rest_id: str, account: Optional[str] = None):
+    """Every classification recorded for a bookmark, newest first."""
+    db = resolve_scope(account).session()
+    try:
+        repo = SqlAlchemyRepository(db)
+        tweet = repo.get_tweet_by_rest_id(rest_id)
+        if not tweet:
+            return _error("Bookmark not found")
+        return {
+            "rest_id": rest_id,
+            "active_classification_id": tweet.active_classification_id,
+            "classifications": [
+                {
+                    "id": c.id,
+                    "model": c.model,
+                    "prompt_version": c.prompt_version,
+                    "topics": c.topics,
+                    "summary": c.summary,
+                    "confidence": c.confidence,
+                    "prompt_tokens": c.prompt_tokens,
+                    "completion_tokens": c.completion_tokens,
+                    "created_at": c.created_at.isoformat() if c.created_at else None,
+                }
+                for c in repo.get_tweet_classifications(rest_id)
+            ],
+        }
+    finally:
+        db.close()
+
+
+@router.get("/api/classifications/versions")
+async def get_classification_versions(account: Optional[str] = None):
+    """Model / prompt versions in classification history with their coverage."""
+    db = resolve_scope(account).session()
+    try:
+        versions = SqlAlchemyRepository(db).get_classification_versions()
+        for version in versions:
+            for key in ("first_at", "last_at"):
+                version[key] = version[key].isoformat() if version[key] else None
+        return {"versions": versions}
+    finally:
+        db.close()
+
+
+@router.post("/api/classifications/activate")
+async def activate_classification_version(
+    model: str, prompt_version: str, account: Optional[str] = None
+):
+    """Switch every bookmark that `model` / `prompt_version` classified back
+    (or forward) to that result. No classifier calls are made."""
+    db = resolve_scope(account).session()
+    try:
+        updated = SqlAlchemyRepository(db).activate_classification_version(
+            model, prompt_version
+        )
+        if not updated:
+            return _error("No classifications for that version")
+        return {
+            "status": "activated",
+            "model": model,
+            "prompt_version": prompt_version,
+            "count": updated,
+        }
+    finally:
+        db.close()
+
+
+@router.get("/api/topics/{topic_name}/bookmarks", responses={200: {"model": TopicBookmarkPage}})
 async def get_bookmarks_by_topic(
     topic_name: str,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    account: Optional[str] = None,
+    collapse: bool = Query(True, description="Fold near-duplicates into their representative"),
 ):
     """Get all bookmarks for a specific topic."""
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
-        query = (
-            db.query(TweetModel)
-            .filter(TweetModel.topics.like(f'%"{topic_name}"%'))
-            .order_by(TweetModel.created_at.desc())
+        query = bookmarks_query(
+            db, topic=topic_name, account_id=scope.account_id, collapse=collapse
         )
 
         total = query.count()
-        tweets = query.offset(offset).limit(limit).all()
+        rows = query.with_entities(*BOOKMARK_COLUMNS).offset(offset).limit(limit).all()
+        counts = duplicate_counts(db, rows, scope.account_id) if collapse else {}
 
-        return {
+        return _model_response(TopicBookmarkPage, {
             "topic": topic_name,
-            "bookmarks": [
-                {
-                    "id": t.id,
-                    "rest_id": t.rest_id,
-                    "text": t.text,
-                    "author_handle": t.author_handle,
-                    "author_name": t.author_name,
-                    "created_at": t.created_at.isoformat() if t.created_at else None,
-                    "topics": t.topics or [],
-                    "summary": t.summary,
-                    "classification_status": t.classification_status,
-                }
-                for t in tweets
-            ],
+            "bookmarks": _bookmark_items(rows, duplicate_counts=counts),
             "total": total,
-        }
+            "limit": limit,
+            "offset": offset,
+        })
     finally:
         db.close()
 
 
-@app.get("/api/tweets/incomplete")
-async def get_incomplete_tweets():
+@router.get("/api/tweets/incomplete")
+async def get_incomplete_tweets(account: Optional[str] = None):
     """Get list of tweet IDs that need hydration (truncated or missing quotes)."""
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
-        tweets = (
-            db.query(TweetModel)
-            .filter(TweetModel.needs_hydration == True)
-            .all()
-        )
+        query = db.query(TweetModel).filter(TweetModel.needs_hydration == True)
+        if scope.account_id is not None:
+            query = query.filter(SqlAlchemyRepository(db).bookmarked_by(scope.account_id))
+        tweets = query.all()
         return {
             "tweets": [
                 {
@@ -380,33 +1481,37 @@ async def get_incomplete_tweets():
         db.close()
 
 
-@app.post("/api/tweets/{rest_id}/hydrate")
-async def hydrate_tweet(rest_id: str, payload: Dict[str, Any]):
+@router.post("/api/tweets/{rest_id}/hydrate")
+async def hydrate_tweet(rest_id: str, payload: Dict[str, Any], account: Optional[str] = None):
     """Update a tweet with full data from viewing the tweet page."""
     from src.adapters.twitter.parser import TwitterParser
 
-    db = SessionLocal()
+    scope = resolve_scope(account)
+    db = scope.session()
     try:
         tweet_model = db.query(TweetModel).filter(TweetModel.rest_id == rest_id).first()
         if not tweet_model:
-            return {"status": "error", "message": "Tweet not found"}
+            return _error("Tweet not found")
 
         # Parse the TweetDetail response
         parsed = TwitterParser.parse_tweet_detail(payload)
         if not parsed:
-            return {"status": "error", "message": "Failed to parse tweet data"}
+            return _error("Failed to parse tweet data", 400)
 
         # Update fields if we got better data
-        if parsed.text and len(parsed.text) > len(tweet_model.text or ""):
+        text_changed = bool(parsed.text and len(parsed.text) > len(tweet_model.text or ""))
+        if text_changed:
             tweet_model.text = parsed.text
             tweet_model.is_truncated = False
-            # Reset classification since text changed
+            # Reclassify the full text; the current topics stay visible (and
+            # in history) until the new classification lands.
             tweet_model.classification_status = "pending"
-            tweet_model.topics = None
-            tweet_model.summary = None
 
         # Update raw_data with new data
         tweet_model.raw_data = parsed.raw_data
+        # Quote and reply links, the quoted tweet's own included
+        repo = SqlAlchemyRepository(db)
+        repo.add_tweet_edges(parsed.edges)
 
         # Check if we got the quoted tweet
         if tweet_model.is_quote_missing and parsed.quoted_status_id:
@@ -422,23 +1527,38 @@ async def hydrate_tweet(rest_id: str, payload: Dict[str, Any]):
                         author_handle=quoted_tweet.author_handle,
                         author_name=quoted_tweet.author_name,
                         created_at=quoted_tweet.created_at,
-                        media_blobs=quoted_tweet.media_blobs,
+                        media_urls=quoted_tweet.media_urls,
                         raw_data=quoted_tweet.raw_data,
                         classification_status="pending",
                     )
-                    db.add(quoted_model)
+                    with repo.track_analytics([quoted_model.rest_id]):
+                        db.add(quoted_model)
                 tweet_model.is_quote_missing = False
 
         # Update needs_hydration flag
         tweet_model.needs_hydration = tweet_model.is_truncated or tweet_model.is_quote_missing
 
+        if text_changed:
+            # The fingerprint and near-duplicate group were taken from the
+            # truncated text; both follow the full text now.
+            tweet_model.content_hash = tweet_fingerprint(parsed)
+            threshold = get_settings().near_duplicate_threshold
+            if threshold:
+                repo.cluster_near_duplicates([parsed], threshold)
         db.commit()
+        publish(
+            "tweet.hydrated",
+            **tweet_delta(
+                tweet_model,
+                ["text", "is_truncated", "is_quote_missing", "needs_hydration", "classification_status"],
+            ),
+        )
 
         # Trigger classification if needed
         settings = get_settings()
-        if settings.groq_api_key and tweet_model.classification_status == "pending":
+        if classifier_configured(settings) and tweet_model.classification_status == "pending":
             from src.infrastructure.tasks import classify_tweets_task
-            classify_tweets_task.delay(1)
+            classify_tweets_task.delay(1, partition=scope.partition)
 
         return {
             "status": "success",
@@ -451,13 +1571,66 @@ async def hydrate_tweet(rest_id: str, payload: Dict[str, Any]):
         db.close()
 
 
-@app.get("/api/health")
+# Cached files are named by content and never change
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _media_response(url_hash: str, account: Optional[str], thumbnail: bool):
+    """The cached file for `url_hash`, or a redirect upstream until it is cached."""
+    import os
+
+    from fastapi.responses import FileResponse, RedirectResponse
+    from src.infrastructure.media.store import get_media_store
+
+    db = resolve_scope(account).session()
+    try:
+        media = SqlAlchemyRepository(db).get_media(url_hash)
+    finally:
+        db.close()
+    if media is None:
+        return _error("Media not found")
+
+    if media.status == "cached":
+        store = get_media_store()
+        if thumbnail and media.has_thumbnail:
+            path, media_type = store.thumbnail_path(media.content_hash), "image/jpeg"
+        else:
+            path, media_type = store.original_path(media.content_hash), media.content_type
+        if os.path.exists(path):
+            return FileResponse(
+                path, media_type=media_type, headers={"Cache-Control": MEDIA_CACHE_CONTROL}
+            )
+    # Not cached yet (or given up on): the browser fetches it upstream, and
+    # asks again next time
+    return RedirectResponse(media.url, status_code=307, headers={"Cache-Control": "no-store"})
+
+
+@router.get("/api/media/{url_hash}")
+async def get_media(url_hash: str, account: Optional[str] = None):
+    """A bookmark's media file (see `media_keys` in list items)."""
+    return _media_response(url_hash, account, thumbnail=False)
+
+
+@router.get("/api/media/{url_hash}/thumbnail")
+async def get_media_thumbnail(url_hash: str, account: Optional[str] = None):
+    """A downscaled JPEG of a cached image; the original when there is none."""
+    return _media_response(url_hash, account, thumbnail=True)
+
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus metrics for this API process."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/api/health")
 async def health_check():
     """Health check endpoint."""
     settings = get_settings()
     return {
         "status": "ok",
         "classification_enabled": settings.classification_enabled,
-        "classifier_configured": bool(settings.groq_api_key),
+        "classifier_configured": classifier_configured(settings),
+        "classifier_backends": settings.classifier_backends,
         "redis_url": settings.redis_url,
     }
@@ -0,0 +1,132 @@
+"""Response cache for read endpoints, keyed on the global data version.
+
+A cache key is the path, the sorted non-empty query parameters and the data
+version (see `infrastructure.database`), which every write to a versioned
+table bumps in the same transaction. Entries are never invalidated
+explicitly: a write moves every key to a new version and stale entries age
+out of the LRU (or expire in Redis).
+
+The ETag is derived from the key, so a client revalidating with
+If-None-Match gets a 304 without the body being looked up at all.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+from src.infrastructure.metrics import RESPONSE_CACHE
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "birdbrain:response:"
+
+
+class MemoryCache:
+    """LRU of response bodies capped by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes // 4:
+            # One huge page shouldn't flush everything else.
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Shared cache for several API workers; entries expire after `ttl_seconds`."""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(REDIS_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def set(self, key: str, body: bytes) -> None:
+        try:
+            self.client.set(REDIS_PREFIX + key, body, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+
+@lru_cache
+def get_response_cache():
+    """The configured cache, or None when RESPONSE_CACHE_BACKEND=off."""
+    from src.infrastructure.config import get_settings
+
+    settings = get_settings()
+    backend = settings.response_cache_backend
+    if backend == "memory":
+        return MemoryCache(settings.response_cache_max_mb * 1024 * 1024)
+    if backend == "redis":
+        return RedisCache(settings.redis_url, settings.response_cache_ttl_seconds)
+    if backend != "off":
+        logger.warning(f"Unknown RESPONSE_CACHE_BACKEND {backend!r}; caching disabled")
+    return None
+
+
+def cache_key(
+    path: str,
+    params: Iterable[Tuple[str, str]],
+    version: int,
+    bucket_seconds: Optional[int] = None,
+) -> str:
+    """Normalised key: empty params dropped, the rest sorted.
+
+    `bucket_seconds` adds a time bucket for responses that also depend on
+    the clock (e.g. retries coming due), capping their staleness.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(p for p in params if p[1] != ""))
+    key = f"{path}?{query}@{version}"
+    if bucket_seconds:
+        key += f"/{int(time.time() // bucket_seconds)}"
+    return key
+
+
+def etag_for(key: str) -> str:
+    """Weak ETag: the body is the same for every encoding (gzip, br, identity)."""
+    return 'W/"' + hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def record(outcome: str) -> None:
+    RESPONSE_CACHE.inc(outcome=outcome)
@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.signals import worker_process_init
 from src.infrastructure.config import get_settings
 
 settings = get_settings()
@@ -20,3 +21,54 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
 )
+
+
+def _scheduled(task: str, seconds: int, args: tuple = ()) -> dict:
+    """Beat entry for `task`; with account databases it runs once per database."""
+    if settings.account_database_dir:
+        return {
+            "task": "src.infrastructure.tasks.for_each_database_task",
+            "schedule": float(seconds),
+            "args": (task, *args),
+        }
+    return {"task": task, "schedule": float(seconds), "args": args}
+
+
+beat_schedule = {}
+if settings.classification_schedule_seconds > 0:
+    # Drains the backlog steadily; the daily token budget caps each batch.
+    beat_schedule["classify-pending-tweets"] = _scheduled(
+        "src.infrastructure.tasks.classify_tweets_task",
+        settings.classification_schedule_seconds,
+        (settings.classification_batch_size,),
+    )
+if settings.classification_retry_poll_seconds > 0:
+    beat_schedule["retry-failed-classifications"] = _scheduled(
+        "src.infrastructure.tasks.retry_failed_classifications_task",
+        settings.classification_retry_poll_seconds,
+    )
+if settings.topic_consolidation_schedule_seconds > 0:
+    beat_schedule["consolidate-topics"] = _scheduled(
+        "src.infrastructure.tasks.consolidate_topics_task",
+        settings.topic_consolidation_schedule_seconds,
+    )
+if settings.media_cache_enabled and settings.media_retry_poll_seconds > 0:
+    beat_schedule["cache-media"] = _scheduled(
+        "src.infrastructure.tasks.cache_media_task",
+        settings.media_retry_poll_seconds,
+    )
+celery_app.conf.beat_schedule = beat_schedule
+
+
+@worker_process_init.connect
+def _start_worker_metrics(**kwargs):
+    """Expose each pool child's metrics on METRICS_WORKER_PORT + child index."""
+    if settings.metrics_worker_port is None:
+        return
+
+    from billiard.process import current_process
+
+    from src.infrastructure.metrics import start_metrics_server
+
+    index = getattr(current_process(), "index", 0) or 0
+    start_metrics_server(settings.metrics_worker_port + index)
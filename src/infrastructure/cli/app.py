@@ -1,18 +1,20 @@
-import asyncio
+# Commands import what they need inside their bodies so that cheap commands
+# (stats, classify) don't pay for FastAPI/uvicorn at startup.
+from typing import List
+
 import typer
 from rich.console import Console
 from rich.table import Table
-from src.infrastructure.database import init_db, get_db
-from src.adapters.db.repository import SqlAlchemyRepository
 from src.infrastructure.config import get_settings
-import uvicorn
-from src.infrastructure.api.server import app as api_app
 
 app = typer.Typer()
 console = Console()
 
 
 def get_repo():
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import get_db
+
     db = next(get_db())
     return SqlAlchemyRepository(db)
 
@@ -20,10 +22,95 @@ def get_repo():
 @app.command()
 def init():
     """Initialize the database."""
+    from src.infrastructure.database import init_db
+
     init_db()
     console.print("[green]Database initialized![/green]")
 
 
+@app.command()
+def migrate(
+    status: bool = typer.Option(False, "--status", help="List migrations without applying them"),
+    redo: List[int] = typer.Option(None, help="Run this applied migration again (repeatable)"),
+):
+    """Apply pending schema migrations to an existing database."""
+    from src.infrastructure.database import get_engine, init_db
+    from src.infrastructure.migrations import migrate as run_migrations, migration_status
+
+    engine = get_engine()
+    if status:
+        table = Table(title="Schema Migrations")
+        for column in ("Version", "Name", "Applied"):
+            table.add_column(column)
+        for migration, applied_at in migration_status(engine):
+            table.add_row(
+                str(migration.version),
+                migration.name,
+                str(applied_at)[:19] if applied_at else "[yellow]pending[/yellow]",
+            )
+        console.print(table)
+        return
+
+    from sqlalchemy import inspect
+
+    if not inspect(engine).has_table("tweets"):
+        init_db()
+        console.print("[green]Created a new database at the latest schema[/green]")
+        return
+    ran = run_migrations(engine, redo=redo)
+    for migration in ran:
+        console.print(f"Applied {migration.version}: {migration.name}")
+    console.print(f"[green]{len(ran) or 'No'} migrations applied[/green]")
+
+
+@app.command()
+def doctor(verbose: bool = typer.Option(False, help="Print every query's plan")):
+    """Explain the endpoints' queries and flag full table scans."""
+    from src.infrastructure.database import SessionLocal, get_engine
+    from src.infrastructure.migrations import pending_migrations
+
+    engine = get_engine()
+    if engine.dialect.name not in ("sqlite", "postgresql"):
+        console.print(f"[yellow]doctor can't explain {engine.dialect.name} plans[/yellow]")
+        raise typer.Exit(1)
+
+    pending = pending_migrations(engine)
+    if pending:
+        console.print(
+            f"[yellow]{len(pending)} migrations pending; run `migrate` before reading plans[/yellow]"
+        )
+
+    from src.infrastructure.doctor import check_query_plans
+
+    db = SessionLocal()
+    try:
+        reports = check_query_plans(db)
+    finally:
+        db.close()
+
+    table = Table(title="Query Plans")
+    for column in ("Query", "Verdict", "Plan" if verbose else "Notes"):
+        table.add_column(column)
+    for report in reports:
+        if report.full_scans and report.expected_scan:
+            verdict = "[yellow]full scan (expected)[/yellow]"
+        elif report.full_scans:
+            verdict = f"[red]FULL SCAN of {', '.join(report.full_scans)}[/red]"
+        else:
+            verdict = "[green]indexed[/green]"
+        notes = [report.expected_scan] if report.expected_scan else []
+        notes += [f"walks {scan} in order" for scan in report.index_scans]
+        if report.temp_sort:
+            notes.append("sorts the results")
+        table.add_row(report.name, verdict, "\n".join(report.plan) if verbose else "; ".join(notes))
+    console.print(table)
+
+    unexpected = [r for r in reports if not r.ok]
+    if unexpected or pending:
+        raise typer.Exit(1)
+    console.print("[green]No unexpected full scans[/green]")
+
+
 @app.command()
 def login(username: str):
     """Deprecated. Use browser extension sync."""
@@ -57,11 +144,41 @@ def import_curl(curl_command: str):
     return
 
 
+@app.command()
+def accounts():
+    """List accounts with their bookmark counts."""
+    from src.infrastructure.accounts import account_summaries
+
+    table = Table(title="Accounts")
+    for column in ("Username", "X user id", "Bookmarks", "Last synced"):
+        table.add_column(column)
+    for summary in account_summaries():
+        synced = summary["last_synced_at"]
+        table.add_row(
+            summary["username"],
+            summary["user_id"] or "-",
+            str(summary["bookmarks"]),
+            synced.strftime("%Y-%m-%d %H:%M") if synced else "-",
+        )
+    console.print(table)
+
+
 @app.command()
 def list(username: str):
     """List stored bookmarks for an account."""
-    repo = get_repo()
-    account = repo.get_account_by_username(username)
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.accounts import UnknownAccount, resolve_scope
+
+    try:
+        scope = resolve_scope(username)
+    except UnknownAccount:
+        console.print("[red]Account not found.[/red]")
+        return
+    repo = SqlAlchemyRepository(scope.session())
+    if scope.partition:
+        account = repo.get_account_by_user_id(scope.partition)
+    else:
+        account = repo.get_account_by_username(username) or repo.get_account_by_user_id(username)
     if not account:
         console.print("[red]Account not found.[/red]")
         return
@@ -91,35 +208,45 @@ def list(username: str):
 
 
 @app.command()
-def classify(batch_size: int = 20):
+def classify(
+    batch_size: int = 20,
+    priority: str = typer.Option(None, help="newest or most_viewed"),
+):
     """Run AI classification on pending tweets."""
     settings = get_settings()
 
-    if not settings.groq_api_key:
-        console.print("[red]GROQ_API_KEY not configured.[/red]")
-        console.print("Set it in your .env file or environment:")
+    from src.adapters.ai.registry import build_classifier, classifier_configured
+
+    if not classifier_configured(settings):
+        console.print(
+            f"[red]No classifier backend configured (CLASSIFIER_BACKENDS={settings.classifier_backends}).[/red]"
+        )
+        console.print("Set GROQ_API_KEY in your .env file or environment:")
         console.print("  export GROQ_API_KEY=gsk_xxx")
+        console.print("or add an offline backend: CLASSIFIER_BACKENDS=groq,openai,rules")
         return
 
-    from src.adapters.ai.groq_classifier import GroqTweetClassifier
-    from src.infrastructure.ai.groq_client import GroqConfig
+    import asyncio
+    import src.infrastructure.events  # noqa: F401  (so API clients see the results)
     from src.use_cases.classify_tweets import classify_pending_tweets
-
-    config = GroqConfig(
-        api_key=settings.groq_api_key,
-        model=settings.groq_model,
-        base_url=settings.groq_base_url,
-        timeout=settings.groq_timeout,
-    )
+    from src.adapters.embeddings.factory import configured_index_hook
 
     repo = get_repo()
-    classifier = GroqTweetClassifier(config)
+    classifier = build_classifier(repo, settings)
 
     console.print(f"[cyan]Classifying up to {batch_size} tweets...[/cyan]")
 
     async def run():
         async with classifier:
-            return await classify_pending_tweets(repo, classifier, batch_size)
+            return await classify_pending_tweets(
+                repo,
+                classifier,
+                batch_size,
+                priority=priority or settings.classification_priority,
+                daily_token_budget=settings.classification_daily_token_budget,
+                max_retries=settings.classification_max_retries,
+                on_classified=configured_index_hook(),
+            )
 
     result = asyncio.run(run())
 
@@ -133,6 +260,381 @@ def classify(batch_size: int = 20):
         )
         if result.get("failed", 0) > 0:
             console.print(f"[yellow]Failed: {result['failed']}[/yellow]")
+        console.print(
+            f"Tokens: {result.get('prompt_tokens', 0)} prompt, "
+            f"{result.get('completion_tokens', 0)} completion"
+        )
+
+
+@app.command()
+def prompt_savings(
+    limit: int = typer.Option(200, help="Number of recent tweets to measure"),
+    show: int = typer.Option(10, help="Rows to print in the per-tweet table"),
+):
+    """Estimate input tokens saved per tweet by the compact prompt."""
+    from src.adapters.ai.prompt import build_messages, estimate_message_tokens
+    from src.adapters.db.models import TweetModel
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import SessionLocal
+
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        repo = SqlAlchemyRepository(db)
+        tweets = (
+            repo._to_tweet_entity(m)
+            for m in db.query(TweetModel)
+            .filter(TweetModel.text.isnot(None))
+            .order_by(TweetModel.created_at.desc())
+            .limit(limit)
+        )
+
+        table = Table(title="Estimated Prompt Tokens per Tweet")
+        table.add_column("Tweet", style="cyan")
+        table.add_column("Legacy", style="white")
+        table.add_column("Compact", style="white")
+        table.add_column("Saved", style="green")
+
+        legacy_total = 0
+        compact_total = 0
+        count = 0
+        for tweet in tweets:
+            legacy = estimate_message_tokens(build_messages(tweet, compact=False))
+            compact = estimate_message_tokens(
+                build_messages(
+                    tweet, compact=True, max_chars=settings.classification_max_input_chars
+                )
+            )
+            legacy_total += legacy
+            compact_total += compact
+            count += 1
+            if count <= show:
+                table.add_row(tweet.rest_id, str(legacy), str(compact), str(legacy - compact))
+    finally:
+        db.close()
+
+    if not count:
+        console.print("[yellow]No tweets to measure.[/yellow]")
+        return
+
+    console.print(table)
+    saved = legacy_total - compact_total
+    console.print(
+        f"[green]{count} tweets: {legacy_total} -> {compact_total} tokens "
+        f"({saved / count:.1f} saved per tweet, {saved / legacy_total:.0%})[/green]"
+    )
+    console.print(
+        f"Tweets per minute at the same TPM limit: x{legacy_total / max(compact_total, 1):.2f}"
+    )
+
+
+@app.command()
+def usage(by: str = typer.Option("day", help="Group by day, model or run")):
+    """Show classification token usage."""
+    repo = get_repo()
+    rows = repo.get_token_usage_summary(group_by=by)
+
+    table = Table(title=f"Token Usage by {by}")
+    table.add_column(by.capitalize(), style="cyan")
+    table.add_column("Classifications", style="magenta")
+    table.add_column("Prompt", style="white")
+    table.add_column("Completion", style="white")
+    table.add_column("Total", style="green")
+
+    for row in rows:
+        table.add_row(
+            str(row[by]),
+            str(row["classifications"]),
+            str(row["prompt_tokens"]),
+            str(row["completion_tokens"]),
+            str(row["total_tokens"]),
+        )
+
+    console.print(table)
+
+    settings = get_settings()
+    if settings.classification_daily_token_budget:
+        from datetime import datetime
+
+        from src.use_cases.classification_scheduler import start_of_day
+
+        used = repo.get_tokens_used_since(start_of_day(datetime.utcnow()))
+        console.print(
+            f"Today: {used}/{settings.classification_daily_token_budget} tokens of daily budget"
+        )
+
+
+@app.command()
+def embed(
+    rebuild: bool = typer.Option(False, help="Clear the index before embedding"),
+    batch_size: int = 256,
+):
+    """Embed stored tweets into the local vector index."""
+    import asyncio
+    from src.adapters.embeddings.factory import get_embedder, get_vector_index
+    from src.use_cases.embed_tweets import backfill_embeddings
+
+    if rebuild:
+        import shutil
+
+        # Drop the files outright: a store built for another model or
+        # dimension cannot even be opened.
+        shutil.rmtree(get_settings().vector_index_dir, ignore_errors=True)
+
+    embedder = get_embedder()
+    index = get_vector_index()
+
+    console.print(f"[cyan]Embedding tweets with {embedder.model_name}...[/cyan]")
+    count = asyncio.run(backfill_embeddings(get_repo(), embedder, index, batch_size))
+    console.print(f"[green]Embedded {count} tweets ({len(index)} in index)[/green]")
+
+
+@app.command()
+def media(retry: bool = typer.Option(False, help="Also retry media that failed or is gone")):
+    """Download bookmark media into the local cache, in every database."""
+    import asyncio
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import SessionLocal, account_partitions
+    from src.infrastructure.media.downloader import configured_downloader
+    from src.infrastructure.media.thumbnails import thumbnails_available
+    from src.use_cases.cache_media import cache_due_media
+
+    settings = get_settings()
+    if not thumbnails_available():
+        console.print("[yellow]Pillow is not installed; no thumbnails will be made[/yellow]")
+
+    async def run(repo) -> dict:
+        async with configured_downloader() as downloader:
+            return await cache_due_media(
+                repo,
+                downloader,
+                batch_size=settings.media_batch_size,
+                max_attempts=settings.media_max_attempts,
+            )
+
+    for partition in [None, *account_partitions()]:
+        db = SessionLocal(partition)
+        try:
+            repo = SqlAlchemyRepository(db)
+            if retry:
+                repo.requeue_media()
+            result = asyncio.run(run(repo))
+            counts = repo.get_media_counts()
+        finally:
+            db.close()
+        name = f"account {partition}" if partition else "main database"
+        console.print(
+            f"[green]{name}: cached {result['cached']}, failed {result['failed']}, "
+            f"gone {result['gone']}[/green] "
+            f"({counts.get('cached', 0)} of {sum(counts.values())} cached in total)"
+        )
+
+
+@app.command()
+def dedupe(
+    threshold: float = typer.Option(None, help="Minimum text similarity to group tweets"),
+    batch_size: int = 1000,
+):
+    """Group stored near-duplicate tweets, in every database."""
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import SessionLocal, account_partitions
+    from src.use_cases.dedupe_tweets import dedupe_tweets
+
+    if threshold is None:
+        threshold = get_settings().near_duplicate_threshold
+    if not threshold:
+        console.print("[yellow]NEAR_DUPLICATE_THRESHOLD is 0; nothing to group[/yellow]")
+        return
+
+    for partition in [None, *account_partitions()]:
+        db = SessionLocal(partition)
+        try:
+            joined = dedupe_tweets(SqlAlchemyRepository(db), threshold, batch_size)
+        finally:
+            db.close()
+        name = f"account {partition}" if partition else "main database"
+        console.print(f"[green]{name}: {joined} near-duplicates grouped[/green]")
+
+
+@app.command()
+def rebuild_analytics():
+    """Recount the analytics rollups from the stored tweets, in every database."""
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.database import SessionLocal, account_partitions
+
+    for partition in [None, *account_partitions()]:
+        db = SessionLocal(partition)
+        try:
+            counted = SqlAlchemyRepository(db).rebuild_analytics()
+        finally:
+            db.close()
+        name = f"account {partition}" if partition else "main database"
+        console.print(f"[green]{name}: {counted} tweets counted[/green]")
+
+
+@app.command()
+def consolidate_topics(
+    threshold: float = typer.Option(None, help="Minimum similarity to propose a merge"),
+    show: int = typer.Option(30, help="Proposals to print"),
+):
+    """Find near-duplicate topics and store alias proposals for review."""
+    import asyncio
+    from src.use_cases.consolidate_topics import consolidate_topics as run_consolidation
+
+    settings = get_settings()
+    embedder = None
+    if settings.embeddings_enabled:
+        from src.adapters.embeddings.factory import get_embedder
+
+        embedder = get_embedder()
+
+    report = asyncio.run(
+        run_consolidation(
+            get_repo(),
+            threshold=threshold if threshold is not None else settings.topic_merge_threshold,
+            embedder=embedder,
+        )
+    )
+
+    table = Table(title=f"Proposed Topic Merges ({len(report.proposed)} of {report.topics} topics)")
+    table.add_column("Alias", style="cyan")
+    table.add_column("Canonical", style="green")
+    table.add_column("Score", style="magenta")
+    for alias in report.proposed[:show]:
+        table.add_row(alias.alias, alias.canonical, f"{alias.score:.2f}")
+    console.print(table)
+    console.print("Review with: uv run main.py review-topics")
+
+
+@app.command()
+def review_topics(
+    approve: List[str] = typer.Option(None, help="Alias to approve (repeatable)"),
+    reject: List[str] = typer.Option(None, help="Alias to reject (repeatable)"),
+    approve_above: float = typer.Option(None, help="Approve every proposal scoring at least this"),
+    apply: bool = typer.Option(True, help="Rewrite stored tweets after approving"),
+):
+    """List proposed topic merges, or approve/reject them."""
+    repo = get_repo()
+
+    if not (approve or reject or approve_above is not None):
+        table = Table(title="Pending Topic Merges")
+        table.add_column("Alias", style="cyan")
+        table.add_column("Canonical", style="green")
+        table.add_column("Score", style="magenta")
+        for alias in repo.get_topic_aliases("proposed"):
+            table.add_row(alias.alias, alias.canonical, f"{alias.score:.2f}")
+        console.print(table)
+        return
+
+    approved = 0
+    for name in approve or []:
+        approved += repo.set_topic_alias_status(name, "approved")
+    if approve_above is not None:
+        for alias in repo.get_topic_aliases("proposed"):
+            if alias.score >= approve_above:
+                approved += repo.set_topic_alias_status(alias.alias, "approved")
+    rejected = sum(repo.set_topic_alias_status(name, "rejected") for name in reject or [])
+    console.print(f"[green]Approved {approved}, rejected {rejected}[/green]")
+
+    if approved and apply:
+        updated = repo.apply_topic_aliases()
+        console.print(f"[green]Rewrote topics on {updated} tweets[/green]")
+
+
+@app.command()
+def apply_topics():
+    """Rewrite stored tweet topics through the approved aliases."""
+    updated = get_repo().apply_topic_aliases()
+    console.print(f"[green]Rewrote topics on {updated} tweets[/green]")
+
+
+@app.command()
+def requeue_dead():
+    """Give dead-lettered tweets a fresh set of classification retries."""
+    count = get_repo().requeue_dead_letters()
+    console.print(f"[green]Requeued {count} dead-lettered tweets[/green]")
+
+
+@app.command()
+def classification_versions():
+    """List model / prompt versions in classification history."""
+    table = Table(title="Classification Versions")
+    for column in ("Model", "Prompt", "Tweets", "Active", "Last run"):
+        table.add_column(column)
+    for version in get_repo().get_classification_versions():
+        table.add_row(
+            version["model"],
+            version["prompt_version"],
+            str(version["tweets"]),
+            str(version["active"]),
+            f"{version['last_at']:%Y-%m-%d %H:%M}" if version["last_at"] else "-",
+        )
+    console.print(table)
+
+
+@app.command()
+def activate_classifications(model: str, prompt_version: str):
+    """Make a stored model / prompt version's results active again (no API calls)."""
+    count = get_repo().activate_classification_version(model, prompt_version)
+    if not count:
+        console.print(f"[yellow]No classifications from {model} / {prompt_version}[/yellow]")
+        return
+    console.print(f"[green]Activated {model} / {prompt_version} on {count} tweets[/green]")
+
+
+@app.command()
+def reclassify_all(
+    status: str = typer.Option(None, help="Only tweets with this classification status"),
+    resume: int = typer.Option(None, help="Continue an interrupted job by id"),
+):
+    """Queue every tweet for reclassification, keeping current topics until replaced."""
+    from src.use_cases.reclassify_all import (
+        mark_reclassify_job,
+        reclassify_progress,
+        start_reclassify_job,
+    )
+
+    settings = get_settings()
+    repo = get_repo()
+    if resume is not None:
+        job = repo.get_reclassify_job(resume)
+        if not job:
+            console.print(f"[red]Reclassify job {resume} not found[/red]")
+            raise typer.Exit(1)
+    else:
+        job = start_reclassify_job(repo, status)
+
+    job = mark_reclassify_job(repo, job.id, settings.reclassify_chunk_size)
+    progress = reclassify_progress(repo, job)
+    console.print(
+        f"[green]Job {job.id}: {progress['flagged']} tweets flagged for re-run, "
+        f"{progress['requeued']} reset to pending[/green]"
+    )
+    console.print("Run `classify` (or the worker) to process them.")
+
+
+@app.command()
+def reclassify_jobs(limit: int = 10):
+    """Show recent reclassify-all jobs and their progress."""
+    from src.use_cases.reclassify_all import reclassify_progress, refresh_reclassify_job
+
+    repo = get_repo()
+    table = Table(title="Reclassify Jobs")
+    for column in ("ID", "Status", "Total", "Reclassified", "Kept old", "Remaining", "Done"):
+        table.add_column(column)
+    for job in repo.get_reclassify_jobs(limit=limit):
+        job = refresh_reclassify_job(repo, job.id)
+        progress = reclassify_progress(repo, job)
+        table.add_row(
+            str(job.id),
+            job.status,
+            str(progress["total"]),
+            str(progress["reclassified"]),
+            str(progress["failed"]),
+            str(progress["remaining"]),
+            f"{progress['percent']}%",
+        )
+    console.print(table)
 
 
 @app.command()
@@ -160,6 +662,16 @@ def stats():
             .filter(TweetModel.classification_status == "failed")
             .scalar()
         )
+        dead = (
+            db.query(func.count(TweetModel.id))
+            .filter(TweetModel.classification_status == "dead")
+            .scalar()
+        )
+        reclassifying = (
+            db.query(func.count(TweetModel.id))
+            .filter(TweetModel.reclassify_job_id.isnot(None))
+            .scalar()
+        )
 
         table = Table(title="Classification Statistics")
         table.add_column("Status", style="cyan")
@@ -168,7 +680,10 @@ def stats():
         table.add_row("Total Tweets", str(total))
         table.add_row("Pending", str(pending))
         table.add_row("Completed", str(completed))
-        table.add_row("Failed", str(failed))
+        table.add_row("Failed (retrying)", str(failed))
+        table.add_row("Dead-lettered", str(dead))
+        if reclassifying:
+            table.add_row("Awaiting reclassification", str(reclassifying))
 
         console.print(table)
     finally:
@@ -183,12 +698,28 @@ def serve(port: int = None):
     console.print(f"[bold green]Starting API server on port {port}...[/bold green]")
     console.print("Install the extension from 'chrome_extension/' (Chrome) or 'firefox_extension/' (Firefox) to sync.")
 
-    if settings.groq_api_key:
-        console.print(f"[cyan]AI Classification: Enabled (model: {settings.groq_model})[/cyan]")
+    from src.adapters.ai.registry import classifier_configured
+
+    if classifier_configured(settings):
+        console.print(
+            f"[cyan]AI Classification: Enabled (backends: {settings.classifier_backends})[/cyan]"
+        )
     else:
         console.print("[yellow]AI Classification: Disabled (set GROQ_API_KEY to enable)[/yellow]")
 
-    uvicorn.run(api_app, host=settings.server_host, port=port)
+    from src.infrastructure.database import get_engine
+    from src.infrastructure.migrations import pending_migrations
+
+    pending = pending_migrations(get_engine())
+    if pending:
+        console.print(
+            f"[yellow]{len(pending)} schema migrations pending; run `uv run main.py migrate`[/yellow]"
+        )
+
+    import uvicorn
+    from src.infrastructure.api.server import create_app
+
+    uvicorn.run(create_app(), host=settings.server_host, port=port)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,15 @@ class Settings(BaseSettings):
     )
 
     database_url: str = "sqlite:///birdbrain.db"
+    # Connection pool per process (PostgreSQL; SQLite ignores these)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    # Reconnect after this long, before the server or a proxy drops idle connections
+    database_pool_recycle_seconds: int = 1800
+    database_pool_timeout_seconds: float = 30.0
+    # Give each account identified by the extension its own SQLite file in this
+    # directory; the main database keeps the account list. Unset = one shared database
+    account_database_dir: Optional[str] = None
     server_port: int = 8787
     server_host: str = "127.0.0.1"
     auth_dir: str = os.path.join(os.getcwd(), "auth_storage")
@@ -33,7 +42,127 @@ class Settings(BaseSettings):
     # Classification behavior
     classification_enabled: bool = True
     classification_batch_size: int = 20
+    # Retries per tweet before it is dead-lettered (status "dead")
     classification_max_retries: int = 3
+    # How often Celery beat checks for failed tweets due for retry; 0 disables
+    classification_retry_poll_seconds: int = 300
+    # Compact system prompt + trimmed tweet text instead of the long prompt
+    classification_compact_prompt: bool = True
+    classification_max_input_chars: int = 1000
+    # "newest" or "most_viewed"
+    classification_priority: str = "newest"
+    # Max prompt + completion tokens per UTC day; 0 disables the budget
+    classification_daily_token_budget: int = 0
+    # Drop a re-posted bookmark page identical to one ingested this recently; 0 disables
+    ingest_duplicate_window_seconds: int = 600
+    # Group bookmarks whose text is at least this similar (MinHash estimate); 0 disables
+    near_duplicate_threshold: float = 0.8
+    # Decompressed size cap for /api/bookmarks/ingest/batch bodies
+    ingest_batch_max_mb: int = 32
+    # Admission control: concurrent ingests per API process before 429
+    ingest_max_in_flight: int = 8
+    # Ingests waiting for a database writer slot before 503
+    ingest_max_writer_queue: int = 4
+    # Concurrent ingest writers; SQLite has one writer, PostgreSQL can use more
+    ingest_writer_concurrency: int = 1
+    # Stop enqueuing classification from ingest while this many Celery tasks wait; 0 = no cap
+    classification_queue_max: int = 50
+    # Run a classification batch every N seconds via Celery beat; 0 disables
+    classification_schedule_seconds: int = 0
+    # Tweets queued per transaction by reclassify-all jobs
+    reclassify_chunk_size: int = 500
+    # Active reclassify jobs idle this long are resumed by the retry poller
+    reclassify_stale_seconds: int = 900
+
+    # Comma-separated fallback chain: "groq", "openai" (self-hosted), "rules"
+    classifier_backends: str = "groq"
+    # Skip a rate-limited backend for this long before trying it again
+    classifier_fallback_cooldown_seconds: int = 60
+    # OpenAI-compatible local server (llama.cpp, Ollama, vLLM)
+    local_llm_base_url: str = "http://localhost:11434/v1"
+    local_llm_model: str = "llama3.1:8b"
+    local_llm_api_key: Optional[str] = None
+    local_llm_timeout: float = 120.0
+    # JSON object of topic -> keywords; built-in rules when unset
+    classifier_rules_path: Optional[str] = None
+
+    # Local k-NN topic stage ahead of Groq (uses the configured embedder)
+    local_classifier_enabled: bool = False
+    local_classifier_k: int = 10
+    # Neighbours below this cosine similarity don't vote
+    local_classifier_min_similarity: float = 0.5
+    # Similarity-weighted vote share the top topic needs to skip Groq
+    local_classifier_min_agreement: float = 0.7
+    # Don't answer locally until this many Groq-labelled tweets exist
+    local_classifier_min_examples: int = 200
+    local_classifier_max_examples: int = 5000
+    local_classifier_refresh_seconds: int = 900
+
+    # Topic consolidation
+    # Minimum similarity for proposing alias -> canonical merges
+    topic_merge_threshold: float = 0.8
+    # Proposals scoring at least this are approved automatically; 0 = review all
+    topic_auto_merge_score: float = 0.0
+    # Run the consolidation job every N seconds via Celery beat; 0 disables
+    topic_consolidation_schedule_seconds: int = 0
+
+    # Embeddings / semantic search
+    embeddings_enabled: bool = False
+    # "hashing" (built-in), "sentence-transformers" or "api" (OpenAI-compatible)
+    embedding_provider: str = "hashing"
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_dim: int = 384
+    embedding_api_base_url: Optional[str] = None
+    embedding_api_key: Optional[str] = None
+    # "float16" or "int8"
+    embedding_dtype: str = "float16"
+    vector_index_dir: str = os.path.join(os.getcwd(), "vector_index")
+    vector_index_nprobe: int = 8
+
+    # Local media cache (/api/media): files are downloaded by the Celery
+    # worker after ingest and stored by content hash under media_dir.
+    # Needs the worker and Redis, so it is off by default
+    media_cache_enabled: bool = False
+    media_dir: str = os.path.join(os.getcwd(), "media")
+    # Comma-separated hosts media may be downloaded from
+    media_allowed_hosts: str = "pbs.twimg.com,video.twimg.com"
+    media_download_concurrency: int = 8
+    media_download_timeout: float = 20.0
+    # Tries per file within one run (transport errors, 429, 5xx)
+    media_download_retries: int = 3
+    # Runs a failing file is retried across before it is given up
+    media_max_attempts: int = 5
+    # Larger files are not cached
+    media_max_mb: int = 25
+    # Files claimed per download round
+    media_batch_size: int = 100
+    # Longest side of thumbnails (needs Pillow); 0 disables them
+    media_thumbnail_size: int = 480
+    # Processes making thumbnails; 0 makes them in a thread instead
+    media_thumbnail_workers: int = 2
+    # How often Celery beat retries failed downloads; 0 disables
+    media_retry_poll_seconds: int = 900
+
+    # Live events (/api/events): "redis" reaches clients from the Celery
+    # worker too; "memory" only delivers events raised in the API process
+    events_backend: str = "redis"
+
+    # Response cache for list/topic/stats reads: "memory" (per API process),
+    # "redis" (shared between workers) or "off"
+    response_cache_backend: str = "memory"
+    # Memory backend: total size of cached bodies
+    response_cache_max_mb: int = 32
+    # Redis backend: entries from old data versions expire after this
+    response_cache_ttl_seconds: int = 3600
+    # gzip (or brotli, if installed) responses at least this large; 0 disables
+    response_compression_min_bytes: int = 1024
+    # Validate list/stats/analytics bodies against their response models
+    # (slower; for development and tests)
+    validate_responses: bool = False
+
+    # Metrics
+    metrics_timing_header: bool = False
+    metrics_worker_port: Optional[int] = None
 
     @property
     def broker_url(self) -> str:
@@ -1,13 +1,124 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from src.infrastructure.config import get_settings
+import os
+import re
+from functools import lru_cache
+from typing import List, Optional
 
-settings = get_settings()
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from src.infrastructure.config import get_settings
 
-engine = create_engine(settings.database_url, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Writes to these tables change what the read endpoints return.
+VERSIONED_TABLES = {"tweets", "bookmarks", "classifications", "topic_aliases", "accounts"}
+_BUMPED = "data_version_bumped"
+
+# Account databases are named by X user id
+PARTITION_KEY = re.compile(r"^\d+$")
+PARTITION_FILE = re.compile(r"^account_(\d+)\.db$")
+
+
+def partition_url(partition: str) -> str:
+    """SQLite URL of an account's own database (ACCOUNT_DATABASE_DIR)."""
+    directory = get_settings().account_database_dir
+    if not directory:
+        raise ValueError("ACCOUNT_DATABASE_DIR is not set")
+    if not PARTITION_KEY.match(partition):
+        raise ValueError(f"Invalid account partition: {partition!r}")
+    return f"sqlite:///{os.path.join(directory, f'account_{partition}.db')}"
+
+
+def account_partitions() -> List[str]:
+    """Keys of the account databases created so far."""
+    directory = get_settings().account_database_dir
+    if not directory or not os.path.isdir(directory):
+        return []
+    matches = (PARTITION_FILE.match(name) for name in os.listdir(directory))
+    return sorted(m.group(1) for m in matches if m)
+
+
+@lru_cache
+def get_engine(partition: Optional[str] = None) -> Engine:
+    """Returns the cached engine, created on first use rather than at import.
+    `partition` selects an account's own database instead of DATABASE_URL."""
+    settings = get_settings()
+    if partition is not None:
+        os.makedirs(settings.account_database_dir, exist_ok=True)
+        engine = create_engine(partition_url(partition), echo=False)
+        init_db(engine)
+        return engine
+    if settings.database_url.startswith("sqlite"):
+        return create_engine(settings.database_url, echo=False)
+    return create_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        # Replicas share the server; connections it restarted or killed are replaced
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache
+def get_session_factory(partition: Optional[str] = None) -> sessionmaker:
+    """Returns the cached session factory bound to the engine."""
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine(partition))
+    _track_data_version(factory)
+    return factory
+
+
+def bump_data_version(connection: Connection) -> None:
+    """Increment the global data version inside the caller's transaction."""
+    updated = connection.execute(
+        text("UPDATE data_version SET version = version + 1 WHERE id = 1")
+    ).rowcount
+    if not updated:
+        connection.execute(text("INSERT INTO data_version (id, version) VALUES (1, 1)"))
+
+
+def get_data_version(db: Session) -> int:
+    """Current data version; response caches key on it."""
+    return db.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar() or 0
+
+
+def mark_data_changed(session: Session) -> None:
+    """Bump the data version once for the session's current transaction.
+    Writes the session events can't see (raw SQL, COPY) call this directly."""
+    if not session.info.get(_BUMPED):
+        session.info[_BUMPED] = True
+        bump_data_version(session.connection())
+
+
+def _track_data_version(factory: sessionmaker) -> None:
+    """Bump the data version once per transaction that writes a versioned
+    table, whether through the unit of work or a bulk UPDATE/DELETE."""
+
+    @event.listens_for(factory, "after_flush")
+    def _after_flush(session, flush_context):
+        changed = session.new | session.dirty | session.deleted
+        if any(getattr(obj, "__tablename__", None) in VERSIONED_TABLES for obj in changed):
+            mark_data_changed(session)
+
+    @event.listens_for(factory, "do_orm_execute")
+    def _bulk_write(state):
+        if state.is_update or state.is_delete:
+            table = getattr(state.statement, "table", None)
+            if getattr(table, "name", None) in VERSIONED_TABLES:
+                mark_data_changed(state.session)
+
+    @event.listens_for(factory, "after_commit")
+    @event.listens_for(factory, "after_rollback")
+    def _reset(session):
+        session.info.pop(_BUMPED, None)
+
+
+def SessionLocal(partition: Optional[str] = None) -> Session:
+    """Open a new session on the main database, or on an account's own one."""
+    return get_session_factory(partition)()
+
 
 def get_db():
     db = SessionLocal()
@@ -17,8 +128,17 @@ def get_db():
         db.close()
 
 
-def init_db():
+def init_db(engine: Optional[Engine] = None):
+    """Create the tables of a new database, then apply pending migrations."""
     # Import models to register them with Base metadata
     from src.adapters.db import models  # noqa: F401
+    from src.infrastructure.migrations import migrate
 
-    Base.metadata.create_all(bind=engine)
+    engine = engine or get_engine()
+    if not inspect(engine).has_table("tweets"):
+        Base.metadata.create_all(bind=engine)
+    # On a new database they only add what the models can't declare
+    migrate(engine)
+    with engine.begin() as connection:
+        if connection.execute(text("SELECT COUNT(*) FROM data_version")).scalar() == 0:
+            connection.execute(text("INSERT INTO data_version (id, version) VALUES (1, 0)"))
@@ -0,0 +1,356 @@
+"""Query plan checks behind the `doctor` command.
+
+Each entry builds the statement an endpoint or job runs, and SQLite's
+EXPLAIN QUERY PLAN (or PostgreSQL's EXPLAIN) shows how it will be executed.
+On SQLite, a plain `SCAN <table>`
+reads every row. `SCAN <table> USING INDEX` walks rows in index order, which
+is cheap under a LIMIT but still visits every row the filter rejects.
+A few queries can't avoid either kind of scan: infix LIKE search and topic
+matching inside the JSON array. Those carry the reason and are reported as
+expected. Any other full scan means an index is missing, or `migrate` hasn't
+been run.
+
+PostgreSQL plans are read with sequential scans disabled for the session, so
+a `Seq Scan` only shows up where no index applies at all.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.orm import Session
+
+# "SCAN tweets" or "SCAN tweets USING [COVERING] INDEX ix_..."
+SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?$")
+TEMP_SORT = "USE TEMP B-TREE"
+PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+PG_INDEX_SCAN = re.compile(r"Index (?:Only )?Scan(?: Backward)? using (\w+) on (\w+)")
+PG_SORT = re.compile(r"^Sort\s+\(cost")
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    name: str
+    build: Callable[[Session], Any]
+    # Why a full scan is unavoidable, when it is
+    expected_scan: Optional[str] = None
+
+
+@dataclass
+class PlanReport:
+    name: str
+    plan: List[str]
+    full_scans: List[str] = field(default_factory=list)
+    # "table via index" for scans in index order
+    index_scans: List[str] = field(default_factory=list)
+    temp_sort: bool = False
+    expected_scan: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans or self.expected_scan is not None
+
+
+def _statement(query: Any) -> Any:
+    return getattr(query, "statement", query)
+
+
+def _count(query: Any) -> Any:
+    """The statement `Query.count()` runs."""
+    return select(func.count()).select_from(_statement(query).subquery())
+
+
+def _page(query: Any) -> Any:
+    from src.infrastructure.api.server import BOOKMARK_COLUMNS
+
+    return query.with_entities(*BOOKMARK_COLUMNS).offset(0).limit(50)
+
+
+def planned_queries() -> List[PlannedQuery]:
+    from src.adapters.db.models import (
+        BookmarkModel,
+        ClassificationModel,
+        MediaModel,
+        NearDuplicateBucketModel,
+        TokenUsageModel,
+        TweetModel,
+    )
+    from src.adapters.db.repository import SqlAlchemyRepository
+    from src.infrastructure.api.server import (
+        author_days_query,
+        bookmarks_query,
+        context_query,
+        duplicate_counts_query,
+        duplicates_query,
+        top_authors_query,
+        top_topics_query,
+        topic_days_query,
+    )
+
+    now = datetime.utcnow()
+    since = now.date()
+    status = TweetModel.classification_status
+    json_topics = "topics are matched with LIKE inside the JSON array"
+    return [
+        PlannedQuery("GET /api/bookmarks", lambda db: _page(bookmarks_query(db))),
+        PlannedQuery("GET /api/bookmarks (total)", lambda db: _count(bookmarks_query(db))),
+        PlannedQuery(
+            "GET /api/bookmarks?collapse=true",
+            lambda db: _page(bookmarks_query(db, collapse=True)),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?collapse=true (total)",
+            lambda db: _count(bookmarks_query(db, collapse=True)),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?collapse=true (duplicate counts)",
+            lambda db: duplicate_counts_query(db, ["1", "2"]),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?status=",
+            lambda db: _page(bookmarks_query(db, status="completed")),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?status= (total)",
+            lambda db: _count(bookmarks_query(db, status="completed")),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?account=",
+            lambda db: _page(bookmarks_query(db, account_id=1)),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?account= (total)",
+            lambda db: _count(bookmarks_query(db, account_id=1)),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?account=&collapse=true",
+            lambda db: _page(bookmarks_query(db, account_id=1, collapse=True)),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?account=&collapse=true (duplicate counts)",
+            lambda db: duplicate_counts_query(db, ["1", "2"], account_id=1),
+        ),
+        PlannedQuery(
+            "GET /api/stats?account= (by status)",
+            lambda db: select(func.count(TweetModel.id)).where(
+                status == "pending", SqlAlchemyRepository(db).bookmarked_by(1)
+            ),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?q=",
+            lambda db: _page(bookmarks_query(db, q="search")),
+            expected_scan="infix LIKE search can't use a b-tree index",
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks?q=&semantic=true",
+            lambda db: bookmarks_query(db, rest_ids=["1", "2"]).with_entities(TweetModel.rest_id),
+        ),
+        PlannedQuery(
+            "GET /api/topics/{name}/bookmarks",
+            lambda db: _page(bookmarks_query(db, topic="topic")),
+            expected_scan=json_topics,
+        ),
+        PlannedQuery(
+            "GET /api/topics",
+            lambda db: select(TweetModel.topics).where(TweetModel.topics.isnot(None)),
+            expected_scan="every classified tweet's topics are counted",
+        ),
+        PlannedQuery(
+            "GET /api/stats (by status)",
+            lambda db: select(func.count(TweetModel.id)).where(status == "pending"),
+        ),
+        PlannedQuery(
+            "GET /api/stats (retry due)",
+            lambda db: select(func.count(TweetModel.id)).where(
+                status == "failed", TweetModel.next_attempt_at <= now
+            ),
+        ),
+        PlannedQuery(
+            "GET /api/stats (reclassifying)",
+            lambda db: select(func.count(TweetModel.id)).where(
+                TweetModel.reclassify_job_id.isnot(None)
+            ),
+        ),
+        PlannedQuery(
+            "GET /api/tweets/incomplete",
+            lambda db: select(TweetModel).where(TweetModel.needs_hydration == True),  # noqa: E712
+        ),
+        PlannedQuery(
+            "ingest: stored fingerprints",
+            lambda db: select(TweetModel.rest_id, TweetModel.content_hash).where(
+                TweetModel.rest_id.in_(["1", "2"])
+            ),
+        ),
+        PlannedQuery(
+            "ingest: account's bookmarks",
+            lambda db: select(BookmarkModel.rest_id).where(
+                BookmarkModel.account_id == 1, BookmarkModel.rest_id.in_(["1", "2"])
+            ),
+        ),
+        PlannedQuery(
+            "classify: pending batch (newest)",
+            lambda db: select(TweetModel)
+            .where(status == "pending")
+            .order_by(TweetModel.created_at.desc())
+            .limit(50),
+        ),
+        PlannedQuery(
+            "classify: due retries",
+            lambda db: select(TweetModel)
+            .where(status == "failed", TweetModel.next_attempt_at <= now)
+            .order_by(TweetModel.next_attempt_at)
+            .limit(50),
+        ),
+        PlannedQuery(
+            "classify: reclassify batch",
+            lambda db: select(TweetModel)
+            .where(
+                TweetModel.reclassify_job_id.isnot(None),
+                or_(TweetModel.next_attempt_at.is_(None), TweetModel.next_attempt_at <= now),
+            )
+            .order_by(TweetModel.reclassify_job_id, TweetModel.id)
+            .limit(50),
+        ),
+        PlannedQuery(
+            "classify: tokens used today",
+            lambda db: select(func.sum(TokenUsageModel.prompt_tokens)).where(
+                TokenUsageModel.created_at >= now
+            ),
+        ),
+        PlannedQuery(
+            "media: due downloads",
+            lambda db: select(MediaModel)
+            .where(
+                MediaModel.status.in_(["pending", "failed"]),
+                or_(MediaModel.next_attempt_at.is_(None), MediaModel.next_attempt_at <= now),
+            )
+            .limit(100),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks/{id}/classifications",
+            lambda db: select(ClassificationModel)
+            .where(ClassificationModel.tweet_rest_id == "1")
+            .order_by(ClassificationModel.id.desc()),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks/{id}/context",
+            lambda db: context_query(db, "1"),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks/{id}/context?account=",
+            lambda db: context_query(db, "1", account_id=1),
+        ),
+        PlannedQuery(
+            "GET /api/bookmarks/{id}/duplicates",
+            lambda db: duplicates_query(db, "1"),
+        ),
+        PlannedQuery(
+            "ingest: near-duplicate candidates",
+            lambda db: select(NearDuplicateBucketModel.rest_id).where(
+                NearDuplicateBucketModel.bucket.in_([1, 2])
+            ),
+        ),
+        PlannedQuery(
+            "classify: mirror near-duplicates",
+            lambda db: select(TweetModel.id).where(TweetModel.duplicate_of.in_(["1", "2"])),
+        ),
+        PlannedQuery(
+            "GET /api/analytics/timeline (top topics)",
+            lambda db: top_topics_query(db, 0, since=since),
+        ),
+        PlannedQuery(
+            "GET /api/analytics/timeline (series)",
+            lambda db: topic_days_query(db, 0, ["", "topic"], since=since),
+        ),
+        PlannedQuery(
+            "GET /api/analytics/authors (top authors)",
+            lambda db: top_authors_query(db, 1).limit(10),
+        ),
+        PlannedQuery(
+            "GET /api/analytics/authors?since= (top authors)",
+            lambda db: top_authors_query(db, 1, since=since).limit(10),
+        ),
+        PlannedQuery(
+            "GET /api/analytics/authors (series)",
+            lambda db: author_days_query(db, 1, ["a", "b"], since=since),
+        ),
+        PlannedQuery(
+            "DELETE /api/bookmarks/{id}?account= (others left)",
+            lambda db: select(func.count()).where(BookmarkModel.rest_id == "1"),
+        ),
+    ]
+
+
+def explain(db: Session, statement: Any) -> List[str]:
+    """The plan for `statement`, one line per step.
+
+    SQLite plans don't depend on bound values, so every parameter is NULL.
+    PostgreSQL folds NULL comparisons away, so values are inlined instead.
+    """
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql":
+        compiled = _statement(statement).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = db.connection().exec_driver_sql(f"EXPLAIN {compiled}".replace("%", "%%"), ())
+        return [row[0].strip().removeprefix("->").strip() for row in rows]
+
+    compiled = _statement(statement).compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = (None,) * len(compiled.positiontup or ())
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params)
+    return [row[-1] for row in rows]
+
+
+def _pg_index_walks(plan: List[str]) -> List[str]:
+    """Index scans with no Index Cond: they read the index end to end."""
+    walks = []
+    for i, line in enumerate(plan):
+        match = PG_INDEX_SCAN.search(line)
+        if not match:
+            continue
+        details = []
+        for following in plan[i + 1:]:
+            if "(cost=" in following:
+                break
+            details.append(following)
+        if not any(detail.startswith("Index Cond:") for detail in details):
+            walks.append(f"{match.group(2)} via {match.group(1)}")
+    return walks
+
+
+def _report(query: PlannedQuery, plan: List[str], tables: set, postgresql: bool) -> PlanReport:
+    if postgresql:
+        scans = [m.group(1) for m in map(PG_SEQ_SCAN.search, plan) if m and m.group(1) in tables]
+        index_scans = _pg_index_walks(plan)
+        temp_sort = any(PG_SORT.match(line) for line in plan)
+    else:
+        matches = [m for m in map(SCAN.match, plan) if m and m.group(1) in tables]
+        scans = [m.group(1) for m in matches if not m.group(2)]
+        index_scans = [f"{m.group(1)} via {m.group(2)}" for m in matches if m.group(2)]
+        temp_sort = any(TEMP_SORT in line for line in plan)
+    return PlanReport(
+        name=query.name,
+        plan=plan,
+        full_scans=scans,
+        index_scans=index_scans,
+        temp_sort=temp_sort,
+        expected_scan=query.expected_scan if scans or index_scans else None,
+    )
+
+
+def check_query_plans(db: Session, queries: Optional[List[PlannedQuery]] = None) -> List[PlanReport]:
+    from src.infrastructure.database import Base
+
+    queries = queries if queries is not None else planned_queries()
+    tables = set(Base.metadata.tables)
+    postgresql = db.get_bind().dialect.name == "postgresql"
+    try:
+        return [_report(q, explain(db, q.build(db)), tables, postgresql) for q in queries]
+    finally:
+        # Drops the SET LOCAL along with the transaction
+        db.rollback()
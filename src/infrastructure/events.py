@@ -0,0 +1,309 @@
+"""Live update events for the /api/events server-sent events stream.
+
+Publishers call `publish` from any thread or process. Use cases announce
+through `src.core.events`, which importing this module binds to
+`publish`. With EVENTS_BACKEND=redis, events go through a Redis
+pub/sub channel, so a separate Celery worker reaches the API's clients. A
+listener thread in the API process relays them into the local bus. With
+"memory" they are dispatched in-process only.
+
+Payloads are small deltas (the changed bookmarks' fields), not pages.
+Clients fall behind only if they stop reading. A client that overflows its
+queue is sent a "resync" event and should refetch once.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set
+
+from src.core import events as core_events
+from src.core.entities import Tweet
+from src.infrastructure.metrics import EVENTS_PUBLISHED, EVENT_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "birdbrain:events"
+RESYNC = "resync"
+# Recent events kept for clients reconnecting with Last-Event-ID
+HISTORY_SIZE = 512
+QUEUE_SIZE = 256
+# Larger ingests are announced by count only; clients refetch the first page
+MAX_DELTA_BOOKMARKS = 50
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One client's bounded queue of events, filled from any thread."""
+
+    def __init__(
+        self, bus: "EventBus", types: Optional[Set[str]], loop: asyncio.AbstractEventLoop
+    ):
+        self._bus = bus
+        self._types = types
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._lagged = False
+
+    def wants(self, event: Event) -> bool:
+        return self._types is None or event.type in self._types or event.type == RESYNC
+
+    def offer(self, event: Event) -> None:
+        """Called from the publishing thread; hands off to the client's loop."""
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Event) -> None:
+        if self._lagged:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog rather than block publishers; the client refetches.
+            self._lagged = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(Event(event.id, RESYNC, {"reason": "lagged"}))
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """Next event, or None after `timeout` seconds (time for a keep-alive)."""
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event.type == RESYNC:
+            self._lagged = False
+        return event
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """Fan-out of events to subscribers in this process."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+
+    def subscribe(
+        self, types: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None
+    ) -> Subscription:
+        """Register a subscriber on the running loop.
+
+        With `last_event_id`, missed events still in history are replayed
+        first. If the gap is older than the history, the client gets a
+        "resync" instead.
+        """
+        sub = Subscription(self, set(types) if types else None, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(sub)
+            missed = [
+                e for e in self._history if last_event_id is not None and e.id > last_event_id
+            ]
+            oldest = self._history[0].id if self._history else None
+        EVENT_SUBSCRIBERS.inc()
+
+        if last_event_id is not None and oldest is not None and oldest > last_event_id + 1:
+            sub._put(Event(oldest - 1, RESYNC, {"reason": "history"}))
+        else:
+            for event in missed:
+                if sub.wants(event):
+                    sub._put(event)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub not in self._subscribers:
+                return
+            self._subscribers.discard(sub)
+        EVENT_SUBSCRIBERS.dec()
+
+    def dispatch(self, type: str, data: Dict[str, Any]) -> Event:
+        with self._lock:
+            event = Event(next(self._ids), type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.wants(event):
+                try:
+                    sub.offer(event)
+                except RuntimeError:
+                    # The subscriber's loop has closed; it will never read again.
+                    self._unsubscribe(sub)
+        return event
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+@lru_cache
+def get_event_bus() -> EventBus:
+    return EventBus()
+
+
+@lru_cache
+def _redis_client():
+    import redis
+
+    from src.infrastructure.config import get_settings
+
+    return redis.Redis.from_url(get_settings().redis_url)
+
+
+def _backend() -> str:
+    from src.infrastructure.config import get_settings
+
+    return get_settings().events_backend
+
+
+def publish(type: str, **data: Any) -> None:
+    """Publish an event to every /api/events client. Never raises."""
+    EVENTS_PUBLISHED.inc(type=type)
+    if _backend() == "redis":
+        try:
+            message = json.dumps({"type": type, "data": data}, default=str)
+            _redis_client().publish(CHANNEL, message)
+            return
+        except Exception as e:
+            logger.warning(f"Redis event publish failed, delivering locally only: {e}")
+    get_event_bus().dispatch(type, data)
+
+
+class RedisRelay(threading.Thread):
+    """Feeds events from the Redis channel into the local bus."""
+
+    def __init__(self, bus: EventBus):
+        super().__init__(name="event-relay", daemon=True)
+        self.bus = bus
+
+    def run(self) -> None:
+        delay = 1.0
+        while True:
+            connected = False
+            try:
+                pubsub = _redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                connected = True
+                delay = 1.0
+                for message in pubsub.listen():
+                    try:
+                        body = json.loads(message["data"])
+                        self.bus.dispatch(body["type"], body.get("data") or {})
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.warning(f"Ignoring malformed event: {e}")
+            except Exception as e:
+                logger.warning(f"Event relay disconnected, retrying in {delay:.0f}s: {e}")
+            if connected:
+                # Events may have been missed while reconnecting.
+                self.bus.dispatch(RESYNC, {"reason": "relay"})
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+_relay_lock = threading.Lock()
+_relay: Optional[RedisRelay] = None
+
+
+def ensure_relay() -> None:
+    """Start the Redis listener for this process (API only), once."""
+    global _relay
+    if _backend() != "redis":
+        return
+    with _relay_lock:
+        if _relay is None or not _relay.is_alive():
+            _relay = RedisRelay(get_event_bus())
+            _relay.start()
+
+
+BOOKMARK_FIELDS = [
+    "text",
+    "author_handle",
+    "author_name",
+    "created_at",
+    "topics",
+    "summary",
+    "classification_status",
+    "quoted_status_id",
+]
+
+
+def tweet_delta(tweet: Any, fields: List[str]) -> Dict[str, Any]:
+    """The named attributes of a tweet entity or model, JSON-ready."""
+    delta = {"rest_id": tweet.rest_id}
+    for name in fields:
+        value = getattr(tweet, name, None)
+        delta[name] = value.isoformat() if hasattr(value, "isoformat") else value
+    return delta
+
+
+def bookmark_delta(tweet: Any) -> Dict[str, Any]:
+    """A new bookmark in the same shape as /api/bookmarks items."""
+    from src.infrastructure.media.store import media_key
+
+    media_urls = tweet.media_urls or []
+    return {
+        **tweet_delta(tweet, BOOKMARK_FIELDS),
+        "media_urls": media_urls,
+        "media_keys": [media_key(url) for url in media_urls],
+    }
+
+
+class _UseCaseEvents:
+    """Publishes what use cases announce through `src.core.events`."""
+
+    def bookmarks_ingested(self, tweets: List[Tweet]) -> None:
+        publish(
+            "bookmarks.ingested",
+            count=len(tweets),
+            bookmarks=[bookmark_delta(t) for t in tweets]
+            if len(tweets) <= MAX_DELTA_BOOKMARKS
+            else [],
+        )
+
+    def tweets_classified(self, classified: List[Tweet], failed: Dict[str, str]) -> None:
+        publish(
+            "tweets.classified",
+            tweets=[
+                tweet_delta(t, ["topics", "summary", "classification_status"])
+                for t in classified
+            ]
+            + [
+                {"rest_id": rest_id, "classification_status": status}
+                for rest_id, status in failed.items()
+            ],
+        )
+
+
+core_events.EVENTS.bind(_UseCaseEvents())
+
+
+async def event_stream(
+    sub: Subscription, is_disconnected, keepalive_seconds: float = 15.0
+) -> AsyncIterator[str]:
+    """SSE frames for `sub` until the client disconnects."""
+    try:
+        yield "retry: 3000\n\n"
+        while not await is_disconnected():
+            event = await sub.get(keepalive_seconds)
+            yield event.to_sse() if event else ": keep-alive\n\n"
+    finally:
+        sub.close()
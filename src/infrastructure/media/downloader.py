@@ -0,0 +1,195 @@
+"""Bounded, retrying media downloads into the media store.
+
+One `httpx.AsyncClient` fetches at most `concurrency` files at a time, and a
+URL listed twice in a run is fetched once. Transport errors, 429 and 5xx
+are retried with exponential backoff, honouring Retry-After, and a backoff
+doesn't hold a download slot. 404 and 410 mean the media is gone upstream.
+Bodies are hashed while they stream to disk, and cut off at `max_bytes`.
+
+Only hosts in `allowed_hosts` are fetched, so a crafted bookmark can't
+point the worker at internal addresses. To run against a local stub
+server, allow its host (see benchmarks.fake_media).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.entities import Media
+from src.core.interfaces import MediaDownloader
+from src.core.value_objects import DownloadResult
+from src.infrastructure.media.store import MediaStore
+from src.infrastructure.media.thumbnails import ThumbnailPool, thumbnails_available
+from src.infrastructure.metrics import MEDIA_DOWNLOAD_BYTES, MEDIA_DOWNLOADS
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between tries within a run, whatever Retry-After asks for
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class _Retry(Exception):
+    def __init__(self, error: str, retry_after: Optional[float] = None):
+        super().__init__(error)
+        self.retry_after = retry_after
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class HttpMediaDownloader(MediaDownloader):
+    """Use as an async context manager; it owns the HTTP client and the
+    thumbnail processes."""
+
+    def __init__(
+        self,
+        store: MediaStore,
+        allowed_hosts: Sequence[str] = ("pbs.twimg.com", "video.twimg.com"),
+        concurrency: int = 8,
+        retries: int = 3,
+        timeout: float = 20.0,
+        max_bytes: int = 25 * 1024 * 1024,
+        thumbnail_size: int = 480,
+        thumbnail_workers: int = 2,
+        backoff_seconds: float = 1.0,
+    ):
+        self.store = store
+        self.allowed_hosts = set(allowed_hosts)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size if thumbnails_available() else 0
+        self.backoff_seconds = backoff_seconds
+        self._thumbnails = ThumbnailPool(thumbnail_workers)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+            ),
+            follow_redirects=False,
+        )
+        return self
+
+    async def __aexit__(self, *args):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        self._thumbnails.close()
+
+    async def download(self, media: List[Media]) -> List[DownloadResult]:
+        """Fetch each distinct URL in `media` into the store."""
+        if not self._client:
+            raise RuntimeError("Downloader not initialized. Use async context manager.")
+        unique: Dict[str, Media] = {m.url_hash: m for m in media}
+        results = await asyncio.gather(*[self._fetch(m) for m in unique.values()])
+        for result in results:
+            MEDIA_DOWNLOADS.inc(outcome=result.status)
+        return list(results)
+
+    async def _fetch(self, media: Media) -> DownloadResult:
+        url = urlsplit(media.url)
+        if url.scheme not in ("http", "https") or url.hostname not in self.allowed_hosts:
+            return DownloadResult(media.url_hash, "gone", error=f"host not allowed: {url.hostname}")
+
+        error, retry_after = "", None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = retry_after if retry_after is not None else self.backoff_seconds * 2**attempt
+                logger.debug(f"Media download failed ({error}), retry in {delay}s: {media.url}")
+                await asyncio.sleep(min(delay, MAX_BACKOFF_SECONDS))
+            try:
+                async with self._slots:
+                    result = await self._stream(media)
+            except _Retry as e:
+                error, retry_after = str(e), e.retry_after
+            except httpx.TransportError as e:
+                error, retry_after = f"{type(e).__name__}: {e}", None
+            else:
+                if result.status == "cached" and self.thumbnail_size:
+                    result.has_thumbnail = await self._thumbnail(result)
+                return result
+        return DownloadResult(media.url_hash, "failed", error=error)
+
+    async def _stream(self, media: Media) -> DownloadResult:
+        async with self._client.stream("GET", media.url) as response:
+            status = response.status_code
+            if status in (404, 410):
+                return DownloadResult(media.url_hash, "gone", error=f"HTTP {status}")
+            if status == 429 or status >= 500:
+                raise _Retry(f"HTTP {status}", _retry_after(response))
+            if status != 200:
+                return DownloadResult(media.url_hash, "failed", error=f"HTTP {status}")
+            if int(response.headers.get("content-length") or 0) > self.max_bytes:
+                return DownloadResult(media.url_hash, "gone", error="larger than MEDIA_MAX_MB")
+
+            digest = hashlib.sha256()
+            size = 0
+            handle = self.store.temp_file()
+            try:
+                with handle:
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            os.unlink(handle.name)
+                            return DownloadResult(
+                                media.url_hash, "gone", error="larger than MEDIA_MAX_MB"
+                            )
+                        digest.update(chunk)
+                        handle.write(chunk)
+            except BaseException:
+                if os.path.exists(handle.name):
+                    os.unlink(handle.name)
+                raise
+            content_hash = digest.hexdigest()
+            self.store.add(handle.name, content_hash)
+
+        MEDIA_DOWNLOAD_BYTES.inc(size)
+        content_type = response.headers.get("content-type", "").split(";")[0].strip()
+        return DownloadResult(
+            media.url_hash,
+            "cached",
+            content_hash=content_hash,
+            content_type=content_type or "application/octet-stream",
+            size=size,
+        )
+
+    async def _thumbnail(self, result: DownloadResult) -> bool:
+        if not result.content_type.startswith("image/"):
+            return False
+        destination = self.store.thumbnail_path(result.content_hash)
+        if os.path.exists(destination):
+            return True
+        return await self._thumbnails.thumbnail(
+            self.store.original_path(result.content_hash), destination, self.thumbnail_size
+        )
+
+
+def configured_downloader() -> HttpMediaDownloader:
+    from src.infrastructure.config import get_settings
+    from src.infrastructure.media.store import get_media_store
+
+    settings = get_settings()
+    return HttpMediaDownloader(
+        get_media_store(),
+        allowed_hosts=[h.strip() for h in settings.media_allowed_hosts.split(",") if h.strip()],
+        concurrency=settings.media_download_concurrency,
+        retries=settings.media_download_retries,
+        timeout=settings.media_download_timeout,
+        max_bytes=settings.media_max_mb * 1024 * 1024,
+        thumbnail_size=settings.media_thumbnail_size,
+        thumbnail_workers=settings.media_thumbnail_workers,
+    )
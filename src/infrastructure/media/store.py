@@ -0,0 +1,62 @@
+"""Content-addressed storage for cached media.
+
+Layout of the media directory:
+
+    originals/ab/<sha256>       downloaded files, named by content hash
+    thumbnails/ab/<sha256>.jpg  downscaled copies, named by the original's hash
+    tmp/                        downloads in progress
+
+Two URLs serving the same bytes share one file, and a file never changes
+once written, so it can be served with a year-long cache lifetime. Files are
+written under tmp/ and renamed into place, so readers never see a partial
+file and two workers downloading the same content don't conflict.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from typing import IO
+
+
+def media_key(url: str) -> str:
+    """The key of a media URL: its `media` row, and its /api/media path."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class MediaStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, kind: str, name: str) -> str:
+        return os.path.join(self.directory, kind, name[:2], name)
+
+    def original_path(self, content_hash: str) -> str:
+        return self._path("originals", content_hash)
+
+    def thumbnail_path(self, content_hash: str) -> str:
+        return self._path("thumbnails", content_hash) + ".jpg"
+
+    def temp_file(self) -> IO[bytes]:
+        """An open file to download into; pass its name to `add` when done."""
+        directory = os.path.join(self.directory, "tmp")
+        os.makedirs(directory, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=directory, delete=False)
+
+    def add(self, temp_path: str, content_hash: str) -> str:
+        """Move a finished download into place and return its path. Content
+        already stored is kept, and the new copy discarded."""
+        path = self.original_path(content_hash)
+        if os.path.exists(path):
+            os.unlink(temp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        return path
+
+
+@lru_cache
+def get_media_store() -> MediaStore:
+    from src.infrastructure.config import get_settings
+
+    return MediaStore(get_settings().media_dir)
@@ -0,0 +1,74 @@
+"""Downscaled JPEG copies of cached images, made in a process pool.
+
+Decoding and resizing are CPU-bound, so they run in worker processes and
+don't stall the download loop. This needs Pillow (the `media` extra).
+Without it no thumbnails are made, and /api/media serves originals.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+
+def thumbnails_available() -> bool:
+    return Image is not None
+
+
+def make_thumbnail(source: str, destination: str, size: int) -> bool:
+    """Write `source` scaled to fit `size` x `size` as a JPEG at `destination`.
+    Returns False when `source` isn't an image Pillow can read."""
+    temp = f"{destination}.{os.getpid()}.tmp"
+    try:
+        with Image.open(source) as image:
+            # JPEGs decode straight at a reduced scale
+            image.draft("RGB", (size, size))
+            image.thumbnail((size, size))
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            image.save(temp, "JPEG", quality=80, optimize=True)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        if os.path.exists(temp):
+            os.unlink(temp)
+        return False
+    os.replace(temp, destination)
+    return True
+
+
+class ThumbnailPool:
+    """Runs `make_thumbnail` in `workers` processes, or in a thread when
+    `workers` is 0 or processes can't be started."""
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def thumbnail(self, source: str, destination: str, size: int) -> bool:
+        if self.workers > 0:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, make_thumbnail, source, destination, size
+                )
+            except (BrokenProcessPool, AssertionError) as e:
+                # AssertionError: daemonic processes (some worker pools) can't have children
+                logger.warning(f"Thumbnail processes unavailable ({e!r}), using a thread")
+                self.close()
+                self.workers = 0
+        return await asyncio.to_thread(make_thumbnail, source, destination, size)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
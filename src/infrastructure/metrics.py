@@ -0,0 +1,385 @@
+"""In-process metrics with Prometheus text exposition.
+
+Stdlib only, so importing it from hot paths (and the CLI) is free. Metrics are
+per process: the API serves its own registry at ``/metrics`` and a Celery
+worker child can expose its registry via ``start_metrics_server``.
+
+Use cases and adapters record through the handles in ``src.core.metrics``;
+importing this module binds them to the registry.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.core import metrics as core_metrics
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        return "\n".join(header + self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> (bucket counts, sum, count)
+        self._series: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._series.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._series[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# --- Application metrics -----------------------------------------------------
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "birdbrain_http_request_duration_seconds",
+    "API request latency by route template.",
+    ["method", "route", "status"],
+)
+
+INGEST_DURATION = REGISTRY.histogram(
+    "birdbrain_ingest_duration_seconds",
+    "Time spent in sync_bookmarks per payload.",
+)
+INGEST_TWEETS = REGISTRY.counter(
+    "birdbrain_ingest_tweets_total",
+    "Ingested tweets: written, unchanged (skipped), near duplicates, or whole duplicate payloads.",
+    ["outcome"],
+)
+INGEST_IN_FLIGHT = REGISTRY.gauge(
+    "birdbrain_ingest_in_flight",
+    "Ingest requests admitted and not yet finished in this process.",
+)
+INGEST_REJECTED = REGISTRY.counter(
+    "birdbrain_ingest_rejected_total",
+    "Ingest requests turned away by admission control, by reason.",
+    ["reason"],
+)
+INGEST_CLASSIFICATION_DEFERRED = REGISTRY.counter(
+    "birdbrain_ingest_classification_deferred_total",
+    "Ingests that skipped enqueuing classification because the Celery queue was full.",
+)
+
+PARSER_DURATION = REGISTRY.histogram(
+    "birdbrain_parser_duration_seconds",
+    "TwitterParser call latency.",
+    ["operation"],
+)
+PARSER_ERRORS = REGISTRY.counter(
+    "birdbrain_parser_errors_total",
+    "Payloads or entries TwitterParser could not parse.",
+    ["operation"],
+)
+
+REPOSITORY_DURATION = REGISTRY.histogram(
+    "birdbrain_repository_duration_seconds",
+    "SqlAlchemyRepository method latency.",
+    ["method"],
+)
+
+GROQ_REQUEST_DURATION = REGISTRY.histogram(
+    "birdbrain_groq_request_duration_seconds",
+    "Latency of individual Groq HTTP attempts.",
+    ["status"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+GROQ_TOKENS = REGISTRY.counter(
+    "birdbrain_groq_tokens_total",
+    "Tokens reported in Groq usage blocks.",
+    ["model", "kind"],
+)
+GROQ_RATE_LIMITED = REGISTRY.counter(
+    "birdbrain_groq_rate_limited_total",
+    "Groq responses with HTTP 429.",
+)
+GROQ_RETRIES = REGISTRY.counter(
+    "birdbrain_groq_retries_total",
+    "Groq request retries by reason.",
+    ["reason"],
+)
+
+CLASSIFICATION_DURATION = REGISTRY.histogram(
+    "birdbrain_classification_batch_duration_seconds",
+    "Time spent in classify_pending_tweets per batch.",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+CLASSIFIED_TWEETS = REGISTRY.counter(
+    "birdbrain_classified_tweets_total",
+    "Tweets processed by classify_pending_tweets.",
+    ["outcome"],
+)
+
+CLASSIFICATION_PATH = REGISTRY.counter(
+    "birdbrain_classification_path_total",
+    "Tweets answered by the local k-NN stage vs. sent to the LLM.",
+    ["path"],
+)
+EVENTS_PUBLISHED = REGISTRY.counter(
+    "birdbrain_events_published_total",
+    "Live update events published, by type.",
+    ["type"],
+)
+EVENT_SUBSCRIBERS = REGISTRY.gauge(
+    "birdbrain_event_subscribers",
+    "Clients connected to /api/events in this process.",
+)
+RESPONSE_CACHE = REGISTRY.counter(
+    "birdbrain_response_cache_total",
+    "Cached read endpoint lookups: hit, miss or not_modified (304).",
+    ["outcome"],
+)
+
+MEDIA_DOWNLOADS = REGISTRY.counter(
+    "birdbrain_media_downloads_total",
+    "Media download attempts by outcome: cached, failed or gone.",
+    ["outcome"],
+)
+MEDIA_DOWNLOAD_BYTES = REGISTRY.counter(
+    "birdbrain_media_download_bytes_total",
+    "Bytes of media downloaded into the local cache.",
+)
+
+CELERY_TASK_DURATION = REGISTRY.histogram(
+    "birdbrain_celery_task_duration_seconds",
+    "Celery task run time.",
+    ["task", "outcome"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
+
+for handle, metric in (
+    (core_metrics.INGEST_DURATION, INGEST_DURATION),
+    (core_metrics.INGEST_TWEETS, INGEST_TWEETS),
+    (core_metrics.PARSER_DURATION, PARSER_DURATION),
+    (core_metrics.PARSER_ERRORS, PARSER_ERRORS),
+    (core_metrics.REPOSITORY_DURATION, REPOSITORY_DURATION),
+    (core_metrics.CLASSIFICATION_DURATION, CLASSIFICATION_DURATION),
+    (core_metrics.CLASSIFIED_TWEETS, CLASSIFIED_TWEETS),
+    (core_metrics.CLASSIFICATION_PATH, CLASSIFICATION_PATH),
+):
+    handle.bind(metric)
+
+
+# --- Exposition --------------------------------------------------------------
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE_LATEST)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve this process's registry on a background thread (for workers)."""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Could not start metrics server on {host}:{port}: {e}")
+        return None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,392 @@
+"""Schema migrations.
+
+`create_all` only creates missing tables. It never adds a column or an index
+to a table that already exists, so a database created before a model change
+needs a migration. Each migration is a function of a connection, and
+`schema_migrations` records the ones applied. A model change ships with its
+migration, appended to MIGRATIONS in the same commit.
+
+A new database is built from the models and then runs every migration, as
+does a database that predates `schema_migrations` (created by `create_all`
+at some earlier release). Migrations therefore check what already exists
+instead of assuming a starting schema. On a new database they only add what
+the models can't declare, and any of them is safe to re-run.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+# Matched with ILIKE by `?q=` search
+SEARCH_COLUMNS = ["text", "author_handle", "author_name", "summary"]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _table(name: str):
+    from src.adapters.db import models  # noqa: F401 - registers the tables
+    from src.infrastructure.database import Base
+
+    return Base.metadata.tables[name]
+
+
+def _index(table: str, name: str):
+    return next(index for index in _table(table).indexes if index.name == name)
+
+
+def _add_columns(connection: Connection, table: str, names: List[str]) -> None:
+    """Add the model's columns `names` that `table` lacks, typed as in the model."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table)}
+    for name in names:
+        if name in existing:
+            continue
+        column = _table(table).c[name]
+        ddl = f"ALTER TABLE {table} ADD COLUMN {name} {column.type.compile(dialect=connection.dialect)}"
+        if column.default is not None and column.default.is_scalar:
+            ddl += f" DEFAULT {column.default.arg!r}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        for foreign_key in column.foreign_keys:
+            ddl += f" REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})"
+        connection.execute(text(ddl))
+
+
+def _create_indexes(connection: Connection, table: str, names: List[str]) -> None:
+    for name in names:
+        _index(table, name).create(connection, checkfirst=True)
+
+
+def _create_tables(connection: Connection, names: List[str]) -> None:
+    for name in names:
+        _table(name).create(connection, checkfirst=True)
+
+
+def _token_usage(connection: Connection) -> None:
+    _create_tables(connection, ["classification_runs", "token_usage"])
+    _add_columns(
+        connection,
+        "tweets",
+        ["view_count", "classification_prompt_tokens", "classification_completion_tokens"],
+    )
+
+
+def _topic_aliases(connection: Connection) -> None:
+    _create_tables(connection, ["topic_aliases"])
+
+
+def _classification_retries(connection: Connection) -> None:
+    _add_columns(connection, "tweets", ["next_attempt_at", "last_error_type"])
+    _create_indexes(connection, "tweets", ["ix_tweets_retry_due"])
+
+
+def _reclassify_jobs(connection: Connection) -> None:
+    _create_tables(connection, ["reclassify_jobs"])
+    _add_columns(connection, "tweets", ["reclassify_job_id"])
+    _create_indexes(connection, "tweets", ["ix_tweets_reclassify_job_id"])
+
+
+def _classification_history(connection: Connection) -> None:
+    _create_tables(connection, ["classifications"])
+    _add_columns(connection, "tweets", ["active_classification_id"])
+
+
+def _data_version(connection: Connection) -> None:
+    _create_tables(connection, ["data_version"])
+    if connection.execute(text("SELECT COUNT(*) FROM data_version")).scalar() == 0:
+        connection.execute(text("INSERT INTO data_version (id, version) VALUES (1, 0)"))
+
+
+def _media_urls(connection: Connection) -> None:
+    """Add `media_urls`, decoded from the legacy `media_blobs` JSON strings."""
+    _add_columns(connection, "tweets", ["media_urls"])
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, media_blobs FROM tweets WHERE id > :last_id "
+                "AND media_urls IS NULL AND media_blobs IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        updates = []
+        for row in rows:
+            try:
+                urls = json.loads(row.media_blobs)
+            except ValueError:
+                urls = []
+            if not isinstance(urls, list):
+                urls = []
+            updates.append({"id": row.id, "media_urls": json.dumps(urls)})
+        connection.execute(
+            text("UPDATE tweets SET media_urls = :media_urls WHERE id = :id"), updates
+        )
+        last_id = rows[-1].id
+
+
+def _content_hash(connection: Connection) -> None:
+    # Stored tweets have no fingerprint; their next ingest writes one
+    _add_columns(connection, "tweets", ["content_hash"])
+
+
+def _list_query_indexes(connection: Connection) -> None:
+    _create_indexes(
+        connection,
+        "tweets",
+        [
+            "ix_tweets_created_at",
+            "ix_tweets_status_created",
+            "ix_tweets_hydration_pending",
+        ],
+    )
+    # Superseded: ix_tweets_status_created leads with the status, and
+    # ix_tweets_hydration_pending covers the only needs_hydration lookup
+    connection.execute(text("DROP INDEX IF EXISTS ix_tweets_classification_status"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_tweets_needs_hydration"))
+    # Refresh planner statistics so the new indexes are picked up
+    connection.execute(text("ANALYZE"))
+
+
+def _create_extension(connection: Connection, name: str) -> bool:
+    try:
+        # A failed statement would otherwise abort the whole transaction
+        with connection.begin_nested():
+            connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {name}"))
+    except DBAPIError as e:
+        logger.warning(f"Could not create extension {name}: {e.orig}")
+        return False
+    return True
+
+
+def _postgresql_search(connection: Connection) -> None:
+    """JSONB topics with a GIN index, and trigram indexes for keyword search."""
+    if connection.dialect.name != "postgresql":
+        return
+    inspector = inspect(connection)
+    topics = next(c for c in inspector.get_columns("tweets") if c["name"] == "topics")
+    if "JSONB" not in str(topics["type"]).upper():
+        connection.execute(text("ALTER TABLE tweets ALTER COLUMN topics TYPE jsonb USING topics::jsonb"))
+    _create_indexes(connection, "tweets", ["ix_tweets_topics"])
+    # Quoted tweets are usually not stored, so PostgreSQL must not enforce this
+    for foreign_key in inspector.get_foreign_keys("tweets"):
+        if foreign_key["constrained_columns"] == ["quoted_status_id"]:
+            connection.execute(text(f'ALTER TABLE tweets DROP CONSTRAINT "{foreign_key["name"]}"'))
+
+    if not _create_extension(connection, "pg_trgm"):
+        logger.warning(
+            "Keyword search will scan the table. Install pg_trgm, then run "
+            "`uv run main.py migrate --redo 10`"
+        )
+        return
+    for name in SEARCH_COLUMNS:
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_tweets_{name}_trgm "
+                f"ON tweets USING gin ({name} gin_trgm_ops)"
+            )
+        )
+
+
+def _account_bookmarks(connection: Connection) -> None:
+    _table("bookmarks").create(connection, checkfirst=True)
+    _create_indexes(connection, "accounts", ["ix_accounts_user_id"])
+    # Superseded by ix_bookmarks_account_created
+    connection.execute(text("DROP INDEX IF EXISTS ix_tweets_account_created"))
+    # Until now a tweet belonged to the one account that imported it
+    connection.execute(
+        text(
+            "INSERT INTO bookmarks (account_id, rest_id, created_at, added_at) "
+            "SELECT account_id, rest_id, created_at, :now FROM tweets "
+            "WHERE account_id IS NOT NULL AND NOT EXISTS ("
+            "SELECT 1 FROM bookmarks WHERE bookmarks.account_id = tweets.account_id "
+            "AND bookmarks.rest_id = tweets.rest_id)"
+        ),
+        {"now": datetime.utcnow()},
+    )
+
+
+def _media_cache(connection: Connection) -> None:
+    _table("media").create(connection, checkfirst=True)
+    # Media of tweets stored before the cache existed
+    from src.infrastructure.media.store import media_key
+
+    now = datetime.utcnow()
+    known = {row[0] for row in connection.execute(text("SELECT url_hash FROM media"))}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, media_urls FROM tweets WHERE id > :last_id "
+                "AND media_urls IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        new = {}
+        for row in rows:
+            urls = row.media_urls if isinstance(row.media_urls, list) else json.loads(row.media_urls)
+            for url in urls or []:
+                key = media_key(url)
+                if key not in known:
+                    new[key] = {"url_hash": key, "url": url, "created_at": now}
+        if new:
+            connection.execute(
+                text(
+                    "INSERT INTO media (url_hash, url, status, attempts, has_thumbnail, created_at) "
+                    "VALUES (:url_hash, :url, 'pending', 0, false, :created_at)"
+                ),
+                list(new.values()),
+            )
+            known.update(new)
+
+
+def _tweet_edges(connection: Connection) -> None:
+    _table("tweet_edges").create(connection, checkfirst=True)
+    # Links of tweets stored before the index existed
+    from src.adapters.twitter.parser import TwitterParser
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, raw_data FROM tweets WHERE id > :last_id "
+                "AND raw_data IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        edges = {}
+        for row in rows:
+            try:
+                result = json.loads(row.raw_data)
+            except ValueError:
+                continue
+            for edge in TwitterParser.extract_edges(result):
+                edges[(edge.source_id, edge.kind)] = edge.target_id
+        if edges:
+            connection.execute(
+                text(
+                    "INSERT INTO tweet_edges (source_id, kind, target_id) "
+                    "VALUES (:source_id, :kind, :target_id) ON CONFLICT DO NOTHING"
+                ),
+                [
+                    {"source_id": source_id, "kind": kind, "target_id": target_id}
+                    for (source_id, kind), target_id in edges.items()
+                ],
+            )
+
+
+def _near_duplicates(connection: Connection) -> None:
+    _add_columns(connection, "tweets", ["duplicate_of"])
+    _create_indexes(connection, "tweets", ["ix_tweets_duplicate_of"])
+    _table("near_duplicate_buckets").create(connection, checkfirst=True)
+    # Stored tweets are grouped by the `dedupe` command, not here: it needs
+    # the signatures of every tweet and can take a while on a large library
+
+
+def _analytics_rollups(connection: Connection) -> None:
+    from sqlalchemy.orm import Session
+
+    from src.adapters.db.repository import SqlAlchemyRepository
+
+    for name in ("topic_day_counts", "author_day_counts", "author_counts"):
+        _table(name).create(connection, checkfirst=True)
+    # Count the tweets stored so far; the session joins this transaction
+    SqlAlchemyRepository(Session(bind=connection)).rebuild_analytics()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "classification token usage", _token_usage),
+    Migration(2, "topic aliases", _topic_aliases),
+    Migration(3, "classification retry schedule", _classification_retries),
+    Migration(4, "reclassify-all jobs", _reclassify_jobs),
+    Migration(5, "classification history", _classification_history),
+    Migration(6, "data version for cached reads", _data_version),
+    Migration(7, "media_urls decoded from media_blobs", _media_urls),
+    Migration(8, "tweet content fingerprints", _content_hash),
+    Migration(9, "indexes for the list queries", _list_query_indexes),
+    Migration(10, "PostgreSQL JSONB topics and trigram search indexes", _postgresql_search),
+    Migration(11, "bookmarks per account", _account_bookmarks),
+    Migration(12, "local media cache", _media_cache),
+    Migration(13, "quote, reply and retweet index", _tweet_edges),
+    Migration(14, "near-duplicate clusters", _near_duplicates),
+    Migration(15, "analytics rollups", _analytics_rollups),
+]
+
+
+def _ensure_migrations_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(
+        text(
+            "INSERT INTO schema_migrations (version, name, applied_at) "
+            "VALUES (:version, :name, :applied_at)"
+        ),
+        {"version": migration.version, "name": migration.name, "applied_at": datetime.utcnow()},
+    )
+
+
+def applied_versions(connection: Connection) -> Dict[int, datetime]:
+    if not inspect(connection).has_table("schema_migrations"):
+        return {}
+    rows = connection.execute(text("SELECT version, applied_at FROM schema_migrations"))
+    return {version: applied_at for version, applied_at in rows}
+
+
+def migration_status(engine: Engine) -> List[Tuple[Migration, Optional[datetime]]]:
+    """Every known migration with when it was applied (None if pending)."""
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [(m, applied.get(m.version)) for m in MIGRATIONS]
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    return [m for m, applied_at in migration_status(engine) if applied_at is None]
+
+
+def migrate(engine: Engine, redo: Optional[List[int]] = None) -> List[Migration]:
+    """Apply pending migrations in order, each in its own transaction.
+
+    Versions in `redo` run again even if applied already.
+    """
+    with engine.begin() as connection:
+        _ensure_migrations_table(connection)
+        for version in redo or []:
+            connection.execute(
+                text("DELETE FROM schema_migrations WHERE version = :version"),
+                {"version": version},
+            )
+    ran = []
+    for migration in pending_migrations(engine):
+        logger.info(f"Applying migration {migration.version}: {migration.name}")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _record(connection, migration)
+        ran.append(migration)
+    return ran
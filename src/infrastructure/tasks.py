@@ -1,41 +1,62 @@
-"""Celery tasks for background processing."""
+"""Celery tasks for background processing.
+
+Tasks that read or write bookmarks take a `partition`: an account's own
+database (see infrastructure.accounts), or None for the main one.
+"""
 
 import asyncio
 import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
 
 from src.infrastructure.celery_app import celery_app
 from src.infrastructure.config import get_settings
-from src.infrastructure.database import SessionLocal
-from src.infrastructure.ai.groq_client import GroqConfig
+from src.infrastructure.database import SessionLocal, account_partitions
+from src.infrastructure.metrics import CELERY_TASK_DURATION
+# Binds the use cases' announcements to the /api/events publisher
+import src.infrastructure.events  # noqa: F401
 from src.adapters.db.repository import SqlAlchemyRepository
-from src.adapters.ai.groq_classifier import GroqTweetClassifier
+from src.adapters.ai.registry import build_classifier, classifier_configured
+from src.adapters.embeddings.factory import configured_index_hook
 from src.use_cases.classify_tweets import classify_pending_tweets
+from src.use_cases.consolidate_topics import consolidate_topics
+from src.use_cases.reclassify_all import (
+    mark_reclassify_job,
+    reclassify_progress,
+    refresh_reclassify_job,
+    stalled_reclassify_jobs,
+)
 
 logger = logging.getLogger(__name__)
 
 
-async def _run_classification(batch_size: int) -> dict:
+async def _run_classification(batch_size: int, partition: Optional[str] = None) -> dict:
     """Async classification runner."""
     settings = get_settings()
 
-    if not settings.groq_api_key:
-        logger.warning("GROQ_API_KEY not configured, skipping classification")
-        return {"skipped": True, "reason": "no_api_key"}
-
-    config = GroqConfig(
-        api_key=settings.groq_api_key,
-        model=settings.groq_model,
-        base_url=settings.groq_base_url,
-        timeout=settings.groq_timeout,
-    )
+    if not classifier_configured(settings):
+        logger.warning(
+            f"No classifier backend configured ({settings.classifier_backends}), "
+            "skipping classification"
+        )
+        return {"skipped": True, "reason": "no_backend"}
 
-    db = SessionLocal()
+    db = SessionLocal(partition)
     try:
         repo = SqlAlchemyRepository(db)
-        classifier = GroqTweetClassifier(config)
+        classifier = build_classifier(repo, settings, partition)
 
         async with classifier:
-            result = await classify_pending_tweets(repo, classifier, batch_size)
+            result = await classify_pending_tweets(
+                repo,
+                classifier,
+                batch_size,
+                priority=settings.classification_priority,
+                daily_token_budget=settings.classification_daily_token_budget,
+                max_retries=settings.classification_max_retries,
+                on_classified=configured_index_hook(),
+            )
             logger.info(f"Classification complete: {result}")
             return result
     finally:
@@ -43,17 +64,175 @@ async def _run_classification(batch_size: int) -> dict:
 
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
-def classify_tweets_task(self, batch_size: int = 20):
+def classify_tweets_task(self, batch_size: int = 20, partition: Optional[str] = None):
     """
     Celery task for tweet classification.
 
     Uses asyncio.run() to execute the async classification in a sync context.
     Retries up to 3 times on failure with 60s delay.
     """
+    start = time.perf_counter()
     try:
-        logger.info(f"Starting classification task (batch_size={batch_size})")
-        result = asyncio.run(_run_classification(batch_size))
+        logger.info(
+            f"Starting classification task (batch_size={batch_size}, partition={partition})"
+        )
+        result = asyncio.run(_run_classification(batch_size, partition))
+        CELERY_TASK_DURATION.observe(
+            time.perf_counter() - start, task="classify_tweets", outcome="success"
+        )
         return result
     except Exception as exc:
+        CELERY_TASK_DURATION.observe(
+            time.perf_counter() - start, task="classify_tweets", outcome="error"
+        )
         logger.error(f"Classification task failed: {exc}")
         raise self.retry(exc=exc)
+
+
+@celery_app.task
+def retry_failed_classifications_task(partition: Optional[str] = None):
+    """Queue a classification batch when failed tweets are due for retry,
+    and resume reclassify jobs that stopped making progress."""
+    settings = get_settings()
+    db = SessionLocal(partition)
+    try:
+        repo = SqlAlchemyRepository(db)
+        due = repo.count_due_retries(datetime.utcnow())
+        stalled = stalled_reclassify_jobs(
+            repo, timedelta(seconds=settings.reclassify_stale_seconds)
+        )
+    finally:
+        db.close()
+    if due:
+        logger.info(f"{due} failed tweets due for retry")
+        classify_tweets_task.delay(
+            min(due, settings.classification_batch_size), partition=partition
+        )
+    for job in stalled:
+        logger.info(f"Resuming stalled reclassify job {job.id} ({job.status})")
+        reclassify_job_task.delay(job.id, partition=partition)
+    return {"due": due, "resumed": [job.id for job in stalled]}
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def reclassify_job_task(self, job_id: int, partition: Optional[str] = None):
+    """
+    Run a reclassify-all job: queue its tweets chunk by chunk, then drain
+    them with classification batches.
+
+    Safe to run again after a crash; marking resumes from the job's cursor.
+    Draining stops early when a batch is skipped (e.g. token budget spent)
+    and is picked up later by the scheduled batches or the retry poller.
+    """
+    settings = get_settings()
+    start = time.perf_counter()
+    outcome = "error"
+    db = SessionLocal(partition)
+    try:
+        repo = SqlAlchemyRepository(db)
+        job = mark_reclassify_job(repo, job_id, settings.reclassify_chunk_size)
+        while job.status == "classifying":
+            result = asyncio.run(
+                _run_classification(settings.classification_batch_size, partition)
+            )
+            job = refresh_reclassify_job(repo, job_id)
+            if result.get("skipped") or not result.get("processed"):
+                break
+            if job.status == "classifying":
+                # Heartbeat, so the retry poller doesn't start a second runner.
+                job = repo.set_reclassify_job_status(job_id, "classifying")
+        outcome = "success"
+        return reclassify_progress(repo, job)
+    except Exception as exc:
+        logger.error(f"Reclassify job {job_id} failed: {exc}")
+        raise self.retry(exc=exc)
+    finally:
+        db.close()
+        CELERY_TASK_DURATION.observe(
+            time.perf_counter() - start, task="reclassify_job", outcome=outcome
+        )
+
+
+async def _run_topic_consolidation(partition: Optional[str] = None) -> dict:
+    settings = get_settings()
+    embedder = None
+    if settings.embeddings_enabled:
+        from src.adapters.embeddings.factory import get_embedder
+
+        embedder = get_embedder()
+
+    db = SessionLocal(partition)
+    try:
+        report = await consolidate_topics(
+            SqlAlchemyRepository(db),
+            threshold=settings.topic_merge_threshold,
+            embedder=embedder,
+            auto_approve_score=settings.topic_auto_merge_score,
+        )
+        return {
+            "topics": report.topics,
+            "proposed": len(report.proposed),
+            "auto_approved": report.auto_approved,
+            "tweets_updated": report.tweets_updated,
+        }
+    finally:
+        db.close()
+
+
+@celery_app.task
+def consolidate_topics_task(partition: Optional[str] = None):
+    """Propose (and optionally auto-approve) topic alias merges."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = asyncio.run(_run_topic_consolidation(partition))
+        outcome = "success"
+        return result
+    finally:
+        CELERY_TASK_DURATION.observe(
+            time.perf_counter() - start, task="consolidate_topics", outcome=outcome
+        )
+
+
+async def _run_media_cache(partition: Optional[str] = None) -> dict:
+    from src.infrastructure.media.downloader import configured_downloader
+    from src.use_cases.cache_media import cache_due_media
+
+    settings = get_settings()
+    db = SessionLocal(partition)
+    try:
+        async with configured_downloader() as downloader:
+            return await cache_due_media(
+                SqlAlchemyRepository(db),
+                downloader,
+                batch_size=settings.media_batch_size,
+                max_attempts=settings.media_max_attempts,
+            )
+    finally:
+        db.close()
+
+
+@celery_app.task
+def cache_media_task(partition: Optional[str] = None):
+    """Download media that is pending or due for a retry into the local cache."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = asyncio.run(_run_media_cache(partition))
+        outcome = "success"
+        return result
+    finally:
+        CELERY_TASK_DURATION.observe(
+            time.perf_counter() - start, task="cache_media", outcome=outcome
+        )
+
+
+@celery_app.task
+def for_each_database_task(task_name: str, *args):
+    """Queue `task_name` for the main database and every account database.
+    Celery beat runs this instead of the task itself when accounts are
+    partitioned."""
+    partitions = [None, *account_partitions()]
+    for partition in partitions:
+        celery_app.send_task(task_name, args=args, kwargs={"partition": partition})
+    return {"task": task_name, "databases": len(partitions)}
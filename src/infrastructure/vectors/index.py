@@ -0,0 +1,68 @@
+"""Tweet-level facade over the vector store and its IVF index.
+
+Tweet ids are stored as int64 keys. Ids that can't be keys (see `to_key`)
+are never in the index: they are skipped on write and not found on read.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.interfaces import VectorIndex
+from src.infrastructure.vectors.ivf import IVFIndex
+from src.infrastructure.vectors.store import VectorStore, to_key
+
+
+class LocalVectorIndex(VectorIndex):
+    def __init__(
+        self,
+        directory: str,
+        dim: int,
+        dtype: str = "float16",
+        model: str = "",
+        nprobe: int = 8,
+    ):
+        self.store = VectorStore(directory, dim=dim, dtype=dtype, model=model)
+        self.ann = IVFIndex(self.store, nprobe=nprobe)
+
+    def upsert(self, rest_ids: Sequence[str], vectors: np.ndarray) -> None:
+        keys = [to_key(r) for r in rest_ids]
+        valid = [i for i, key in enumerate(keys) if key is not None]
+        if not valid:
+            return
+        if len(valid) < len(keys):
+            keys, vectors = [keys[i] for i in valid], vectors[valid]
+        with self.store.write_lock():
+            rows = self.store.upsert_locked(keys, vectors)
+            self.ann.add(rows, vectors)
+
+    def remove(self, rest_ids: Sequence[str]) -> None:
+        self.store.delete(_keys(rest_ids))
+
+    def vector_for(self, rest_id: str) -> Optional[np.ndarray]:
+        key = to_key(rest_id)
+        if key is None:
+            return None
+        self.store.refresh()
+        return self.store.vector(key)
+
+    def search(
+        self, vector: np.ndarray, k: int = 10, exclude: Sequence[str] = ()
+    ) -> List[Tuple[str, float]]:
+        hits = self.ann.search(vector, k=k, exclude=_keys(exclude))
+        return [(str(key), score) for key, score in hits]
+
+    def retrain(self) -> None:
+        with self.store.write_lock():
+            self.ann.train()
+
+    def clear(self) -> None:
+        self.store.clear()
+        self.ann.train()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+
+def _keys(rest_ids: Sequence[str]) -> List[int]:
+    return [key for key in map(to_key, rest_ids) if key is not None]
@@ -0,0 +1,207 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index over a VectorStore.
+
+Vectors are L2-normalised, so cosine similarity is a dot product. Training
+runs spherical k-means on a sample to get ``nlist`` centroids, and every row
+is assigned to its nearest centroid. A query only scores the rows in the
+``nprobe`` closest lists, about ``nprobe / nlist`` of the data. New rows are
+assigned incrementally, and the index retrains once the store has grown 4x
+since the last training. Small stores are searched exactly.
+
+Files (next to the store): ``centroids.npy``, ``lists.i32`` (row -> list id)
+and ``ivf.json``.
+"""
+
+import json
+import os
+from typing import List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.infrastructure.vectors.store import VectorStore
+
+EXACT_SEARCH_BELOW = 20_000
+RETRAIN_GROWTH = 4
+TRAIN_SAMPLE = 50_000
+SCAN_CHUNK = 65_536
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def spherical_kmeans(
+    data: np.ndarray, k: int, iterations: int = 15, seed: int = 0
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        counts = np.bincount(assignment, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters from random points.
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    def __init__(self, store: VectorStore, nprobe: int = 8, nlist: Optional[int] = None):
+        self.store = store
+        self.nprobe = nprobe
+        self.nlist = nlist
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_count = 0
+        self._lists: Optional[np.ndarray] = None
+        self._meta_mtime: Optional[int] = None
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.store.directory, name)
+
+    # --- persistence ------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            with open(self._path("ivf.json")) as f:
+                meta = json.load(f)
+            self.centroids = np.load(self._path("centroids.npy"))
+            self.trained_count = meta["trained_count"]
+            lists = np.fromfile(self._path("lists.i32"), dtype=np.int32)
+            self._lists = lists
+            self._meta_mtime = os.stat(self._path("ivf.json")).st_mtime_ns
+        except FileNotFoundError:
+            self.centroids = None
+            self.trained_count = 0
+            self._lists = None
+
+    def _save(self) -> None:
+        np.save(self._path("centroids.npy"), self.centroids)
+        self._lists.astype(np.int32).tofile(self._path("lists.i32"))
+        tmp = self._path("ivf.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"trained_count": self.trained_count, "nlist": len(self.centroids)}, f)
+        os.replace(tmp, self._path("ivf.json"))
+        self._meta_mtime = os.stat(self._path("ivf.json")).st_mtime_ns
+
+    def refresh(self) -> None:
+        self.store.refresh()
+        try:
+            mtime = os.stat(self._path("ivf.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._meta_mtime:
+            self._load()
+
+    # --- training / insertion --------------------------------------------
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def _nlist_for(self, n: int) -> int:
+        if self.nlist:
+            return self.nlist
+        return int(np.clip(np.sqrt(n), 16, 4096))
+
+    def train(self) -> None:
+        rows = self.store.live_rows()
+        if len(rows) < EXACT_SEARCH_BELOW:
+            self.centroids = None
+            self._lists = None
+            for name in ("ivf.json", "centroids.npy", "lists.i32"):
+                try:
+                    os.remove(self._path(name))
+                except FileNotFoundError:
+                    pass
+            return
+
+        rng = np.random.default_rng(0)
+        sample = rows if len(rows) <= TRAIN_SAMPLE else rng.choice(rows, TRAIN_SAMPLE, replace=False)
+        nlist = min(self._nlist_for(len(rows)), len(sample))
+        self.centroids = spherical_kmeans(self.store.vectors(np.sort(sample)), nlist)
+
+        self._lists = np.full(self.store.count, -1, dtype=np.int32)
+        for start in range(0, self.store.count, SCAN_CHUNK):
+            chunk = np.arange(start, min(start + SCAN_CHUNK, self.store.count))
+            self._lists[chunk] = np.argmax(
+                self.store.vectors(chunk) @ self.centroids.T, axis=1
+            )
+        self._lists[self.store.keys() < 0] = -1
+        self.trained_count = len(rows)
+        self._save()
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Assign freshly upserted rows; retrain when the store has outgrown the centroids."""
+        live = len(self.store)
+        if not self.trained:
+            if live >= EXACT_SEARCH_BELOW:
+                self.train()
+            return
+        if live >= self.trained_count * RETRAIN_GROWTH:
+            self.train()
+            return
+
+        if len(self._lists) < self.store.count:
+            grown = np.full(self.store.count, -1, dtype=np.int32)
+            grown[: len(self._lists)] = self._lists
+            self._lists = grown
+        self._lists[rows] = np.argmax(
+            np.asarray(vectors, dtype=np.float32) @ self.centroids.T, axis=1
+        )
+        self._save()
+
+    # --- search -----------------------------------------------------------
+
+    def _candidate_rows(self, query: np.ndarray) -> np.ndarray:
+        if not self.trained or self._lists is None:
+            return self.store.live_rows()
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes = np.argsort(-(self.centroids @ query))[:nprobe]
+        lists = self._lists[: self.store.count]
+        candidates = np.nonzero(np.isin(lists, probes))[0]
+        # Rows added since the lists were last saved by another process.
+        unassigned = np.arange(len(lists), self.store.count)
+        return np.concatenate([candidates, unassigned])
+
+    def search(
+        self, query: np.ndarray, k: int = 10, exclude: Sequence[int] = ()
+    ) -> List[Tuple[int, float]]:
+        """Top-k (key, cosine similarity) pairs for `query`."""
+        self.refresh()
+        if len(self.store) == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        excluded: Set[int] = {int(e) for e in exclude}
+        keys = self.store.keys()
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        candidates = self._candidate_rows(query)
+        for start in range(0, len(candidates), SCAN_CHUNK):
+            rows = candidates[start:start + SCAN_CHUNK]
+            rows = rows[keys[rows] >= 0]
+            if not len(rows):
+                continue
+            scores = self.store.vectors(rows) @ query
+            best_scores = np.concatenate([best_scores, scores])
+            best_rows = np.concatenate([best_rows, rows])
+            keep = k + len(excluded)
+            if len(best_scores) > keep:
+                top = np.argpartition(-best_scores, keep)[:keep]
+                best_scores, best_rows = best_scores[top], best_rows[top]
+
+        order = np.argsort(-best_scores)
+        results = []
+        for i in order:
+            key = int(keys[best_rows[i]])
+            if key in excluded:
+                continue
+            results.append((key, float(best_scores[i])))
+            if len(results) >= k:
+                break
+        return results
@@ -0,0 +1,265 @@
+"""Append-only, memory-mapped vector storage.
+
+Layout of a store directory:
+
+    meta.json     dim, dtype, count, capacity, model
+    keys.i64      int64 tweet ids, one per row (-1 = deleted)
+    vectors.bin   row-major float16 or int8 vectors
+    scales.f32    per-row dequantisation scale (int8 only)
+
+Files grow by doubling, so appends are amortised O(1) and readers map the
+data instead of loading it. Writers take an exclusive ``fcntl`` lock on
+``.lock``; readers notice a changed ``meta.json`` and remap.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+DTYPES = {"float16": np.float16, "int8": np.int8}
+INITIAL_CAPACITY = 1024
+
+
+class VectorStore:
+    def __init__(self, directory: str, dim: int, dtype: str = "float16", model: str = ""):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.directory = directory
+        self.dim = dim
+        self.dtype = dtype
+        self.model = model
+        os.makedirs(directory, exist_ok=True)
+
+        self._meta_mtime: Optional[float] = None
+        self.count = 0
+        self.capacity = 0
+        self._keys: Optional[np.memmap] = None
+        self._vectors: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._rows: Dict[int, int] = {}
+
+        if os.path.exists(self._path("meta.json")):
+            self._load()
+        else:
+            with self.write_lock():
+                self._allocate(INITIAL_CAPACITY)
+                self._write_meta()
+
+    # --- files ------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        with open(self._path(".lock"), "a+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _map(self, name: str, dtype, shape, mode: str = "r+") -> np.memmap:
+        return np.memmap(self._path(name), dtype=dtype, mode=mode, shape=shape)
+
+    def _allocate(self, capacity: int) -> None:
+        """Create or grow the backing files to `capacity` rows and remap."""
+        itemsize = np.dtype(DTYPES[self.dtype]).itemsize
+        sizes = {
+            "keys.i64": capacity * 8,
+            "vectors.bin": capacity * self.dim * itemsize,
+        }
+        if self.dtype == "int8":
+            sizes["scales.f32"] = capacity * 4
+        for name, size in sizes.items():
+            with open(self._path(name), "ab") as f:
+                f.truncate(size)
+
+        if self.capacity == 0:
+            # Fresh files are zero-filled; mark every key slot as empty.
+            keys = self._map("keys.i64", np.int64, (capacity,))
+            keys[:] = -1
+            keys.flush()
+        elif capacity > self.capacity:
+            keys = self._map("keys.i64", np.int64, (capacity,))
+            keys[self.capacity:] = -1
+            keys.flush()
+
+        self.capacity = capacity
+        self._remap()
+
+    def _remap(self) -> None:
+        self._keys = self._map("keys.i64", np.int64, (self.capacity,))
+        self._vectors = self._map(
+            "vectors.bin", DTYPES[self.dtype], (self.capacity, self.dim)
+        )
+        self._scales = (
+            self._map("scales.f32", np.float32, (self.capacity,))
+            if self.dtype == "int8"
+            else None
+        )
+        keys = np.asarray(self._keys[: self.count])
+        live = np.nonzero(keys >= 0)[0]
+        self._rows = dict(zip(keys[live].tolist(), live.tolist()))
+
+    def _write_meta(self) -> None:
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "count": self.count,
+            "capacity": self.capacity,
+            "model": self.model,
+        }
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path("meta.json"))
+        self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+
+    def _load(self) -> None:
+        with open(self._path("meta.json")) as f:
+            meta = json.load(f)
+        if meta["dim"] != self.dim or meta["dtype"] != self.dtype:
+            raise ValueError(
+                f"Vector store at {self.directory} has dim={meta['dim']} "
+                f"dtype={meta['dtype']}; expected dim={self.dim} dtype={self.dtype}. "
+                "Rebuild it with `main.py embed --rebuild`."
+            )
+        if self.model and meta.get("model") and meta["model"] != self.model:
+            raise ValueError(
+                f"Vector store was built with {meta['model']}, not {self.model}. "
+                "Rebuild it with `main.py embed --rebuild`."
+            )
+        self.model = meta.get("model") or self.model
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+        self._remap()
+
+    def refresh(self) -> bool:
+        """Remap if another process has written since we last looked."""
+        try:
+            mtime = os.stat(self._path("meta.json")).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._meta_mtime:
+            return False
+        self._load()
+        return True
+
+    # --- data -------------------------------------------------------------
+
+    def _encode(self, vectors: np.ndarray):
+        if self.dtype == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def upsert(self, keys: Sequence[int], vectors: np.ndarray) -> np.ndarray:
+        """Insert or overwrite vectors for `keys`. Returns their row numbers."""
+        with self.write_lock():
+            return self.upsert_locked(keys, vectors)
+
+    def upsert_locked(self, keys: Sequence[int], vectors: np.ndarray) -> np.ndarray:
+        """`upsert` for callers already holding `write_lock()`."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim})")
+
+        self.refresh()
+        rows = np.empty(len(keys), dtype=np.int64)
+        new = {int(k) for k in keys if int(k) not in self._rows}
+        needed = self.count + len(new)
+        if needed > self.capacity:
+            capacity = max(self.capacity, INITIAL_CAPACITY)
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+
+        for i, key in enumerate(keys):
+            row = self._rows.get(int(key))
+            if row is None:
+                row = self.count
+                self.count += 1
+                self._rows[int(key)] = row
+                self._keys[row] = int(key)
+            rows[i] = row
+
+        encoded, scales = self._encode(vectors)
+        self._vectors[rows] = encoded
+        if scales is not None:
+            self._scales[rows] = scales
+        self._keys.flush()
+        self._vectors.flush()
+        if self._scales is not None:
+            self._scales.flush()
+        self._write_meta()
+        return rows
+
+    def delete(self, keys: Sequence[int]) -> None:
+        with self.write_lock():
+            self.refresh()
+            for key in keys:
+                row = self._rows.pop(int(key), None)
+                if row is not None:
+                    self._keys[row] = -1
+            self._keys.flush()
+            self._write_meta()
+
+    def row_of(self, key: int) -> Optional[int]:
+        return self._rows.get(int(key))
+
+    def keys(self) -> np.ndarray:
+        return np.asarray(self._keys[: self.count])
+
+    def vectors(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dequantised float32 vectors for `rows` (all rows if None)."""
+        if rows is None:
+            rows = np.arange(self.count)
+        data = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self._scales is not None:
+            data *= np.asarray(self._scales[rows])[:, None]
+        return data
+
+    def vector(self, key: int) -> Optional[np.ndarray]:
+        row = self.row_of(key)
+        if row is None:
+            return None
+        return self.vectors(np.array([row]))[0]
+
+    def live_rows(self) -> np.ndarray:
+        return np.nonzero(self.keys() >= 0)[0]
+
+    def clear(self) -> None:
+        with self.write_lock():
+            for name in ("keys.i64", "vectors.bin", "scales.f32"):
+                try:
+                    os.remove(self._path(name))
+                except FileNotFoundError:
+                    pass
+            self.count = 0
+            self.capacity = 0
+            self._allocate(INITIAL_CAPACITY)
+            self._write_meta()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+# Row keys are int64 and -1 marks a deleted row
+MAX_KEY = 2**63 - 1
+
+
+def to_key(rest_id: str) -> Optional[int]:
+    """The row key of a tweet id, or None for ids that can't be stored
+    (not a non-negative integer, or too large for int64)."""
+    if not rest_id.isascii() or not rest_id.isdigit():
+        return None
+    key = int(rest_id)
+    return key if key <= MAX_KEY else None
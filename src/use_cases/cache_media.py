@@ -0,0 +1,62 @@
+"""Use case for copying the media of stored bookmarks into the local cache.
+
+Ingest records every media URL it sees as pending. Each run claims a batch
+of due URLs, downloads them, and records where the files went. A failed URL
+comes due again after a backoff that grows with its attempts, and is given
+up ("gone") once it has used them all.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from src.core.interfaces import BookmarkRepository, MediaDownloader
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE = timedelta(minutes=10)
+RETRY_MAX = timedelta(days=1)
+# A run that dies keeps its claimed URLs this long before others may retry them
+CLAIM_LEASE_SECONDS = 900
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return min(RETRY_BASE * 4 ** (attempts - 1), RETRY_MAX)
+
+
+async def cache_due_media(
+    repo: BookmarkRepository,
+    downloader: MediaDownloader,
+    batch_size: int = 100,
+    max_attempts: int = 5,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Download media until none is due. Returns counts per outcome."""
+    counts = {"cached": 0, "failed": 0, "gone": 0}
+    while True:
+        claimed = repo.claim_due_media(now or datetime.utcnow(), batch_size, CLAIM_LEASE_SECONDS)
+        if not claimed:
+            return counts
+        results = {r.url_hash: r for r in await downloader.download(claimed)}
+        fetched_at = datetime.utcnow()
+        for media in claimed:
+            result = results[media.url_hash]
+            media.status = result.status
+            media.last_error = result.error
+            media.next_attempt_at = None
+            if result.status == "cached":
+                media.content_hash = result.content_hash
+                media.content_type = result.content_type
+                media.size = result.size
+                media.has_thumbnail = result.has_thumbnail
+                media.fetched_at = fetched_at
+            elif result.status == "failed":
+                if media.attempts >= max_attempts:
+                    media.status = "gone"
+                else:
+                    media.next_attempt_at = fetched_at + retry_delay(media.attempts)
+            counts[media.status] += 1
+        repo.save_media(claimed)
+        logger.info(f"Media batch: {counts}")
+        if len(claimed) < batch_size:
+            return counts
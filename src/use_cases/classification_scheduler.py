@@ -0,0 +1,56 @@
+"""Decides how many pending tweets the next classification batch may take."""
+
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Optional
+
+from src.core.interfaces import BookmarkRepository
+
+# Used until enough classifications have been recorded to measure the real
+# average (prompt + completion for one tweet with the default prompt).
+DEFAULT_TOKENS_PER_CLASSIFICATION = 450
+
+
+@dataclass(frozen=True)
+class BatchPlan:
+    limit: int
+    estimated_tokens_per_tweet: float
+    tokens_remaining: Optional[int] = None
+    reason: Optional[str] = None
+
+
+def start_of_day(now: datetime) -> datetime:
+    """UTC midnight for `now` (token_usage timestamps are naive UTC)."""
+    return datetime.combine(now.date(), time.min)
+
+
+def plan_classification_batch(
+    repo: BookmarkRepository,
+    batch_size: int,
+    daily_token_budget: int = 0,
+    now: Optional[datetime] = None,
+) -> BatchPlan:
+    """
+    Size the next batch so today's spend stays within `daily_token_budget`.
+
+    A budget of 0 disables the limit. The per-tweet estimate is the recent
+    average from token_usage, so a batch is only admitted if it is expected
+    to fit in what is left of the day's budget.
+    """
+    estimate = (
+        repo.get_average_tokens_per_classification() or DEFAULT_TOKENS_PER_CLASSIFICATION
+    )
+    if daily_token_budget <= 0:
+        return BatchPlan(limit=batch_size, estimated_tokens_per_tweet=estimate)
+
+    now = now or datetime.utcnow()
+    used = repo.get_tokens_used_since(start_of_day(now))
+    remaining = max(0, daily_token_budget - used)
+    limit = min(batch_size, int(remaining // estimate)) if estimate > 0 else batch_size
+
+    return BatchPlan(
+        limit=limit,
+        estimated_tokens_per_tweet=estimate,
+        tokens_remaining=remaining,
+        reason="token_budget_exhausted" if limit == 0 else None,
+    )
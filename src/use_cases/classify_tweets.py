@@ -1,53 +1,150 @@
 """Use case for classifying tweets."""
 
 import logging
-from typing import Dict, Any
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from src.core.entities import Tweet
+
+from src.core.events import EVENTS
 from src.core.interfaces import BookmarkRepository, TweetClassifier
+from src.core.metrics import CLASSIFICATION_DURATION, CLASSIFIED_TWEETS, timed
+from src.use_cases.classification_scheduler import plan_classification_batch
+from src.use_cases.retry_policy import classify_error, next_attempt_at
 
 logger = logging.getLogger(__name__)
 
 
+@timed(CLASSIFICATION_DURATION)
 async def classify_pending_tweets(
     repo: BookmarkRepository,
     classifier: TweetClassifier,
     batch_size: int = 20,
+    priority: str = "newest",
+    daily_token_budget: int = 0,
+    max_retries: int = 3,
+    on_classified: Optional[Callable[[List[Tweet]], Awaitable[Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Process pending tweets for classification.
 
+    Tweets are taken newest-first (or most-viewed-first) and the batch is
+    shrunk, or skipped, so the day's token spend stays within
+    `daily_token_budget` (0 = unlimited). Failed tweets whose backoff has
+    expired go first; after `max_retries` retries a tweet is dead-lettered.
+    Tweets flagged by a reclassify-all job fill whatever room is left, and
+    keep their current classification if every retry fails.
+    `on_classified` receives the updated tweets after the batch, e.g. to
+    refresh the embedding index.
+
     Returns:
-        Stats dict with success/failure counts
+        Stats dict with success/failure counts and token usage
     """
     if not classifier.is_available():
         logger.warning("Classifier not available - skipping classification")
         return {"skipped": True, "reason": "classifier_unavailable"}
 
-    tweets = repo.get_unclassified_tweets(limit=batch_size)
+    plan = plan_classification_batch(repo, batch_size, daily_token_budget)
+    if plan.limit == 0:
+        logger.info(f"Skipping classification: {plan.reason}")
+        return {
+            "skipped": True,
+            "reason": plan.reason,
+            "tokens_remaining": plan.tokens_remaining,
+        }
+
+    now = datetime.utcnow()
+    tweets = repo.get_due_retries(now, limit=plan.limit)
+    if len(tweets) < plan.limit:
+        tweets += repo.get_unclassified_tweets(
+            limit=plan.limit - len(tweets), priority=priority
+        )
+    if len(tweets) < plan.limit:
+        # Re-runs from a reclassify-all job come last: they already have topics.
+        tweets += repo.get_reclassify_tweets(now, limit=plan.limit - len(tweets))
     if not tweets:
         return {"processed": 0, "success": 0, "failed": 0}
 
+    run = repo.start_classification_run(model=None)
     results = await classifier.classify_batch(tweets, max_concurrent=5)
 
     success_count = 0
     fail_count = 0
+    models: Counter = Counter()
+    classified: List[Tweet] = []
+    failed: Dict[str, str] = {}
 
     for tweet, result, error in results:
         if result:
-            repo.update_tweet_classification(tweet.rest_id, result)
+            classified.append(repo.update_tweet_classification(tweet.rest_id, result))
+            repo.record_token_usage(
+                tweet.rest_id,
+                model=result.model_used,
+                prompt_tokens=result.prompt_tokens,
+                completion_tokens=result.completion_tokens,
+                run_id=run.id,
+            )
+            run.prompt_tokens += result.prompt_tokens
+            run.completion_tokens += result.completion_tokens
+            models[result.model_used] += 1
             success_count += 1
+            CLASSIFIED_TWEETS.inc(outcome="success")
             logger.info(f"Classified tweet {tweet.rest_id}: {result.topics}")
         else:
+            attempt = tweet.classification_retry_count + 1
+            retry_at = next_attempt_at(error, attempt, max_retries)
+            fail_count += 1
+            if tweet.reclassify_job_id is not None:
+                repo.mark_reclassification_failed(
+                    tweet.rest_id,
+                    error_type=classify_error(error),
+                    retry_count=attempt,
+                    next_attempt_at=retry_at,
+                )
+                CLASSIFIED_TWEETS.inc(outcome="failed" if retry_at else "kept")
+                logger.warning(f"Failed to reclassify tweet {tweet.rest_id}: {error}")
+                continue
+
             repo.mark_classification_failed(
                 tweet.rest_id,
-                error_type=type(error).__name__ if error else "unknown",
-                retry_count=tweet.classification_retry_count + 1,
+                error_type=classify_error(error),
+                retry_count=attempt,
+                next_attempt_at=retry_at,
             )
-            fail_count += 1
-            logger.warning(f"Failed to classify tweet {tweet.rest_id}: {error}")
+            failed[tweet.rest_id] = "failed" if retry_at else "dead"
+            if retry_at:
+                CLASSIFIED_TWEETS.inc(outcome="failed")
+                logger.warning(
+                    f"Failed to classify tweet {tweet.rest_id}: {error} (retry at {retry_at:%H:%M:%S})"
+                )
+            else:
+                CLASSIFIED_TWEETS.inc(outcome="dead")
+                logger.warning(
+                    f"Dead-lettered tweet {tweet.rest_id} after {attempt} attempts: {error}"
+                )
+
+    run.model = models.most_common(1)[0][0] if models else None
+    run.processed = len(tweets)
+    run.succeeded = success_count
+    run.failed = fail_count
+    run.finished_at = datetime.utcnow()
+    repo.finish_classification_run(run)
+
+    if classified or failed:
+        EVENTS.tweets_classified(classified, failed)
+
+    if on_classified and classified:
+        try:
+            await on_classified(classified)
+        except Exception as e:
+            logger.warning(f"Post-classification hook failed: {e}")
 
     return {
         "processed": len(tweets),
         "success": success_count,
         "failed": fail_count,
+        "run_id": run.id,
+        "prompt_tokens": run.prompt_tokens,
+        "completion_tokens": run.completion_tokens,
     }
@@ -0,0 +1,191 @@
+"""Use case for folding near-duplicate topic names into canonical ones.
+
+Topic names are compared with three signals, and the strongest one wins:
+
+- identical normalised spelling ("Machine Learning" / "machine-learning",
+  "webdev" / "web-dev", "startups" / "startup")
+- cosine similarity of TF-IDF weighted character trigram vectors, hashed
+  into a fixed width so the whole vocabulary is one numpy matrix
+- cosine similarity of name embeddings, when an embedder is given
+
+and acronyms of multi-word topics ("ml" / "machine-learning") are matched
+at a fixed score.
+
+Topics are visited from most to least used. Each joins the most similar
+canonical topic above the threshold, or becomes canonical itself. Merges
+never chain, and the canonical name is always the more popular spelling.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.entities import TopicAlias
+from src.core.interfaces import BookmarkRepository, TextEmbedder
+from src.core.topics import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+NGRAM_DIM = 1024
+ROW_CHUNK = 1024
+ACRONYM_SCORE = 0.85
+
+
+@dataclass
+class ConsolidationReport:
+    topics: int
+    proposed: List[TopicAlias]
+    auto_approved: int = 0
+    tweets_updated: int = 0
+
+
+def _trigrams(name: str) -> List[str]:
+    padded = f" {name.replace('-', ' ')} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def ngram_matrix(names: List[str], dim: int = NGRAM_DIM) -> np.ndarray:
+    """L2-normalised TF-IDF character-trigram vectors, one row per name."""
+    rows, cols = [], []
+    for row, name in enumerate(names):
+        for gram in _trigrams(name):
+            digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest()
+            rows.append(row)
+            cols.append(int.from_bytes(digest, "little") % dim)
+
+    counts = np.zeros((len(names), dim), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), 1.0)
+
+    document_freq = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(names)) / (1 + document_freq)) + 1.0
+    weighted = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    return weighted / np.maximum(norms, 1e-12)
+
+
+def _match_key(name: str) -> str:
+    """Spelling-insensitive key: separators dropped, simple plurals singular."""
+    words = []
+    for word in name.split("-"):
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return "".join(words)
+
+
+def _acronym(name: str) -> Optional[str]:
+    parts = [p for p in name.split("-") if p]
+    return "".join(p[0] for p in parts) if len(parts) >= 2 else None
+
+
+def propose_merges(
+    counts: Dict[str, int],
+    threshold: float = 0.8,
+    name_vectors: Optional[np.ndarray] = None,
+    rejected: Optional[set] = None,
+) -> List[TopicAlias]:
+    """Alias proposals for `counts` (topic -> usage).
+
+    `name_vectors` are optional normalised embeddings aligned with the
+    topics sorted by count; `rejected` holds (alias, canonical) pairs that
+    were turned down before and must not be proposed again.
+    """
+    names = sorted(counts, key=lambda n: (-counts[n], n))
+    if len(names) < 2:
+        return []
+    rejected = rejected or set()
+    normalized = [normalize_topic(n) for n in names]
+    keys = [_match_key(n) for n in normalized]
+    grams = ngram_matrix(normalized)
+
+    acronyms: Dict[str, int] = {}
+    for i, norm in enumerate(normalized):
+        acronym = _acronym(norm)
+        if acronym and acronym not in acronyms:
+            acronyms[acronym] = i
+
+    is_canonical = np.zeros(len(names), dtype=bool)
+    first_by_key: Dict[str, int] = {}
+    proposals: List[TopicAlias] = []
+
+    for start in range(0, len(names), ROW_CHUNK):
+        stop = min(start + ROW_CHUNK, len(names))
+        # Similarity of this chunk against every more popular topic.
+        sims = grams[start:stop] @ grams[:stop].T
+        if name_vectors is not None:
+            sims = np.maximum(sims, name_vectors[start:stop] @ name_vectors[:stop].T)
+
+        for offset, i in enumerate(range(start, stop)):
+            name, norm, key = names[i], normalized[i], keys[i]
+            best, score = None, 0.0
+            expansion = first_by_key.get(_acronym(norm) or "", i)
+
+            if key in first_by_key:
+                best, score = first_by_key[key], 1.0
+            else:
+                row = np.where(is_canonical[:stop], sims[offset], -1.0)
+                j = int(np.argmax(row))
+                if row[j] >= threshold:
+                    best, score = j, float(row[j])
+                elif is_canonical[acronyms.get(norm, i)]:
+                    # "ml" after "machine-learning"
+                    best, score = acronyms[norm], ACRONYM_SCORE
+                elif is_canonical[expansion]:
+                    # "artificial-intelligence" after "ai"
+                    best, score = expansion, ACRONYM_SCORE
+
+            if best is not None and (name, names[best]) not in rejected:
+                proposals.append(
+                    TopicAlias(alias=name, canonical=names[best], score=round(score, 4))
+                )
+                first_by_key.setdefault(key, best)
+                continue
+
+            is_canonical[i] = True
+            first_by_key.setdefault(key, i)
+
+    return proposals
+
+
+async def consolidate_topics(
+    repo: BookmarkRepository,
+    threshold: float = 0.8,
+    embedder: Optional[TextEmbedder] = None,
+    auto_approve_score: float = 0.0,
+) -> ConsolidationReport:
+    """Propose aliases for the current topics and store them for review.
+
+    Proposals scoring at least `auto_approve_score` (when > 0) are approved
+    and applied to stored tweets immediately.
+    """
+    counts = repo.get_topic_counts()
+    # Topics already folded into a canonical are not re-clustered.
+    approved = {a.alias for a in repo.get_topic_aliases("approved")}
+    counts = {t: c for t, c in counts.items() if t not in approved}
+    rejected = {(a.alias, a.canonical) for a in repo.get_topic_aliases("rejected")}
+
+    name_vectors = None
+    if embedder is not None and len(counts) >= 2:
+        names = sorted(counts, key=lambda n: (-counts[n], n))
+        name_vectors = await embedder.embed([n.replace("-", " ") for n in names])
+
+    proposals = propose_merges(counts, threshold, name_vectors, rejected)
+    auto = 0
+    if auto_approve_score > 0:
+        for alias in proposals:
+            if alias.score >= auto_approve_score:
+                alias.status = "approved"
+                auto += 1
+    repo.save_topic_aliases(proposals)
+
+    updated = repo.apply_topic_aliases() if auto else 0
+    logger.info(
+        f"Topic consolidation: {len(counts)} topics, {len(proposals)} proposals, "
+        f"{auto} auto-approved, {updated} tweets updated"
+    )
+    return ConsolidationReport(
+        topics=len(counts), proposed=proposals, auto_approved=auto, tweets_updated=updated
+    )
@@ -0,0 +1,28 @@
+"""Use case for grouping stored tweets into near-duplicate clusters.
+
+Ingest groups tweets as they arrive (see sync_bookmarks). This walks the
+tweets stored before grouping existed, or after the threshold changed.
+"""
+
+import logging
+
+from src.core.interfaces import BookmarkRepository
+
+logger = logging.getLogger(__name__)
+
+
+def dedupe_tweets(repo: BookmarkRepository, threshold: float, batch_size: int = 1000) -> int:
+    """Group every stored tweet, walking the table in rest_id order (roughly
+    posting order), and return how many are near-duplicates of another."""
+    total = 0
+    joined = 0
+    after = None
+    while True:
+        tweets = repo.get_tweets_page(after_rest_id=after, limit=batch_size)
+        if not tweets:
+            break
+        joined += len(repo.cluster_near_duplicates(tweets, threshold))
+        total += len(tweets)
+        after = tweets[-1].rest_id
+        logger.info(f"Grouped {total} tweets, {joined} near-duplicates")
+    return joined
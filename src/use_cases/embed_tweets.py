@@ -0,0 +1,62 @@
+"""Use cases for keeping the tweet embedding index up to date."""
+
+import logging
+from typing import Awaitable, Callable, List
+
+from src.core.entities import Tweet
+from src.core.interfaces import BookmarkRepository, TextEmbedder, VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_text(tweet: Tweet) -> str:
+    """Text that represents a tweet in the vector space: body, summary, topics."""
+    parts = [tweet.text or ""]
+    if tweet.summary:
+        parts.append(tweet.summary)
+    if tweet.topics:
+        parts.append(" ".join(tweet.topics))
+    return "\n".join(p for p in parts if p)
+
+
+async def index_tweets(
+    embedder: TextEmbedder, index: VectorIndex, tweets: List[Tweet]
+) -> int:
+    """Embed `tweets` and upsert them into the index."""
+    tweets = [t for t in tweets if t.rest_id and (t.text or t.summary)]
+    if not tweets:
+        return 0
+    vectors = await embedder.embed([embedding_text(t) for t in tweets])
+    index.upsert([t.rest_id for t in tweets], vectors)
+    return len(tweets)
+
+
+def make_index_hook(
+    embedder: TextEmbedder, index: VectorIndex
+) -> Callable[[List[Tweet]], Awaitable[int]]:
+    """Callback for `classify_pending_tweets` that indexes freshly classified tweets."""
+
+    async def hook(tweets: List[Tweet]) -> int:
+        return await index_tweets(embedder, index, tweets)
+
+    return hook
+
+
+async def backfill_embeddings(
+    repo: BookmarkRepository,
+    embedder: TextEmbedder,
+    index: VectorIndex,
+    batch_size: int = 256,
+) -> int:
+    """Embed every stored tweet, walking the table in rest_id order."""
+    total = 0
+    after = None
+    while True:
+        tweets = repo.get_tweets_page(after_rest_id=after, limit=batch_size)
+        if not tweets:
+            break
+        total += await index_tweets(embedder, index, tweets)
+        after = tweets[-1].rest_id
+        logger.info(f"Embedded {total} tweets")
+    index.retrain()
+    return total
@@ -0,0 +1,84 @@
+"""Use case for re-running classification over the whole library.
+
+A job walks the tweets table in id order, one keyset chunk per short
+transaction, with its cursor stored alongside the chunk. Completed tweets are
+only flagged: they keep their topics and summary until the new result lands,
+so the UI never goes blank. The flagged tweets are drained by the normal
+classification batches, after new and retrying tweets.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from src.core.entities import ReclassifyJob
+from src.core.interfaces import BookmarkRepository
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ["marking", "classifying"]
+
+
+def start_reclassify_job(
+    repo: BookmarkRepository, status: Optional[str] = None
+) -> ReclassifyJob:
+    """Create a job for every tweet, or only those with classification `status`."""
+    job = repo.create_reclassify_job(status)
+    logger.info(f"Reclassify job {job.id} created for {job.total} tweets")
+    return job
+
+
+def mark_reclassify_job(
+    repo: BookmarkRepository, job_id: int, chunk_size: int = 500
+) -> ReclassifyJob:
+    """Queue the rest of a job's tweets, chunk by chunk, from its saved cursor."""
+    job = repo.advance_reclassify_job(job_id, chunk_size)
+    while job.status == "marking":
+        job = repo.advance_reclassify_job(job_id, chunk_size)
+    logger.info(
+        f"Reclassify job {job_id}: {job.flagged} flagged, {job.requeued} requeued"
+    )
+    return job
+
+
+def refresh_reclassify_job(repo: BookmarkRepository, job_id: int) -> Optional[ReclassifyJob]:
+    """Mark a job completed once none of its flagged tweets are left."""
+    job = repo.get_reclassify_job(job_id)
+    if job and job.status == "classifying" and not repo.count_reclassify_remaining(job_id):
+        job = repo.set_reclassify_job_status(job_id, "completed")
+        logger.info(f"Reclassify job {job_id} completed ({job.failed} kept old topics)")
+    return job
+
+
+def stalled_reclassify_jobs(
+    repo: BookmarkRepository, stale_after: timedelta, now: Optional[datetime] = None
+) -> List[ReclassifyJob]:
+    """Active jobs that have not made progress within `stale_after`."""
+    cutoff = (now or datetime.utcnow()) - stale_after
+    return [
+        job
+        for job in repo.get_reclassify_jobs(ACTIVE_STATUSES)
+        if job.updated_at is None or job.updated_at < cutoff
+    ]
+
+
+def reclassify_progress(repo: BookmarkRepository, job: ReclassifyJob) -> Dict[str, Any]:
+    """Progress counters for a job, suitable for the API and CLI."""
+    remaining = repo.count_reclassify_remaining(job.id) if job.status != "completed" else 0
+    reclassified = max(job.flagged - remaining - job.failed, 0)
+    done = job.requeued + reclassified + job.failed
+    return {
+        "id": job.id,
+        "status": job.status,
+        "status_filter": job.status_filter,
+        "total": job.total,
+        "flagged": job.flagged,
+        "requeued": job.requeued,
+        "reclassified": reclassified,
+        "failed": job.failed,
+        "remaining": remaining + (job.total - job.flagged - job.requeued),
+        "percent": round(100.0 * done / job.total, 1) if job.total else 100.0,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
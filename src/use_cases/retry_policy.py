@@ -0,0 +1,91 @@
+"""Backoff schedule for failed classifications.
+
+Errors are grouped by what a retry can fix. A rate limit clears within
+minutes. A malformed model response often succeeds on the next sample. A
+4xx other than 429 is most likely permanent, so it gets one late retry
+before the tweet is dead-lettered.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+RATE_LIMIT = "rate_limit"
+PARSE_ERROR = "parse_error"
+CLIENT_ERROR = "client_error"
+TRANSIENT = "transient"
+UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class Backoff:
+    base_seconds: float
+    factor: float
+    max_seconds: float
+    # Overrides the global max retries when lower
+    max_retries: Optional[int] = None
+
+
+POLICIES: Dict[str, Backoff] = {
+    RATE_LIMIT: Backoff(base_seconds=60, factor=2, max_seconds=3600),
+    TRANSIENT: Backoff(base_seconds=30, factor=2, max_seconds=1800),
+    PARSE_ERROR: Backoff(base_seconds=300, factor=4, max_seconds=6 * 3600),
+    CLIENT_ERROR: Backoff(base_seconds=3600, factor=4, max_seconds=24 * 3600, max_retries=1),
+    UNKNOWN: Backoff(base_seconds=120, factor=2, max_seconds=7200),
+}
+
+TRANSPORT_ERRORS = {"TransportError", "TimeoutException", "ConnectionError", "TimeoutError"}
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def classify_error(error: Optional[BaseException]) -> str:
+    """Map an exception from a classifier to a retry policy name."""
+    if error is None:
+        return UNKNOWN
+    status = _status_code(error)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None:
+        return TRANSIENT if status >= 500 else CLIENT_ERROR
+    if isinstance(error, (json.JSONDecodeError, KeyError, TypeError, IndexError)):
+        return PARSE_ERROR
+    # httpx errors are matched by name to keep this layer free of httpx.
+    if any(cls.__name__ in TRANSPORT_ERRORS for cls in type(error).__mro__):
+        return TRANSIENT
+    return UNKNOWN
+
+
+def _retry_after(error: Optional[BaseException]) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def next_attempt_at(
+    error: Optional[BaseException],
+    attempt: int,
+    max_retries: int,
+    now: Optional[datetime] = None,
+) -> Optional[datetime]:
+    """When to retry after failed `attempt` (1-based), or None to dead-letter."""
+    policy = POLICIES[classify_error(error)]
+    limit = min(max_retries, policy.max_retries or max_retries)
+    if attempt > limit:
+        return None
+
+    delay = min(policy.base_seconds * policy.factor ** (attempt - 1), policy.max_seconds)
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    # ±10% jitter so a burst of failures doesn't come back as a burst.
+    delay *= random.uniform(0.9, 1.1)
+    return (now or datetime.utcnow()) + timedelta(seconds=delay)
@@ -1,32 +1,225 @@
+"""Use case for ingesting bookmark timeline pages from the browser extension.
+
+The extension re-posts the same pages whenever the bookmarks page is
+revisited, so ingest is idempotent at two levels. A payload identical to
+one seen recently is dropped before parsing. Otherwise each parsed tweet is
+fingerprinted, and only tweets whose fingerprint differs from the stored one
+are written. Volatile fields (view counts, the raw GraphQL blob) are left out
+of the fingerprint, so engagement changes alone don't rewrite a row.
+
+Tweets are shared between accounts. A tweet that is unchanged but new to
+the ingesting account is still written, to record it as that account's
+bookmark.
+
+Written tweets are then grouped with stored near-duplicates (the same text
+reposted, or edited by a word or two). A tweet that joins a group isn't
+classified on its own: it mirrors the group's representative, and it isn't
+announced as a new bookmark.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from src.adapters.twitter.parser import TwitterParser
-from src.core.entities import Account
+from src.core.entities import Account, Tweet
+from src.core.events import EVENTS
 from src.core.interfaces import BookmarkRepository
+from src.core.metrics import INGEST_DURATION, INGEST_TWEETS, timed
+
+
+def payload_fingerprint(payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def tweet_fingerprint(tweet: Tweet) -> str:
+    """Hash of the fields ingest writes that matter to readers and the classifier."""
+    content = [
+        tweet.text,
+        tweet.author_handle,
+        tweet.author_name,
+        tweet.created_at.isoformat() if tweet.created_at else None,
+        tweet.media_urls or [],
+        tweet.quoted_status_id,
+        tweet.is_truncated,
+        tweet.is_quote_missing,
+    ]
+    encoded = json.dumps(content, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class RecentPayloads:
+    """When recently ingested payloads were seen, oldest evicted first."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, fingerprint: str, window_seconds: float) -> bool:
+        with self._lock:
+            seen_at = self._seen.get(fingerprint)
+        return seen_at is not None and time.monotonic() - seen_at < window_seconds
+
+    def add(self, fingerprint: str) -> None:
+        """Record a payload once it has been ingested successfully."""
+        with self._lock:
+            self._seen[fingerprint] = time.monotonic()
+            self._seen.move_to_end(fingerprint)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
 
 
-def _ensure_account(repo: BookmarkRepository) -> Account:
-    accounts = repo.get_all_accounts()
-    if not accounts:
-        account = Account(username="web_imported", last_synced_at=datetime.now())
-        return repo.save_account(account)
+recent_payloads = RecentPayloads()
 
-    account = accounts[0]
-    account.last_synced_at = datetime.now()
-    return repo.save_account(account)
+
+# Ingests that don't identify an account (older extensions) land here
+DEFAULT_ACCOUNT = "web_imported"
+
+
+def ensure_account(
+    repo: BookmarkRepository, user_id: Optional[str] = None, handle: Optional[str] = None
+) -> Account:
+    """The importing account, created on first sync. Its sync time is only
+    written along with changed tweets.
+
+    Accounts are keyed by X user id. Until the extension reports a handle,
+    the account is named after the id."""
+    if not user_id:
+        account = repo.get_account_by_username(DEFAULT_ACCOUNT)
+        if account is None:
+            account = repo.save_account(
+                Account(username=DEFAULT_ACCOUNT, last_synced_at=datetime.now())
+            )
+        return account
+    account = repo.get_account_by_user_id(user_id)
+    if account is None or (handle and account.username != handle):
+        account = repo.save_account(
+            Account(
+                username=handle or f"user_{user_id}",
+                user_id=user_id,
+                last_synced_at=account.last_synced_at if account else datetime.now(),
+            )
+        )
+    return account
+
+
+@timed(INGEST_DURATION)
+def sync_bookmark_batch(
+    payloads: List[Dict[str, Any]],
+    repo: BookmarkRepository,
+    parser: type[TwitterParser] = TwitterParser,
+    duplicate_window_seconds: float = 0,
+    user_id: Optional[str] = None,
+    handle: Optional[str] = None,
+    near_duplicate_threshold: float = 0,
+) -> Dict[str, Any]:
+    """Write the new or changed tweets from several captured pages at once,
+    as bookmarks of the account with X `user_id` (see `ensure_account`).
+
+    All writes, including the account's sync time, share one transaction.
+    A tweet appearing on several pages is written once, from the last page.
+    Payloads repeating one ingested within `duplicate_window_seconds` (or
+    earlier in the same batch) are dropped; 0 disables that check.
+    Written tweets at least `near_duplicate_threshold` similar to a stored
+    one join its group; 0 disables grouping.
+    """
+    # Resolved first, so a newly reported handle renames the account even
+    # when the pages repeat ones already ingested
+    account = ensure_account(repo, user_id, handle)
+    fresh: List[Dict[str, Any]] = []
+    fingerprints: List[str] = []
+    duplicates = 0
+    for payload in payloads:
+        if duplicate_window_seconds:
+            fingerprint = f"{user_id or ''}:{payload_fingerprint(payload)}"
+            if fingerprint in fingerprints or recent_payloads.seen(
+                fingerprint, duplicate_window_seconds
+            ):
+                duplicates += 1
+                continue
+            fingerprints.append(fingerprint)
+        fresh.append(payload)
+    if duplicates:
+        INGEST_TWEETS.inc(duplicates, outcome="duplicate_payload")
+
+    received = 0
+    tweets: Dict[str, Tweet] = {}
+    for payload in fresh:
+        parsed = parser.parse_bookmarks_response(payload)
+        received += len(parsed)
+        for tweet in parsed:
+            tweets[tweet.rest_id] = tweet
+
+    saved: List[Tweet] = []
+    if tweets:
+        stored = repo.get_content_hashes(list(tweets))
+        bookmarked = set(repo.get_bookmarked_rest_ids(account.id, list(tweets)))
+        changed: List[Tweet] = []
+        for tweet in tweets.values():
+            tweet.account_id = account.id
+            tweet.content_hash = tweet_fingerprint(tweet)
+            if stored.get(tweet.rest_id) != tweet.content_hash or tweet.rest_id not in bookmarked:
+                changed.append(tweet)
+        if changed:
+            account.last_synced_at = datetime.now()
+            saved = repo.save_tweets(
+                changed, account=account, near_duplicate_threshold=near_duplicate_threshold
+            )
+
+    joined = {t.rest_id for t in saved if t.duplicate_of}
+    if joined:
+        INGEST_TWEETS.inc(len(joined), outcome="near_duplicate")
+
+    skipped = received - len(saved)
+    INGEST_TWEETS.inc(len(saved), outcome="written")
+    INGEST_TWEETS.inc(skipped, outcome="unchanged")
+    announced = [t for t in saved if t.rest_id not in joined]
+    if announced:
+        EVENTS.bookmarks_ingested(announced)
+    for fingerprint in fingerprints:
+        recent_payloads.add(fingerprint)
+    return {
+        "payloads": len(payloads),
+        "duplicate_payloads": duplicates,
+        "received": received,
+        "written": len(saved),
+        "skipped": skipped,
+        "near_duplicates": len(joined),
+    }
 
 
 def sync_bookmarks(
     payload: Dict[str, Any],
     repo: BookmarkRepository,
     parser: type[TwitterParser] = TwitterParser,
-) -> int:
-    tweets = parser.parse_bookmarks_response(payload)
-    account = _ensure_account(repo)
-
-    for tweet in tweets:
-        tweet.account_id = account.id
-        repo.save_tweet(tweet)
+    duplicate_window_seconds: float = 0,
+    user_id: Optional[str] = None,
+    handle: Optional[str] = None,
+    near_duplicate_threshold: float = 0,
+) -> Dict[str, Any]:
+    """Write the new or changed tweets in one captured page.
 
-    return len(tweets)
+    Returns counts of tweets received, written and skipped as unchanged,
+    and whether the whole payload repeated a recent one.
+    """
+    result = sync_bookmark_batch(
+        [payload], repo, parser, duplicate_window_seconds, user_id, handle,
+        near_duplicate_threshold,
+    )
+    return {
+        "received": result["received"],
+        "written": result["written"],
+        "skipped": result["skipped"],
+        "near_duplicates": result["near_duplicates"],
+        "duplicate_payload": bool(result["duplicate_payloads"]),
+    }